@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright 1999-2020 Alibaba Group Holding Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Micro-benchmark of remote tells without waiting, with and without batching.
+
+    python benchmarks/actor_tell.py [-n N_MESSAGES] [-p N_PROCESS] [-a ADDRESS]
+"""
+
+import argparse
+import time
+
+from mars.actors import create_actor_pool, Actor
+from mars.actors.pool.gevent_pool import ActorClient
+
+
+class CounterActor(Actor):
+    def __init__(self):
+        super().__init__()
+        self._count = 0
+
+    def on_receive(self, message):
+        if message == 'get':
+            return self._count
+        self._count += 1
+
+
+def bench_tell(address, n_messages, batch_latency=None):
+    client = ActorClient(batch_latency=batch_latency)
+    ref = client.create_actor(CounterActor, address=address)
+
+    start = time.time()
+    futures = [ref.tell('inc', wait=False) for _ in range(n_messages)]
+    [f.result() for f in futures]
+    while ref.send('get') < n_messages:
+        client.sleep(0.001)
+    elapsed = time.time() - start
+
+    ref.destroy()
+    return n_messages / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', '--n-messages', type=int, default=20000)
+    parser.add_argument('-p', '--n-process', type=int, default=1)
+    parser.add_argument('-a', '--address', default='127.0.0.1:23456')
+    args = parser.parse_args()
+
+    with create_actor_pool(args.address, n_process=args.n_process):
+        for name, latency in [('unbatched', -1), ('batched', None)]:
+            rate = bench_tell(args.address, args.n_messages, batch_latency=latency)
+            print(f'{name:>10}: {rate:12.1f} messages/s')
+
+
+if __name__ == '__main__':
+    main()
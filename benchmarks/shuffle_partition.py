@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright 1999-2020 Alibaba Group Holding Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Micro-benchmark of splitting a DataFrame into shuffle partitions, comparing
+grouping index labels and selecting with `.loc` against positional splitting.
+
+    python benchmarks/shuffle_partition.py [-r N_ROWS] [-s N_PARTITIONS] [--unique-index]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from mars.dataframe.utils import hash_dataframe_on, split_by_partition_ids
+
+
+def split_by_labels(df, on, size):
+    partition_ids = hash_dataframe_on(df, on, size)
+    idx_to_grouped = df.index.groupby(partition_ids)
+    filters = [idx_to_grouped.get(i, pd.Index([])).unique() for i in range(size)]
+    return [df.loc[f] for f in filters]
+
+
+def split_by_positions(df, on, size):
+    return split_by_partition_ids(df, hash_dataframe_on(df, on, size), size)
+
+
+def bench_split(func, df, on, size, repeat=3):
+    best = np.inf
+    for _ in range(repeat):
+        start = time.time()
+        func(df, on, size)
+        best = min(best, time.time() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-r', '--n-rows', type=int, default=1000000)
+    parser.add_argument('-s', '--n-partitions', type=int, default=1000)
+    parser.add_argument('--unique-index', action='store_true', default=False)
+    args = parser.parse_args()
+
+    rs = np.random.RandomState(0)
+    index = np.arange(args.n_rows) if args.unique_index \
+        else rs.randint(0, args.n_rows // 10, (args.n_rows,))
+    df = pd.DataFrame({'a': rs.randint(0, args.n_rows, (args.n_rows,)),
+                       'b': rs.rand(args.n_rows)}, index=index)
+
+    for name, func in [('labels', split_by_labels), ('positions', split_by_positions)]:
+        elapsed = bench_split(func, df, 'a', args.n_partitions)
+        print(f'{name:>10}: {elapsed:8.3f} s, {elapsed * 1e9 / args.n_rows:10.1f} ns/row')
+
+
+if __name__ == '__main__':
+    main()
@@ -44,7 +44,7 @@ from .messages cimport pack_send_message, pack_tell_message, pack_create_actor_m
     unpack_create_actor_message, unpack_destroy_actor_message, unpack_result_message, \
     pack_has_actor_message, unpack_has_actor_message, pack_error_message, unpack_error_message, \
     unpack_message_type_value, unpack_message_type, unpack_message_id, read_remote_message, \
-    get_index, MessageType
+    pack_tell_batch_message, unpack_tell_batch_message, get_index, MessageType
 from .messages import write_remote_message
 from .utils cimport new_actor_id
 from .utils import create_actor_ref
@@ -55,10 +55,19 @@ cdef int REMOTE_FROM_INDEX = -2
 cdef int UNKNOWN_TO_INDEX = -1
 cpdef int REMOTE_DEFAULT_PARALLEL = 50  # parallel connection at most
 cpdef int REMOTE_MAX_CONNECTION = 200  # most connections
+# seconds a remote tell without waiting can be delayed to be batched with others,
+# negative value disables batching
+REMOTE_BATCH_LATENCY = 0.001
+REMOTE_BATCH_MAX_SIZE = 1024 ** 2  # flush a batch once its size reaches the limit
+REMOTE_BATCH_MAX_COUNT = 1000  # flush a batch once it holds so many messages
 
 _inaction_encoder = _inaction_decoder = None
 
 
+def _identity(x):
+    return x
+
+
 cdef class MessageContext:
     cdef public object message
     cdef public object async_result
@@ -439,6 +448,29 @@ class Connections(object):
                 pass
 
 
+cdef class TellBatch:
+    """
+    Tell messages to the same address waiting to be sent in one frame
+    """
+    cdef public list messages
+    cdef public list futures
+    cdef public list callbacks
+    cdef public size_t size
+
+    def __init__(self):
+        self.messages = []
+        self.futures = []
+        self.callbacks = []
+        self.size = 0
+
+    cpdef void append(self, list binaries, object future, object callback):
+        self.messages.append(binaries)
+        self.futures.append(future)
+        self.callbacks.append(callback)
+        for b in binaries:
+            self.size += len(b)
+
+
 cdef class ActorRemoteHelper:
     """
     Used to handle remote operations, like deliver create_actor, destroy_actor, send etc to remote,
@@ -452,12 +484,16 @@ cdef class ActorRemoteHelper:
     cdef object _pool
     cdef dict _connections
     cdef object _lock
+    cdef double _batch_latency
+    cdef dict _tell_batches
 
-    def __init__(self, parallel=None):
+    def __init__(self, parallel=None, batch_latency=None):
         self._parallel = parallel if parallel is not None else REMOTE_DEFAULT_PARALLEL
         self._pool = gevent.pool.Pool(self._parallel)
         self._connections = dict()
         self._lock = gevent.lock.RLock()
+        self._batch_latency = batch_latency if batch_latency is not None else REMOTE_BATCH_LATENCY
+        self._tell_batches = dict()
 
     cdef object _new_connection(self, str address):
         with self._lock:
@@ -496,6 +532,7 @@ cdef class ActorRemoteHelper:
         wait = kwargs.pop('wait', True)
         callback = kwargs.pop('callback', None)
 
+        self._flush_tell_batch(address)
         try:
             binaries = pack_create_actor_message(
                 ActorRemoteHelper.index, UNKNOWN_TO_INDEX,
@@ -557,6 +594,7 @@ cdef class ActorRemoteHelper:
     cpdef object destroy_actor(self, ActorRef actor_ref, bint wait=True, object callback=None):
         cdef tuple binaries
 
+        self._flush_tell_batch(actor_ref.address)
         binaries = pack_destroy_actor_message(ActorRemoteHelper.index, UNKNOWN_TO_INDEX, actor_ref)[1:]
 
         if wait:
@@ -568,6 +606,7 @@ cdef class ActorRemoteHelper:
     cpdef object has_actor(self, ActorRef actor_ref, bint wait=True, object callback=None):
         cdef tuple binaries
 
+        self._flush_tell_batch(actor_ref.address)
         binaries = pack_has_actor_message(ActorRemoteHelper.index, UNKNOWN_TO_INDEX, actor_ref)[1:]
 
         if wait:
@@ -596,12 +635,80 @@ cdef class ActorRemoteHelper:
         except (AttributeError, pickle.PickleError):
             raise pickle.PicklingError(f'Unable to pickle message: {message!r}')
 
+        if not wait_response and not wait and self._batch_latency >= 0:
+            return self._batch_tell(actor_ref.address, binaries, callback=callback)
+
+        # keep pending tells ahead of the message
+        self._flush_tell_batch(actor_ref.address)
+
         if wait:
             return self._pool.apply(self._send_remote, (actor_ref.address, binaries))
 
         # return future
         return self._async_run(actor_ref.address, binaries, callback=callback)
 
+    cdef object _batch_tell(self, str address, list binaries, object callback=None):
+        cdef TellBatch batch
+        cdef object future
+
+        future = gevent.event.AsyncResult()
+        try:
+            batch = self._tell_batches[address]
+        except KeyError:
+            batch = self._tell_batches[address] = TellBatch()
+            gevent.spawn_later(self._batch_latency, self._flush_tell_batch, address, batch)
+        batch.append(binaries, future, callback)
+
+        if batch.size >= REMOTE_BATCH_MAX_SIZE or len(batch.messages) >= REMOTE_BATCH_MAX_COUNT:
+            self._flush_tell_batch(address)
+        return future
+
+    def _flush_tell_batch(self, str address, TellBatch batch=None):
+        cdef object p
+        cdef list binaries
+
+        if batch is None:
+            batch = self._tell_batches.get(address)
+            if batch is None:
+                return
+        if self._tell_batches.get(address) is not batch:
+            # already flushed
+            return
+        del self._tell_batches[address]
+
+        if len(batch.messages) == 1:
+            binaries = batch.messages[0]
+        else:
+            binaries = pack_tell_batch_message(
+                ActorRemoteHelper.index, UNKNOWN_TO_INDEX, batch.messages)[1:]
+
+        def on_success(g):
+            results = g.value
+            if len(batch.messages) == 1:
+                results = [None]
+            for res_binary, future, callback in zip(results, batch.futures, batch.callbacks):
+                if res_binary is not None and \
+                        unpack_message_type_value(res_binary) == MessageType.error:
+                    error_message = unpack_error_message(res_binary)
+                    future.set_exception(error_message.error, exc_info=(
+                        error_message.error_type, error_message.error, error_message.traceback))
+                    continue
+                if callback is not None:
+                    callback(None)
+                future.set_result(None)
+
+        def on_failure(g):
+            try:
+                g.get()
+            except:
+                t, ex, tb = sys.exc_info()
+                for future in batch.futures:
+                    future.set_exception(ex, exc_info=(t, ex, tb))
+
+        p = self._pool.apply_async(self._send_remote, (address, binaries))
+        p.link_value(on_success)
+        p.link_exception(on_failure)
+
     cpdef send(self, ActorRef actor_ref, object message, bint wait=True, object callback=None):
         return self._send(actor_ref, message, wait_response=True, wait=wait, callback=callback)
 
@@ -655,6 +762,7 @@ cdef class Communicator(AsyncHandler):
         self._handlers = {
             MessageType.send_all: self._on_receive_send,
             MessageType.tell_all: self._on_receive_tell,
+            MessageType.tell_batch: self._on_receive_tell_batch,
             MessageType.create_actor: self._on_receive_create_actor,
             MessageType.destroy_actor: self._on_receive_destroy_actor,
             MessageType.has_actor: self._on_receive_has_actor,
@@ -987,6 +1095,17 @@ cdef class Communicator(AsyncHandler):
 
         return callback(result_binary)
 
+    cpdef _on_receive_tell_batch(self, bytes binary, object callback):
+        cdef object message
+        cdef list results
+        cdef bytearray result_binary
+
+        message = unpack_tell_batch_message(binary)
+        results = [bytes(self._on_receive_tell(b, _identity)) for b in message.messages]
+        _, result_binary = pack_result_message(
+            message.message_id, self.index, message.from_index, results)
+        return callback(result_binary)
+
     cpdef _on_receive_create_actor(self, bytes binary, object callback):
         cdef object message
         cdef ActorExecutionContext actor_ctx
@@ -1114,6 +1233,7 @@ cdef class Dispatcher(AsyncHandler):
         self.handlers = {
             MessageType.send_all: self._on_receive_action,
             MessageType.tell_all: self._on_receive_action,
+            MessageType.tell_batch: self._on_receive_tell_batch,
             MessageType.create_actor: self._on_receive_action,
             MessageType.destroy_actor: self._on_receive_action,
             MessageType.has_actor: self._on_receive_action,
@@ -1289,6 +1409,18 @@ cdef class Dispatcher(AsyncHandler):
             # sent from other process, just redirect
             self.pipes[to_index].put(binary)
 
+    cpdef _on_receive_tell_batch(self, bytes binary):
+        cdef object message
+        cdef list ps
+        cdef bytearray result_binary
+
+        # redirect tells to processes, and send back their results together
+        message = unpack_tell_batch_message(binary)
+        ps = [gevent.spawn(self._on_receive_action, b) for b in message.messages]
+        _, result_binary = pack_result_message(
+            message.message_id, self.index, message.from_index, [p.get() for p in ps])
+        return result_binary
+
     cpdef _on_receive_result(self, bytes binary):
         cdef int from_index
         cdef int to_index
@@ -1659,8 +1791,8 @@ cdef class ActorPool:
 cdef class ActorClient:
     cdef object remote_handler
 
-    def __init__(self, parallel=None):
-        self.remote_handler = ActorRemoteHelper(parallel)
+    def __init__(self, parallel=None, batch_latency=None):
+        self.remote_handler = ActorRemoteHelper(parallel, batch_latency=batch_latency)
 
     def create_actor(self, object actor_cls, *args, **kwargs):
         cdef object address
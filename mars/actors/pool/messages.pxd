@@ -39,6 +39,7 @@ cpdef enum MessageType:
     tell_chunk_start = 10
     tell_chunk = 11
     tell_chunk_end = 12
+    tell_batch = 13
 
 
 cpdef INT32_t unpack_message_type_value(bytes binary)
@@ -53,6 +54,9 @@ cpdef object unpack_send_message(bytes message)
 cpdef object pack_tell_message(INT32_t from_index, INT32_t to_index, ActorRef actor_ref, object message,
                                object write=*, INT32_t protocol=*)
 cpdef object unpack_tell_message(bytes message)
+cpdef object pack_tell_batch_message(INT32_t from_index, INT32_t to_index, list messages,
+                                     object write=*, INT32_t protocol=*)
+cpdef object unpack_tell_batch_message(bytes binary)
 cpdef tuple get_index(bytes binary, object calc_from_uid)
 cpdef object pack_create_actor_message(INT32_t from_index, INT32_t to_index, ActorRef actor_ref, object actor_cls,
                                        tuple args, dict kw, object write=*, INT32_t protocol=*)
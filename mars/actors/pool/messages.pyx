@@ -35,6 +35,7 @@ pickling_support.install()
 # 5) error that throws back by the actor in a different process or machine
 # 6) send all, the send actor message
 # 7) tell all, the tell actor message
+# 8) tell batch, tell actor messages coalesced into one frame
 cpdef BYTE_t CREATE_ACTOR = MessageType.create_actor
 cpdef BYTE_t DESTROY_ACTOR = MessageType.destroy_actor
 cpdef BYTE_t HAS_ACTOR = MessageType.has_actor
@@ -42,6 +43,7 @@ cpdef BYTE_t RESULT = MessageType.result
 cpdef BYTE_t ERROR = MessageType.error
 cpdef BYTE_t SEND_ALL = MessageType.send_all
 cpdef BYTE_t TELL_ALL = MessageType.tell_all
+cpdef BYTE_t TELL_BATCH = MessageType.tell_batch
 
 
 cpdef enum MessageSerialType:
@@ -153,6 +155,18 @@ cdef class SEND_MESSAGE(_BASE_ACTOR_MESSAGE):
         self.message = message
 
 
+cdef class TELL_BATCH_MESSAGE(_BASE_ACTOR_MESSAGE):
+    cdef public list messages
+
+    def __init__(self, INT32_t message_type=-1, bytes message_id=None,
+                 INT32_t from_index=0, INT32_t to_index=0, list messages=None):
+        self.message_type = message_type
+        self.message_id = message_id
+        self.from_index = from_index
+        self.to_index = to_index
+        self.messages = messages
+
+
 @cython.boundscheck(False)
 @cython.wraparound(False)
 cdef inline void _pack_byte(BYTE_t val, bytearray arr):
@@ -575,6 +589,72 @@ cpdef object unpack_tell_message(bytes message):
     return _unpack_send_message(message, send=False)
 
 
+cpdef object pack_tell_batch_message(INT32_t from_index, INT32_t to_index, list messages,
+                                     object write=None, INT32_t protocol=DEFAULT_PROTOCOL):
+    """
+    Pack tell messages into one message, every element in `messages` is
+    a list of binaries of a packed tell message
+    """
+    cdef bytes message_id
+    cdef bytearray buf
+    cdef bytearray size_buf
+    cdef list binaries
+    cdef INT64_t size
+
+    message_id = new_message_id()
+
+    buf = bytearray()
+    _pack_message_type(TELL_BATCH, buf, protocol=protocol)
+    _pack_message_id(message_id, buf)
+    _pack_index(from_index, buf)
+    _pack_index(to_index, buf)
+    _pack_message_size(len(messages), buf)
+
+    binaries = [buf]
+    for message in messages:
+        size = 0
+        for b in message:
+            size += len(b)
+        size_buf = bytearray()
+        _pack_long(size, size_buf)
+        binaries.append(size_buf)
+        binaries.extend(message)
+
+    if write is not None:
+        write(*binaries)
+        return message_id
+
+    return [message_id] + binaries
+
+
+cpdef object unpack_tell_batch_message(bytes binary):
+    cdef bytes message_id
+    cdef INT32_t from_index
+    cdef INT32_t to_index
+    cdef size_t n_messages
+    cdef size_t size
+    cdef list messages
+    cdef size_t pos = 0
+    cdef const char *binary_ptr = binary
+
+    _unpack_message_type_value(binary_ptr, &pos)
+    message_id = _unpack_message_id(binary_ptr, &pos)
+    from_index = _unpack_index(binary_ptr, &pos)
+    to_index = _unpack_index(binary_ptr, &pos)
+    n_messages = _unpack_message_size(binary_ptr, &pos)
+
+    messages = []
+    for _ in range(n_messages):
+        size = _unpack_long(binary_ptr + pos)
+        pos += sizeof(INT64_t)
+        messages.append(binary_ptr[pos:pos + size])
+        pos += size
+
+    return TELL_BATCH_MESSAGE(message_type=TELL_BATCH, message_id=message_id,
+                              from_index=from_index, to_index=to_index,
+                              messages=messages)
+
+
 cpdef tuple get_index(bytes binary, object calc_from_uid):
     cdef object buf
     cdef INT32_t from_index
@@ -26,7 +26,9 @@ import gevent
 from mars.actors import create_actor_pool as new_actor_pool, Actor, FunctionActor, \
     ActorPoolNotStarted, ActorAlreadyExist, ActorNotExist, Distributor, new_client, \
     register_actor_implementation, unregister_actor_implementation
-from mars.actors.pool.gevent_pool import Dispatcher, Connections
+from mars.actors.pool.gevent_pool import Dispatcher, Connections, ActorClient
+from mars.actors.pool.messages import pack_tell_message, pack_tell_batch_message, \
+    unpack_tell_batch_message, unpack_tell_message
 from mars.lib.mmh3 import hash as mmh_hash
 from mars.utils import to_binary
 
@@ -1255,6 +1257,53 @@ class Test(unittest.TestCase):
                 client.sleep(.5)
                 self.assertEqual(ref2.send(('get',)), 9)
 
+    def testTellBatchMessage(self):
+        ref = ActorClient().actor_ref('uid', address='127.0.0.1:12345')
+        messages = [pack_tell_message(-2, -1, ref, ('add', i))[1:] for i in range(3)]
+        binaries = pack_tell_batch_message(-2, -1, messages)[1:]
+
+        message = unpack_tell_batch_message(b''.join(binaries))
+        self.assertEqual(message.from_index, -2)
+        self.assertEqual(message.to_index, -1)
+        self.assertEqual(len(message.messages), 3)
+        for i, binary in enumerate(message.messages):
+            tell_message = unpack_tell_message(binary)
+            self.assertEqual(tell_message.actor_ref.uid, 'uid')
+            self.assertEqual(tell_message.message, ('add', i))
+
+    def testRemoteTellBatch(self):
+        for n_process in (1, 2):
+            with create_actor_pool(address=True, n_process=n_process, backend='gevent') as pool:
+                addr = pool.cluster_info.address
+
+                client = new_client(backend='gevent')
+                ref = client.create_actor(DummyActor, 0, address=addr)
+
+                # tells issued together are delivered in one frame
+                futures = [ref.tell(('add', i), wait=False) for i in range(100)]
+                [f.result() for f in futures]
+                self.assertEqual(ref.send(('get',)), sum(range(100)))
+
+                # errors only reach futures of failed tells
+                called = []
+                fake_ref = client.actor_ref('fake_uid', address=addr)
+                futures = [ref.tell(('add', 1), wait=False, callback=called.append),
+                           fake_ref.tell(('add', 1), wait=False),
+                           ref.tell(('add', 'x'), wait=False, callback=called.append)]
+                self.assertIsNone(futures[0].result())
+                with self.assertRaises(ActorNotExist):
+                    futures[1].result()
+                self.assertIsNone(futures[2].result())
+                self.assertEqual(called, [None, None])
+                self.assertEqual(ref.send(('get',)), sum(range(100)) + 1)
+
+                # batching can be disabled
+                client = ActorClient(batch_latency=-1)
+                ref = client.actor_ref(ref.uid, address=addr)
+                futures = [ref.tell(('add', 1), wait=False) for _ in range(10)]
+                [f.result() for f in futures]
+                self.assertEqual(ref.send(('get',)), sum(range(100)) + 11)
+
     def testRemoteDestroyHasLocalPool(self):
         # client -> local pool
         with create_actor_pool(address=True, n_process=1, backend='gevent') as pool:
@@ -17,17 +17,20 @@ import logging
 import random
 import time
 import uuid
+from collections import deque
 
 from .actors import new_client, ActorNotExist
+from .config import options
 from .errors import GraphNotExists
 from .scheduler import SessionActor, GraphActor, GraphMetaActor, ResourceActor, \
     SessionManagerActor, ChunkMetaClient
 from .scheduler.node_info import NodeInfoActor
 from .scheduler.utils import SchedulerClusterInfoActor
+from .worker.tracer import TracerActor
 from .worker.transfer import ResultSenderActor, ReceiverManagerActor
 from .tensor.utils import slice_split
 from .serialize import dataserializer
-from .utils import tokenize, merge_chunks, arrow_array_to_objects
+from .utils import tokenize, merge_chunks, arrow_array_to_objects, split_chunk_batches
 
 logger = logging.getLogger(__name__)
 
@@ -189,6 +192,29 @@ class MarsAPI(object):
         except ActorNotExist:
             raise GraphNotExists
 
+    def get_graph_trace_spans(self, session_id, graph_key):
+        """
+        Collect trace spans of operands in a graph from schedulers and workers
+        :return: list of trace spans and dict mapping operand keys to operand names
+        """
+        graph_meta_ref = self.get_graph_meta_ref(session_id, graph_key)
+        try:
+            op_infos = graph_meta_ref.get_operand_info()
+            spans = graph_meta_ref.get_trace_spans()
+        except ActorNotExist:
+            raise GraphNotExists
+        op_names = dict((k, v.get('op_name')) for k, v in op_infos.items())
+
+        # operands may be executed in more than one worker when retried
+        op_keys = list(op_names.keys())
+        for worker in self.get_workers_meta():
+            tracer_ref = self.actor_client.actor_ref(TracerActor.default_uid(), address=worker)
+            try:
+                spans.extend(tracer_ref.get_spans(session_id, op_keys))
+            except ActorNotExist:
+                continue
+        return spans, op_names
+
     def wait_graph_finish(self, session_id, graph_key, timeout=None):
         graph_meta_ref = self.get_graph_meta_ref(session_id, graph_key)
         self.actor_client.actor_ref(graph_meta_ref.get_wait_ref()).wait(timeout)
@@ -216,20 +242,55 @@ class MarsAPI(object):
                 chunk_key = chunk_index_to_key[chunk_index]
                 chunk_results[chunk_index] = self.fetch_chunk_data(session_id, chunk_key, slice_obj)
 
-        chunk_results = [(idx, dataserializer.loads(f.result())) for
-                         idx, f in chunk_results.items()]
-        if len(chunk_results) == 1:
-            ret = chunk_results[0][1]
-        else:
-            ret = merge_chunks(chunk_results)
+        ret = self._merge_chunk_results(chunk_results.items())
         if not serial:
             return ret
+        return self._serialize_result(ret, serial_type=serial_type, compressions=compressions,
+                                      pickle_protocol=pickle_protocol)
+
+    @staticmethod
+    def _merge_chunk_results(chunk_futures):
+        chunk_results = [(idx, dataserializer.loads(f.result())) for idx, f in chunk_futures]
+        if len(chunk_results) == 1:
+            return chunk_results[0][1]
+        else:
+            return merge_chunks(chunk_results)
+
+    @staticmethod
+    def _serialize_result(ret, serial_type=None, compressions=None, pickle_protocol=None):
         compressions = max(compressions) if compressions else dataserializer.CompressType.NONE
         if serial_type == dataserializer.SerialType.PICKLE:
             ret = arrow_array_to_objects(ret)
         return dataserializer.dumps(ret, serial_type=serial_type, compress=compressions,
                                     pickle_protocol=pickle_protocol)
 
+    def iter_fetch_chunks_data(self, session_id, chunk_indexes, chunk_keys, batch_size=1,
+                               prefetch=None, serial=True, serial_type=None,
+                               compressions=None, pickle_protocol=None):
+        """
+        Fetch chunks batch by batch in index order, at most `prefetch` batches
+        are fetched ahead of the batch being yielded.
+        """
+        prefetch = prefetch if prefetch is not None else options.client.iter_fetch_prefetch
+        batches = iter(split_chunk_batches(chunk_indexes, chunk_keys, batch_size=batch_size))
+
+        def _submit_batch(batch):
+            return [(idx, self.fetch_chunk_data(session_id, k)) for idx, k in batch]
+
+        batch_futures = deque(_submit_batch(b) for b in itertools.islice(batches, prefetch + 1))
+        while batch_futures:
+            chunk_futures = batch_futures.popleft()
+            next_batch = next(batches, None)
+            if next_batch is not None:
+                batch_futures.append(_submit_batch(next_batch))
+
+            ret = self._merge_chunk_results(chunk_futures)
+            if not serial:
+                yield ret
+            else:
+                yield self._serialize_result(ret, serial_type=serial_type, compressions=compressions,
+                                             pickle_protocol=pickle_protocol)
+
     def fetch_data(self, session_id, graph_key, tileable_key, index_obj=None,
                    serial=True, serial_type=None, compressions=None, pickle_protocol=None):
         graph_uid = GraphActor.gen_uid(session_id, graph_key)
@@ -239,6 +300,15 @@ class MarsAPI(object):
                                       index_obj=index_obj, serial=serial, serial_type=serial_type,
                                       compressions=compressions, pickle_protocol=pickle_protocol)
 
+    def iter_fetch_data(self, session_id, graph_key, tileable_key, batch_size=1, prefetch=None,
+                        serial=True, serial_type=None, compressions=None, pickle_protocol=None):
+        graph_uid = GraphActor.gen_uid(session_id, graph_key)
+        graph_ref = self.get_actor_ref(graph_uid)
+        _nsplits, chunk_keys, chunk_indexes = graph_ref.get_tileable_metas([tileable_key])[0]
+        return self.iter_fetch_chunks_data(session_id, chunk_indexes, chunk_keys, batch_size=batch_size,
+                                           prefetch=prefetch, serial=serial, serial_type=serial_type,
+                                           compressions=compressions, pickle_protocol=pickle_protocol)
+
     def fetch_chunk_data(self, session_id, chunk_key, index_obj=None):
         endpoints = self.chunk_meta_client.get_workers(session_id, chunk_key)
         if endpoints is None:
@@ -262,6 +332,11 @@ class MarsAPI(object):
         graph_ref = self.get_actor_ref(graph_uid)
         graph_ref.free_tileable_data(tileable_key, wait=wait, _tell=not wait)
 
+    def pin_data(self, session_id, graph_key, tileable_key, pin=True):
+        graph_uid = GraphActor.gen_uid(session_id, graph_key)
+        graph_ref = self.get_actor_ref(graph_uid)
+        graph_ref.pin_tileable_data(tileable_key, pin=pin)
+
     def get_tileable_nsplits(self, session_id, graph_key, tileable_key):
         # nsplits is essential for operator like `reshape` and shape can be calculated by nsplits
         graph_uid = GraphActor.gen_uid(session_id, graph_key)
@@ -305,6 +305,14 @@ default_options.register_option('check_interval', 20, validator=is_integer)
 default_options.register_option('dataframe.mode.use_inf_as_na', False, validator=is_bool)
 default_options.register_option('dataframe.use_arrow_dtype', None, validator=any_validator(is_null, is_bool))
 default_options.register_option('dataframe.arrow_array.pandas_only', None, validator=any_validator(is_null, is_bool))
+# max estimated size of the side of merge to broadcast, chunk_store_limit is used if not specified
+default_options.register_option('dataframe.broadcast_join_limit', None,
+                                validator=any_validator(is_null, is_numeric), serialize=True)
+# split keys with estimated rows more than `heavy_factor` times the average rows
+# of a reducer over multiple reducers when shuffling for merge
+default_options.register_option('dataframe.skew_join.enabled', False, validator=is_bool, serialize=True)
+default_options.register_option('dataframe.skew_join.sample_size', 1000, validator=is_integer, serialize=True)
+default_options.register_option('dataframe.skew_join.heavy_factor', 1.0, validator=is_numeric, serialize=True)
 
 # learn options
 assume_finite = os.environ.get('SKLEARN_ASSUME_FINITE')
@@ -327,6 +335,10 @@ default_options.register_option('chunk_size', None, validator=any_validator(is_n
 default_options.register_option('rechunk.threshold', 4, validator=is_integer, serialize=True)
 default_options.register_option('rechunk.chunk_size_limit', int(1e8), validator=is_integer, serialize=True)
 
+# rechunk operands of matrix products to reduce transferred data
+# given number of cores in the cluster
+default_options.register_option('tensor.matmul.reblock', True, validator=is_bool, serialize=True)
+
 # deploy
 default_options.register_option('deploy.open_browser', True, validator=is_bool)
 
@@ -353,12 +365,33 @@ default_options.register_option('scheduler.worker_blacklist_time', 3600, validat
 default_options.register_option('scheduler.batch_enqueue_initials', True, validator=is_bool, serialize=True)
 # invoke assigning when where there is no ready descendants
 default_options.register_option('scheduler.aggressive_assign', False, validator=is_bool, serialize=True)
+# number of OperandHostActors per session to host operands in,
+# 0 means creating one OperandActor per operand
+default_options.register_option('scheduler.operand_host_shards', 0, validator=is_integer, serialize=True)
+# store chunk meta in NumPy arrays instead of one object per chunk
+default_options.register_option('scheduler.columnar_chunk_meta', False, validator=is_bool, serialize=True)
+
+# Local
+# max size of data held in memory by a local session before spilling to disk,
+# can be a size like '4G' or a percentage of total memory like '50%'
+default_options.register_option('local.spill_limit', None, validator=(is_null, is_string, is_integer))
+default_options.register_option('local.spill_directory', None, validator=(is_null, is_string))
+default_options.register_option('local.eviction_policy', 'lru', validator=is_string)
+
+# Result cache
+# directory of the cache of chunk results persisted across sessions, can be
+# a local path or one on a shared file system, the cache is disabled if not set
+default_options.register_option('result_cache.directory', None, validator=(is_null, is_string))
+# total size of cached results, least recently used ones are evicted beyond the size
+default_options.register_option('result_cache.max_size', '10G', validator=(is_null, is_string, is_integer))
+default_options.register_option('result_cache.storage_options', None, validator=(is_null, is_dict))
 
 # Worker
 default_options.register_option('worker.spill_directory', None, validator=(is_null, is_string, is_list))
 default_options.register_option('worker.disk_compression', 'lz4', validator=is_string, serialize=True)
 default_options.register_option('worker.min_spill_size', '5%', validator=(is_string, is_integer))
 default_options.register_option('worker.max_spill_size', '95%', validator=(is_string, is_integer))
+default_options.register_option('worker.eviction_policy', 'lru', validator=is_string, serialize=True)
 default_options.register_option('worker.min_cache_mem_size', None, validator=(is_null, is_string, is_integer))
 default_options.register_option('worker.callback_preserve_time', 3600 * 24, validator=is_integer)
 default_options.register_option('worker.event_preserve_time', 3600 * 24, validator=(is_integer, is_float))
@@ -366,11 +399,18 @@ default_options.register_option('worker.copy_block_size', 64 * 1024, validator=i
 default_options.register_option('worker.cuda_thread_num', 2, validator=is_integer)
 default_options.register_option('worker.transfer_block_size', 1 * 1024 ** 2, validator=is_integer)
 default_options.register_option('worker.transfer_compression', 'lz4', validator=is_string, serialize=True)
+default_options.register_option('worker.transfer_window_size', 4, validator=is_integer, serialize=True)
 default_options.register_option('worker.prepare_data_timeout', 600, validator=is_integer)
 default_options.register_option('worker.peer_blacklist_time', 3600, validator=is_numeric, serialize=True)
 default_options.register_option('worker.io_parallel_num', 1, validator=is_integer, serialize=True)
 default_options.register_option('worker.recover_dead_process', True, validator=is_bool, serialize=True)
 default_options.register_option('worker.write_shuffle_to_disk', False, validator=is_bool, serialize=True)
+# shuffle data no larger than the size are packed into segment files when spilled,
+# 0 means writing one file per data key
+default_options.register_option('worker.spill_segment_max_item_size', 1024 ** 2, validator=is_integer)
+default_options.register_option('worker.spill_segment_size', 64 * 1024 ** 2, validator=is_integer)
+# read uncompressed spilled data into process memory via memory mapping
+default_options.register_option('worker.mmap_spilled_data', True, validator=is_bool)
 
 default_options.register_option('worker.plasma_socket', '/tmp/plasma', validator=is_string)
 
@@ -387,6 +427,8 @@ default_options.register_option('eager_mode', False, validator=is_bool)
 
 # client serialize type
 default_options.register_option('client.serial_type', 'arrow', validator=is_string)
+# number of batches fetched ahead when iterating results
+default_options.register_option('client.iter_fetch_prefetch', 2, validator=is_integer)
 
 # custom log dir
 default_options.register_option('custom_log_dir', None, validator=any_validator(is_null, is_string))
@@ -394,6 +436,11 @@ default_options.register_option('custom_log_dir', None, validator=any_validator(
 # vineyard
 default_options.register_option('vineyard.socket', None)
 
+# record time spans of operand execution stages in schedulers and workers
+default_options.register_option('trace.enabled', False, validator=is_bool, serialize=True)
+# max number of spans kept for every session in a worker
+default_options.register_option('trace.max_spans', 100000, validator=is_integer)
+
 _options_local = threading.local()
 _options_local.default_options = default_options
 
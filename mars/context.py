@@ -24,6 +24,8 @@ from typing import List, Dict, Optional
 
 import numpy as np
 
+from .spill import SpillableStorage, SpilledData
+
 
 _context_factory = threading.local()
 
@@ -216,14 +218,18 @@ ChunkMeta = namedtuple('ChunkMeta', ['chunk_size', 'chunk_shape', 'workers'])
 TileableInfos = namedtuple('TileableInfos', ['tileable_key', 'tileable_shape'])
 
 
-class LocalContext(ContextBase, dict):
-    def __init__(self, local_session, ncores=None):
-        dict.__init__(self)
+class LocalContext(ContextBase, SpillableStorage):
+    def __init__(self, local_session, ncores=None, spill_limit=None, spiller=None,
+                 pinned_keys=None):
+        SpillableStorage.__init__(self, spill_limit=spill_limit, spiller=spiller,
+                                  pinned_keys=pinned_keys)
         self._local_session = local_session
         self._ncores = ncores
 
     def copy(self):
-        new_d = LocalContext(self._local_session, ncores=self._ncores)
+        new_d = LocalContext(self._local_session, ncores=self._ncores,
+                             spill_limit=self.spill_limit, spiller=self.spiller,
+                             pinned_keys=self.pinned_keys)
         new_d.update(self)
         return new_d
 
@@ -267,11 +273,14 @@ class LocalContext(ContextBase, dict):
     def get_chunk_metas(self, chunk_keys, filter_fields=None):
         metas = []
         for chunk_key in chunk_keys:
-            chunk_data = self.get(chunk_key)
+            chunk_data = self.peek(chunk_key) if chunk_key in self else None
             if chunk_data is None:
                 metas.append(None)
                 continue
-            if hasattr(chunk_data, 'nbytes'):
+            if isinstance(chunk_data, SpilledData):
+                size = chunk_data.size
+                shape = chunk_data.shape
+            elif hasattr(chunk_data, 'nbytes'):
                 # ndarray
                 size = chunk_data.nbytes
                 shape = chunk_data.shape
@@ -380,6 +380,24 @@ class _ExecutableMixin:
             thread_executor = ThreadPoolExecutor(1)
             return thread_executor.submit(run)
 
+    def persist(self, session=None, **kw):
+        """
+        Execute if not executed, and pin chunks where they are stored,
+        see `Session.persist` for details.
+        """
+        from .session import Session
+
+        if session is None:
+            session = Session.default_or_local()
+        session.persist(self, **kw)
+        return self
+
+    def unpersist(self, session=None):
+        session = self._get_session(session)
+        self._check_session(session, 'unpersist')
+        session.unpersist(self)
+        return self
+
     def _get_session(self, session=None):
         from .session import Session
 
@@ -642,6 +660,14 @@ class HasShapeTileableEnity(TileableEntity):
             thread_executor = ThreadPoolExecutor(1)
             return thread_executor.submit(run)
 
+    def persist(self, session=None, **kw):
+        self.data.persist(session, **kw)
+        return self
+
+    def unpersist(self, session=None):
+        self.data.unpersist(session)
+        return self
+
 
 class ObjectData(TileableData, _ToObjectMixin):
     __slots__ = ()
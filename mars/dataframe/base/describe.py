@@ -17,7 +17,7 @@ import pandas as pd
 
 from ... import opcodes as OperandDef
 from ... import tensor as mt
-from ...serialize import ValueType, KeyField, ListField
+from ...serialize import ValueType, KeyField, ListField, BoolField, Float64Field
 from ...utils import recursive_tile
 from ..core import SERIES_TYPE
 from ..initializer import DataFrame, Series
@@ -32,11 +32,14 @@ class DataFrameDescribe(DataFrameOperand, DataFrameOperandMixin):
     _percentiles = ListField('percentiles', ValueType.float64)
     _include = ListField('include')
     _exclude = ListField('exclude')
+    _approx = BoolField('approx')
+    _relative_error = Float64Field('relative_error')
 
-    def __init__(self, percentiles=None, include=None, exclude=None,
-                 output_types=None, **kw):
+    def __init__(self, percentiles=None, include=None, exclude=None, approx=None,
+                 relative_error=None, output_types=None, **kw):
         super().__init__(_percentiles=percentiles, _include=include,
-                         _exclude=exclude, _output_types=output_types, **kw)
+                         _exclude=exclude, _approx=approx,
+                         _relative_error=relative_error, _output_types=output_types, **kw)
 
     @property
     def input(self):
@@ -54,6 +57,19 @@ class DataFrameDescribe(DataFrameOperand, DataFrameOperandMixin):
     def exclude(self):
         return self._exclude
 
+    @property
+    def approx(self):
+        return self._approx
+
+    @property
+    def relative_error(self):
+        return self._relative_error
+
+    def _get_quantile_kw(self):
+        if not self._approx:
+            return dict()
+        return dict(approx=True, relative_error=self._relative_error)
+
     def _set_inputs(self, inputs):
         super()._set_inputs(inputs)
         self._input = self._inputs[0]
@@ -117,7 +133,7 @@ class DataFrameDescribe(DataFrameOperand, DataFrameOperandMixin):
         for i, agg in enumerate(names[:4]):
             values[i] = mt.atleast_1d(getattr(series, agg)())
         values[-1] = mt.atleast_1d(getattr(series, names[-1])())
-        values[4] = series.quantile(op.percentiles).to_tensor()
+        values[4] = series.quantile(op.percentiles, **op._get_quantile_kw()).to_tensor()
 
         t = mt.concatenate(values).rechunk(len(names))
         ret = Series(t, index=index, name=series.name)
@@ -139,7 +155,7 @@ class DataFrameDescribe(DataFrameOperand, DataFrameOperandMixin):
         for i, agg in enumerate(names[:4]):
             values[i] = getattr(df, agg)().to_tensor()[None, :]
         values[-1] = getattr(df, names[-1])().to_tensor()[None, :]
-        values[4] = df.quantile(op.percentiles).to_tensor()
+        values[4] = df.quantile(op.percentiles, **op._get_quantile_kw()).to_tensor()
 
         t = mt.concatenate(values).rechunk((len(index), len(columns)))
         ret = DataFrame(t, index=index, columns=columns)
@@ -153,7 +169,8 @@ class DataFrameDescribe(DataFrameOperand, DataFrameOperandMixin):
             percentiles=op.percentiles, include=op.include, exclude=op.exclude)
 
 
-def describe(df_or_series, percentiles=None, include=None, exclude=None):
+def describe(df_or_series, percentiles=None, include=None, exclude=None,
+             approx=False, relative_error=0.01):
     if percentiles is not None:
         for p in percentiles:
             if p < 0 or p > 1:
@@ -164,5 +181,6 @@ def describe(df_or_series, percentiles=None, include=None, exclude=None):
     if not percentiles:
         percentiles = [0.5]
 
-    op = DataFrameDescribe(percentiles=percentiles, include=include, exclude=exclude)
+    op = DataFrameDescribe(percentiles=percentiles, include=include, exclude=exclude,
+                           approx=approx, relative_error=relative_error)
     return op(df_or_series)
@@ -26,7 +26,8 @@ from ..initializer import DataFrame as asdataframe
 from ..operands import DataFrameMapReduceOperand, DataFrameOperandMixin, \
     DataFrameShuffleProxy, OutputType
 from ..merge import DataFrameConcat
-from ..utils import parse_index, hash_dataframe_on, gen_unknown_index_value, standardize_range_index
+from ..utils import parse_index, hash_dataframe_on, gen_unknown_index_value, standardize_range_index, \
+    split_by_partition_ids
 
 cudf = lazy_import('cudf', globals=globals())
 
@@ -409,9 +410,10 @@ class DataFrameDropDuplicates(DataFrameMapReduceOperand, DataFrameOperandMixin):
                 subset = dropped.columns.tolist()
         dropped['_chunk_index_'] = out.index[0]
         dropped['_i_'] = np.arange(dropped.shape[0])
-        hashed = hash_dataframe_on(dropped, subset, shuffle_size)
-        for i, data in enumerate(hashed):
-            ctx[(out.key, str(i))] = dropped.loc[data]
+        partition_ids = hash_dataframe_on(dropped, subset, shuffle_size)
+        partitions = split_by_partition_ids(dropped, partition_ids, shuffle_size)
+        for i, data in enumerate(partitions):
+            ctx[(out.key, str(i))] = data
 
     @classmethod
     def _execute_shuffle_reduce(cls, ctx, op):
@@ -248,6 +248,18 @@ class Test(TestBase):
         with self.assertRaises(ValueError):
             df.describe(percentiles=[1.1])
 
+        # percentiles are computed by t-digests
+        r = df.describe(approx=True)
+        result = self.executor.execute_dataframe(r, concat=True)[0]
+        expected = df_raw.describe()
+        pd.testing.assert_frame_equal(result, expected)
+
+        series = from_pandas_series(s_raw, chunk_size=3)
+        r = series.describe(percentiles=[0.1, 0.9], approx=True)
+        result = self.executor.execute_dataframe(r, concat=True)[0]
+        expected = s_raw.describe(percentiles=[0.1, 0.9])
+        pd.testing.assert_series_equal(result, expected)
+
         # test input dataframe which has unknown shape
         with self.ctx:
             df = from_pandas_df(df_raw, chunk_size=3)
@@ -24,10 +24,10 @@ from ...config import options
 from ...core import OutputType
 from ...utils import parse_readable_size, lazy_import, FixedSizeFileObject
 from ...serialize import StringField, DictField, ListField, Int32Field, Int64Field, BoolField, AnyField
-from ...filesystem import open_file, file_size, glob
+from ...filesystem import open_file, file_size, glob, get_fingerprint
 from ..arrays import ArrowStringDtype
 from ..core import IndexValue
-from ..utils import parse_index, build_empty_df, standardize_range_index, \
+from ..utils import parse_index, build_empty_df, standardize_range_index, filter_by_predicates, \
     to_arrow_dtypes, contain_arrow_dtype
 from ..operands import DataFrameOperand, DataFrameOperandMixin
 
@@ -83,6 +83,7 @@ def _find_chunk_start_end(f, offset, size):
 
 class DataFrameReadCSV(DataFrameOperand, DataFrameOperandMixin):
     _op_type_ = OperandDef.READ_CSV
+    _external_source_ = True
 
     _path = AnyField('path')
     _names = ListField('names')
@@ -98,18 +99,20 @@ class DataFrameReadCSV(DataFrameOperand, DataFrameOperandMixin):
     _use_arrow_dtype = BoolField('use_arrow_dtype')
     _keep_usecols_order = BoolField('keep_usecols_order')
     _storage_options = DictField('storage_options')
+    # list of (column, op, value) to select rows
+    _filters = AnyField('filters')
 
     def __init__(self, path=None, names=None, sep=None, header=None, index_col=None,
                  compression=None, usecols=None, offset=None, size=None, nrows=None,
                  gpu=None, keep_usecols_order=None, incremental_index=None,
-                 use_arrow_dtype=None, storage_options=None, **kw):
+                 use_arrow_dtype=None, storage_options=None, filters=None, **kw):
         super().__init__(_path=path, _names=names, _sep=sep, _header=header,
                          _index_col=index_col, _compression=compression,
                          _usecols=usecols, _offset=offset, _size=size, _nrows=nrows,
                          _gpu=gpu, _incremental_index=incremental_index,
                          _keep_usecols_order=keep_usecols_order,
                          _use_arrow_dtype=use_arrow_dtype,
-                         _storage_options=storage_options,
+                         _storage_options=storage_options, _filters=filters,
                          _output_types=[OutputType.dataframe], **kw)
 
     @property
@@ -168,6 +171,14 @@ class DataFrameReadCSV(DataFrameOperand, DataFrameOperandMixin):
     def storage_options(self):
         return self._storage_options
 
+    @property
+    def filters(self):
+        return getattr(self, '_filters', None)
+
+    def get_fingerprint(self, memo=None):
+        return get_fingerprint(self._path, storage_options=self._storage_options,
+                               memo=memo)
+
     @classmethod
     def _tile_compressed(cls, op):
         # Compression does not support break into small parts
@@ -319,6 +330,8 @@ class DataFrameReadCSV(DataFrameOperand, DataFrameOperandMixin):
             else:
                 df = cls._cudf_read_csv(op) if op.gpu else cls._pandas_read_csv(f, op)
 
+        if op.filters:
+            df = filter_by_predicates(df, op.filters)
         ctx[out_df.key] = df
 
     def __call__(self, index_value=None, columns_value=None, dtypes=None, chunk_bytes=None):
@@ -14,8 +14,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
 import os
 import pickle
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import pandas as pd
@@ -33,13 +35,18 @@ except ImportError:
 
 from ... import opcodes as OperandDef
 from ...config import options
-from ...filesystem import open_file, glob
+from ...filesystem import open_file, glob, get_fingerprint
 from ...serialize import AnyField, BoolField, DictField, ListField,\
-    StringField, Int32Field, BytesField
+    StringField, BytesField
+from ...utils import parse_readable_size
 from ..arrays import ArrowStringDtype
 from ..operands import DataFrameOperandMixin, DataFrameOperand, OutputType
 from ..utils import parse_index, to_arrow_dtypes, contain_arrow_dtype, \
-    standardize_range_index
+    standardize_range_index, filter_by_predicates
+
+
+# max number of threads to read footers of files when tiling
+_max_footer_readers = 16
 
 
 def check_engine(engine):
@@ -71,6 +78,52 @@ def get_engine(engine):
         raise RuntimeError('Unsupported engine {}'.format(engine))
 
 
+def _stats_may_match(min_value, max_value, op, value, has_nulls=True):
+    if op == 'in':
+        return any(_stats_may_match(min_value, max_value, '==', v) for v in value)
+    if isinstance(min_value, datetime.date) and isinstance(value, str):
+        value = pd.Timestamp(value)
+    if op == '==':
+        return min_value <= value <= max_value
+    elif op == '!=':
+        # nulls are not equal to any value
+        return has_nulls or not (min_value == max_value == value)
+    elif op == '<':
+        return min_value < value
+    elif op == '<=':
+        return min_value <= value
+    elif op == '>':
+        return max_value > value
+    elif op == '>=':
+        return max_value >= value
+    return True
+
+
+def row_group_may_match(row_group, filters):
+    """
+    Check by column statistics if any row in the row group
+    may satisfy all filters of (column, op, value)
+    """
+    column_indices = dict((row_group.column(i).path_in_schema, i)
+                          for i in range(row_group.num_columns))
+    for col, op, value in filters:
+        try:
+            stats = row_group.column(column_indices[col]).statistics
+        except KeyError:
+            continue
+        if stats is None or not stats.has_min_max:
+            continue
+        try:
+            has_nulls = not stats.has_null_count or stats.null_count > 0
+            if not _stats_may_match(stats.min, stats.max, op, value,
+                                    has_nulls=has_nulls):
+                return False
+        except TypeError:
+            # values not comparable with statistics
+            continue
+    return True
+
+
 class ParqueEngine:
     def read_dtypes(self, f, **kwargs):
         raise NotImplementedError
@@ -79,8 +132,8 @@ class ParqueEngine:
                        use_arrow_dtype=None, **kwargs):
         raise NotImplementedError
 
-    def read_group_to_pandas(self, f, group_index, columns=None,
-                             use_arrow_dtype=None, **kwargs):
+    def read_groups_to_pandas(self, f, group_indices, columns=None,
+                              use_arrow_dtype=None, **kwargs):
         raise NotImplementedError
 
 
@@ -101,14 +154,47 @@ class ArrowEngine(ParqueEngine):
     def read_to_pandas(self, f, columns=None,
                        use_arrow_dtype=None, **kwargs):
         file = pq.ParquetFile(f)
-        t = file.read(columns=columns, **kwargs)
+        t = file.read(columns=columns, use_pandas_metadata=True, **kwargs)
         return self._table_to_pandas(t, use_arrow_dtype=use_arrow_dtype)
 
-    def read_group_to_pandas(self, f, group_index, columns=None,
-                             use_arrow_dtype=None, **kwargs):
+    @staticmethod
+    def _get_groups_range_index(file, group_indices):
+        """
+        Get labels of rows in row groups as if the whole file is read,
+        None if the file is not stored with a RangeIndex.
+        """
+        index_columns = (file.schema_arrow.pandas_metadata or dict()).get('index_columns')
+        if not index_columns:
+            start, step, name = 0, 1, None
+        elif len(index_columns) == 1 and isinstance(index_columns[0], dict) \
+                and index_columns[0]['kind'] == 'range':
+            start, step, name = index_columns[0]['start'], index_columns[0]['step'], \
+                index_columns[0]['name']
+        else:
+            return None
+
+        metadata = file.metadata
+        offsets = np.cumsum([0] + [metadata.row_group(i).num_rows
+                                   for i in range(metadata.num_row_groups)])
+        if list(group_indices) == list(range(group_indices[0], group_indices[-1] + 1)):
+            return pd.RangeIndex(start + offsets[group_indices[0]] * step,
+                                 start + offsets[group_indices[-1] + 1] * step,
+                                 step, name=name)
+        rows = np.concatenate([np.arange(offsets[i], offsets[i + 1]) for i in group_indices])
+        return pd.Index(start + rows * step, name=name)
+
+    def read_groups_to_pandas(self, f, group_indices, columns=None,
+                              use_arrow_dtype=None, **kwargs):
         file = pq.ParquetFile(f)
-        t = file.read_row_group(group_index, columns=columns, **kwargs)
-        return self._table_to_pandas(t, use_arrow_dtype=use_arrow_dtype)
+        t = file.read_row_groups(group_indices, columns=columns,
+                                 use_pandas_metadata=True, **kwargs)
+        df = self._table_to_pandas(t, use_arrow_dtype=use_arrow_dtype)
+        if len(group_indices) > 0:
+            # keep index of rows in the file instead of restarting from 0
+            index = self._get_groups_range_index(file, group_indices)
+            if index is not None:
+                df.index = index
+        return df
 
 
 class FastpaquetEngine(ParqueEngine):
@@ -120,7 +206,7 @@ class FastpaquetEngine(ParqueEngine):
     def read_to_pandas(self, f, columns=None,
                        use_arrow_dtype=None, **kwargs):
         file = fastparquet.ParquetFile(f)
-        df = file.to_pandas(**kwargs)
+        df = file.to_pandas(columns=columns, **kwargs)
         if use_arrow_dtype:
             df = df.astype(to_arrow_dtypes(df.dtypes).to_dict())
 
@@ -129,34 +215,37 @@ class FastpaquetEngine(ParqueEngine):
 
 class DataFrameReadParquet(DataFrameOperand, DataFrameOperandMixin):
     _op_type_ = OperandDef.READ_PARQUET
+    _external_source_ = True
 
     _path = AnyField('path')
     _engine = StringField('engine')
     _columns = ListField('columns')
     _use_arrow_dtype = BoolField('use_arrow_dtype')
     _groups_as_chunks = BoolField('groups_as_chunks')
-    _group_index = Int32Field('group_index')
+    _group_indices = ListField('group_indices')
     _read_kwargs = DictField('read_kwargs')
     _incremental_index = BoolField('incremental_index')
     _storage_options = DictField('storage_options')
+    # list of (column, op, value) to select rows
+    _filters = AnyField('filters')
 
     # for chunk
     _partitions = BytesField('partitions')
     _partition_keys = ListField('partition_keys')
 
     def __init__(self, path=None, engine=None, columns=None, use_arrow_dtype=None,
-                 groups_as_chunks=None, group_index=None, incremental_index=None,
+                 groups_as_chunks=None, group_indices=None, incremental_index=None,
                  read_kwargs=None, partitions=None, partition_keys=None,
-                 storage_options=None, **kw):
+                 storage_options=None, filters=None, **kw):
         super().__init__(_path=path, _engine=engine, _columns=columns,
                          _use_arrow_dtype=use_arrow_dtype,
                          _groups_as_chunks=groups_as_chunks,
-                         _group_index=group_index,
+                         _group_indices=group_indices,
                          _read_kwargs=read_kwargs,
                          _incremental_index=incremental_index,
                          _partitions=partitions,
                          _partition_keys=partition_keys,
-                         _storage_options=storage_options,
+                         _storage_options=storage_options, _filters=filters,
                          _output_types=[OutputType.dataframe], **kw)
 
     @property
@@ -180,8 +269,8 @@ class DataFrameReadParquet(DataFrameOperand, DataFrameOperandMixin):
         return self._groups_as_chunks
 
     @property
-    def group_index(self):
-        return self._group_index
+    def group_indices(self):
+        return self._group_indices
 
     @property
     def read_kwargs(self):
@@ -203,6 +292,14 @@ class DataFrameReadParquet(DataFrameOperand, DataFrameOperandMixin):
     def storage_options(self):
         return self._storage_options
 
+    @property
+    def filters(self):
+        return getattr(self, '_filters', None)
+
+    def get_fingerprint(self, memo=None):
+        return get_fingerprint(self._path, storage_options=self._storage_options,
+                               memo=memo)
+
     @classmethod
     def _to_arrow_dtypes(cls, dtypes, op):
         if op.use_arrow_dtype is None and not op.gpu and \
@@ -240,6 +337,68 @@ class DataFrameReadParquet(DataFrameOperand, DataFrameOperandMixin):
                                      columns_value=out_df.columns_value,
                                      chunks=out_chunks, nsplits=nsplits)
 
+    @staticmethod
+    def _read_metadata(path, storage_options=None):
+        with open_file(path, storage_options=storage_options) as f:
+            return pq.ParquetFile(f).metadata
+
+    @classmethod
+    def _read_metadatas(cls, paths, storage_options=None):
+        # read footers of files in parallel, as they may be stored remotely
+        if len(paths) <= 1:
+            return [cls._read_metadata(pth, storage_options) for pth in paths]
+        with ThreadPoolExecutor(min(len(paths), _max_footer_readers)) as pool:
+            return list(pool.map(lambda pth: cls._read_metadata(pth, storage_options), paths))
+
+    @staticmethod
+    def _get_group_nbytes(row_group, columns=None):
+        if columns is None:
+            return row_group.total_byte_size
+        columns = set(columns)
+        nbytes = 0
+        for i in range(row_group.num_columns):
+            col = row_group.column(i)
+            if col.path_in_schema.split('.', 1)[0] in columns:
+                nbytes += col.total_uncompressed_size
+        return nbytes
+
+    @classmethod
+    def _split_row_groups(cls, op, metadata, chunk_bytes):
+        """
+        Split row groups of a file into list of (row group indices, number of rows),
+        row group indices are None if the whole file is read.
+        """
+        all_groups = list(range(metadata.num_row_groups))
+        groups = all_groups
+        if op.filters:
+            # skip row groups whose statistics do not match filters
+            groups = [i for i in groups
+                      if row_group_may_match(metadata.row_group(i), op.filters)]
+            if not groups:
+                return []
+
+        if op.groups_as_chunks:
+            return [([i], metadata.row_group(i).num_rows) for i in groups]
+
+        # coalesce consecutive row groups into chunks of the target size,
+        # while large files are split by row groups
+        splits = []
+        split_groups, split_rows, split_bytes = [], 0, 0
+        for i in groups:
+            row_group = metadata.row_group(i)
+            nbytes = cls._get_group_nbytes(row_group, op.columns)
+            if split_groups and split_bytes + nbytes > chunk_bytes:
+                splits.append((split_groups, split_rows))
+                split_groups, split_rows, split_bytes = [], 0, 0
+            split_groups.append(i)
+            split_rows += row_group.num_rows
+            split_bytes += nbytes
+        if split_groups:
+            splits.append((split_groups, split_rows))
+        if len(splits) == 1 and splits[0][0] == all_groups:
+            splits = [(None, splits[0][1])]
+        return splits
+
     @classmethod
     def _tile_no_partitioned(cls, op):
         chunk_index = 0
@@ -247,41 +406,45 @@ class DataFrameReadParquet(DataFrameOperand, DataFrameOperandMixin):
         out_df = op.outputs[0]
 
         dtypes = cls._to_arrow_dtypes(out_df.dtypes, op)
-        shape = (np.nan, out_df.shape[1])
+        chunk_bytes = int(parse_readable_size(
+            out_df.extra_params.get('chunk_bytes') or options.chunk_store_limit)[0])
 
         paths = op.path if isinstance(op.path, (tuple, list)) else \
             glob(op.path, storage_options=op.storage_options)
 
-        for pth in paths:
-            if op.groups_as_chunks:
-                for group_idx in range(pq.ParquetFile(pth).num_row_groups):
-                    chunk_op = op.copy().reset_key()
-                    chunk_op._path = pth
-                    chunk_op._group_index = group_idx
-                    new_chunk = chunk_op.new_chunk(
-                        None, shape=shape, index=(chunk_index, 0),
-                        index_value=out_df.index_value,
-                        columns_value=out_df.columns_value,
-                        dtypes=dtypes)
-                    out_chunks.append(new_chunk)
-                    chunk_index += 1
-            else:
-                chunk_op = op.copy().reset_key()
-                chunk_op._path = pth
-                new_chunk = chunk_op.new_chunk(
-                    None, shape=shape, index=(chunk_index, 0),
-                    index_value=out_df.index_value,
-                    columns_value=out_df.columns_value,
-                    dtypes=dtypes)
-                out_chunks.append(new_chunk)
-                chunk_index += 1
+        # list of (path, row group indices, number of rows)
+        pieces = []
+        if op.engine == 'pyarrow':
+            metadatas = cls._read_metadatas(paths, op.storage_options)
+            for pth, metadata in zip(paths, metadatas):
+                pieces.extend((pth, group_indices, nrows) for group_indices, nrows
+                              in cls._split_row_groups(op, metadata, chunk_bytes))
+            # at least one chunk is kept to produce an empty DataFrame
+            pieces = pieces or [(paths[0], [], 0)]
+        else:
+            pieces = [(pth, None, np.nan) for pth in paths]
+
+        for pth, group_indices, nrows in pieces:
+            chunk_op = op.copy().reset_key()
+            chunk_op._path = pth
+            chunk_op._group_indices = group_indices
+            # rows are unknown until filtered
+            shape = (np.nan if op.filters else nrows, out_df.shape[1])
+            new_chunk = chunk_op.new_chunk(
+                None, shape=shape, index=(chunk_index, 0),
+                index_value=out_df.index_value,
+                columns_value=out_df.columns_value,
+                dtypes=dtypes)
+            out_chunks.append(new_chunk)
+            chunk_index += 1
 
         if op.incremental_index:
             out_chunks = standardize_range_index(out_chunks)
 
         new_op = op.copy()
-        nsplits = ((np.nan,) * len(out_chunks), (out_df.shape[1],))
-        return new_op.new_dataframes(None, out_df.shape, dtypes=dtypes,
+        nsplits = (tuple(c.shape[0] for c in out_chunks), (out_df.shape[1],))
+        shape = (sum(nsplits[0]), out_df.shape[1])
+        return new_op.new_dataframes(None, shape, dtypes=dtypes,
                                      index_value=out_df.index_value,
                                      columns_value=out_df.columns_value,
                                      chunks=out_chunks, nsplits=nsplits)
@@ -300,6 +463,8 @@ class DataFrameReadParquet(DataFrameOperand, DataFrameOperandMixin):
         piece = pq.ParquetDatasetPiece(op.path, partition_keys=op.partition_keys,
                                        open_file_func=open_file)
         df = piece.read(partitions=partitions).to_pandas()
+        if op.filters:
+            df = filter_by_predicates(df, op.filters)
         ctx[out.key] = df
 
     @classmethod
@@ -313,27 +478,29 @@ class DataFrameReadParquet(DataFrameOperand, DataFrameOperandMixin):
         engine = get_engine(op.engine)
         with open_file(path, storage_options=op.storage_options) as f:
             use_arrow_dtype = contain_arrow_dtype(out.dtypes)
-            if op.groups_as_chunks:
-                df = engine.read_group_to_pandas(f, op.group_index, columns=op.columns,
-                                                 use_arrow_dtype=use_arrow_dtype,
-                                                 **op.read_kwargs or dict())
+            if op.group_indices is not None:
+                df = engine.read_groups_to_pandas(f, op.group_indices, columns=op.columns,
+                                                  use_arrow_dtype=use_arrow_dtype,
+                                                  **op.read_kwargs or dict())
             else:
                 df = engine.read_to_pandas(f, columns=op.columns,
                                            use_arrow_dtype=use_arrow_dtype,
                                            **op.read_kwargs or dict())
+            if op.filters:
+                df = filter_by_predicates(df, op.filters)
 
             ctx[out.key] = df
 
-    def __call__(self, index_value=None, columns_value=None, dtypes=None):
+    def __call__(self, index_value=None, columns_value=None, dtypes=None, chunk_bytes=None):
         shape = (np.nan, len(dtypes))
         return self.new_dataframe(None, shape, dtypes=dtypes, index_value=index_value,
-                                  columns_value=columns_value)
+                                  columns_value=columns_value, chunk_bytes=chunk_bytes)
 
 
 def read_parquet(path, engine: str = "auto", columns=None,
                  groups_as_chunks=False, use_arrow_dtype=None,
                  incremental_index=False, storage_options=None,
-                 **kwargs):
+                 chunk_bytes='128M', **kwargs):
     """
     Load a parquet object from the file path, returning a DataFrame.
 
@@ -357,7 +524,9 @@ def read_parquet(path, engine: str = "auto", columns=None,
         If not None, only these columns will be read from the file.
     groups_as_chunks : bool, default False
         if True, each row group correspond to a chunk.
-        if False, each file correspond to a chunk.
+        if False, row groups of each file are coalesced or split
+        into chunks by `chunk_bytes` for 'pyarrow' engine, or each
+        file correspond to a chunk for 'fastparquet' engine.
         Only available for 'pyarrow' engine.
     incremental_index: bool, default False
         Create a new RangeIndex if csv doesn't contain index columns.
@@ -365,6 +534,9 @@ def read_parquet(path, engine: str = "auto", columns=None,
         If True, use arrow dtype to store columns.
     storage_options: dict, optional
         Options for storage connection.
+    chunk_bytes: int, float or str, optional
+        Number of decompressed bytes of each chunk, estimated by
+        metadata of row groups, default is 128M.
     **kwargs
         Any additional kwargs are passed to the engine.
 
@@ -411,4 +583,4 @@ def read_parquet(path, engine: str = "auto", columns=None,
                               incremental_index=incremental_index,
                               storage_options=storage_options)
     return op(index_value=index_value, columns_value=columns_value,
-              dtypes=dtypes)
+              dtypes=dtypes, chunk_bytes=chunk_bytes)
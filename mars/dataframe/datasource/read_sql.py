@@ -14,6 +14,7 @@
 
 import binascii
 import datetime
+import operator
 import pickle
 import uuid
 
@@ -33,8 +34,25 @@ from ..utils import parse_index, create_sa_connection, \
     standardize_range_index, to_arrow_dtypes
 
 
+_filter_operators = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+
+
+def _filter_to_clause(column, op, value):
+    if op == 'in':
+        return column.in_(list(value))
+    return _filter_operators[op](column, value)
+
+
 class DataFrameReadSQL(DataFrameOperand, DataFrameOperandMixin):
     _op_type_ = OperandDef.READ_SQL
+    _external_source_ = True
 
     _table_or_sql = StringField('table_or_sql')
     _selectable = BytesField('selectable', on_serialize=pickle.dumps,
@@ -60,13 +78,16 @@ class DataFrameReadSQL(DataFrameOperand, DataFrameOperandMixin):
     _left_end = BoolField('left_end')
     _right_end = BoolField('right_end')
     _nrows = Int64Field('nrows')
+    # list of (column, op, value) to select rows
+    _filters = AnyField('filters')
 
     def __init__(self, table_or_sql=None, selectable=None, con=None, schema=None,
                  index_col=None, coerce_float=None, parse_dates=None, columns=None,
                  engine_kwargs=None, row_memory_usage=None, method=None,
                  incremental_index=None, use_arrow_dtype=None, offset=None, partition_col=None,
                  num_partitions=None, low_limit=None, high_limit=None, left_end=None,
-                 right_end=None, nrows=None, output_types=None, gpu=None, **kw):
+                 right_end=None, nrows=None, filters=None, output_types=None, gpu=None,
+                 **kw):
         super().__init__(_table_or_sql=table_or_sql, _selectable=selectable, _con=con,
                          _schema=schema, _index_col=index_col, _coerce_float=coerce_float,
                          _parse_dates=parse_dates, _columns=columns,
@@ -75,7 +96,8 @@ class DataFrameReadSQL(DataFrameOperand, DataFrameOperandMixin):
                          _use_arrow_dtype=use_arrow_dtype, _offset=offset,
                          _partition_col=partition_col, _num_partitions=num_partitions,
                          _low_limit=low_limit, _left_end=left_end, _right_end=right_end,
-                         _high_limit=high_limit, _nrows=nrows, _output_types=output_types,
+                         _high_limit=high_limit, _nrows=nrows, _filters=filters,
+                         _output_types=output_types,
                          _gpu=gpu, **kw)
         if not self.output_types:
             self._output_types = [OutputType.dataframe]
@@ -164,6 +186,10 @@ class DataFrameReadSQL(DataFrameOperand, DataFrameOperandMixin):
     def nrows(self):
         return self._nrows
 
+    @property
+    def filters(self):
+        return getattr(self, '_filters', None)
+
     def _get_selectable(self, engine_or_conn, columns=None):
         import sqlalchemy as sa
         from sqlalchemy import sql
@@ -456,6 +482,13 @@ class DataFrameReadSQL(DataFrameOperand, DataFrameOperandMixin):
                 # at last, we sort by all the columns
                 query = query.order_by(*columns)
 
+            if op.filters:
+                # only supported by partition method as rows of chunks
+                # are counted ahead when reading by offsets
+                query = query.where(sa.and_(*[
+                    _filter_to_clause(selectable.columns[col], pred, value)
+                    for col, pred, value in op.filters]))
+
             if op.method == 'offset':
                 query = query.limit(out.shape[0])
                 if op.offset > 0:
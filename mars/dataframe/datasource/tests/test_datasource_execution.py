@@ -799,3 +799,48 @@ class Test(TestBase):
             mdf = md.read_parquet(f'{tempdir}/*.parquet', groups_as_chunks=True)
             r = self.executor.execute_dataframe(mdf, concat=True)[0]
             pd.testing.assert_frame_equal(df, r.sort_values('a').reset_index(drop=True))
+
+    @unittest.skipIf(pa is None, 'pyarrow not installed')
+    def testReadParquetChunkBytes(self):
+        df = pd.DataFrame({'a': np.arange(1000).astype(np.int64, copy=False),
+                           'b': np.random.rand(1000)})
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            # a large file with small row groups, and a small file
+            df[:900].to_parquet(os.path.join(tempdir, 'test0.parquet'), row_group_size=100)
+            df[900:].to_parquet(os.path.join(tempdir, 'test1.parquet'), row_group_size=100)
+
+            # about 2000 bytes per row group
+            mdf = md.read_parquet(f'{tempdir}/*.parquet', chunk_bytes=6000).tiles()
+            self.assertEqual(mdf.nsplits[0], (300, 300, 300, 100))
+            self.assertEqual(mdf.shape, (1000, 2))
+            self.assertIsNone(mdf.chunks[-1].op.group_indices)
+            r = self.executor.execute_dataframe(mdf, concat=True)[0]
+            pd.testing.assert_frame_equal(df, r.sort_values('a').reset_index(drop=True))
+
+            # row groups are coalesced by pruned columns
+            mdf = md.read_parquet(f'{tempdir}/*.parquet', columns=['a'],
+                                  chunk_bytes=6000).tiles()
+            self.assertEqual(mdf.nsplits[0], (600, 300, 100))
+
+            mdf = md.read_parquet(f'{tempdir}/*.parquet', groups_as_chunks=True).tiles()
+            self.assertEqual(mdf.nsplits[0], (100,) * 10)
+
+            # known rows avoid iterative tiling
+            mdf = md.read_parquet(os.path.join(tempdir, 'test0.parquet'), chunk_bytes=6000)
+            r = self.executor.execute_dataframe(mdf.iloc[250:350], concat=True)[0]
+            pd.testing.assert_frame_equal(r, df[250:350])
+
+            # index of row groups split from a file is not restarted
+            df.to_parquet(os.path.join(tempdir, 'test2.parquet'), row_group_size=100)
+            mdf = md.read_parquet(os.path.join(tempdir, 'test2.parquet'), chunk_bytes=2000)
+            r = self.executor.execute_dataframe(mdf.iloc[150:155], concat=True)[0]
+            pd.testing.assert_frame_equal(r, df.iloc[150:155])
+            r = self.executor.execute_dataframe(mdf, concat=True)[0]
+            pd.testing.assert_frame_equal(r, df)
+
+            # index of row groups kept after filtering
+            mdf = md.read_parquet(os.path.join(tempdir, 'test2.parquet'), chunk_bytes=6000)
+            mdf = mdf[(mdf['a'] < 150) | (mdf['a'] >= 420)]
+            r = mdf.execute().fetch()
+            pd.testing.assert_frame_equal(r, df[(df['a'] < 150) | (df['a'] >= 420)])
@@ -19,7 +19,7 @@ from ..core import GroupBy, DataFrameGroupBy, SeriesGroupBy
 def _install():
     from ..core import DATAFRAME_TYPE, SERIES_TYPE, GROUPBY_TYPE, DATAFRAME_GROUPBY_TYPE
     from .core import groupby
-    from .aggregation import agg
+    from .aggregation import agg, nunique
     from .apply import groupby_apply
     from .transform import groupby_transform
     from .cum import cumcount, cummin, cummax, cumprod, cumsum
@@ -46,6 +46,7 @@ def _install():
         setattr(cls, 'std', lambda groupby, **kw: agg(groupby, 'std', **kw))
         setattr(cls, 'all', lambda groupby, **kw: agg(groupby, 'all', **kw))
         setattr(cls, 'any', lambda groupby, **kw: agg(groupby, 'any', **kw))
+        setattr(cls, 'nunique', nunique)
 
         setattr(cls, 'apply', groupby_apply)
         setattr(cls, 'transform', groupby_transform)
@@ -26,9 +26,12 @@ from ...config import options
 from ...context import get_context, RunningMode
 from ...core import Base, Entity, OutputType
 from ...custom_log import redirect_custom_log
+from ...lib.hyperloglog import HyperLogLog, hash_values, precision_from_error
 from ...operands import OperandStage
-from ...serialize import ValueType, AnyField, StringField, ListField, DictField
-from ...utils import enter_current_session
+from ...serialize import ValueType, AnyField, StringField, ListField, DictField, \
+    BoolField, Int32Field
+from ...tiles import TilesError
+from ...utils import enter_current_session, build_fetch_chunk, ceildiv
 from ..merge import DataFrameConcat
 from ..operands import DataFrameOperand, DataFrameOperandMixin, DataFrameShuffleProxy
 from ..core import GROUPBY_TYPE
@@ -47,7 +50,30 @@ _stage_infos = namedtuple('stage_infos', ('intermediate_cols', 'agg_cols',
 _series_col_name = 'col_name'
 
 
+def _nunique_map(df, grouped, columns, precision=None, dropna=True):
+    # sketch distinct values of every group by HyperLogLog
+    group_index = grouped.size().index
+    group_ids = grouped.ngroup().values
+    values = df[columns[0]]
+    mask = group_ids >= 0
+    if dropna:
+        mask &= values.notna().values
+    hashes = hash_values(values[mask], dropna=False)
+    sketches = HyperLogLog.from_grouped_hashes(
+        group_ids[mask], hashes, len(group_index), precision=precision)
+    return pd.Series(sketches, index=group_index, dtype=object)
+
+
+def _nunique_combine(df, grouped, columns):
+    return grouped[columns[0]].agg(HyperLogLog.merge)
+
+
+def _nunique_agg(df, grouped, columns):
+    return grouped[columns[0]].agg(lambda s: HyperLogLog.merge(s).count()).astype(np.int64)
+
+
 class DataFrameGroupByAgg(DataFrameOperand, DataFrameOperandMixin):
+    __slots__ = '_adaptive_map_chunks',
     _op_type_ = OperandDef.GROUPBY_AGG
 
     _func = AnyField('func')
@@ -63,14 +89,21 @@ class DataFrameGroupByAgg(DataFrameOperand, DataFrameOperandMixin):
     _output_column_to_func = DictField('output_column_to_func')
     # for chunk
     _tileable_op_key = StringField('tileable_op_key')
+    # if specified, nunique is estimated by HyperLogLog sketches of the precision
+    _approx_precision = Int32Field('approx_precision')
+    _dropna = BoolField('dropna')
 
     def __init__(self, func=None, method=None, groupby_params=None, raw_func=None,
                  agg_columns=None, output_column_to_func=None, stage=None,
-                 output_types=None, tileable_op_key=None, **kw):
+                 output_types=None, tileable_op_key=None, approx_precision=None,
+                 dropna=None, **kw):
         super().__init__(_func=func, _method=method, _groupby_params=groupby_params,
                          _agg_columns=agg_columns, _output_column_to_func=output_column_to_func,
                          _raw_func=raw_func, _stage=stage, _output_types=output_types,
-                         _tileable_op_key=tileable_op_key, **kw)
+                         _tileable_op_key=tileable_op_key, _approx_precision=approx_precision,
+                         _dropna=dropna, **kw)
+        if getattr(self, '_adaptive_map_chunks', None) is None:
+            self._adaptive_map_chunks = []
 
     @property
     def func(self):
@@ -100,6 +133,14 @@ class DataFrameGroupByAgg(DataFrameOperand, DataFrameOperandMixin):
     def tileable_op_key(self):
         return self._tileable_op_key
 
+    @property
+    def approx_precision(self):
+        return self._approx_precision
+
+    @property
+    def dropna(self):
+        return self._dropna
+
     def _set_inputs(self, inputs):
         super()._set_inputs(inputs)
         inputs_iter = iter(self._inputs[1:])
@@ -220,14 +261,15 @@ class DataFrameGroupByAgg(DataFrameOperand, DataFrameOperandMixin):
         d[key].append(val)
 
     @classmethod
-    def _append_func(cls, func_dict, callable_func_dict, col, func, src_cols):
+    def _append_func(cls, func_dict, callable_func_dict, col, func, src_cols, out_col=None):
         if callable(func):
-            callable_func_dict[col] = partial(func, columns=list(src_cols))
+            callable_func_dict[out_col or col] = partial(func, columns=list(src_cols))
             func = None
         cls._safe_append(func_dict, col, func)
 
     @classmethod
-    def _gen_stages_columns_and_funcs(cls, func):
+    def _gen_stages_columns_and_funcs(cls, op):
+        func = op.func
         intermediate_cols = []
         intermediate_cols_set = set()
         agg_cols = []
@@ -249,7 +291,7 @@ class DataFrameGroupByAgg(DataFrameOperand, DataFrameOperandMixin):
                     intermediate_cols_set.add(mapper_col)
 
                     cls._append_func(map_func, map_output_column_to_func,
-                                     col, mapper, (mapper_col,))
+                                     col, mapper, (col,), out_col=mapper_col)
                     cls._append_func(combine_func, combine_output_column_to_func,
                                      mapper_col, combiner, mapper_to_cols.values())
 
@@ -288,6 +330,10 @@ class DataFrameGroupByAgg(DataFrameOperand, DataFrameOperandMixin):
                     _add_column_to_functions(col, f, ['sum', 'count', 'var'],
                                              ['sum', 'sum', _reduce_var],
                                              _reduce_var if f == 'var' else _reduce_std)
+                elif f == 'nunique' and op.approx_precision is not None:
+                    mapper = partial(_nunique_map, precision=op.approx_precision,
+                                     dropna=op.dropna)
+                    _add_column_to_functions(col, f, [mapper], [_nunique_combine], _nunique_agg)
                 else:  # pragma: no cover
                     raise NotImplementedError
 
@@ -300,10 +346,10 @@ class DataFrameGroupByAgg(DataFrameOperand, DataFrameOperandMixin):
                             agg_output_column_to_func=agg_output_column_to_func)
 
     @classmethod
-    def _gen_shuffle_chunks(cls, op, in_df, chunks):
+    def _gen_shuffle_chunks(cls, op, in_df, chunks, shuffle_size=None):
         # generate map chunks
         map_chunks = []
-        chunk_shape = (in_df.chunk_shape[0], 1)
+        chunk_shape = (shuffle_size or in_df.chunk_shape[0], 1)
         for chunk in chunks:
             # no longer consider as_index=False for the intermediate phases,
             # will do reset_index at last if so
@@ -362,7 +408,44 @@ class DataFrameGroupByAgg(DataFrameOperand, DataFrameOperandMixin):
         return agg_chunks
 
     @classmethod
-    def _tile_with_shuffle(cls, op):
+    def _gen_combine_chunks(cls, op, out_df, chunks, stage_infos: _stage_infos):
+        index = out_df.index_value.to_pandas()
+        level = 0 if not isinstance(index, pd.MultiIndex) else list(range(len(index.levels)))
+
+        combine_size = options.combine_size
+        new_chunks = []
+        for idx, i in enumerate(range(0, len(chunks), combine_size)):
+            chks = chunks[i: i + combine_size]
+            if len(chks) == 1:
+                chk = chks[0]
+            else:
+                concat_op = DataFrameConcat(output_types=[OutputType.dataframe])
+                # Change index for concatenate
+                for j, c in enumerate(chks):
+                    c._index = (j, 0)
+                chk = concat_op.new_chunk(chks, dtypes=chks[0].dtypes)
+            chunk_op = op.copy().reset_key()
+            chunk_op._tileable_op_key = None
+            chunk_op.output_types = [OutputType.dataframe]
+            chunk_op._stage = OperandStage.combine
+            chunk_op._groupby_params = chunk_op.groupby_params.copy()
+            chunk_op._groupby_params.pop('selection', None)
+            # use levels instead of by for agg
+            chunk_op._groupby_params.pop('by', None)
+            chunk_op._groupby_params['level'] = level
+            chunk_op._func = stage_infos.combine_func
+            chunk_op._output_column_to_func = stage_infos.combine_output_column_to_func
+
+            columns_value = parse_index(pd.Index(stage_infos.intermediate_cols), store_data=True)
+            new_shape = (np.nan, out_df.shape[1]) if len(out_df.shape) == 2 else (np.nan,)
+
+            new_chunks.append(chunk_op.new_chunk([chk], index=(idx, 0), shape=new_shape,
+                                                 index_value=chks[0].index_value,
+                                                 columns_value=columns_value))
+        return new_chunks
+
+    @classmethod
+    def _tile_with_shuffle(cls, op, map_chunks=None, shuffle_size=None):
         in_df = op.inputs[0]
         if len(in_df.shape) > 1:
             in_df = build_concatenated_rows_frame(in_df)
@@ -371,13 +454,13 @@ class DataFrameGroupByAgg(DataFrameOperand, DataFrameOperandMixin):
         index = out_df.index_value.to_pandas()
         level = 0 if not isinstance(index, pd.MultiIndex) else list(range(len(index.levels)))
 
-        stage_infos = cls._gen_stages_columns_and_funcs(op.func)
+        stage_infos = cls._gen_stages_columns_and_funcs(op)
 
         # First, perform groupby and aggregation on each chunk.
-        agg_chunks = cls._gen_map_chunks(op, in_df, out_df, stage_infos)
+        agg_chunks = map_chunks or cls._gen_map_chunks(op, in_df, out_df, stage_infos)
 
         # Shuffle the aggregation chunk.
-        reduce_chunks = cls._gen_shuffle_chunks(op, in_df, agg_chunks)
+        reduce_chunks = cls._gen_shuffle_chunks(op, in_df, agg_chunks, shuffle_size=shuffle_size)
 
         # Combine groups
         agg_chunks = []
@@ -413,7 +496,7 @@ class DataFrameGroupByAgg(DataFrameOperand, DataFrameOperandMixin):
         return new_op.new_tileables([in_df], **kw)
 
     @classmethod
-    def _tile_with_tree(cls, op):
+    def _tile_with_tree(cls, op, map_chunks=None):
         in_df = op.inputs[0]
         if len(in_df.shape) > 1:
             in_df = build_concatenated_rows_frame(in_df)
@@ -422,40 +505,11 @@ class DataFrameGroupByAgg(DataFrameOperand, DataFrameOperandMixin):
         index = out_df.index_value.to_pandas()
         level = 0 if not isinstance(index, pd.MultiIndex) else list(range(len(index.levels)))
 
-        stage_infos = cls._gen_stages_columns_and_funcs(op.func)
+        stage_infos = cls._gen_stages_columns_and_funcs(op)
         combine_size = options.combine_size
-        chunks = cls._gen_map_chunks(op, in_df, out_df, stage_infos)
+        chunks = map_chunks or cls._gen_map_chunks(op, in_df, out_df, stage_infos)
         while len(chunks) > combine_size:
-            new_chunks = []
-            for idx, i in enumerate(range(0, len(chunks), combine_size)):
-                chks = chunks[i: i + combine_size]
-                if len(chks) == 1:
-                    chk = chks[0]
-                else:
-                    concat_op = DataFrameConcat(output_types=[OutputType.dataframe])
-                    # Change index for concatenate
-                    for j, c in enumerate(chks):
-                        c._index = (j, 0)
-                    chk = concat_op.new_chunk(chks, dtypes=chks[0].dtypes)
-                chunk_op = op.copy().reset_key()
-                chunk_op._tileable_op_key = None
-                chunk_op.output_types = [OutputType.dataframe]
-                chunk_op._stage = OperandStage.combine
-                chunk_op._groupby_params = chunk_op.groupby_params.copy()
-                chunk_op._groupby_params.pop('selection', None)
-                # use levels instead of by for agg
-                chunk_op._groupby_params.pop('by', None)
-                chunk_op._groupby_params['level'] = level
-                chunk_op._func = stage_infos.combine_func
-                chunk_op._output_column_to_func = stage_infos.combine_output_column_to_func
-
-                columns_value = parse_index(pd.Index(stage_infos.intermediate_cols), store_data=True)
-                new_shape = (np.nan, out_df.shape[1]) if len(out_df.shape) == 2 else (np.nan,)
-
-                new_chunks.append(chunk_op.new_chunk([chk], index=(idx, 0), shape=new_shape,
-                                                     index_value=chks[0].index_value,
-                                                     columns_value=columns_value))
-            chunks = new_chunks
+            chunks = cls._gen_combine_chunks(op, out_df, chunks, stage_infos)
 
         concat_op = DataFrameConcat(output_types=[OutputType.dataframe])
         chk = concat_op.new_chunk(chunks, dtypes=chunks[0].dtypes)
@@ -483,8 +537,71 @@ class DataFrameGroupByAgg(DataFrameOperand, DataFrameOperandMixin):
         kw.update(dict(chunks=[chunk], nsplits=nsplits))
         return new_op.new_tileables(op.inputs, **kw)
 
+    @classmethod
+    def _choose_adaptive_strategy(cls, map_sizes):
+        """
+        Choose the way to aggregate outputs of the map stage given their sizes.
+
+        :param map_sizes: sizes of map chunks in bytes
+        :return: tuple of strategy, one of 'tree', 'shuffle' or 'hybrid',
+                 and the number of reducers when shuffle is needed
+        """
+        total_size = sum(map_sizes)
+        chunk_limit = options.chunk_store_limit
+        if total_size <= chunk_limit:
+            # aggregated result can be held in one chunk
+            return 'tree', None
+        # size reducers by the data instead of the number of input chunks
+        shuffle_size = min(ceildiv(total_size, chunk_limit), len(map_sizes))
+        mean_size = total_size / len(map_sizes)
+        if len(map_sizes) > options.combine_size and \
+                mean_size * options.combine_size <= chunk_limit:
+            # map outputs are small, combine them before shuffle
+            # to reduce number of pieces to transfer
+            return 'hybrid', shuffle_size
+        return 'shuffle', shuffle_size
+
+    @classmethod
+    def _tile_adaptive(cls, op: "DataFrameGroupByAgg"):
+        in_df = op.inputs[0]
+        if len(in_df.shape) > 1:
+            in_df = build_concatenated_rows_frame(in_df)
+        out_df = op.outputs[0]
+
+        ctx = get_context()
+        if ctx is None or len(in_df.chunks) <= options.combine_size:
+            # one combine is enough, no need to execute map stage first
+            return cls._tile_with_tree(op)
+
+        stage_infos = cls._gen_stages_columns_and_funcs(op)
+        if len(op._adaptive_map_chunks) == 0:
+            # execute map stage first to see sizes of outputs
+            map_chunks = cls._gen_map_chunks(op, in_df, out_df, stage_infos)
+            op._adaptive_map_chunks = map_chunks
+            err = TilesError('map stage of groupby aggregation '
+                             'should be executed first')
+            err.partial_tiled_chunks = [c.data for c in map_chunks]
+            raise err
+
+        map_chunks = op._adaptive_map_chunks
+        metas = ctx.get_chunk_metas([c.key for c in map_chunks])
+        map_chunks = [build_fetch_chunk(c).data for c in map_chunks]
+        if any(meta is None for meta in metas):  # pragma: no cover
+            return cls._tile_with_shuffle(op, map_chunks=map_chunks)
+
+        strategy, shuffle_size = cls._choose_adaptive_strategy(
+            [meta.chunk_size for meta in metas])
+        if strategy == 'tree':
+            return cls._tile_with_tree(op, map_chunks=map_chunks)
+        elif strategy == 'hybrid':
+            map_chunks = cls._gen_combine_chunks(op, out_df, map_chunks, stage_infos)
+            shuffle_size = min(shuffle_size, len(map_chunks))
+        return cls._tile_with_shuffle(op, map_chunks=map_chunks, shuffle_size=shuffle_size)
+
     @classmethod
     def tile(cls, op: "DataFrameGroupByAgg"):
+        if op.method == 'adaptive':
+            return cls._tile_adaptive(op)
         if op.method == 'auto':
             ctx = get_context()
             if ctx is not None and ctx.running_mode == RunningMode.distributed:  # pragma: no cover
@@ -566,7 +683,10 @@ class DataFrameGroupByAgg(DataFrameOperand, DataFrameOperandMixin):
                     cls._safe_append(func, col, f)
                     processed_cols.append(c)
 
-        if cls._is_raw_one_func(op):
+        if not func:
+            # all functions require operating on the grouped data
+            result = pd.DataFrame(index=grouped.size().index)
+        elif cls._is_raw_one_func(op):
             # do some optimization if the raw func is a str or list whose length is 1
             func = next(iter(func.values()))[0]
             try:
@@ -620,6 +740,10 @@ class DataFrameGroupByAgg(DataFrameOperand, DataFrameOperandMixin):
                 if not op.groupby_params.get('as_index', True):
                     result.reset_index(inplace=True)
                 result.columns = out.columns_value.to_pandas()
+        if op.stage == OperandStage.agg and len(result) == 0:
+            # keep dtypes for empty pieces to concatenate with others
+            result = result.astype(out.dtypes if op.output_types[0] == OutputType.dataframe
+                                   else out.dtype)
         ctx[out.key] = result
 
 
@@ -652,10 +776,12 @@ def agg(groupby, func, method='auto', *args, **kwargs):
         Groupby data.
     func : str or list-like
         Aggregation functions.
-    method : {'auto', 'shuffle', 'tree'}, default 'auto'
+    method : {'auto', 'shuffle', 'tree', 'adaptive'}, default 'auto'
         'tree' method provide a better performance, 'shuffle' is recommended
         if aggregated result is very large, 'auto' will use 'shuffle' method
-        in distributed mode and use 'tree' in local mode.
+        in distributed mode and use 'tree' in local mode. 'adaptive' will
+        execute the map stage first and choose 'tree', 'shuffle' or combining
+        before shuffle according to sizes of its outputs.
 
     Returns
     -------
@@ -668,9 +794,9 @@ def agg(groupby, func, method='auto', *args, **kwargs):
     if not isinstance(groupby, GROUPBY_TYPE):
         raise TypeError(f'Input should be type of groupby, not {type(groupby)}')
 
-    if method not in ['shuffle', 'tree', 'auto']:
+    if method not in ['shuffle', 'tree', 'auto', 'adaptive']:
         raise ValueError(f"Method {method} is not available, "
-                         "please specify 'tree' or 'shuffle")
+                         "please specify 'tree', 'shuffle' or 'adaptive'")
 
     if not _check_if_func_available(func):
         return groupby.transform(func, *args, _call_agg=True, **kwargs)
@@ -678,3 +804,42 @@ def agg(groupby, func, method='auto', *args, **kwargs):
     agg_op = DataFrameGroupByAgg(func=func, method=method, raw_func=func,
                                  groupby_params=groupby.op.groupby_params)
     return agg_op(groupby)
+
+
+def nunique(groupby, dropna=True, approx=False, relative_error=0.01, method='auto'):
+    """
+    Return number of distinct values in each group.
+
+    Parameters
+    ----------
+    groupby : Mars Groupby
+        Groupby data.
+    dropna : bool, default True
+        Don't include NaN in the counts.
+    approx : bool, default False
+        If True, numbers are estimated by HyperLogLog sketches merged
+        across chunks, thus only sketches of bounded sizes are transferred
+        between stages instead of distinct values.
+    relative_error : float, default 0.01
+        Approximate standard error of estimated numbers when `approx` is True.
+    method : {'auto', 'shuffle', 'tree', 'adaptive'}, default 'auto'
+        Method to aggregate when `approx` is True, see `agg`.
+
+    Returns
+    -------
+    Series or DataFrame
+        Number of distinct values.
+    """
+    if not isinstance(groupby, GROUPBY_TYPE):
+        raise TypeError(f'Input should be type of groupby, not {type(groupby)}')
+    if not approx:
+        return agg(groupby, 'nunique', method=method, dropna=dropna)
+
+    if method not in ['shuffle', 'tree', 'auto', 'adaptive']:
+        raise ValueError(f"Method {method} is not available, "
+                         "please specify 'tree', 'shuffle' or 'adaptive'")
+    agg_op = DataFrameGroupByAgg(func='nunique', method=method, raw_func='nunique',
+                                 groupby_params=groupby.op.groupby_params,
+                                 approx_precision=precision_from_error(relative_error),
+                                 dropna=dropna)
+    return agg_op(groupby)
@@ -28,7 +28,7 @@ from ..align import align_dataframe_series, align_series_series
 from ..initializer import Series as asseries
 from ..core import SERIES_TYPE, SERIES_CHUNK_TYPE
 from ..utils import build_concatenated_rows_frame, hash_dataframe_on, \
-    build_df, build_series, parse_index
+    split_by_partition_ids, build_df, build_series, parse_index
 from ..operands import DataFrameOperandMixin, DataFrameMapReduceOperand, DataFrameShuffleProxy
 
 
@@ -295,9 +295,14 @@ class DataFrameGroupByOperand(DataFrameMapReduceOperand, DataFrameOperandMixin):
             on = by
         else:
             on = None
-        filters = hash_dataframe_on(df, on, op.shuffle_size, level=op.level)
-
-        for index_idx, index_filter in enumerate(filters):
+        partition_ids = hash_dataframe_on(df, on, op.shuffle_size, level=op.level)
+        partitions = split_by_partition_ids(df, partition_ids, op.shuffle_size)
+        if deliver_by:
+            # series in `by` are aligned with rows of df
+            by_partitions = [split_by_partition_ids(v, partition_ids, op.shuffle_size)
+                             if isinstance(v, pd.Series) else None for v in by]
+
+        for index_idx, partition in enumerate(partitions):
             if is_dataframe_obj:
                 group_key = ','.join([str(index_idx), str(chunk.index[1])])
             else:
@@ -305,14 +310,14 @@ class DataFrameGroupByOperand(DataFrameMapReduceOperand, DataFrameOperandMixin):
 
             if deliver_by:
                 filtered_by = []
-                for v in by:
-                    if isinstance(v, pd.Series):
-                        filtered_by.append(v.loc[index_filter])
+                for v, v_partitions in zip(by, by_partitions):
+                    if v_partitions is not None:
+                        filtered_by.append(v_partitions[index_idx])
                     else:
                         filtered_by.append(v)
-                ctx[(chunk.key, group_key)] = (df.loc[index_filter], filtered_by)
+                ctx[(chunk.key, group_key)] = (partition, filtered_by)
             else:
-                ctx[(chunk.key, group_key)] = df.loc[index_filter]
+                ctx[(chunk.key, group_key)] = partition
 
     @classmethod
     def execute_reduce(cls, ctx, op):
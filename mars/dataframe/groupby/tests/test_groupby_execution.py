@@ -23,8 +23,10 @@ except ImportError:  # pragma: no cover
     pa = None
 
 import mars.dataframe as md
-from mars.operands import ShuffleProxy
+from mars.config import option_context
+from mars.operands import OperandStage, ShuffleProxy
 from mars.tests.core import TestBase, ExecutorForTest, assert_groupby_equal
+from mars.tiles import get_tiled
 from mars.utils import arrow_array_to_objects
 
 
@@ -299,6 +301,36 @@ class Test(TestBase):
         self.assertEqual(r15.op.method, 'auto')
         self.assertTrue(all((not isinstance(c.op, ShuffleProxy)) for c in r15.build_graph(tiled=True)))
 
+    def testDataFrameGroupByAggAdaptive(self):
+        rs = np.random.RandomState(0)
+        raw = pd.DataFrame({'a': rs.randint(0, 1000, (1000,)),
+                            'b': rs.rand(1000)})
+        expected = raw.groupby('a').agg(['sum', 'mean'])
+
+        # tree, shuffle and hybrid are chosen respectively
+        for limit, n_chunks, combined in [(10 ** 8, 1, False), (2000, 12, False), (20000, 2, True)]:
+            with option_context({'chunk_store_limit': limit}):
+                mdf = md.DataFrame(raw, chunk_size=50)
+                r = mdf.groupby('a').agg(['sum', 'mean'], method='adaptive')
+                result = self.executor.execute_tileables([r])[0]
+                pd.testing.assert_frame_equal(result.sort_index(), expected)
+
+                tiled = get_tiled(r)
+                self.assertEqual(len(tiled.chunks), n_chunks)
+                if n_chunks > 1:
+                    proxy_chunk = tiled.chunks[0].inputs[0].inputs[0]
+                    self.assertIsInstance(proxy_chunk.op, ShuffleProxy)
+                    # map outputs are combined before shuffle in hybrid strategy
+                    self.assertEqual(all(c.inputs[0].op.stage == OperandStage.combine
+                                         for c in proxy_chunk.inputs), combined)
+
+        # input with few chunks is aggregated with tree directly
+        mdf = md.DataFrame(raw, chunk_size=500)
+        r = mdf.groupby('a').b.agg('sum', method='adaptive')
+        result = self.executor.execute_tileables([r])[0]
+        pd.testing.assert_series_equal(result, raw.groupby('a').b.agg('sum'))
+        self.assertEqual(len(get_tiled(r).chunks), 1)
+
     def testSeriesGroupByAgg(self):
         rs = np.random.RandomState(0)
         series1 = pd.Series(rs.rand(10))
@@ -393,6 +425,38 @@ class Test(TestBase):
         pd.testing.assert_frame_equal(self.executor.execute_dataframe(r11, concat=True)[0].sort_index(),
                                       series1.groupby(lambda x: x % 2).agg(['cumsum', 'cumcount']).sort_index())
 
+    def testGroupByNunique(self):
+        rs = np.random.RandomState(0)
+        data_size = 20000
+        raw = pd.DataFrame({'a': rs.randint(5, size=data_size),
+                            'a2': rs.randint(2, size=data_size),
+                            'b': rs.randint(3000, size=data_size),
+                            'c': rs.choice(['x', 'y', None], size=data_size)})
+        mdf = md.DataFrame(raw, chunk_size=3000)
+
+        for method in ['tree', 'shuffle']:
+            r = mdf.groupby('a').nunique(approx=True, method=method)
+            result = self.executor.execute_dataframe(r, concat=True)[0].sort_index()
+            expected = raw.groupby('a').nunique()
+            pd.testing.assert_index_equal(result.columns, expected.columns)
+            self.assertTrue((result.dtypes == np.int64).all())
+            np.testing.assert_allclose(result, expected, rtol=0.03)
+
+        r = mdf.groupby(['a', 'a2'])['b'].nunique(approx=True)
+        result = self.executor.execute_dataframe(r, concat=True)[0]
+        expected = raw.groupby(['a', 'a2'])['b'].nunique()
+        pd.testing.assert_index_equal(result.index, expected.index)
+        np.testing.assert_allclose(result, expected, rtol=0.03)
+
+        r = mdf.groupby('a')['c'].nunique(approx=True, dropna=False)
+        result = self.executor.execute_dataframe(r, concat=True)[0]
+        pd.testing.assert_series_equal(result, raw.groupby('a')['c'].nunique(dropna=False))
+
+        # exact numbers
+        r = mdf.groupby('a')['c'].nunique()
+        result = self.executor.execute_dataframe(r, concat=True)[0].sort_index()
+        pd.testing.assert_series_equal(result, raw.groupby('a')['c'].nunique())
+
     def testGroupByApply(self):
         df1 = pd.DataFrame({'a': [3, 4, 5, 3, 5, 4, 1, 2, 3],
                             'b': [1, 3, 4, 5, 6, 5, 4, 4, 4],
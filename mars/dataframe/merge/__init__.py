@@ -13,7 +13,8 @@
 # limitations under the License.
 
 from .concat import DataFrameConcat, concat
-from .merge import join, merge, DataFrameShuffleMerge, DataFrameMergeAlign
+from .merge import join, merge, DataFrameShuffleMerge, DataFrameMergeAlign, \
+    DataFrameMergeSkewSample, DataFrameMergeSkewPlan
 from .append import DataFrameAppend, append
 
 
@@ -17,14 +17,17 @@ import numpy as np
 import pandas as pd
 
 from ... import opcodes as OperandDef
+from ...config import options
 from ...core import OutputType
 from ...operands import OperandStage
-from ...serialize import AnyField, BoolField, StringField, TupleField, KeyField, Int32Field
-from ...utils import get_shuffle_input_keys_idxes
+from ...serialize import AnyField, BoolField, StringField, TupleField, KeyField, Int32Field, \
+    Float64Field
+from ...utils import get_shuffle_input_keys_idxes, OBJECT_FIELD_OVERHEAD
 from ..operands import DataFrameOperand, DataFrameOperandMixin, DataFrameMapReduceOperand, \
     DataFrameShuffleProxy
 from ..utils import build_concatenated_rows_frame, build_df, parse_index, hash_dataframe_on, \
-    infer_index_value
+    infer_index_value, split_by_partition_ids
+from .concat import DataFrameConcat
 
 import logging
 logger = logging.getLogger(__name__)
@@ -35,13 +38,16 @@ class DataFrameMergeAlign(DataFrameMapReduceOperand, DataFrameOperandMixin):
 
     _index_shuffle_size = Int32Field('index_shuffle_size')
     _shuffle_on = AnyField('shuffle_on')
+    # side of merge the input belongs to, 0 for left and 1 for right
+    _side = Int32Field('side')
 
     _input = KeyField('input')
+    _skew_plan = KeyField('skew_plan')
 
-    def __init__(self, index_shuffle_size=None, shuffle_on=None, sparse=None,
+    def __init__(self, index_shuffle_size=None, shuffle_on=None, side=None, sparse=None,
                  stage=None, shuffle_key=None, **kw):
         super().__init__(
-            _index_shuffle_size=index_shuffle_size, _shuffle_on=shuffle_on,
+            _index_shuffle_size=index_shuffle_size, _shuffle_on=shuffle_on, _side=side,
             _sparse=sparse, _output_types=[OutputType.dataframe], _stage=stage,
             _shuffle_key=shuffle_key, **kw)
 
@@ -53,38 +59,75 @@ class DataFrameMergeAlign(DataFrameMapReduceOperand, DataFrameOperandMixin):
     def shuffle_on(self):
         return self._shuffle_on
 
+    @property
+    def side(self):
+        return self._side
+
+    @property
+    def skew_plan(self):
+        return getattr(self, '_skew_plan', None)
+
     def _set_inputs(self, inputs):
         super()._set_inputs(inputs)
         self._input = self._inputs[0]
+        if len(self._inputs) > 1:
+            self._skew_plan = self._inputs[1]
 
     @classmethod
     def execute_map(cls, ctx, op):
         chunk = op.outputs[0]
-        df = ctx[op.inputs[0].key]
-        shuffle_on = op.shuffle_on
-
-        if shuffle_on is not None:
-            # shuffle on field may be resident in index
-            to_reset_index_names = []
-            if not isinstance(shuffle_on, (list, tuple)):
-                if shuffle_on not in df.dtypes:
-                    to_reset_index_names.append(shuffle_on)
-            else:
-                for son in shuffle_on:
-                    if son not in df.dtypes:
-                        to_reset_index_names.append(shuffle_on)
-            if len(to_reset_index_names) > 0:
-                df = df.reset_index(to_reset_index_names)
-
-        filters = hash_dataframe_on(df, shuffle_on, op.index_shuffle_size)
-
-        # shuffle on index
-        for index_idx, index_filter in enumerate(filters):
+        df = _reset_shuffle_on_index(ctx[op.inputs[0].key], op.shuffle_on)
+
+        if op.skew_plan is not None:
+            cls._execute_skew_map(ctx, op, df)
+            return
+
+        size = op.index_shuffle_size
+        partitions = split_by_partition_ids(df, hash_dataframe_on(df, op.shuffle_on, size), size)
+        for index_idx, partition in enumerate(partitions):
+            group_key = ','.join([str(index_idx), str(chunk.index[1])])
+            ctx[(chunk.key, group_key)] = partition
+
+    @classmethod
+    def _execute_skew_map(cls, ctx, op, df):
+        chunk = op.outputs[0]
+        plan = ctx[op.skew_plan.key]
+        size = op.index_shuffle_size
+
+        # rows of keys not in the plan are hashed as usual
+        positions = np.arange(len(df))
+        dests = hash_dataframe_on(df, op.shuffle_on, size)
+
+        key_idxes = plan.index.get_indexer(_get_shuffle_keys(df, op.shuffle_on))
+        heavy = key_idxes >= 0
+        if heavy.any():
+            heavy_positions = positions[heavy]
+            key_idxes = key_idxes[heavy]
+            starts = plan['start'].values[key_idxes]
+            counts = plan['count'].values[key_idxes]
+            salted = plan['side'].values[key_idxes] == op.side
+
+            # rows of heavy keys on the salted side are spread over
+            # reducers assigned to the key in a round-robin way
+            salted_idxes = key_idxes[salted]
+            offsets = pd.Series(salted_idxes).groupby(salted_idxes).cumcount().values
+            salted_dests = starts[salted] + (offsets + chunk.index[0]) % counts[salted]
+
+            # rows of heavy keys on the other side are copied to
+            # all reducers assigned to the key
+            copies = counts[~salted]
+            copied_positions = np.repeat(heavy_positions[~salted], copies)
+            copy_offsets = np.arange(len(copied_positions)) - \
+                np.repeat(np.cumsum(copies) - copies, copies)
+            copied_dests = np.repeat(starts[~salted], copies) + copy_offsets
+
+            positions = np.concatenate([positions[~heavy], heavy_positions[salted], copied_positions])
+            dests = np.concatenate([dests[~heavy], salted_dests % size, copied_dests % size])
+
+        partitions = split_by_partition_ids(df, dests, size, positions=positions)
+        for index_idx, partition in enumerate(partitions):
             group_key = ','.join([str(index_idx), str(chunk.index[1])])
-            if index_filter is not None and index_filter is not list():
-                ctx[(chunk.key, group_key)] = df.loc[index_filter]
-            else:
-                ctx[(chunk.key, group_key)] = None
+            ctx[(chunk.key, group_key)] = partition
 
     @classmethod
     def execute_reduce(cls, ctx, op):
@@ -109,6 +152,113 @@ class DataFrameMergeAlign(DataFrameMapReduceOperand, DataFrameOperandMixin):
             cls.execute_reduce(ctx, op)
 
 
+class DataFrameMergeSkewSample(DataFrameOperand, DataFrameOperandMixin):
+    """
+    Estimate frequencies of shuffle keys in a chunk from a regular sample
+    """
+    _op_type_ = OperandDef.DATAFRAME_MERGE_SKEW_SAMPLE
+
+    _shuffle_on = AnyField('shuffle_on')
+    _sample_size = Int32Field('sample_size')
+
+    def __init__(self, shuffle_on=None, sample_size=None, **kw):
+        super().__init__(_shuffle_on=shuffle_on, _sample_size=sample_size,
+                         _output_types=[OutputType.series], **kw)
+
+    @property
+    def shuffle_on(self):
+        return self._shuffle_on
+
+    @property
+    def sample_size(self):
+        return self._sample_size
+
+    @classmethod
+    def execute(cls, ctx, op):
+        df = _reset_shuffle_on_index(ctx[op.inputs[0].key], op.shuffle_on)
+        keys = _get_shuffle_keys(df, op.shuffle_on)
+        step = max(len(keys) // op.sample_size, 1)
+        ctx[op.outputs[0].key] = keys[::step].value_counts() * step
+
+
+class DataFrameMergeSkewPlan(DataFrameOperand, DataFrameOperandMixin):
+    """
+    Find heavy keys from sampled key frequencies of both sides of merge, and
+    assign a range of reducers to every heavy key. Rows of a heavy key on one
+    side are spread over its reducers, while rows on the other side are copied
+    to all of them. The plan is a DataFrame indexed by heavy keys, with columns
+    `start` and `count` for the reducers and `side` for the side to spread.
+    """
+    _op_type_ = OperandDef.DATAFRAME_MERGE_SKEW_PLAN
+
+    _how = StringField('how')
+    _n_left = Int32Field('n_left')
+    _shuffle_size = Int32Field('shuffle_size')
+    _heavy_factor = Float64Field('heavy_factor')
+
+    def __init__(self, how=None, n_left=None, shuffle_size=None, heavy_factor=None, **kw):
+        super().__init__(_how=how, _n_left=n_left, _shuffle_size=shuffle_size,
+                         _heavy_factor=heavy_factor, _output_types=[OutputType.dataframe], **kw)
+
+    @property
+    def how(self):
+        return self._how
+
+    @property
+    def n_left(self):
+        return self._n_left
+
+    @property
+    def shuffle_size(self):
+        return self._shuffle_size
+
+    @property
+    def heavy_factor(self):
+        return self._heavy_factor
+
+    @classmethod
+    def execute(cls, ctx, op):
+        samples = [ctx[c.key] for c in op.inputs]
+        side_counts = [_sum_key_counts(samples[:op.n_left]),
+                       _sum_key_counts(samples[op.n_left:])]
+        size = op.shuffle_size
+
+        # unmatched rows of the copied side cannot be kept
+        salt_sides = []
+        if op.how in ('inner', 'left'):
+            salt_sides.append(0)
+        if op.how in ('inner', 'right'):
+            salt_sides.append(1)
+
+        # spread the side where the key is heavier
+        heavy_keys = dict()
+        for side in salt_sides:
+            counts = side_counts[side]
+            target = counts.sum() / size
+            if target == 0:
+                continue
+            for key, count in counts[counts > op.heavy_factor * target].items():
+                ratio = count / target
+                if key not in heavy_keys or ratio > heavy_keys[key][0]:
+                    heavy_keys[key] = (ratio, side)
+
+        keys, starts, n_reducers, sides = [], [], [], []
+        offset = 0
+        for key, (ratio, side) in sorted(heavy_keys.items(), key=lambda it: -it[1][0]):
+            n = min(size, int(np.ceil(ratio)))
+            if n < 2:
+                continue
+            keys.append(key)
+            starts.append(offset % size)
+            n_reducers.append(n)
+            sides.append(side)
+            offset += n
+
+        ctx[op.outputs[0].key] = pd.DataFrame(
+            {'start': starts, 'count': n_reducers, 'side': sides},
+            index=pd.Index(keys, tupleize_cols=False), dtype=np.int64)
+
+
 class _DataFrameMergeBase(DataFrameOperand, DataFrameOperandMixin):
     _how = StringField('how')
     _on = AnyField('on')
@@ -194,18 +344,43 @@ class _DataFrameMergeBase(DataFrameOperand, DataFrameOperandMixin):
 class DataFrameShuffleMerge(_DataFrameMergeBase):
     _op_type_ = OperandDef.DATAFRAME_SHUFFLE_MERGE
 
-    def __init__(self, **kw):
-        super().__init__(**kw)
+    _strategy = StringField('strategy')
+
+    def __init__(self, strategy=None, **kw):
+        super().__init__(_strategy=strategy, **kw)
+
+    @property
+    def strategy(self):
+        return self._strategy
+
+    @classmethod
+    def _gen_skew_plan_chunk(cls, op, shuffle_size, left, left_on, right, right_on):
+        sample_size = options.dataframe.skew_join.sample_size
+        sample_chunks = []
+        for df, shuffle_on in ((left, left_on), (right, right_on)):
+            for chunk in df.chunks:
+                sample_op = DataFrameMergeSkewSample(shuffle_on=shuffle_on, sample_size=sample_size)
+                sample_chunks.append(sample_op.new_chunk(
+                    [chunk], shape=(np.nan,), index=chunk.index[:1], dtype=np.dtype(np.int64),
+                    index_value=parse_index(pd.Index([]), chunk, shuffle_on), name=None))
+
+        plan_op = DataFrameMergeSkewPlan(how=op.how, n_left=len(left.chunks), shuffle_size=shuffle_size,
+                                         heavy_factor=options.dataframe.skew_join.heavy_factor)
+        plan_dtypes = pd.Series([np.dtype(np.int64)] * 3, index=['start', 'count', 'side'])
+        return plan_op.new_chunk(sample_chunks, shape=(np.nan, 3), index=(0, 0), dtypes=plan_dtypes,
+                                 index_value=parse_index(pd.Index([]), *sample_chunks),
+                                 columns_value=parse_index(plan_dtypes.index, store_data=True))
 
     @classmethod
-    def _gen_shuffle_chunks(cls, op, out_shape, shuffle_on, df):
+    def _gen_shuffle_chunks(cls, op, out_shape, shuffle_on, df, side=None, skew_plan=None):
         # gen map chunks
         map_chunks = []
         for chunk in df.chunks:
             map_op = DataFrameMergeAlign(stage=OperandStage.map, shuffle_on=shuffle_on,
-                                         sparse=chunk.issparse(),
+                                         sparse=chunk.issparse(), side=side,
                                          index_shuffle_size=out_shape[0])
-            map_chunks.append(map_op.new_chunk([chunk], shape=(np.nan, np.nan), dtypes=chunk.dtypes, index=chunk.index,
+            inputs = [chunk] if skew_plan is None else [chunk, skew_plan]
+            map_chunks.append(map_op.new_chunk(inputs, shape=(np.nan, np.nan), dtypes=chunk.dtypes, index=chunk.index,
                                                index_value=chunk.index_value, columns_value=chunk.columns_value))
 
         proxy_chunk = DataFrameShuffleProxy(output_types=[OutputType.dataframe]).new_chunk(
@@ -270,6 +445,53 @@ class DataFrameShuffleMerge(_DataFrameMergeBase):
                                      chunks=out_chunks, dtypes=df.dtypes,
                                      index_value=df.index_value, columns_value=df.columns_value)
 
+    @classmethod
+    def _concat_chunks(cls, df):
+        concat_chunk = DataFrameConcat(axis=0, output_types=[OutputType.dataframe]).new_chunk(
+            df.chunks, shape=df.shape, index=(0, 0), dtypes=df.dtypes,
+            index_value=df.index_value, columns_value=df.columns_value)
+        return DataFrameConcat(axis=0, output_types=[OutputType.dataframe]).new_dataframe(
+            [df], chunks=[concat_chunk], nsplits=((df.shape[0],), (df.shape[1],)),
+            shape=df.shape, dtypes=df.dtypes,
+            index_value=df.index_value, columns_value=df.columns_value)
+
+    @classmethod
+    def _get_broadcast_side(cls, op, left, right):
+        """
+        Choose the side to broadcast, the other side will be joined chunk
+        by chunk. None returned if broadcast join cannot be applied.
+        """
+        # rows of the broadcast side not matched cannot be kept
+        candidates = []
+        if op.how in ('inner', 'right'):
+            candidates.append(0)
+        if op.how in ('inner', 'left'):
+            candidates.append(1)
+        if not candidates:
+            return
+
+        sizes = [_estimate_size(left), _estimate_size(right)]
+        if op.strategy == 'broadcast':
+            # broadcast the smaller side, or the one with fewer chunks if unknown
+            return min(candidates, key=lambda i: (sizes[i] if sizes[i] is not None else np.inf,
+                                                  len((left, right)[i].chunks)))
+
+        limit = options.dataframe.broadcast_join_limit or options.chunk_store_limit
+        candidates = [i for i in candidates if sizes[i] is not None and sizes[i] <= limit]
+        # never broadcast the larger side
+        candidates = [i for i in candidates if sizes[1 - i] is None or sizes[i] < sizes[1 - i]]
+        if candidates:
+            return min(candidates, key=lambda i: sizes[i])
+
+    @classmethod
+    def _tile_broadcast(cls, op, left, right, broadcast_side):
+        # concatenate the small side and join it with every chunk of the other side
+        if broadcast_side == 0:
+            left = cls._concat_chunks(left)
+        else:
+            right = cls._concat_chunks(right)
+        return cls._tile_one_chunk(op, left, right)
+
     @classmethod
     def tile(cls, op):
         df = op.outputs[0]
@@ -279,6 +501,11 @@ class DataFrameShuffleMerge(_DataFrameMergeBase):
         if len(left.chunks) == 1 or len(right.chunks) == 1:
             return cls._tile_one_chunk(op, left, right)
 
+        if op.strategy != 'shuffle':
+            broadcast_side = cls._get_broadcast_side(op, left, right)
+            if broadcast_side is not None:
+                return cls._tile_broadcast(op, left, right, broadcast_side)
+
         left_row_chunk_size = left.chunk_shape[0]
         right_row_chunk_size = right.chunk_shape[0]
         out_row_chunk_size = max(left_row_chunk_size, right_row_chunk_size)
@@ -289,9 +516,17 @@ class DataFrameShuffleMerge(_DataFrameMergeBase):
         left_on = _prepare_shuffle_on(op.left_index, op.left_on, op.on)
         right_on = _prepare_shuffle_on(op.right_index, op.right_on, op.on)
 
+        # split heavy keys over multiple reducers to avoid skewed reducers
+        skew_plan = None
+        if options.dataframe.skew_join.enabled and op.how in ('inner', 'left', 'right'):
+            skew_plan = cls._gen_skew_plan_chunk(op, out_row_chunk_size, left, left_on,
+                                                 right, right_on)
+
         # do shuffle
-        left_chunks = cls._gen_shuffle_chunks(op, out_chunk_shape, left_on, left)
-        right_chunks = cls._gen_shuffle_chunks(op, out_chunk_shape, right_on, right)
+        left_chunks = cls._gen_shuffle_chunks(op, out_chunk_shape, left_on, left,
+                                              side=0, skew_plan=skew_plan)
+        right_chunks = cls._gen_shuffle_chunks(op, out_chunk_shape, right_on, right,
+                                               side=1, skew_plan=skew_plan)
 
         out_chunks = []
         for left_chunk, right_chunk in zip(left_chunks, right_chunks):
@@ -337,6 +572,56 @@ class DataFrameShuffleMerge(_DataFrameMergeBase):
         ctx[chunk.key] = r
 
 
+def _estimate_size(df):
+    # estimate memory size of a DataFrame, None if shape is unknown
+    if np.isnan(df.shape[0]):
+        return None
+    row_size = 0
+    for dtype in df.dtypes:
+        if dtype == np.dtype('O') or not hasattr(dtype, 'itemsize'):
+            row_size += OBJECT_FIELD_OVERHEAD
+        else:
+            row_size += dtype.itemsize
+    return df.shape[0] * row_size
+
+
+def _reset_shuffle_on_index(df, shuffle_on):
+    # shuffle on field may be resident in index
+    if shuffle_on is None:
+        return df
+    if not isinstance(shuffle_on, (list, tuple)):
+        shuffle_on = [shuffle_on]
+    to_reset_index_names = [son for son in shuffle_on if son not in df.dtypes]
+    if len(to_reset_index_names) > 0:
+        df = df.reset_index(to_reset_index_names)
+    return df
+
+
+def _get_shuffle_keys(df, shuffle_on):
+    # keys of rows to shuffle, composite keys are represented as tuples
+    if shuffle_on is None:
+        keys = df.index
+    elif not isinstance(shuffle_on, (list, tuple)):
+        keys = pd.Index(df[shuffle_on])
+    elif len(shuffle_on) == 1:
+        keys = pd.Index(df[shuffle_on[0]])
+    else:
+        keys = pd.MultiIndex.from_frame(df[list(shuffle_on)])
+    if isinstance(keys, pd.MultiIndex):
+        keys = keys.to_flat_index()
+    return keys
+
+
+def _sum_key_counts(counts):
+    counts = [c for c in counts if len(c) > 0]
+    if not counts:
+        return pd.Series([], dtype=np.int64)
+    counts = pd.concat(counts)
+    if isinstance(counts.index, pd.MultiIndex):
+        counts.index = counts.index.to_flat_index()
+    return counts.groupby(level=0, sort=False).sum()
+
+
 def _prepare_shuffle_on(use_index, side_on, on):
     # consistent with pandas: `left_index` precedes `left_on` and `right_index` precedes `right_on`
     if use_index:
@@ -351,10 +636,12 @@ def _prepare_shuffle_on(use_index, side_on, on):
 def merge(df, right, how='inner', on=None, left_on=None, right_on=None,
           left_index=False, right_index=False, sort=False, suffixes=('_x', '_y'),
           copy=True, indicator=False, strategy=None, validate=None):
-    if strategy is not None and strategy != 'shuffle':
-        raise NotImplementedError('Only shuffle merge is supported')
+    if strategy is not None and strategy not in ('shuffle', 'broadcast'):
+        raise NotImplementedError('Only shuffle and broadcast merge are supported')
+    if strategy == 'broadcast' and how not in ('inner', 'left', 'right'):
+        raise ValueError(f'Broadcast merge is not available for how={how!r}')
     op = DataFrameShuffleMerge(
-        how=how, on=on, left_on=left_on, right_on=right_on,
+        strategy=strategy, how=how, on=on, left_on=left_on, right_on=right_on,
         left_index=left_index, right_index=right_index, sort=sort, suffixes=suffixes,
         copy=copy, indicator=indicator, validate=validate, output_types=[OutputType.dataframe])
     return op(df, right)
@@ -15,6 +15,7 @@
 import numpy as np
 import pandas as pd
 
+from mars.config import option_context
 from mars.operands import OperandStage
 from mars.executor import Executor
 from mars.tiles import get_tiled
@@ -22,7 +23,8 @@ from mars.tests.core import TestBase
 from mars.dataframe.core import IndexValue
 from mars.dataframe.base.standardize_range_index import ChunkStandardizeRangeIndex
 from mars.dataframe.datasource.dataframe import from_pandas
-from mars.dataframe.merge import DataFrameMergeAlign, DataFrameShuffleMerge, concat
+from mars.dataframe.merge import DataFrameMergeAlign, DataFrameShuffleMerge, \
+    DataFrameMergeSkewSample, DataFrameMergeSkewPlan, concat
 
 
 class Test(TestBase):
@@ -91,7 +93,7 @@ class Test(TestBase):
         ]
 
         for kw in parameters:
-            df = mdf1.join(mdf2, **kw)
+            df = mdf1.join(mdf2, strategy='shuffle', **kw)
             df = df.tiles()
 
             self.assertEqual(df.chunk_shape, (3, 1))
@@ -134,7 +136,7 @@ class Test(TestBase):
         ]
 
         for kw in parameters:
-            df = mdf1.join(mdf2, **kw)
+            df = mdf1.join(mdf2, strategy='shuffle', **kw)
             df = df.tiles()
 
             self.assertEqual(df.chunk_shape, (3, 1))
@@ -200,6 +202,77 @@ class Test(TestBase):
         self.assertEqual(tiled.chunks[1].inputs[0].key, get_tiled(mdf1).chunks[1].key)
         self.assertEqual(tiled.chunks[1].inputs[1].key, get_tiled(mdf2).chunks[0].key)
 
+    def testBroadcastMerge(self):
+        df1 = pd.DataFrame(np.arange(200).reshape((40, 5)), columns=['a', 'b', 'c', 'd', 'e'])
+        df2 = pd.DataFrame(np.arange(20).reshape((5, 4)), columns=['a', 'b', 'x', 'y'])
+
+        mdf1 = from_pandas(df1, chunk_size=10)
+        mdf2 = from_pandas(df2, chunk_size=2)
+
+        # the small side is broadcast automatically
+        for kw in [{}, {'how': 'left', 'on': 'a'}]:
+            df = mdf1.merge(mdf2, **kw).tiles()
+            self.assertEqual(df.chunk_shape, (4, 1))
+            for i, chunk in enumerate(df.chunks):
+                self.assertIsInstance(chunk.op, DataFrameShuffleMerge)
+                left, right = chunk.inputs
+                self.assertIs(left, get_tiled(mdf1).chunks[i].data)
+                self.assertEqual(len(right.inputs), 3)
+                self.assertIs(right, df.chunks[0].inputs[1])
+
+        # the right side of right join cannot be broadcast
+        df = mdf1.merge(mdf2, how='right', on='a').tiles()
+        self.assertIsInstance(df.chunks[0].inputs[0].op, DataFrameMergeAlign)
+
+        # too large to broadcast
+        with option_context({'dataframe.broadcast_join_limit': 10}):
+            df = mdf1.merge(mdf2).tiles()
+            self.assertIsInstance(df.chunks[0].inputs[0].op, DataFrameMergeAlign)
+
+        # forced by strategy
+        df = mdf2.merge(mdf1, how='left', strategy='broadcast').tiles()
+        self.assertEqual(df.chunk_shape, (3, 1))
+        self.assertEqual(len(df.chunks[0].inputs[1].inputs), 4)
+        df = mdf1.merge(mdf2, strategy='shuffle').tiles()
+        self.assertIsInstance(df.chunks[0].inputs[0].op, DataFrameMergeAlign)
+
+        with self.assertRaises(ValueError):
+            mdf1.merge(mdf2, how='outer', strategy='broadcast')
+        with self.assertRaises(NotImplementedError):
+            mdf1.merge(mdf2, strategy='unknown')
+
+    def testSkewMerge(self):
+        df1 = pd.DataFrame(np.arange(200).reshape((40, 5)), columns=['a', 'b', 'c', 'd', 'e'])
+        df2 = pd.DataFrame(np.arange(80).reshape((20, 4)), columns=['a', 'b', 'x', 'y'])
+
+        mdf1 = from_pandas(df1, chunk_size=10)
+        mdf2 = from_pandas(df2, chunk_size=5)
+
+        with option_context({'dataframe.skew_join.enabled': True}):
+            df = mdf1.merge(mdf2, how='left', on='a', strategy='shuffle').tiles()
+            self.assertEqual(df.chunk_shape, (4, 1))
+
+            plan_chunk = df.chunks[0].inputs[0].inputs[0].inputs[0].inputs[1]
+            self.assertIsInstance(plan_chunk.op, DataFrameMergeSkewPlan)
+            self.assertEqual(plan_chunk.op.n_left, 4)
+            self.assertEqual(plan_chunk.op.shuffle_size, 4)
+            self.assertEqual(len(plan_chunk.inputs), 8)
+            for c in plan_chunk.inputs:
+                self.assertIsInstance(c.op, DataFrameMergeSkewSample)
+                self.assertEqual(c.op.shuffle_on, 'a')
+
+            for i, side_chunk in enumerate(df.chunks[0].inputs):
+                for map_chunk in side_chunk.inputs[0].inputs:
+                    self.assertEqual(map_chunk.op.stage, OperandStage.map)
+                    self.assertEqual(map_chunk.op.side, i)
+                    self.assertIs(map_chunk.op.skew_plan, plan_chunk)
+
+            # heavy keys cannot be split for outer join
+            df = mdf1.merge(mdf2, how='outer', on='a', strategy='shuffle').tiles()
+            map_chunk = df.chunks[0].inputs[0].inputs[0].inputs[0]
+            self.assertEqual(len(map_chunk.inputs), 1)
+            self.assertIsNone(map_chunk.op.skew_plan)
+
     def testAppend(self):
         df1 = pd.DataFrame(np.random.rand(10, 4), columns=list('ABCD'))
         df2 = pd.DataFrame(np.random.rand(10, 4), columns=list('ABCD'))
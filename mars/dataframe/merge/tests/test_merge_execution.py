@@ -12,9 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import itertools
+
 import numpy as np
 import pandas as pd
 
+from mars.config import option_context
+from mars.executor import Executor
 from mars.tests.core import TestBase, ExecutorForTest
 from mars.session import new_session
 from mars.dataframe.datasource.dataframe import from_pandas
@@ -300,6 +304,66 @@ class Test(TestBase):
         pd.testing.assert_frame_equal(expected.sort_values(by=expected.columns[1]).reset_index(drop=True),
                                       result.sort_values(by=result.columns[1]).reset_index(drop=True))
 
+    def testBroadcastMerge(self):
+        rs = np.random.RandomState(0)
+        raw1 = pd.DataFrame({'a': rs.randint(0, 10, (100,)),
+                             'b': rs.rand(100)})
+        raw2 = pd.DataFrame({'a': np.arange(8), 'c': list('abcdefgh')})
+
+        df1 = from_pandas(raw1, chunk_size=20)
+        df2 = from_pandas(raw2, chunk_size=3)
+
+        for kw in [dict(), dict(how='left'), dict(how='left', strategy='broadcast')]:
+            r = df1.merge(df2, on='a', **kw)
+            result = self.executor.execute_dataframe(r, concat=True)[0]
+            expected = raw1.merge(raw2, on='a', how=kw.get('how', 'inner'))
+            pd.testing.assert_frame_equal(expected.sort_values(['a', 'b']).reset_index(drop=True),
+                                          result.sort_values(['a', 'b']).reset_index(drop=True))
+
+        r = df2.merge(df1, on='a', how='right', strategy='broadcast')
+        result = self.executor.execute_dataframe(r, concat=True)[0]
+        expected = raw2.merge(raw1, on='a', how='right')
+        pd.testing.assert_frame_equal(expected.sort_values(['a', 'b']).reset_index(drop=True),
+                                      result.sort_values(['a', 'b']).reset_index(drop=True))
+
+    def testSkewMerge(self):
+        rs = np.random.RandomState(0)
+        # most rows of the left side have the same key
+        raw1 = pd.DataFrame({'a': np.where(rs.rand(200) < 0.6, 0, rs.randint(1, 20, (200,))),
+                             'b': rs.rand(200),
+                             'c': rs.randint(0, 3, (200,))})
+        raw2 = pd.DataFrame({'a': np.arange(30) % 20,
+                             'c': rs.randint(0, 3, (30,)),
+                             'd': rs.rand(30)})
+
+        df1 = from_pandas(raw1, chunk_size=50)
+        df2 = from_pandas(raw2, chunk_size=10)
+
+        with option_context({'dataframe.skew_join.enabled': True,
+                             'dataframe.skew_join.sample_size': 20}):
+            for how, on in itertools.product(['inner', 'left', 'right'], ['a', ['a', 'c']]):
+                r = df1.merge(df2, how=how, on=on, strategy='shuffle')
+                result = self.executor.execute_dataframe(r, concat=True)[0]
+                expected = raw1.merge(raw2, how=how, on=on)
+                cols = list(expected.columns)
+                pd.testing.assert_frame_equal(expected.sort_values(cols).reset_index(drop=True),
+                                              result.sort_values(cols).reset_index(drop=True))
+
+            r = df1.set_index('a').merge(df2.set_index('a'), left_index=True, right_index=True,
+                                         strategy='shuffle')
+            result = self.executor.execute_dataframe(r, concat=True)[0]
+            expected = raw1.set_index('a').merge(raw2.set_index('a'), left_index=True, right_index=True)
+            cols = list(expected.columns)
+            pd.testing.assert_frame_equal(expected.sort_values(cols), result.sort_values(cols))
+
+        # rows of the heavy key are spread over multiple reducers
+        r = df1.merge(df2, on='a', strategy='shuffle')
+        max_size = max(len(c) for c in Executor().execute_dataframe(r))
+        with option_context({'dataframe.skew_join.enabled': True,
+                             'dataframe.skew_join.sample_size': 20}):
+            r = df1.merge(df2, on='a', strategy='shuffle')
+            self.assertLess(max(len(c) for c in Executor().execute_dataframe(r)), max_size)
+
     def testMergeOnDuplicateColumns(self):
         raw1 = pd.DataFrame([['foo', 1, 'bar'],
                              ['bar', 2, 'foo'],
@@ -315,7 +379,7 @@ class Test(TestBase):
         r = df1.merge(df2, left_on='lkey', right_on='rkey')
         result = self.executor.execute_dataframe(r, concat=True)[0]
         expected = raw1.merge(raw2, left_on='lkey', right_on='rkey')
-        pd.testing.assert_frame_equal(expected, result)
+        pd.testing.assert_frame_equal(expected, result.reset_index(drop=True))
 
     def testAppendExecution(self):
         executor = ExecutorForTest(storage=new_session().context)
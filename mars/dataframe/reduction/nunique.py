@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from collections import OrderedDict
+
 import pandas as pd
 try:
     import pyarrow as pa
@@ -21,7 +23,9 @@ except ImportError:  # pragma: no cover
 from ... import opcodes as OperandDef
 from ...core import OutputType
 from ...config import options
-from ...serialize import BoolField
+from ...lib.hyperloglog import HyperLogLog, precision_from_error
+from ...operands import OperandStage
+from ...serialize import BoolField, Int32Field
 from ...utils import lazy_import
 from ..arrays import ArrowListArray, ArrowListDtype
 from .core import DataFrameReductionOperand, DataFrameReductionMixin
@@ -36,10 +40,13 @@ class DataFrameNunique(DataFrameReductionOperand, DataFrameReductionMixin):
 
     _dropna = BoolField('dropna')
     _use_arrow_dtype = BoolField('use_arrow_dtype')
+    # if specified, estimate by HyperLogLog sketches of the precision
+    _approx_precision = Int32Field('approx_precision')
 
-    def __init__(self, dropna=None, use_arrow_dtype=None, **kw):
+    def __init__(self, dropna=None, use_arrow_dtype=None, approx_precision=None, **kw):
         super(DataFrameNunique, self).__init__(
-            _dropna=dropna, _use_arrow_dtype=use_arrow_dtype, **kw)
+            _dropna=dropna, _use_arrow_dtype=use_arrow_dtype,
+            _approx_precision=approx_precision, **kw)
 
     @property
     def dropna(self):
@@ -49,6 +56,14 @@ class DataFrameNunique(DataFrameReductionOperand, DataFrameReductionMixin):
     def use_arrow_dtype(self):
         return self._use_arrow_dtype
 
+    @property
+    def approx_precision(self):
+        return self._approx_precision
+
+    @classmethod
+    def _is_approx(cls, op):
+        return op.approx_precision is not None and op.axis != 1
+
     @classmethod
     def _if_use_arrow_dtype(cls, op):
         use_arrow_dtype = op.use_arrow_dtype
@@ -68,8 +83,34 @@ class DataFrameNunique(DataFrameReductionOperand, DataFrameReductionMixin):
             # fallback due to diverse dtypes
             return [v.drop_duplicates().to_list()]
 
+    @classmethod
+    def _execute_approx(cls, ctx, op):
+        in_data = ctx[op.inputs[0].key]
+
+        def sketch(values):
+            if op.stage == OperandStage.map:
+                return HyperLogLog.from_values(values, precision=op.approx_precision,
+                                               dropna=op.dropna)
+            return HyperLogLog.merge(values)
+
+        if isinstance(in_data, pd.Series):
+            result = sketch(in_data)
+            if op.stage == OperandStage.agg:
+                result = result.count()
+            else:
+                result = pd.Series([result], name=in_data.name)
+        elif op.stage == OperandStage.agg:
+            result = pd.Series(OrderedDict(
+                (d, sketch(v).count()) for d, v in in_data.iteritems()), dtype='int64')
+        else:
+            result = pd.DataFrame(OrderedDict(
+                (d, [sketch(v)]) for d, v in in_data.iteritems()))
+        ctx[op.outputs[0].key] = result
+
     @classmethod
     def _execute_map(cls, ctx, op: "DataFrameNunique"):
+        if cls._is_approx(op):
+            return cls._execute_approx(ctx, op)
         use_arrow_dtype = cls._if_use_arrow_dtype(op)
 
         xdf = cudf if op.gpu else pd
@@ -97,6 +138,8 @@ class DataFrameNunique(DataFrameReductionOperand, DataFrameReductionMixin):
 
     @classmethod
     def _execute_combine(cls, ctx, op):
+        if cls._is_approx(op):
+            return cls._execute_approx(ctx, op)
         use_arrow_dtype = cls._if_use_arrow_dtype(op)
 
         xdf = cudf if op.gpu else pd
@@ -125,6 +168,8 @@ class DataFrameNunique(DataFrameReductionOperand, DataFrameReductionMixin):
 
     @classmethod
     def _execute_agg(cls, ctx, op):
+        if cls._is_approx(op):
+            return cls._execute_approx(ctx, op)
         xdf = cudf if op.gpu else pd
         in_data = ctx[op.inputs[0].key]
         dropna = op.dropna
@@ -147,7 +192,8 @@ class DataFrameNunique(DataFrameReductionOperand, DataFrameReductionMixin):
         return in_data.nunique(dropna=op.dropna, **kwargs)
 
 
-def nunique_dataframe(df, axis=0, dropna=True, combine_size=None):
+def nunique_dataframe(df, axis=0, dropna=True, combine_size=None,
+                      approx=False, relative_error=0.01):
     """
     Count distinct observations over requested axis.
 
@@ -163,6 +209,12 @@ def nunique_dataframe(df, axis=0, dropna=True, combine_size=None):
         Don't include NaN in the counts.
     combine_size : int, optional
         The number of chunks to combine.
+    approx : bool, default False
+        If True, numbers are estimated along axis 0 by HyperLogLog sketches
+        merged across chunks, thus only sketches of bounded sizes are
+        transferred between stages instead of distinct values.
+    relative_error : float, default 0.01
+        Approximate standard error of estimated numbers when `approx` is True.
 
     Returns
     -------
@@ -188,13 +240,15 @@ def nunique_dataframe(df, axis=0, dropna=True, combine_size=None):
     2    2
     dtype: int64
     """
+    approx_precision = precision_from_error(relative_error) if approx else None
     op = DataFrameNunique(axis=axis, dropna=dropna, combine_size=combine_size,
+                          approx_precision=approx_precision,
                           output_types=[OutputType.series],
                           use_arrow_dtype=options.dataframe.use_arrow_dtype)
     return op(df)
 
 
-def nunique_series(df, dropna=True, combine_size=None):
+def nunique_series(df, dropna=True, combine_size=None, approx=False, relative_error=0.01):
     """
     Return number of unique elements in the object.
 
@@ -206,6 +260,12 @@ def nunique_series(df, dropna=True, combine_size=None):
         Don't include NaN in the count.
     combine_size : int, optional
         The number of chunks to combine.
+    approx : bool, default False
+        If True, the number is estimated by HyperLogLog sketches merged
+        across chunks, thus only sketches of bounded sizes are transferred
+        between stages instead of distinct values.
+    relative_error : float, default 0.01
+        Approximate standard error of the estimated number when `approx` is True.
 
     Returns
     -------
@@ -231,7 +291,9 @@ def nunique_series(df, dropna=True, combine_size=None):
     >>> s.nunique().execute()
     4
     """
+    approx_precision = precision_from_error(relative_error) if approx else None
     op = DataFrameNunique(dropna=dropna, combine_size=combine_size,
+                          approx_precision=approx_precision,
                           output_types=[OutputType.scalar],
                           use_arrow_dtype=options.dataframe.use_arrow_dtype)
     return op(df)
@@ -433,6 +433,36 @@ class TestCount(TestBase):
         expected = data1.nunique(axis=1)
         pd.testing.assert_series_equal(result, expected)
 
+    def testApproxNunique(self):
+        rs = np.random.RandomState(0)
+        data = pd.DataFrame({'a': rs.randint(10 ** 9, size=20000),
+                             'b': rs.choice(['x', 'y', None], size=20000),
+                             'c': rs.randint(500, size=20000).astype(float)})
+        data.loc[::7, 'c'] = np.nan
+
+        df = from_pandas_df(data, chunk_size=(3000, 2))
+        result = self.executor.execute_dataframe(df.nunique(approx=True), concat=True)[0]
+        expected = data.nunique()
+        pd.testing.assert_index_equal(result.index, expected.index)
+        np.testing.assert_allclose(result, expected, rtol=0.03)
+
+        r = df.nunique(approx=True, dropna=False, relative_error=0.005)
+        result = self.executor.execute_dataframe(r, concat=True)[0]
+        np.testing.assert_allclose(result, data.nunique(dropna=False), rtol=0.015)
+
+        series = from_pandas_series(data['a'], chunk_size=3000)
+        result = self.executor.execute_dataframe(series.nunique(approx=True), concat=True)[0]
+        self.assertLess(abs(result / data['a'].nunique() - 1), 0.03)
+
+        series = from_pandas_series(data['b'], chunk_size=3000)
+        result = self.executor.execute_dataframe(series.nunique(approx=True), concat=True)[0]
+        self.assertEqual(result, 2)
+
+        # approx is ignored along axis 1
+        df = from_pandas_df(data.iloc[:10], chunk_size=3)
+        result = self.executor.execute_dataframe(df.nunique(axis=1, approx=True), concat=True)[0]
+        pd.testing.assert_series_equal(result, data.iloc[:10].nunique(axis=1))
+
     @unittest.skipIf(pa is None, 'pyarrow not installed')
     def testUseArrowDtypeNUnique(self):
         with option_context({'dataframe.use_arrow_dtype': True, 'combine_size': 2}):
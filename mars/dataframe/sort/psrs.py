@@ -23,7 +23,7 @@ from ...utils import lazy_import, get_shuffle_input_keys_idxes
 from ...operands import OperandStage
 from ...serialize import Int32Field, ListField, StringField, BoolField
 from ...tensor.base.psrs import PSRSOperandMixin
-from ..utils import standardize_range_index
+from ..utils import standardize_range_index, split_by_bounds
 from ..operands import DataFrameOperandMixin, DataFrameOperand, DataFrameShuffleProxy, \
     DataFrameMapReduceOperand
 
@@ -485,9 +485,8 @@ class DataFramePSRSShuffle(DataFrameMapReduceOperand, DataFrameOperandMixin):
                 poses = len(records) - records[::-1].searchsorted(p_records, side='right')
             del records, p_records
 
-            poses = (None,) + tuple(poses) + (None,)
-            for i in range(op.n_partition):
-                values = a.iloc[poses[i]: poses[i + 1]]
+            bounds = (0,) + tuple(poses) + (len(a),)
+            for i, values in enumerate(split_by_bounds(a, bounds)):
                 ctx[(out.key, str(i))] = values
         else:  # pragma: no cover
             # for cudf, find split positions in loops.
@@ -516,9 +515,8 @@ class DataFramePSRSShuffle(DataFrameMapReduceOperand, DataFrameOperandMixin):
                 poses = a.searchsorted(pivots, side='right')
             else:
                 poses = len(a) - a.iloc[::-1].searchsorted(pivots, side='right')
-            poses = (None,) + tuple(poses) + (None,)
-            for i in range(op.n_partition):
-                values = a.iloc[poses[i]: poses[i + 1]]
+            bounds = (0,) + tuple(poses) + (len(a),)
+            for i, values in enumerate(split_by_bounds(a, bounds)):
                 ctx[(out.key, str(i))] = values
 
     @classmethod
@@ -530,9 +528,8 @@ class DataFramePSRSShuffle(DataFrameMapReduceOperand, DataFrameOperandMixin):
             poses = a.index.searchsorted(list(pivots), side='right')
         else:
             poses = len(a) - a.index[::-1].searchsorted(list(pivots), side='right')
-        poses = (None,) + tuple(poses) + (None,)
-        for i in range(op.n_partition):
-            values = a.iloc[poses[i]: poses[i + 1]]
+        bounds = (0,) + tuple(poses) + (len(a),)
+        for i, values in enumerate(split_by_bounds(a, bounds)):
             ctx[(out.key, str(i))] = values
 
     @classmethod
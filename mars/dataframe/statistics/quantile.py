@@ -18,7 +18,9 @@ import numpy as np
 import pandas as pd
 
 from ... import opcodes as OperandDef
-from ...core import Base, Entity
+from ...config import options
+from ...core import Base, Entity, OutputType
+from ...operands import OperandStage
 from ...serialize import KeyField, AnyField, StringField, DataTypeField, \
     BoolField, Int32Field
 from ...tensor.core import TENSOR_TYPE
@@ -31,6 +33,7 @@ from ..core import DATAFRAME_TYPE
 from ..datasource.from_tensor import series_from_tensor, dataframe_from_tensor
 from ..initializer import DataFrame as create_df
 from ..utils import parse_index, build_empty_df, find_common_type, validate_axis
+from .tdigest import TDigest, compression_from_error
 
 
 class DataFrameQuantile(DataFrameOperand, DataFrameOperandMixin):
@@ -41,13 +44,18 @@ class DataFrameQuantile(DataFrameOperand, DataFrameOperandMixin):
     _axis = Int32Field('axis')
     _numeric_only = BoolField('numeric_only')
     _interpolation = StringField('interpolation')
+    # compute by mergeable sketches of which compression is specified
+    _approx = BoolField('approx')
+    _compression = Int32Field('compression')
 
     _dtype = DataTypeField('dtype')
 
     def __init__(self, q=None, interpolation=None, axis=None, numeric_only=None,
-                 dtype=None, gpu=None, output_types=None, **kw):
+                 approx=None, compression=None, dtype=None, gpu=None,
+                 output_types=None, **kw):
         super().__init__(_q=q, _interpolation=interpolation, _axis=axis,
-                         _numeric_only=numeric_only, _dtype=dtype, _gpu=gpu,
+                         _numeric_only=numeric_only, _approx=approx,
+                         _compression=compression, _dtype=dtype, _gpu=gpu,
                          _output_types=output_types, **kw)
 
     @property
@@ -70,6 +78,14 @@ class DataFrameQuantile(DataFrameOperand, DataFrameOperandMixin):
     def numeric_only(self):
         return self._numeric_only
 
+    @property
+    def approx(self):
+        return self._approx
+
+    @property
+    def compression(self):
+        return self._compression
+
     def _set_inputs(self, inputs):
         super()._set_inputs(inputs)
         self._input = self._inputs[0]
@@ -245,15 +261,159 @@ class DataFrameQuantile(DataFrameOperand, DataFrameOperandMixin):
             r = series_from_tensor(t, index=op.q, name=op.outputs[0].name)
         return [recursive_tile(r)]
 
+    @classmethod
+    def _tree_combine(cls, op, chunks):
+        combine_size = options.combine_size
+        while len(chunks) > combine_size:
+            new_chunks = []
+            for i in range(0, len(chunks), combine_size):
+                chunk_op = op.copy().reset_key()
+                chunk_op.stage = OperandStage.combine
+                chunk_op.output_types = [OutputType.object]
+                new_chunks.append(chunk_op.new_chunk(
+                    chunks[i: i + combine_size], index=(len(new_chunks),)))
+            chunks = new_chunks
+        return chunks
+
+    @classmethod
+    def _tile_approx(cls, op):
+        in_data = op.input
+        out = op.outputs[0]
+
+        if isinstance(in_data, DATAFRAME_TYPE):
+            out_columns = out.dtypes.index if out.ndim == 2 else out.index_value.to_pandas()
+            col_blocks = []
+            for j in range(in_data.chunk_shape[1]):
+                columns = [c for c in in_data.cix[0, j].dtypes.index if c in out_columns]
+                if columns:
+                    col_blocks.append((j, columns))
+        else:
+            col_blocks = [(None, None)]
+
+        out_chunks = []
+        for out_idx, (j, columns) in enumerate(col_blocks):
+            in_chunks = in_data.chunks if j is None else \
+                [in_data.cix[i, j] for i in range(in_data.chunk_shape[0])]
+            map_chunks = []
+            for c in in_chunks:
+                chunk_op = op.copy().reset_key()
+                chunk_op.stage = OperandStage.map
+                chunk_op.output_types = [OutputType.object]
+                map_chunks.append(chunk_op.new_chunk([c], index=c.index[:1]))
+            combined_chunks = cls._tree_combine(op, map_chunks)
+
+            chunk_op = op.copy().reset_key()
+            chunk_op.stage = OperandStage.agg
+            if out.ndim == 0:
+                params = dict(shape=(), dtype=out.dtype, index=())
+            elif columns is None:
+                params = dict(shape=out.shape, dtype=out.dtype, index=(0,),
+                              index_value=out.index_value, name=out.name)
+            elif out.ndim == 1:
+                params = dict(shape=(len(columns),), dtype=out.dtype, index=(out_idx,),
+                              index_value=parse_index(pd.Index(columns), store_data=True),
+                              name=out.name)
+            else:
+                dtypes = out.dtypes[columns]
+                params = dict(shape=(out.shape[0], len(columns)), dtypes=dtypes,
+                              index=(0, out_idx), index_value=out.index_value,
+                              columns_value=parse_index(dtypes.index, store_data=True))
+            out_chunks.append(chunk_op.new_chunk(combined_chunks, kws=[params]))
+
+        if out.ndim == 0:
+            nsplits = ()
+        elif out.ndim == 1:
+            nsplits = (tuple(c.shape[0] for c in out_chunks),)
+        else:
+            nsplits = ((out.shape[0],), tuple(c.shape[1] for c in out_chunks))
+        new_op = op.copy()
+        params = out.params.copy()
+        params.update(dict(chunks=out_chunks, nsplits=nsplits))
+        return new_op.new_tileables(op.inputs, kws=[params])
+
     @classmethod
     def tile(cls, op):
+        if op.approx:
+            return cls._tile_approx(op)
         if isinstance(op.input, DATAFRAME_TYPE):
             return cls._tile_dataframe(op)
         else:
             return cls._tile_series(op)
 
+    @staticmethod
+    def _to_sketch_values(series):
+        if series.dtype.kind in 'mM':
+            values = series.values.view(np.int64).astype(np.float64)
+            values[series.isna().values] = np.nan
+            return values
+        return series.values.astype(np.float64)
+
+    @staticmethod
+    def _from_sketch_values(values, dtype):
+        if dtype.kind in 'mM':
+            values = np.round(values).astype(np.int64).view(dtype)
+            return pd.Series(values).tolist()
+        return values.tolist()
 
-def quantile_series(series, q=0.5, interpolation='linear'):
+    @classmethod
+    def _execute_map(cls, ctx, op):
+        data = ctx[op.inputs[0].key]
+        if isinstance(data, pd.DataFrame):
+            if op.numeric_only:
+                data = data._get_numeric_data()
+            result = OrderedDict(
+                (col, (TDigest.from_values(cls._to_sketch_values(data[col]), op.compression),
+                       data[col].dtype))
+                for col in data.columns)
+        else:
+            result = (TDigest.from_values(cls._to_sketch_values(data), op.compression),
+                      data.dtype)
+        ctx[op.outputs[0].key] = result
+
+    @classmethod
+    def _merge_sketches(cls, inputs):
+        if isinstance(inputs[0], tuple):
+            return TDigest.merge([inp[0] for inp in inputs]), inputs[0][1]
+        return OrderedDict(
+            (col, (TDigest.merge([inp[col][0] for inp in inputs]), dtype))
+            for col, (_, dtype) in inputs[0].items())
+
+    @classmethod
+    def execute(cls, ctx, op):
+        if op.stage == OperandStage.map:
+            return cls._execute_map(ctx, op)
+
+        merged = cls._merge_sketches([ctx[inp.key] for inp in op.inputs])
+        out = op.outputs[0]
+        if op.stage == OperandStage.combine:
+            ctx[out.key] = merged
+            return
+
+        q = np.asarray(op.q)
+        if isinstance(merged, tuple):
+            digest, dtype = merged
+            values = cls._from_sketch_values(np.atleast_1d(digest.quantile(q)), dtype)
+            if q.ndim == 0:
+                result = values[0] if dtype.kind in 'mM' else np.dtype(out.dtype).type(values[0])
+            else:
+                result = pd.Series(values, index=pd.Index(q), name=out.name, dtype=out.dtype)
+        else:
+            columns = out.index_value.to_pandas() if out.ndim == 1 else out.dtypes.index
+            data = OrderedDict()
+            for col in columns:
+                digest, dtype = merged[col]
+                data[col] = cls._from_sketch_values(np.atleast_1d(digest.quantile(q)), dtype)
+            if q.ndim == 0:
+                result = pd.Series([data[col][0] for col in columns], index=columns,
+                                   name=out.name, dtype=out.dtype)
+            else:
+                result = pd.DataFrame(data, index=pd.Index(q), columns=columns)
+                result = result.astype(out.dtypes.to_dict())
+        ctx[out.key] = result
+
+
+def quantile_series(series, q=0.5, interpolation='linear', approx=False,
+                    relative_error=0.01):
     """
     Return value at the given quantile.
 
@@ -272,6 +432,11 @@ def quantile_series(series, q=0.5, interpolation='linear'):
             * higher: `j`.
             * nearest: `i` or `j` whichever is nearest.
             * midpoint: (`i` + `j`) / 2.
+    approx : bool, default False
+        If True, quantiles are estimated by mergeable t-digests in a single
+        pass over all chunks with bounded memory, `interpolation` is ignored.
+    relative_error : float, default 0.01
+        Approximate bound of rank errors of quantiles when `approx` is True.
 
     Returns
     -------
@@ -299,18 +464,21 @@ def quantile_series(series, q=0.5, interpolation='linear'):
     """
 
     if isinstance(q, (Base, Entity)):
+        if approx:
+            raise NotImplementedError('q cannot be a tensor when approx is True')
         q = astensor(q)
         q_input = q
     else:
         q_input = None
 
-    op = DataFrameQuantile(q=q, interpolation=interpolation,
-                           gpu=series.op.gpu)
+    compression = compression_from_error(relative_error) if approx else None
+    op = DataFrameQuantile(q=q, interpolation=interpolation, approx=approx,
+                           compression=compression, gpu=series.op.gpu)
     return op(series, q_input=q_input)
 
 
 def quantile_dataframe(df, q=0.5, axis=0, numeric_only=True,
-                       interpolation='linear'):
+                       interpolation='linear', approx=False, relative_error=0.01):
     """
     Return values at the given quantile over requested axis.
 
@@ -332,6 +500,12 @@ def quantile_dataframe(df, q=0.5, axis=0, numeric_only=True,
         * higher: `j`.
         * nearest: `i` or `j` whichever is nearest.
         * midpoint: (`i` + `j`) / 2.
+    approx : bool, default False
+        If True, quantiles of all columns are estimated by mergeable t-digests
+        in a single pass over all chunks with bounded memory, `interpolation`
+        is ignored. Only axis 0 is supported.
+    relative_error : float, default 0.01
+        Approximate bound of rank errors of quantiles when `approx` is True.
 
     Returns
     -------
@@ -377,13 +551,18 @@ def quantile_dataframe(df, q=0.5, axis=0, numeric_only=True,
     Name: 0.5, dtype: object
     """
     if isinstance(q, (Base, Entity)):
+        if approx:
+            raise NotImplementedError('q cannot be a tensor when approx is True')
         q = astensor(q)
         q_input = q
     else:
         q_input = None
     axis = validate_axis(axis, df)
+    if approx and axis == 1:
+        raise NotImplementedError('axis 1 is not supported when approx is True')
 
+    compression = compression_from_error(relative_error) if approx else None
     op = DataFrameQuantile(q=q, interpolation=interpolation,
-                           axis=axis, numeric_only=numeric_only,
-                           gpu=df.op.gpu)
+                           axis=axis, numeric_only=numeric_only, approx=approx,
+                           compression=compression, gpu=df.op.gpu)
     return op(df, q_input=q_input)
@@ -0,0 +1,124 @@
+# Copyright 1999-2020 Alibaba Group Holding Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+
+
+def compression_from_error(relative_error):
+    """
+    Get compression of t-digests whose rank error
+    of quantiles is approximately bounded by `relative_error`
+    """
+    if not 0 < relative_error < 1:
+        raise ValueError('relative_error should be in the interval (0, 1)')
+    # a centroid around the median spans pi / compression of ranks
+    return int(np.ceil(np.pi / (2 * relative_error)))
+
+
+class TDigest(object):
+    """
+    Mergeable sketch for quantiles. Values are summarized into at most
+    about `compression / 2` weighted centroids, which are smaller around
+    both tails thus extreme quantiles are more accurate. Quantiles are
+    exact when no more than `compression` values are summarized.
+    """
+    __slots__ = '_compression', '_means', '_weights', '_min', '_max'
+
+    def __init__(self, compression=100, means=None, weights=None,
+                 min_value=np.inf, max_value=-np.inf):
+        self._compression = compression
+        self._means = means if means is not None else np.empty(0, dtype=np.float64)
+        self._weights = weights if weights is not None else np.empty(0, dtype=np.float64)
+        self._min = min_value
+        self._max = max_value
+
+    def __getstate__(self):
+        return self._compression, self._means, self._weights, self._min, self._max
+
+    def __setstate__(self, state):
+        self._compression, self._means, self._weights, self._min, self._max = state
+
+    @property
+    def compression(self):
+        return self._compression
+
+    @property
+    def count(self):
+        return self._weights.sum()
+
+    @property
+    def n_centroids(self):
+        return len(self._means)
+
+    @classmethod
+    def from_values(cls, values, compression=100):
+        values = np.asarray(values, dtype=np.float64)
+        values = np.sort(values[~np.isnan(values)])
+        if len(values) == 0:
+            return cls(compression=compression)
+        digest = cls(compression=compression, means=values,
+                     weights=np.ones(len(values)), min_value=values[0],
+                     max_value=values[-1])
+        digest._compress()
+        return digest
+
+    @classmethod
+    def merge(cls, digests):
+        digests = list(digests)
+        compression = max(d.compression for d in digests)
+        means = np.concatenate([d._means for d in digests])
+        weights = np.concatenate([d._weights for d in digests])
+        order = np.argsort(means, kind='mergesort')
+        digest = cls(compression=compression, means=means[order], weights=weights[order],
+                     min_value=min(d._min for d in digests),
+                     max_value=max(d._max for d in digests))
+        digest._compress()
+        return digest
+
+    def _compress(self):
+        if self._weights.sum() <= self._compression:
+            return
+        weights = self._weights
+        total = weights.sum()
+        cum_weights = np.cumsum(weights)
+        # scale function k(q) = compression / (2 * pi) * arcsin(2q - 1),
+        # centroids whose middle lies in the same unit of k are merged
+        q = (cum_weights - weights / 2) / total
+        k = self._compression / (2 * np.pi) * np.arcsin(2 * q - 1)
+        ids = np.floor(k - k[0]).astype(np.int64)
+        ids = np.unique(ids, return_inverse=True)[1]
+        new_weights = np.bincount(ids, weights=weights)
+        self._means = np.bincount(ids, weights=weights * self._means) / new_weights
+        self._weights = new_weights
+
+    def quantile(self, q):
+        """
+        Get quantiles of summarized values, linearly interpolated
+        like `numpy.quantile` when values are not compressed.
+        """
+        q = np.asarray(q, dtype=np.float64)
+        if len(self._means) == 0:
+            return np.full(q.shape, np.nan)
+
+        total = self._weights.sum()
+        # position of each centroid among sorted values
+        positions = np.cumsum(self._weights) - self._weights / 2 - 0.5
+        values = self._means
+        if positions[0] > 0:
+            positions = np.concatenate([[0], positions])
+            values = np.concatenate([[self._min], values])
+        if positions[-1] < total - 1:
+            positions = np.concatenate([positions, [total - 1]])
+            values = np.concatenate([values, [self._max]])
+        return np.interp(q * (total - 1), positions, values)
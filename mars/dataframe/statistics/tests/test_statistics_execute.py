@@ -138,6 +138,58 @@ class Test(TestBase):
 
         pd.testing.assert_series_equal(result, expected)
 
+    def testApproxQuantileExecution(self):
+        rs = np.random.RandomState(0)
+        raw = pd.DataFrame({'a': rs.rand(10000),
+                            'b': rs.randn(10000),
+                            'c': rs.randint(100, size=10000),
+                            'd': pd.date_range('2020-1-1', periods=10000, freq='min')})
+        df = DataFrame(raw, chunk_size=(1000, 2))
+        numeric_raw = raw[['a', 'b', 'c']]
+
+        def assert_rank_error(result, expected_raw, qs, relative_error):
+            for q in qs:
+                ranks = (expected_raw <= result.loc[q]).mean()
+                np.testing.assert_array_less(np.abs(ranks - q), relative_error)
+
+        # all columns and quantiles are computed by t-digests
+        r = df.quantile([0.01, 0.3, 0.5, 0.99], approx=True)
+        result = self.executor.execute_dataframe(r, concat=True)[0]
+        self.assertEqual(result.shape, (4, 3))
+        pd.testing.assert_index_equal(result.columns, numeric_raw.columns)
+        assert_rank_error(result, numeric_raw, [0.01, 0.3, 0.5, 0.99], 0.01)
+
+        r = df.quantile(0.3, approx=True, relative_error=0.005)
+        result = self.executor.execute_dataframe(r, concat=True)[0]
+        self.assertEqual(result.name, 0.3)
+        assert_rank_error(pd.DataFrame([result], index=[0.3]), numeric_raw, [0.3], 0.005)
+
+        r = df.quantile([0.1, 0.9], numeric_only=False, approx=True)
+        result = self.executor.execute_dataframe(r, concat=True)[0]
+        self.assertEqual(result['d'].dtype, raw['d'].dtype)
+        assert_rank_error(result, raw, [0.1, 0.9], 0.01)
+
+        series = Series(raw['b'], chunk_size=700)
+        r = series.quantile(0.5, approx=True)
+        result = self.executor.execute_dataframe(r, concat=True)[0]
+        self.assertLess(abs((raw['b'] <= result).mean() - 0.5), 0.01)
+
+        r = series.quantile([0.2, 0.8], approx=True)
+        result = self.executor.execute_dataframe(r, concat=True)[0]
+        self.assertEqual(result.name, 'b')
+        assert_rank_error(result, raw['b'], [0.2, 0.8], 0.01)
+
+        # results are exact for small data
+        raw2 = pd.Series([3., 1., 2., 5., np.nan, 7.])
+        r = Series(raw2, chunk_size=2).quantile([0.1, 0.5, 0.77], approx=True)
+        pd.testing.assert_series_equal(self.executor.execute_dataframe(r, concat=True)[0],
+                                       raw2.quantile([0.1, 0.5, 0.77]))
+
+        with self.assertRaises(NotImplementedError):
+            df.quantile(0.5, axis=1, approx=True)
+        with self.assertRaises(NotImplementedError):
+            series.quantile(tensor([0.1, 0.5]), approx=True)
+
     def testDataFrameCorr(self):
         rs = np.random.RandomState(0)
         raw = rs.rand(20, 10)
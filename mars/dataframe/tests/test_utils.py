@@ -24,7 +24,8 @@ from mars.dataframe.initializer import DataFrame
 from mars.dataframe.core import IndexValue
 from mars.dataframe.utils import decide_dataframe_chunk_sizes, decide_series_chunk_size, \
     split_monotonic_index_min_max, build_split_idx_to_origin_idx, parse_index, filter_index_value, \
-    infer_dtypes, infer_index_value, validate_axis, fetch_corner_data
+    infer_dtypes, infer_index_value, validate_axis, fetch_corner_data, hash_dataframe_on, \
+    split_by_partition_ids
 from mars.session import new_session
 
 
@@ -381,6 +382,35 @@ class Test(unittest.TestCase):
         df2 = df[df[0] < 0.5]  # create unknown shape
         self.assertEqual(validate_axis(0, df2), 0)
 
+    def testSplitByPartitionIds(self):
+        rs = np.random.RandomState(0)
+        # index with duplicate labels
+        raw = pd.DataFrame({'a': rs.randint(0, 20, (100,)), 'b': rs.rand(100)},
+                           index=rs.randint(0, 10, (100,)))
+
+        partition_ids = hash_dataframe_on(raw, 'a', 7)
+        self.assertEqual(partition_ids.shape, (100,))
+        self.assertTrue(((partition_ids >= 0) & (partition_ids < 7)).all())
+
+        partitions = split_by_partition_ids(raw, partition_ids, 7)
+        self.assertEqual(len(partitions), 7)
+        self.assertEqual(sum(len(p) for p in partitions), len(raw))
+        for i, p in enumerate(partitions):
+            pd.testing.assert_frame_equal(p, raw[partition_ids == i])
+            # rows of the same key are in the same partition
+            for j, other in enumerate(partitions):
+                if i != j:
+                    self.assertFalse(set(p['a']) & set(other['a']))
+
+        partitions = split_by_partition_ids(raw['b'], [2, 0, 0] + [1] * 97, 4)
+        self.assertEqual([len(p) for p in partitions], [2, 97, 1, 0])
+        pd.testing.assert_series_equal(partitions[0], raw['b'].iloc[1:3])
+
+        # rows can be put into multiple partitions given positions
+        partitions = split_by_partition_ids(raw, [1, 0, 1], 2, positions=[3, 3, 5])
+        pd.testing.assert_frame_equal(partitions[0], raw.iloc[[3]])
+        pd.testing.assert_frame_equal(partitions[1], raw.iloc[[3, 5]])
+
     def testDataFrameDir(self):
         df = DataFrame(pd.DataFrame(np.random.rand(4, 3), columns=list('ABC')))
         dir_result = set(dir(df))
@@ -43,6 +43,9 @@ def hash_index(index, size):
 
 
 def hash_dataframe_on(df, on, size, level=None):
+    """
+    Get partition id of every row in the DataFrame by hashing on shuffle keys
+    """
     if on is None:
         idx = df.index
         if level is not None:
@@ -63,8 +66,68 @@ def hash_dataframe_on(df, on, size, level=None):
         else:
             data = df[on]
         hashed_label = pd.util.hash_pandas_object(data, index=False, categorize=False)
-    idx_to_grouped = df.index.groupby(hashed_label % size)
-    return [idx_to_grouped.get(i, pd.Index([])).unique() for i in range(size)]
+    return (np.asarray(hashed_label) % np.uint64(size)).astype(np.int64)
+
+
+def split_by_bounds(obj, bounds):
+    """
+    Split rows of a DataFrame or Series into consecutive slices
+    :param obj: DataFrame or Series
+    :param bounds: positions of splits, including the start and the end
+    """
+    return [obj.iloc[bounds[i]: bounds[i + 1]] for i in range(len(bounds) - 1)]
+
+
+def split_by_partition_ids(obj, partition_ids, size, positions=None):
+    """
+    Split rows of a DataFrame or Series into partitions given partition ids.
+    Rows are gathered only once in order of partitions, thus the cost does
+    not grow with number of partitions, and orders of rows are kept inside
+    every partition.
+    :param obj: DataFrame or Series
+    :param partition_ids: partition id of every row
+    :param size: number of partitions
+    :param positions: positions of rows the partition ids refer to, rows can
+                      be repeated to put them into multiple partitions
+    :return: list of partitions
+    """
+    partition_ids = np.asarray(partition_ids)
+    # stable sort on integers no more than 16 bits is done by radix sort
+    order = np.argsort(partition_ids.astype(np.min_scalar_type(max(size - 1, 0)), copy=False),
+                       kind='stable')
+    if positions is not None:
+        order = np.asarray(positions)[order]
+    bounds = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(partition_ids, minlength=size), out=bounds[1:])
+    return split_by_bounds(obj.take(order), bounds)
+
+
+_predicate_funcs = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    'in': lambda s, v: s.isin(v),
+}
+
+
+def filter_by_predicates(df, predicates):
+    """
+    Select rows of a DataFrame satisfying all the predicates.
+    :param df: DataFrame
+    :param predicates: list of (column, op, value), op can be one of
+                       '==', '!=', '<', '<=', '>', '>=' and 'in'
+    :return: filtered DataFrame
+    """
+    if not predicates:
+        return df
+    mask = None
+    for col, op, value in predicates:
+        col_mask = _predicate_funcs[op](df[col], value)
+        mask = col_mask if mask is None else mask & col_mask
+    return df[mask]
 
 
 def hash_dtypes(dtypes, size):
@@ -519,6 +519,33 @@ class Test(unittest.TestCase):
                 r4 = session.run(a4, timeout=_exec_timeout)
                 np.testing.assert_array_equal(r4, r1)
 
+    def testIterFetch(self, *_):
+        with new_cluster(scheduler_n_process=2, worker_n_process=2,
+                         shared_memory='20M', web=True) as cluster:
+            raw = np.random.rand(10, 20)
+            raw_df = pd.DataFrame(np.random.rand(10, 4), columns=list('abcd'))
+
+            for session in (cluster.session, new_session('http://' + cluster._web_endpoint)):
+                with session:
+                    a = mt.tensor(raw, chunk_size=8) + 1
+                    with self.assertRaises(ValueError):
+                        session.iter_fetch(a)
+                    session.run(a, timeout=_exec_timeout)
+
+                    batches = list(session.iter_fetch(a))
+                    self.assertEqual([b.shape for b in batches], [(8, 20), (2, 20)])
+                    np.testing.assert_array_equal(np.concatenate(batches), raw + 1)
+
+                    batches = list(session.iter_fetch(a, batch_size=2, prefetch=0))
+                    self.assertEqual(len(batches), 1)
+                    np.testing.assert_array_equal(batches[0], raw + 1)
+
+                    df = md.DataFrame(raw_df, chunk_size=3) * 2
+                    session.run(df, timeout=_exec_timeout)
+                    batches = list(session.iter_fetch(df, batch_size=2))
+                    self.assertEqual(len(batches), 2)
+                    pd.testing.assert_frame_equal(pd.concat(batches), raw_df * 2)
+
     def testFetchDataFrame(self, *_):
         from mars.dataframe.datasource.dataframe import from_pandas as from_pandas_df
         from mars.dataframe.arithmetic import add
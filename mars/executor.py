@@ -30,12 +30,15 @@ import numpy as np
 from .operands import Fetch, ShuffleProxy
 from .graph import DAG
 from .config import options
-from .tiles import IterativeChunkGraphBuilder, ChunkGraphBuilder, get_tiled
+from .tiles import IterativeChunkGraphBuilder, ChunkGraphBuilder, TilesError, get_tiled
 from .optimizes.runtime.core import RuntimeOptimizer
 from .optimizes.tileable_graph import tileable_optimized, OptimizeIntegratedTileableGraphBuilder
 from .graph_builder import TileableGraphBuilder
 from .context import LocalContext
-from .utils import enter_mode, build_fetch, calc_nsplits, has_unknown_shape, prune_chunk_graph
+from .resultcache import get_result_cache
+from .spill import SpillableStorage
+from .utils import enter_mode, build_fetch, build_fetch_with_new_keys, calc_nsplits, \
+    has_unknown_shape, prune_chunk_graph
 
 try:
     from numpy.core._exceptions import UFuncTypeError
@@ -577,6 +580,18 @@ class GraphExecution:
             return [self._chunk_results[key] for key in self._keys]
 
 
+class CompiledChunkGraph(object):
+    """
+    Chunk graph tiled from tileables once, whose inputs are fed
+    with new data before every execution.
+    """
+    def __init__(self, chunk_graph, tileables, result_keys):
+        self.chunk_graph = chunk_graph
+        self.tileables = tileables
+        self.result_keys = result_keys
+        self.n_runs = 0
+
+
 class Executor(object):
     _op_runners = {}
     _op_size_estimators = {}
@@ -603,6 +618,8 @@ class Executor(object):
         # dict value is a fetch tileable to record metas.
         self.stored_tileables = dict()
         self._tileable_names = dict()
+        # chunk key -> key in the result cache
+        self._result_cache_keys = dict()
         # executed key to ref counts
         self.key_to_ref_counts = defaultdict(lambda: 0)
         # synchronous provider
@@ -732,10 +749,10 @@ class Executor(object):
             if hasattr(c, 'shape') and c.shape is not None and \
                     any(np.isnan(s) for s in c.shape) and c.key in chunk_result:
                 try:
-                    c._shape = chunk_result[c.key].shape
+                    c._shape = cls._get_chunk_shape(c.key, chunk_result)
                 except AttributeError:
                     # Fuse chunk
-                    c._composed[-1]._shape = chunk_result[c.key].shape
+                    c._composed[-1]._shape = cls._get_chunk_shape(c.key, chunk_result)
 
     def _update_tileable_and_chunk_shape(self, tileable_graph, chunk_result, failed_ops):
         for n in tileable_graph:
@@ -770,6 +787,7 @@ class Executor(object):
         tileable_keys_set = set(tileable_keys)
 
         result_keys = []
+        result_chunks = []
         to_release_keys = set()
         tileable_data_to_concat_keys = weakref.WeakKeyDictionary()
         tileable_data_to_chunks = weakref.WeakKeyDictionary()
@@ -777,6 +795,11 @@ class Executor(object):
         node_to_fetch = weakref.WeakKeyDictionary()
         skipped_tileables = set()
 
+        result_cache = get_result_cache() if not mock else None
+        cache_key_memo = dict()
+        fingerprint_memo = dict()
+        cache_missed_keys = set()
+
         def _generate_fetch_tileable(node):
             # Attach chunks to fetch tileables to skip tile.
             if isinstance(node.op, Fetch) and node.key in self.stored_tileables:
@@ -808,7 +831,7 @@ class Executor(object):
             # node processor that if the node is executed
             # replace it with a fetch node
             _to_fetch = node_to_fetch  # noqa: F821
-            if nd.key not in chunk_result:
+            if nd.key not in chunk_result and not _load_from_cache(nd):
                 return nd
             if nd in _to_fetch:
                 return _to_fetch[nd]
@@ -816,11 +839,30 @@ class Executor(object):
             _to_fetch[nd] = fn
             return fn
 
+        def _get_cache_key(nd):
+            return result_cache.get_cache_key(
+                nd, fetch_cache_keys=self._result_cache_keys, memo=cache_key_memo,
+                fingerprint_memo=fingerprint_memo)
+
+        def _load_from_cache(nd):
+            # load result of the node computed by previous sessions
+            if result_cache is None or isinstance(nd.op, Fetch) \
+                    or nd.key in cache_missed_keys:
+                return False
+            cache_key = _get_cache_key(nd)
+            data = result_cache.get(cache_key) if cache_key is not None else None
+            if data is None:
+                cache_missed_keys.add(nd.key)
+                return False
+            chunk_result[nd.key] = data
+            return True
+
         def _on_tile_success(before_tile_data, after_tile_data):
             if before_tile_data.key not in tileable_keys_set:
                 return after_tile_data
             tile_chunk_keys = [c.key for c in after_tile_data.chunks]
             result_keys.extend(tile_chunk_keys)
+            result_chunks.extend(after_tile_data.chunks)
             tileable_data_to_chunks[before_tile_data] = [build_fetch(c) for c in after_tile_data.chunks]
             if not fetch:
                 pass
@@ -909,20 +951,16 @@ class Executor(object):
                                                       if inp in to_run_tileables_set])
                     tileable_graph = tileable_graph_builder.build(to_run_tileables_set)
 
+            if result_cache is not None:
+                self._store_result_cache(result_cache, result_chunks, chunk_result,
+                                         _get_cache_key)
+
             if name is not None:
                 if not isinstance(name, (list, tuple)):
                     name = [name]
                 self._tileable_names.update(zip(name, tileables))
 
-            for tileable in tileables:
-                fetch_tileable = build_fetch(get_tiled(tileable, mapping=tileable_optimized))
-                fetch_tileable._key = tileable.key
-                fetch_tileable._id = tileable.id
-                if tileable.key in self.stored_tileables:
-                    if tileable.id not in [t.id for t in self.stored_tileables[tileable.key]]:
-                        self.stored_tileables[tileable.key].append(fetch_tileable)
-                else:
-                    self.stored_tileables[tileable.key] = [fetch_tileable]
+            self._store_tileables(tileables)
 
             try:
                 if fetch:
@@ -934,12 +972,153 @@ class Executor(object):
             finally:
                 for to_release_key in to_release_keys:
                     del chunk_result[to_release_key]
+                # spilled data are kept on disk when moved into the storage
+                get_data = chunk_result.peek if isinstance(chunk_result, SpillableStorage) \
+                    else chunk_result.__getitem__
                 self._chunk_result.update(
-                    {k: chunk_result[k] for k in result_keys if k in chunk_result})
+                    {k: get_data(k) for k in result_keys if k in chunk_result})
 
     execute_tensors = execute_tileables
     execute_dataframes = execute_tileables
 
+    def _store_tileables(self, tileables):
+        for tileable in tileables:
+            fetch_tileable = build_fetch(get_tiled(tileable, mapping=tileable_optimized))
+            fetch_tileable._key = tileable.key
+            fetch_tileable._id = tileable.id
+            if tileable.key in self.stored_tileables:
+                if tileable.id not in [t.id for t in self.stored_tileables[tileable.key]]:
+                    self.stored_tileables[tileable.key].append(fetch_tileable)
+            else:
+                self.stored_tileables[tileable.key] = [fetch_tileable]
+
+    @enter_mode(build=True, kernel=True)
+    def compile_tileables(self, tileables, inputs, n_parallel=None, n_thread=None,
+                          print_progress=False, compose=True):
+        """
+        Tile tileables depending on inputs into a chunk graph only once, thus
+        the graph can be executed repeatedly by `execute_compiled` with new data
+        of inputs. Tileables not depending on inputs are executed at once and
+        kept as fetch chunks in the graph.
+
+        :param tileables: tileables to compile
+        :param inputs: fetch tileables with chunks whose data are fed in every run
+        :return: compiled graph or None if tileables cannot be tiled at once,
+                 and tileables executed at once
+        """
+        tileables = [t.data if hasattr(t, 'data') else t for t in tileables]
+        inputs = [t.data if hasattr(t, 'data') else t for t in inputs]
+        tileable_keys = set(t.key for t in tileables)
+        input_keys = set(t.key for t in inputs)
+
+        def _skip_executed_tileables(inps):
+            return [inp for inp in inps if inp.key in input_keys
+                    or inp.key not in self.stored_tileables
+                    or get_tiled(inp, raise_err_if_not_tiled=False) is None]
+
+        # tileables not depending on inputs are only executed once
+        tileable_graph = TileableGraphBuilder(
+            inputs_selector=_skip_executed_tileables).build(tileables)
+        dependents = set()
+        for node in tileable_graph.topological_iter():
+            if node.key in input_keys or any(
+                    pred in dependents for pred in tileable_graph.iter_predecessors(node)):
+                dependents.add(node)
+        constants = [node for node in tileable_graph if node not in dependents
+                     and node.key not in self.stored_tileables
+                     and (node.key in tileable_keys or any(
+                         succ in dependents for succ in tileable_graph.iter_successors(node)))]
+        if constants:
+            self.execute_tileables(constants, fetch=False, n_parallel=n_parallel,
+                                   n_thread=n_thread, print_progress=print_progress)
+
+        result_keys = []
+        node_to_fetch = dict()
+
+        def _generate_fetch_if_executed(nd):
+            if nd.key not in self._chunk_result:
+                return nd
+            if nd not in node_to_fetch:
+                node_to_fetch[nd] = build_fetch(nd).data
+            return node_to_fetch[nd]
+
+        def _on_tile_success(before_tile_data, after_tile_data):
+            if before_tile_data.key in tileable_keys:
+                result_keys.extend(c.key for c in after_tile_data.chunks)
+            return after_tile_data
+
+        if options.optimize_tileable_graph:
+            builder_cls = OptimizeIntegratedTileableGraphBuilder
+        else:
+            builder_cls = TileableGraphBuilder
+        tileable_graph = builder_cls(
+            inputs_selector=_skip_executed_tileables).build(tileables)
+        chunk_graph_builder = ChunkGraphBuilder(
+            graph_cls=DAG, node_processor=_generate_fetch_if_executed,
+            compose=False, on_tile_success=_on_tile_success)
+        try:
+            chunk_graph = chunk_graph_builder.build(tileables, tileable_graph=tileable_graph)
+        except TilesError:
+            # shapes are unknown until some of the tileables executed
+            return None, constants
+
+        result_keys = list(OrderedDict.fromkeys(result_keys))
+        prune_chunk_graph(chunk_graph, result_keys)
+        if compose:
+            RuntimeOptimizer(chunk_graph, self._engine).optimize(keys=result_keys)
+        return CompiledChunkGraph(chunk_graph, tileables, result_keys), constants
+
+    def execute_compiled(self, compiled, feeds, n_parallel=None, n_thread=None,
+                         print_progress=False):
+        """
+        Execute a graph compiled by `compile_tileables`.
+
+        :param compiled: compiled graph
+        :param feeds: dict of chunk keys of inputs to chunk data
+        :return: fetch tileables of results, whose keys are different in every run
+        """
+        # shallow copy chunk_result, prevent from any chunk key decref
+        chunk_result = self._chunk_result.copy()
+        chunk_result.update(feeds)
+        with self._gen_local_context(chunk_result):
+            self.execute_graph(compiled.chunk_graph, compiled.result_keys,
+                               n_parallel=n_parallel or n_thread, compose=False,
+                               print_progress=print_progress, retval=False,
+                               chunk_result=chunk_result)
+
+        # spilled data are kept on disk when moved into the storage
+        get_data = chunk_result.peek if isinstance(chunk_result, SpillableStorage) \
+            else chunk_result.__getitem__
+        compiled.n_runs += 1
+        results = []
+        for tileable in compiled.tileables:
+            tiled = get_tiled(tileable, mapping=tileable_optimized)
+            chunk_shapes = None
+            if has_unknown_shape(tiled):
+                chunk_shapes = OrderedDict(
+                    (c.index, self._get_chunk_shape(c.key, chunk_result)) for c in tiled.chunks)
+            result = build_fetch_with_new_keys(tiled, compiled.n_runs, chunk_shapes=chunk_shapes)
+            self._chunk_result.update({rc.key: get_data(c.key)
+                                       for rc, c in zip(result.chunks, tiled.chunks)})
+            self.stored_tileables.setdefault(result.key, []).append(build_fetch(result).data)
+            results.append(result)
+        return results
+
+    def _store_result_cache(self, result_cache, chunks, chunk_result, get_cache_key):
+        stored = False
+        for chunk in chunks:
+            if chunk.key not in chunk_result:
+                continue
+            cache_key = self._result_cache_keys[chunk.key] = get_cache_key(chunk)
+            # skip results not cacheable, loaded from the cache or executed before
+            if cache_key is None or isinstance(chunk.op, Fetch) \
+                    or chunk.key in self._chunk_result or cache_key in result_cache:
+                continue
+            result_cache.put(cache_key, chunk_result[chunk.key])
+            stored = True
+        if stored:
+            result_cache.evict()
+
     @classmethod
     def _check_slice_on_tileable(cls, tileable):
         from .tensor.indexing import TensorIndex
@@ -974,10 +1153,14 @@ class Executor(object):
         for to_release_tileable in to_release_tileables:
             for c in get_tiled(to_release_tileable, mapping=tileable_optimized).chunks:
                 del self._chunk_result[c.key]
+                self._result_cache_keys.pop(c.key, None)
         return result
 
     @classmethod
     def _get_chunk_shape(cls, chunk_key, chunk_result):
+        if isinstance(chunk_result, SpillableStorage):
+            # shapes of spilled data are recorded in placeholders
+            return chunk_result.peek(chunk_key).shape
         return chunk_result[chunk_key].shape
 
     def get_tileable_nsplits(self, tileable, chunk_result=None):
@@ -988,6 +1171,23 @@ class Executor(object):
             chunk_idx_to_shape[chunk.index] = self._get_chunk_shape(chunk.key, chunk_result)
         return calc_nsplits(chunk_idx_to_shape)
 
+    def persist_tileables(self, tileables, pin=True):
+        """
+        Pin or unpin chunks of executed tileables. Pinned chunks
+        are kept in memory when the storage is spillable.
+        """
+        if not isinstance(self._chunk_result, SpillableStorage):
+            return
+        chunk_keys = []
+        for tileable in tileables:
+            if tileable.key in self.stored_tileables:
+                tiled = self.stored_tileables[tileable.key][0]
+                chunk_keys.extend(c.key for c in tiled.chunks)
+        if pin:
+            self._chunk_result.pin_keys(chunk_keys)
+        else:
+            self._chunk_result.unpin_keys(chunk_keys)
+
     def decref(self, *keys):
         rs = set(self._chunk_result)
         for key in keys:
@@ -1005,7 +1205,12 @@ class Executor(object):
                 if len(self.stored_tileables[tileable_key]) != 0:
                     continue
                 for chunk_key in (chunk_keys & rs):
-                    self._chunk_result.pop(chunk_key, None)
+                    # delete rather than pop to avoid loading spilled data
+                    if chunk_key in self._chunk_result:
+                        del self._chunk_result[chunk_key]
+                    self._result_cache_keys.pop(chunk_key, None)
+                if isinstance(self._chunk_result, SpillableStorage):
+                    self._chunk_result.unpin_keys(chunk_keys)
                 del self.stored_tileables[tileable_key]
 
 
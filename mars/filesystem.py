@@ -319,9 +319,16 @@ class LocalFileSystem(ArrowLocalFileSystem):
     if implements is not None:
         delete = implements(FileSystem.delete)(delete)
 
+    def rename(self, path, new_path):
+        os.replace(path, new_path)
+
+    if implements is not None:
+        rename = implements(FileSystem.rename)(rename)
+
     def stat(self, path):
         os_stat = os.stat(path)
-        stat = dict(name=path, size=os_stat.st_size, created=os_stat.st_ctime)
+        stat = dict(name=path, size=os_stat.st_size, created=os_stat.st_ctime,
+                    modified=os_stat.st_mtime)
         if os.path.isfile(path):
             stat['type'] = 'file'
         elif os.path.isdir(path):
@@ -402,6 +409,38 @@ def file_size(path, storage_options=None):
     return fs.stat(path)['size']
 
 
+def get_fingerprint(path, storage_options=None, memo=None):
+    """
+    Get names, sizes and modification times of files under the path,
+    which can be a file, a directory, a glob or a list of them
+
+    :param path: path to get fingerprint
+    :param storage_options: options of the file system
+    :param memo: dict of paths to fingerprints already computed
+    """
+    paths = path if isinstance(path, (list, tuple)) else [path]
+    fingerprint = []
+    for pth in paths:
+        if memo is not None and pth in memo:
+            fingerprint.extend(memo[pth])
+            continue
+        fs = get_fs(pth, storage_options)
+        path_fingerprint = []
+        for p in sorted(glob(pth, storage_options=storage_options)):
+            if fs.isdir(p):
+                files = sorted(pjoin(root, fn) for root, _, fns in fs.walk(p) for fn in fns)
+            else:
+                files = [p]
+            for fn in files:
+                stat = fs.stat(fn)
+                path_fingerprint.append((fn, stat.get('size'),
+                                         stat.get('modified', stat.get('last_modified'))))
+        if memo is not None:
+            memo[pth] = path_fingerprint
+        fingerprint.extend(path_fingerprint)
+    return fingerprint
+
+
 class FSMap(MutableMapping):
     """Wrap a FileSystem instance as a mutable wrapping.
     The keys of the mapping become files under the given root, and the
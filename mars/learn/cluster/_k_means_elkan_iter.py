@@ -623,9 +623,9 @@ class KMeansElkanPostprocess(LearnOperand, LearnOperandMixin):
             return cls._execute_reduce(ctx, op)
 
 
-def elkan_iter(X, sample_weight, centers_old, center_half_distances,
-               distance_next_center, upper_bounds, lower_bounds, labels,
-               center_shift, update_centers=True, session=None, run_kwargs=None):
+def elkan_update(X, sample_weight, centers_old, center_half_distances,
+                 distance_next_center, upper_bounds, lower_bounds, labels,
+                 update_centers=True):
     update_op = KMeansElkanUpdate(x=X, sample_weight=sample_weight,
                                   centers_old=centers_old,
                                   center_half_distances=center_half_distances,
@@ -634,8 +634,28 @@ def elkan_iter(X, sample_weight, centers_old, center_half_distances,
                                   lower_bounds=lower_bounds,
                                   update_centers=update_centers,
                                   n_clusters=centers_old.shape[0])
+    # labels, upper_bounds, lower_bounds, centers_new and weight_in_clusters
+    return update_op()
+
+
+def elkan_postprocess(centers_old, centers_new, center_shift, upper_bounds,
+                      lower_bounds, labels, weight_in_clusters):
+    postprocess = KMeansElkanPostprocess(
+        centers_old=centers_old, centers_new=centers_new,
+        center_shift=center_shift, lower_bounds=lower_bounds,
+        upper_bounds=upper_bounds, labels=labels,
+        weight_in_clusters=weight_in_clusters)
+    # centers_new, center_shift, upper_bounds and lower_bounds
+    return postprocess()
+
+
+def elkan_iter(X, sample_weight, centers_old, center_half_distances,
+               distance_next_center, upper_bounds, lower_bounds, labels,
+               center_shift, update_centers=True, session=None, run_kwargs=None):
     to_run = []
-    ret = update_op()
+    ret = elkan_update(X, sample_weight, centers_old, center_half_distances,
+                       distance_next_center, upper_bounds, lower_bounds,
+                       labels, update_centers=update_centers)
     to_run.extend(ret)
     labels, upper_bounds, lower_bounds, centers_new, weight_in_clusters = ret
 
@@ -644,12 +664,9 @@ def elkan_iter(X, sample_weight, centers_old, center_half_distances,
             _relocate_empty_clusters(X, sample_weight, centers_old, centers_new,
                                      weight_in_clusters, labels, to_run=to_run,
                                      session=session, run_kwargs=run_kwargs)
-        postprocess = KMeansElkanPostprocess(
-            centers_old=centers_old, centers_new=centers_new,
-            center_shift=center_shift, lower_bounds=lower_bounds,
-            upper_bounds=upper_bounds, labels=labels,
-            weight_in_clusters=weight_in_clusters)
-        centers_new, center_shift, upper_bounds, lower_bounds = postprocess()
+        centers_new, center_shift, upper_bounds, lower_bounds = elkan_postprocess(
+            centers_old, centers_new, center_shift, upper_bounds,
+            lower_bounds, labels, weight_in_clusters)
 
     return centers_new, weight_in_clusters, upper_bounds, lower_bounds, \
            labels, center_shift
@@ -326,15 +326,30 @@ class KMeansLloydPostprocess(LearnOperand, LearnOperandMixin):
             ctx[op.outputs[1].key] = out_center_shift
 
 
-def lloyd_iter(X, sample_weight, x_squared_norms, centers_old, labels,
-               center_shift, update_centers=True, session=None, run_kwargs=None):
+def lloyd_update(X, sample_weight, x_squared_norms, centers_old, labels,
+                 update_centers=True):
     update_op = KMeansLloydUpdate(x=X, sample_weight=sample_weight,
                                   x_squared_norms=x_squared_norms,
                                   centers_old=centers_old, labels=labels,
                                   update_centers=update_centers,
                                   n_clusters=centers_old.shape[0])
+    # labels, centers_new and weight_in_clusters
+    return update_op()
+
+
+def lloyd_postprocess(centers_old, centers_new, center_shift, weight_in_clusters):
+    postprocess = KMeansLloydPostprocess(
+        centers_old=centers_old, centers_new=centers_new,
+        center_shift=center_shift, weight_in_clusters=weight_in_clusters)
+    # centers_new and center_shift
+    return postprocess()
+
+
+def lloyd_iter(X, sample_weight, x_squared_norms, centers_old, labels,
+               center_shift, update_centers=True, session=None, run_kwargs=None):
     to_run = []
-    ret = update_op()
+    ret = lloyd_update(X, sample_weight, x_squared_norms, centers_old,
+                       labels, update_centers=update_centers)
     to_run.extend(ret)
     labels, centers_new, weight_in_clusters = ret
 
@@ -343,9 +358,7 @@ def lloyd_iter(X, sample_weight, x_squared_norms, centers_old, labels,
             _relocate_empty_clusters(X, sample_weight, centers_old, centers_new,
                                      weight_in_clusters, labels, to_run=to_run,
                                      session=session, run_kwargs=run_kwargs)
-        postprocess = KMeansLloydPostprocess(
-            centers_old=centers_old, centers_new=centers_new,
-            center_shift=center_shift, weight_in_clusters=weight_in_clusters)
-        centers_new, center_shift = postprocess()
+        centers_new, center_shift = lloyd_postprocess(
+            centers_old, centers_new, center_shift, weight_in_clusters)
 
     return centers_new, weight_in_clusters, labels, center_shift
@@ -19,15 +19,17 @@ from sklearn.base import BaseEstimator, ClusterMixin, TransformerMixin
 from sklearn.exceptions import ConvergenceWarning
 
 from ... import tensor as mt
+from ...session import Session
 from ...tensor.utils import check_random_state
 from ..metrics.pairwise import euclidean_distances
 from ..utils.extmath import row_norms
 from ..utils.validation import _check_sample_weight, check_array, \
     check_X_y, _num_samples, check_is_fitted
-from ._k_means_common import _inertia
-from ._k_means_elkan_iter import init_bounds, elkan_iter
+from ._k_means_common import _inertia, _relocate_empty_clusters
+from ._k_means_elkan_iter import init_bounds, elkan_iter, \
+    elkan_update, elkan_postprocess
 from ._k_means_init import _k_init, _scalable_k_init
-from ._k_means_lloyd_iter import lloyd_iter
+from ._k_means_lloyd_iter import lloyd_iter, lloyd_update, lloyd_postprocess
 
 
 ###############################################################################
@@ -180,6 +182,28 @@ def k_means(X, n_clusters, sample_weight=None, init='k-means||',
         return est.cluster_centers_, est.labels_, est.inertia_
 
 
+def _elkan_step_postprocess(centers, centers_new, center_shift, upper_bounds,
+                            lower_bounds, labels, weight_in_clusters):
+    centers_new, center_shift, upper_bounds, lower_bounds = elkan_postprocess(
+        centers, centers_new, center_shift, upper_bounds,
+        lower_bounds, labels, weight_in_clusters)
+    # compute new pairwise distances between centers and closest other
+    # center of each center for next iterations
+    center_half_distances = euclidean_distances(centers_new) / 2
+    distance_next_center = mt.partition(
+        mt.asarray(center_half_distances), kth=1, axis=0)[1]
+    center_shift_tot = (center_shift ** 2).sum()
+    return [centers_new, center_shift, upper_bounds, lower_bounds,
+            center_half_distances, distance_next_center, center_shift_tot]
+
+
+def _lloyd_step_postprocess(centers, centers_new, center_shift, weight_in_clusters):
+    centers_new, center_shift = lloyd_postprocess(
+        centers, centers_new, center_shift, weight_in_clusters)
+    center_shift_tot = (center_shift ** 2).sum()
+    return [centers_new, center_shift, center_shift_tot]
+
+
 def _kmeans_single_elkan(X, sample_weight, n_clusters, max_iter=300,
                          init='k-means++', verbose=False, x_squared_norms=None,
                          random_state=None, tol=1e-4, oversampling_factor=2,
@@ -212,31 +236,48 @@ def _kmeans_single_elkan(X, sample_weight, n_clusters, max_iter=300,
     labels, upper_bounds, lower_bounds = \
         init_bounds(X, centers, center_half_distances, n_clusters)
 
-    for i in range(max_iter):
-        to_runs = []
-
-        centers_new, weight_in_clusters, upper_bounds, lower_bounds, labels, center_shift = \
-            elkan_iter(X, sample_weight, centers, center_half_distances,
-                       distance_next_center, upper_bounds, lower_bounds,
-                       labels, center_shift, session=session, run_kwargs=run_kwargs)
-        to_runs.extend([centers_new, weight_in_clusters, upper_bounds,
-                        lower_bounds, labels, center_shift])
-
-        # compute new pairwise distances between centers and closest other
-        # center of each center for next iterations
-        center_half_distances = euclidean_distances(centers_new) / 2
-        distance_next_center = mt.partition(
-            mt.asarray(center_half_distances), kth=1, axis=0)[1]
-        to_runs.extend([center_half_distances, distance_next_center])
-
+    def _elkan_step(centers, center_half_distances, distance_next_center,
+                    upper_bounds, lower_bounds, labels, center_shift):
+        labels, upper_bounds, lower_bounds, centers_new, weight_in_clusters = \
+            elkan_update(X, sample_weight, centers, center_half_distances,
+                         distance_next_center, upper_bounds, lower_bounds, labels)
+        # empty clusters are relocated out of the compiled graph
+        n_empty = mt.equal(weight_in_clusters, 0).sum()
+        ret = [labels, upper_bounds, lower_bounds, centers_new, weight_in_clusters, n_empty]
+        ret.extend(_elkan_step_postprocess(
+            centers, centers_new, center_shift, upper_bounds,
+            lower_bounds, labels, weight_in_clusters))
         if verbose:
-            inertia = _inertia(X, sample_weight, centers, labels)
-            to_runs.append(inertia)
+            ret.append(_inertia(X, sample_weight, centers, labels))
+        return ret
 
-        center_shift_tot = (center_shift ** 2).sum()
-        to_runs.append(center_shift_tot)
+    # the graph of an iteration is tiled only once, X and
+    # sample_weight are kept in the session during iterations
+    session = session or Session.default_or_local()
+    run_kwargs = run_kwargs or dict()
+    step = session.compile(_elkan_step, centers, center_half_distances,
+                           distance_next_center, upper_bounds, lower_bounds,
+                           labels, center_shift, **run_kwargs)
 
-        mt.ExecutableTuple(to_runs).execute(session=session, **(run_kwargs or dict()))
+    for i in range(max_iter):
+        labels, upper_bounds_new, lower_bounds_new, centers_new, weight_in_clusters, \
+            n_empty, *postprocessed = \
+            step.run(centers, center_half_distances, distance_next_center,
+                     upper_bounds, lower_bounds, labels, center_shift, **run_kwargs)
+        if verbose:
+            inertia = postprocessed.pop()
+
+        if n_empty.fetch(session=session) > 0:
+            centers_new, weight_in_clusters = \
+                _relocate_empty_clusters(X, sample_weight, centers, centers_new,
+                                         weight_in_clusters, labels,
+                                         session=session, run_kwargs=run_kwargs)
+            postprocessed = _elkan_step_postprocess(
+                centers, centers_new, center_shift, upper_bounds_new,
+                lower_bounds_new, labels, weight_in_clusters)
+            mt.ExecutableTuple(postprocessed).execute(session=session, **run_kwargs)
+        centers_new, center_shift, upper_bounds, lower_bounds, \
+            center_half_distances, distance_next_center, center_shift_tot = postprocessed
 
         if verbose:
             inertia_data = inertia.fetch(session=session)
@@ -293,23 +334,39 @@ def _kmeans_single_lloyd(X, sample_weight, n_clusters, max_iter=300,
     labels = mt.full(X.shape[0], -1, dtype=mt.int32)
     center_shift = mt.zeros(n_clusters, dtype=X.dtype)
 
-    for i in range(max_iter):
-        to_runs = []
-
-        centers_new, weight_in_clusters, labels, center_shift = \
-            lloyd_iter(X, sample_weight, x_squared_norms, centers,
-                       labels, center_shift, update_centers=True,
-                       session=session, run_kwargs=run_kwargs)
-        to_runs.extend([centers_new, weight_in_clusters, labels, center_shift])
-
-        if verbose:
-            inertia = _inertia(X, sample_weight, centers, labels)
-            to_runs.append(inertia)
+    def _lloyd_step(centers, labels, center_shift):
+        labels, centers_new, weight_in_clusters = \
+            lloyd_update(X, sample_weight, x_squared_norms, centers, labels)
+        # empty clusters are relocated out of the compiled graph
+        n_empty = mt.equal(weight_in_clusters, 0).sum()
+        ret = [labels, centers_new, weight_in_clusters, n_empty]
+        ret.extend(_lloyd_step_postprocess(
+            centers, centers_new, center_shift, weight_in_clusters))
+        if verbose:  # pragma: no cover
+            ret.append(_inertia(X, sample_weight, centers, labels))
+        return ret
 
-        center_shift_tot = (center_shift ** 2).sum()
-        to_runs.append(center_shift_tot)
+    # the graph of an iteration is tiled only once, X, sample_weight
+    # and x_squared_norms are kept in the session during iterations
+    session = session or Session.default_or_local()
+    run_kwargs = run_kwargs or dict()
+    step = session.compile(_lloyd_step, centers, labels, center_shift, **run_kwargs)
 
-        mt.ExecutableTuple(to_runs).execute(session=session, **(run_kwargs or dict()))
+    for i in range(max_iter):
+        labels, centers_new, weight_in_clusters, n_empty, *postprocessed = \
+            step.run(centers, labels, center_shift, **run_kwargs)
+        if verbose:  # pragma: no cover
+            inertia = postprocessed.pop()
+
+        if n_empty.fetch(session=session) > 0:
+            centers_new, weight_in_clusters = \
+                _relocate_empty_clusters(X, sample_weight, centers, centers_new,
+                                         weight_in_clusters, labels,
+                                         session=session, run_kwargs=run_kwargs)
+            postprocessed = _lloyd_step_postprocess(
+                centers, centers_new, center_shift, weight_in_clusters)
+            mt.ExecutableTuple(postprocessed).execute(session=session, **run_kwargs)
+        centers_new, center_shift, center_shift_tot = postprocessed
 
         if verbose:  # pragma: no cover
             inertia_data = inertia.fetch(session=session)
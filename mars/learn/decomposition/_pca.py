@@ -31,6 +31,7 @@ from ...tensor.linalg import randomized_svd
 from ...tensor.linalg.randomized_svd import svd_flip
 from ...lib.sparse import issparse
 from ...core import ExecutableTuple
+from ...session import Session
 from ..utils import check_array
 from ._base import _BasePCA
 
@@ -418,7 +419,8 @@ class PCA(_BasePCA):
         if self._fit_svd_solver == 'full':
             ret = self._fit_full(X, n_components, session=session)
         elif self._fit_svd_solver in ['arpack', 'randomized']:
-            ret = self._fit_truncated(X, n_components, self._fit_svd_solver)
+            ret = self._fit_truncated(X, n_components, self._fit_svd_solver,
+                                      session=session, run_kwargs=run_kwargs)
         else:
             raise ValueError(f"Unrecognized svd_solver='{self._fit_svd_solver}'")
 
@@ -492,7 +494,8 @@ class PCA(_BasePCA):
 
         return U, S, V
 
-    def _fit_truncated(self, X, n_components, svd_solver):
+    def _fit_truncated(self, X, n_components, svd_solver,
+                       session=None, run_kwargs=None):
         """Fit the model by computing truncated SVD (by ARPACK or randomized)
         on X
         """
@@ -539,10 +542,14 @@ class PCA(_BasePCA):
 
         elif svd_solver == 'randomized':
             # sign flipping is done inside
+            # power iterations are executed with a graph compiled only once
+            # in local sessions, and built lazily into one graph otherwise
             U, S, V = randomized_svd(X, n_components=n_components,
                                      n_iter=self.iterated_power,
                                      flip_sign=True,
-                                     random_state=random_state)
+                                     random_state=random_state,
+                                     session=session or Session.default_or_local(),
+                                     run_kwargs=run_kwargs)
 
         self.n_samples_, self.n_features_ = n_samples, n_features
         self.components_ = V
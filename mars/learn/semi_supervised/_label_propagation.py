@@ -20,6 +20,7 @@ from sklearn.exceptions import ConvergenceWarning
 
 from ... import tensor as mt
 from ...core import ExecutableTuple
+from ...session import Session
 from ..base import ClassifierMixin
 from ..metrics.pairwise import rbf_kernel
 from ..neighbors.unsupervised import NearestNeighbors
@@ -214,34 +215,41 @@ class BaseLabelPropagation(ClassifierMixin, BaseEstimator, metaclass=ABCMeta):
 
         unlabeled = unlabeled[:, mt.newaxis]
 
-        for self.n_iter_ in range(self.max_iter):
-            cond = mt.abs(self.label_distributions_ - l_previous).sum() < self.tol
-
-            to_run.append(cond)
-            ExecutableTuple(to_run).execute(
-                session=session, **(run_kwargs or dict()))
-            # clear
-            to_run = []
-
-            if cond.fetch(session=session):
-                break
-
-            l_previous = self.label_distributions_
-            self.label_distributions_ = graph_matrix.dot(self.label_distributions_)
+        def _propagate(label_distributions):
+            new_label_distributions = graph_matrix.dot(label_distributions)
 
             if self._variant == 'propagation':
                 normalizer = mt.sum(
-                    self.label_distributions_, axis=1)[:, mt.newaxis]
-                self.label_distributions_ /= normalizer
-                self.label_distributions_ = mt.where(unlabeled,
-                                                     self.label_distributions_,
-                                                     y_static)
+                    new_label_distributions, axis=1)[:, mt.newaxis]
+                new_label_distributions /= normalizer
+                new_label_distributions = mt.where(unlabeled,
+                                                   new_label_distributions,
+                                                   y_static)
             else:  # pragma: no cover
                 # clamp
-                self.label_distributions_ = mt.multiply(
-                    alpha, self.label_distributions_) + y_static
+                new_label_distributions = mt.multiply(
+                    alpha, new_label_distributions) + y_static
+
+            cond = mt.abs(new_label_distributions - label_distributions).sum() < self.tol
+            return new_label_distributions, cond
+
+        cond = mt.abs(self.label_distributions_ - l_previous).sum() < self.tol
+        to_run.extend([self.label_distributions_, cond])
+        ExecutableTuple(to_run).execute(
+            session=session, **(run_kwargs or dict()))
+
+        # the graph of an iteration is tiled only once,
+        # and graph_matrix is kept in the session during iterations
+        session = session or Session.default_or_local()
+        propagate = session.compile(_propagate, self.label_distributions_,
+                                    **(run_kwargs or dict()))
+
+        for self.n_iter_ in range(self.max_iter):
+            if cond.fetch(session=session):
+                break
 
-            to_run.append(self.label_distributions_)
+            self.label_distributions_, cond = propagate.run(
+                self.label_distributions_, **(run_kwargs or dict()))
         else:
             warnings.warn(
                 f'max_iter={self.max_iter} was reached without convergence.',
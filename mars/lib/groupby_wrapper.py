@@ -126,6 +126,9 @@ class GroupByWrapper:
             self.as_index, self.sort, self.group_keys, self.squeeze, self.observed, \
             self.mutated, getattr(self.groupby_obj.grouper, '_cache', dict())
 
+    def __reduce__(self):
+        return type(self).from_tuple, (self.to_tuple(pickle_function=True, truncate=True),)
+
     @classmethod
     def from_tuple(cls, tp):
         obj, keys, axis, level, exclusions, selection, as_index, sort, group_keys, squeeze, \
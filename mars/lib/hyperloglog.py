@@ -0,0 +1,214 @@
+# Copyright 1999-2020 Alibaba Group Holding Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pandas as pd
+
+_min_precision = 4
+_max_precision = 18
+# bits to store rank of a hash in a sparse code
+_rank_bits = 6
+
+
+def precision_from_error(relative_error):
+    """
+    Get precision of HyperLogLog sketches whose standard error
+    of estimated cardinality is approximately `relative_error`
+    """
+    if not 0 < relative_error < 1:
+        raise ValueError('relative_error should be in the interval (0, 1)')
+    precision = int(np.ceil(np.log2((1.04 / relative_error) ** 2)))
+    return min(max(precision, _min_precision), _max_precision)
+
+
+def hash_values(values, dropna=True):
+    """
+    Hash values into 64-bit integers, values of the same dtype
+    are hashed the same in all processes.
+    """
+    if not isinstance(values, pd.Series):
+        values = pd.Series(np.asarray(values).ravel())
+    if dropna:
+        values = values.dropna()
+    return pd.util.hash_pandas_object(values, index=False).values
+
+
+def _bit_length(values):
+    values = values.copy()
+    lengths = np.zeros(len(values), dtype=np.uint64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        shift = np.uint64(shift)
+        mask = values >= (np.uint64(1) << shift)
+        lengths[mask] += shift
+        values[mask] >>= shift
+    lengths += values > 0
+    return lengths
+
+
+def _hashes_to_codes(hashes, precision):
+    # code of a hash is its register index followed by its rank
+    hashes = np.asarray(hashes, dtype=np.uint64)
+    n_rest_bits = 64 - precision
+    indices = hashes >> np.uint64(n_rest_bits)
+    rest = hashes & np.uint64((1 << n_rest_bits) - 1)
+    ranks = np.uint64(n_rest_bits + 1) - _bit_length(rest)
+    return ((indices << np.uint64(_rank_bits)) | ranks).astype(np.uint32)
+
+
+def _keep_max_ranks(keys):
+    """
+    Keep keys with maximal ranks given sorted keys ending with ranks
+    """
+    if len(keys) == 0:
+        return keys
+    prefixes = keys >> type(keys[0])(_rank_bits)
+    keep = np.empty(len(keys), dtype=bool)
+    keep[:-1] = prefixes[1:] != prefixes[:-1]
+    keep[-1] = True
+    return keys[keep]
+
+
+class HyperLogLog(object):
+    """
+    Mergeable sketch for the number of distinct values. Hashes are kept
+    as sparse codes when few values are summarized, and as `2 ** precision`
+    one-byte registers otherwise, thus the size is bounded.
+    """
+    __slots__ = '_precision', '_codes', '_registers'
+
+    def __init__(self, precision=14, codes=None, registers=None):
+        self._precision = precision
+        if codes is None and registers is None:
+            codes = np.empty(0, dtype=np.uint32)
+        self._codes = codes
+        self._registers = registers
+
+    def __getstate__(self):
+        return self._precision, self._codes, self._registers
+
+    def __setstate__(self, state):
+        self._precision, self._codes, self._registers = state
+
+    @property
+    def precision(self):
+        return self._precision
+
+    @property
+    def is_sparse(self):
+        return self._registers is None
+
+    @classmethod
+    def _from_codes(cls, codes, precision):
+        max_n_codes = (1 << precision) // codes.itemsize
+        if len(codes) <= max_n_codes:
+            codes = _keep_max_ranks(np.unique(codes))
+        if len(codes) > max_n_codes:
+            return cls(precision, registers=cls._codes_to_registers(codes, precision))
+        return cls(precision, codes=codes)
+
+    @staticmethod
+    def _codes_to_registers(codes, precision, registers=None):
+        if registers is None:
+            registers = np.zeros(1 << precision, dtype=np.uint8)
+        np.maximum.at(registers, codes >> np.uint32(_rank_bits),
+                      (codes & np.uint32((1 << _rank_bits) - 1)).astype(np.uint8))
+        return registers
+
+    @classmethod
+    def from_hashes(cls, hashes, precision=14):
+        return cls._from_codes(_hashes_to_codes(hashes, precision), precision)
+
+    @classmethod
+    def from_values(cls, values, precision=14, dropna=True):
+        return cls.from_hashes(hash_values(values, dropna=dropna), precision)
+
+    @classmethod
+    def from_grouped_hashes(cls, group_ids, hashes, n_groups, precision=14):
+        """
+        Build a sketch for every group given group ids of hashes.
+
+        :param group_ids: ids of groups in [0, n_groups)
+        :param hashes: hashes of values
+        :param n_groups: number of groups
+        :param precision: precision of sketches
+        :return: list of sketches
+        """
+        codes = _hashes_to_codes(hashes, precision).astype(np.uint64)
+        keys = (np.asarray(group_ids, dtype=np.uint64) << np.uint64(32)) | codes
+        keys = _keep_max_ranks(np.unique(keys))
+        key_group_ids = keys >> np.uint64(32)
+        bounds = np.searchsorted(key_group_ids, np.arange(n_groups + 1, dtype=np.uint64))
+        codes = (keys & np.uint64(0xffffffff)).astype(np.uint32)
+        return [cls._from_codes(codes[bounds[i]: bounds[i + 1]], precision)
+                for i in range(n_groups)]
+
+    @classmethod
+    def merge(cls, sketches):
+        sketches = list(sketches)
+        precision = sketches[0].precision
+        if any(s.precision != precision for s in sketches):
+            raise ValueError('Cannot merge sketches of different precisions')
+
+        dense = [s._registers for s in sketches if not s.is_sparse]
+        codes = [s._codes for s in sketches if s.is_sparse]
+        codes = np.concatenate(codes) if codes else np.empty(0, dtype=np.uint32)
+        if not dense:
+            return cls._from_codes(codes, precision)
+        registers = np.maximum.reduce(dense) if len(dense) > 1 else dense[0].copy()
+        return cls(precision, registers=cls._codes_to_registers(codes, precision, registers))
+
+    def count(self):
+        """
+        Estimate number of distinct values by the improved estimator in
+        "New cardinality estimation algorithms for HyperLogLog sketches"
+        (Ertl, 2017), which is unbiased for both small and large cardinalities.
+        """
+        registers = self._registers
+        if registers is None:
+            registers = self._codes_to_registers(self._codes, self._precision)
+        m = len(registers)
+        q = 64 - self._precision
+        counts = np.bincount(registers, minlength=q + 2)
+
+        z = m * _tau(1 - counts[q + 1] / m)
+        for k in range(q, 0, -1):
+            z = 0.5 * (z + counts[k])
+        z += m * _sigma(counts[0] / m)
+        return int(round(m * m / (2 * np.log(2) * z)))
+
+
+def _sigma(x):
+    if x == 1:
+        return np.inf
+    y, z = 1.0, x
+    while True:
+        x *= x
+        z_old = z
+        z += x * y
+        y += y
+        if z == z_old:
+            return z
+
+
+def _tau(x):
+    if x == 0 or x == 1:
+        return 0.0
+    y, z = 1.0, 1 - x
+    while True:
+        x = np.sqrt(x)
+        z_old = z
+        y *= 0.5
+        z -= (1 - x) ** 2 * y
+        if z == z_old:
+            return z / 3
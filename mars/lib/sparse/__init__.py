@@ -475,6 +475,9 @@ def tensordot(a, b, axes=2, sparse=True):
         if a_axes == (a.ndim - 1,) and b_axes == (b.ndim - 1,):
             # inner product of multiple dims
             return dot(a, b.T, sparse=sparse)
+        if a_axes == (0,) and b_axes == (0,):
+            # inner product of columns
+            return dot(a.T, b, sparse=sparse)
 
     if a.ndim == 1 or b.ndim == 1:
         return dot(a, b, sparse=sparse)
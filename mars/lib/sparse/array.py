@@ -43,6 +43,13 @@ class SparseNDArray:
     def raw(self):
         raise NotImplementedError
 
+    def __reduce__(self):
+        return _reconstruct_sparse_nd_array, (self.raw, self.shape)
+
+
+def _reconstruct_sparse_nd_array(raw, shape):
+    return SparseNDArray(raw, shape=shape)
+
 
 def call_sparse_binary_scalar(method, left, right, **kwargs):
     if isinstance(left, SparseNDArray):
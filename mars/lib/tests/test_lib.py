@@ -19,6 +19,7 @@ import pandas as pd
 import numpy as np
 
 from mars.lib.groupby_wrapper import GroupByWrapper, wrapped_groupby
+from mars.lib.hyperloglog import HyperLogLog, hash_values, precision_from_error
 from mars.tests.core import assert_groupby_equal
 from mars.utils import calc_data_size
 
@@ -105,3 +106,29 @@ class Test(unittest.TestCase):
         assert_groupby_equal(grouped, df.B.groupby(lambda x: x[-1] % 2), with_selection=True)
         self.assertEqual(grouped.shape, (8,))
         self.assertFalse(grouped.is_frame)
+
+    def testHyperLogLog(self):
+        self.assertEqual(precision_from_error(0.01), 14)
+        with self.assertRaises(ValueError):
+            precision_from_error(0)
+
+        rs = np.random.RandomState(0)
+        values = rs.randint(10 ** 12, size=200000)
+        sketches = [HyperLogLog.from_values(v) for v in np.array_split(values, 7)]
+        merged = HyperLogLog.merge(sketches)
+        self.assertFalse(merged.is_sparse)
+        self.assertLess(abs(merged.count() / len(np.unique(values)) - 1), 0.03)
+
+        # small sketches are kept sparse and nearly exact
+        sketch = HyperLogLog.from_values(pd.Series(['a', 'b', None, 'a']))
+        self.assertTrue(sketch.is_sparse)
+        self.assertEqual(sketch.count(), 2)
+        self.assertEqual(HyperLogLog.from_values(['a', 'b', None, 'a'], dropna=False).count(), 3)
+        self.assertEqual(HyperLogLog().count(), 0)
+
+        sketches = HyperLogLog.from_grouped_hashes(
+            [0, 1, 1, 2, 2, 2], hash_values([1, 1, 2, 1, 2, 3]), 4)
+        self.assertEqual([s.count() for s in sketches], [1, 2, 3, 0])
+
+        with self.assertRaises(ValueError):
+            HyperLogLog.merge([HyperLogLog(precision=10), HyperLogLog(precision=12)])
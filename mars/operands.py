@@ -73,6 +73,8 @@ class Operand(AttributeAsDictKey, metaclass=OperandMetaclass):
     attr_tag = 'attr'
     _init_update_key_ = False
     _output_type_ = None
+    # if the operand reads data outside Mars, like files or databases
+    _external_source_ = False
 
     _op_id = IdentityField('type')
 
@@ -165,6 +167,17 @@ class Operand(AttributeAsDictKey, metaclass=OperandMetaclass):
     def get_dependent_data_keys(self):
         return [dep.key for dep in self.inputs or ()]
 
+    def get_fingerprint(self, memo=None):
+        """
+        Fingerprint of external data read by the operand, which changes
+        once the data changes. None if no external data is read or the
+        fingerprint is unknown, and results depending on external sources
+        without fingerprints are not cached.
+
+        :param memo: dict of fingerprints of paths already computed
+        """
+        return None
+
     @property
     def gpu(self):
         return getattr(self, '_gpu', False)
@@ -79,7 +79,7 @@ class DataSourceGetitemRule(DataFrameRuntimeOptimizeRule):
             input_successors = graph.successors(inputs[0])
             if len(input_successors) == 1 and isinstance(op, DataFrameIndex) and \
                 op.col_names is not None and isinstance(inputs[0].op, (DataFrameReadCSV, DataFrameReadSQL)) and \
-                    inputs[0].key not in keys:
+                    not inputs[0].op.filters and inputs[0].key not in keys:
                 return True
             return False
 
@@ -135,7 +135,7 @@ class DataSourceHeadRule(DataFrameRuntimeOptimizeRule):
         inputs = graph.predecessors(chunk)
         if len(inputs) == 1 and isinstance(op, (DataFrameIlocGetItem, SeriesIlocGetItem)) and \
                 op.can_be_optimized() and isinstance(inputs[0].op, (DataFrameReadCSV, DataFrameReadSQL)) and \
-                inputs[0].key not in keys:
+                not inputs[0].op.filters and inputs[0].key not in keys:
             return True
         return False
 
@@ -14,5 +14,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from .column_pruning import GroupbyPruneReadCSV
+from .column_pruning import ColumnPruning, register_column_pruning
+from .predicate_pushdown import PredicatePushdown
 from .core import OptimizeIntegratedTileableGraphBuilder, tileable_optimized
@@ -14,55 +14,313 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+
+import pandas as pd
+
+from ...core import Base, Entity
 from ...utils import copy_tileables
-from ...dataframe.utils import parse_index
-from ...dataframe.groupby.aggregation import DataFrameGroupByAgg
+from ...dataframe.arithmetic.core import DataFrameBinOp, DataFrameUnaryOp
+from ...dataframe.base.astype import DataFrameAstype
+from ...dataframe.core import DATAFRAME_TYPE
 from ...dataframe.datasource.read_csv import DataFrameReadCSV
-from .core import TileableOptimizeRule, register
+from ...dataframe.datasource.read_parquet import DataFrameReadParquet
+from ...dataframe.datasource.read_sql import DataFrameReadSQL
+from ...dataframe.groupby.aggregation import DataFrameGroupByAgg
+from ...dataframe.indexing.getitem import DataFrameIndex
+from ...dataframe.indexing.iloc import DataFrameIlocGetItem
+from ...dataframe.merge.merge import DataFrameShuffleMerge
+from ...dataframe.sort.sort_values import DataFrameSortValues
+from ...dataframe.utils import build_df, parse_index
+from .core import TileableGraphOptimizeRule, register_graph_rule
+
+# operand type -> function returning columns required from the input
+# at the given position, given columns required from the output.
+# None means all columns are required.
+_input_columns_getters = dict()
+# operand type -> function checking if output columns are the same as the first input
+_column_preserving_checkers = dict()
+# operand type -> function returning dtypes of the output given pruned inputs
+_output_dtypes_getters = dict()
+
+
+def _get_registered(registry, op):
+    for op_type in type(op).__mro__:
+        if op_type in registry:
+            return registry[op_type]
+
+
+def _is_label(obj):
+    return not isinstance(obj, (Base, Entity)) and pd.api.types.is_hashable(obj)
+
+
+def _to_list(obj):
+    if obj is None:
+        return []
+    return list(obj) if isinstance(obj, (list, tuple)) else [obj]
+
+
+def _get_preserving_input_columns(node, input_idx, columns):
+    return columns if input_idx == 0 else None
+
+
+def _get_index_input_columns(node, input_idx, columns):
+    op = node.op
+    if op.col_names is None:
+        # filtered by a mask
+        return columns if input_idx == 0 else None
+    col_names = _to_list(op.col_names)
+    if not all(_is_label(c) for c in col_names):
+        return None
+    return set(col_names)
+
+
+def _get_bin_op_input_columns(node, input_idx, columns):
+    # only operations with scalars keep columns of the input
+    if len(node.inputs) != 1:
+        return None
+    return columns
+
+
+def _get_iloc_input_columns(node, input_idx, columns):
+    indexes = node.op.indexes
+    if len(indexes) != 2 or indexes[1] != slice(None) or \
+            isinstance(indexes[0], (Base, Entity)):
+        return None
+    return columns
+
+
+def _get_astype_input_columns(node, input_idx, columns):
+    if columns is None:
+        return None
+    dtype_values = node.op.dtype_values
+    if isinstance(dtype_values, dict):
+        return columns | set(dtype_values)
+    return columns
+
+
+def _get_sort_values_input_columns(node, input_idx, columns):
+    op = node.op
+    if columns is None or op.axis != 0 or not all(_is_label(c) for c in op.by):
+        return None
+    return columns | set(op.by)
+
+
+def _get_groupby_agg_input_columns(node, input_idx, columns):
+    op = node.op
+    params = op.groupby_params
+    by = _to_list(params.get('by'))
+    if input_idx != 0 or not isinstance(op.func, dict) or params.get('level') is not None \
+            or not by or not all(_is_label(b) for b in by):
+        return None
+    in_columns = node.inputs[0].dtypes.index
+    required = set(by) | set(op.func)
+    if any(c not in in_columns for c in required):
+        return None
+    return required
+
 
+def _get_merge_input_columns(node, input_idx, columns):
+    op = node.op
+    if columns is None:
+        return None
+    keys = [_to_list(op.on or op.left_on), _to_list(op.on or op.right_on)]
+    if not all(_is_label(k) for k in keys[0] + keys[1]):
+        return None
 
-class GroupbyPruneReadCSV(TileableOptimizeRule):
+    in_columns = [set(inp.dtypes.index) for inp in node.inputs]
+    overlap = (in_columns[0] & in_columns[1]) - set(_to_list(op.on))
+    suffixes = op.suffixes or ('_x', '_y')
+
+    required = set(keys[input_idx])
+    for c in in_columns[input_idx]:
+        if c in overlap:
+            # keep overlapping columns on both sides to keep their suffixes
+            if f'{c}{suffixes[0] or ""}' in columns or f'{c}{suffixes[1] or ""}' in columns:
+                required.add(c)
+        elif c in columns:
+            required.add(c)
+    return required
+
+
+def _get_merge_output_dtypes(node, inputs):
+    op = node.op
+    empty_left, empty_right = build_df(inputs[0]), build_df(inputs[1])
+    merged = empty_left.merge(empty_right, how=op.how, on=op.on,
+                              left_on=op.left_on, right_on=op.right_on,
+                              left_index=op.left_index, right_index=op.right_index,
+                              sort=op.sort, suffixes=op.suffixes,
+                              copy=op.copy_, indicator=op.indicator, validate=op.validate)
+    return node.dtypes[[c for c in node.dtypes.index if c in merged.columns]]
+
+
+def register_column_pruning(op_type, input_columns_getter,
+                            preserve_columns=False, output_dtypes_getter=None):
     """
-    An experimental implementation for tileable optimization rule.
-    This rule works only when groupby aggregation operation follows the read CSV files,
-    we can prune the columns that not used by the following operations when read the files.
+    Register how an operand type requires columns from its inputs, thus
+    columns can be pruned across operands of the type.
+
+    :param op_type: operand type
+    :param input_columns_getter: function accepting the tileable, index of the input
+        and set of columns required from the output, returning set of columns
+        required from the input or None if all columns are required
+    :param preserve_columns: if output columns are the same as the first input, can be
+        a function accepting the tileable
+    :param output_dtypes_getter: function accepting the tileable and pruned inputs,
+        returning dtypes of the output
     """
-    def match(self, node):
-        if isinstance(node.inputs[0].op, DataFrameReadCSV) and \
-                node.inputs[0] not in self._optimizer_context.result_tileables:
-            by_data = node.op.groupby_params.get('by')
-            by_columns = by_data if isinstance(by_data, (list, tuple)) else [by_data]
-            if isinstance(node.op.func, (str, list)):
-                # Passing func name(s) means perform on all columns.
-                return False
-            elif len(set(by_columns + list(node.op.func))) == len(node.inputs[0].op.usecols or node.inputs[0].dtypes):
-                # If performs on all columns, no need to prune.
-                return False
-            return True
+    _input_columns_getters[op_type] = input_columns_getter
+    if preserve_columns:
+        _column_preserving_checkers[op_type] = \
+            preserve_columns if callable(preserve_columns) else lambda _: True
+    if output_dtypes_getter is not None:
+        _output_dtypes_getters[op_type] = output_dtypes_getter
+
+
+def _prune_read_csv(node, columns):
+    op = node.op
+    if op.index_col is not None or \
+            (op.usecols is not None and not isinstance(op.usecols, list)):
+        return False
+    op._usecols = columns
+    return True
+
+
+def _prune_read_parquet(node, columns):
+    op = node.op
+    if isinstance(op.path, str) and os.path.isdir(op.path):
+        # columns are not selectable for partitioned datasets
+        return False
+    op._columns = columns
+    return True
+
+
+def _prune_read_sql(node, columns):
+    op = node.op
+    if not op.index_col:
+        # rows are sorted by all selected columns without index columns
         return False
+    op._columns = [c for c in columns if c not in op.index_col]
+    return True
+
+
+_data_source_pruners = {
+    DataFrameReadCSV: _prune_read_csv,
+    DataFrameReadParquet: _prune_read_parquet,
+    DataFrameReadSQL: _prune_read_sql,
+}
+
+
+class ColumnPruning(TileableGraphOptimizeRule):
+    """
+    Prune columns not used by the graph when reading data sources. Columns
+    required by results are propagated backwards through operands registered
+    by `register_column_pruning`, then read by data sources only.
+    """
+    def _get_required_columns(self, graph):
+        result_tileables = set(self._optimizer_context.result_tileables)
+        required = dict()
+        for node in graph.topological_iter(reverse=True):
+            if not isinstance(node, DATAFRAME_TYPE):
+                continue
+            if node in result_tileables or graph.count_successors(node) == 0:
+                required[node] = None
+                continue
 
-    def apply(self, node):
-        by_data = node.op.groupby_params.get('by')
-        by_columns = by_data if isinstance(by_data, (list, tuple)) else [by_data]
-        agg_columns = list(node.op.func)
-        input_node = node.inputs[0]
-        selected_columns = [c for c in list(input_node.dtypes.index) if c in by_columns + agg_columns]
-        if input_node in self._optimizer_context:
-            new_input = self._optimizer_context[input_node]
-            selected_columns = [
-                c for c in list(input_node.dtypes.index) if c in selected_columns + new_input.op._usecols]
+            columns = set()
+            for succ in graph.iter_successors(node):
+                getter = _get_registered(_input_columns_getters, succ.op)
+                if getter is None:
+                    columns = None
+                    break
+                succ_columns = required.get(succ)
+                for idx, inp in enumerate(succ.inputs):
+                    if inp is not node:
+                        continue
+                    inp_columns = getter(succ, idx, succ_columns)
+                    if inp_columns is None:
+                        columns = None
+                        break
+                    columns.update(inp_columns)
+                if columns is None:
+                    break
+            required[node] = columns
+        return required
+
+    @staticmethod
+    def _copy_with_dtypes(node, inputs, dtypes=None):
+        new_node = copy_tileables([node], inputs=inputs)[0].data
+        if dtypes is not None:
+            new_node._shape = (node.shape[0], len(dtypes))
+            new_node._dtypes = dtypes
+            new_node._columns_value = parse_index(dtypes.index, store_data=True)
+        return new_node
+
+    def _prune_data_source(self, node, columns):
+        all_columns = list(node.dtypes.index)
+        if columns is not None:
+            # columns to filter rows are always read
+            columns = columns | set(f[0] for f in node.op.filters or ())
+        if columns is None or len(columns) >= len(all_columns) or \
+                len(set(all_columns)) != len(all_columns):
+            return
+        selected_columns = [c for c in all_columns if c in columns] or all_columns[:1]
+
+        new_node = copy_tileables([node])[0].data
+        if not _data_source_pruners[type(node.op)](new_node, selected_columns):
+            return
+        dtypes = node.dtypes[selected_columns]
+        new_node._shape = (node.shape[0], len(dtypes))
+        new_node._dtypes = dtypes
+        new_node._columns_value = parse_index(dtypes.index, store_data=True)
+        return new_node
+
+    def _copy_successor(self, node, inputs):
+        if len(node.op.outputs) > 1:
+            return copy_tileables(node.op.outputs, inputs=inputs)
+        preserving_checker = _get_registered(_column_preserving_checkers, node.op)
+        dtypes_getter = _get_registered(_output_dtypes_getters, node.op)
+        if preserving_checker is not None and preserving_checker(node) \
+                and isinstance(node, DATAFRAME_TYPE):
+            in_columns = inputs[0].dtypes.index
+            dtypes = node.dtypes[[c for c in node.dtypes.index if c in in_columns]]
+        elif dtypes_getter is not None:
+            dtypes = dtypes_getter(node, inputs)
         else:
-            new_input = copy_tileables([input_node])[0].data
+            dtypes = None
+        return [self._copy_with_dtypes(node, inputs, dtypes=dtypes)]
+
+    def optimize(self, graph):
+        required = self._get_required_columns(graph)
+
+        replaced = dict()
+        for node in graph.topological_iter():
+            if node in replaced:
+                continue
+            if type(node.op) in _data_source_pruners:
+                new_node = self._prune_data_source(node, required.get(node))
+                if new_node is not None:
+                    replaced[node] = new_node
+            elif any(inp in replaced for inp in node.inputs or ()):
+                new_inputs = [replaced.get(inp, inp) for inp in node.inputs]
+                new_nodes = self._copy_successor(node, new_inputs)
+                for out, new_out in zip(node.op.outputs, new_nodes):
+                    replaced[out] = getattr(new_out, 'data', new_out)
 
-        new_input._shape = (input_node.shape[0], len(selected_columns))
-        new_input._dtypes = input_node.dtypes[selected_columns]
-        new_input._columns_value = parse_index(new_input._dtypes.index, store_data=True)
-        new_input.op._usecols = selected_columns
-        new_node = copy_tileables([node], inputs=[new_input])[0].data
+        if not replaced:
+            return graph
 
-        self._optimizer_context[node] = new_node
-        self._optimizer_context[input_node] = new_input
-        return node
+        return self._replace_nodes(graph, replaced)
 
 
-register(DataFrameGroupByAgg, GroupbyPruneReadCSV)
+register_column_pruning(DataFrameIndex, _get_index_input_columns,
+                        preserve_columns=lambda node: node.op.col_names is None)
+register_column_pruning(DataFrameBinOp, _get_bin_op_input_columns, preserve_columns=True)
+register_column_pruning(DataFrameUnaryOp, _get_preserving_input_columns, preserve_columns=True)
+register_column_pruning(DataFrameIlocGetItem, _get_iloc_input_columns, preserve_columns=True)
+register_column_pruning(DataFrameAstype, _get_astype_input_columns, preserve_columns=True)
+register_column_pruning(DataFrameSortValues, _get_sort_values_input_columns, preserve_columns=True)
+register_column_pruning(DataFrameGroupByAgg, _get_groupby_agg_input_columns)
+register_column_pruning(DataFrameShuffleMerge, _get_merge_input_columns,
+                        output_dtypes_getter=_get_merge_output_dtypes)
+register_graph_rule(ColumnPruning)
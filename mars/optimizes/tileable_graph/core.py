@@ -22,6 +22,7 @@ from ...graph_builder import TileableGraphBuilder
 from ...utils import copy_tileables, enter_mode
 
 _rules = defaultdict(list)
+_graph_rules = []
 
 tileable_optimized = weakref.WeakKeyDictionary()
 
@@ -37,6 +38,42 @@ class TileableOptimizeRule(object):
         raise NotImplementedError
 
 
+class TileableGraphOptimizeRule(object):
+    """
+    Rule optimizing the whole tileable graph once it is built,
+    copied tileables are recorded into the optimizer context.
+    """
+    def __init__(self, optimized_context):
+        self._optimizer_context = optimized_context
+
+    def optimize(self, graph):
+        raise NotImplementedError
+
+    def _replace_nodes(self, graph, replaced, removed=None):
+        """
+        Build a new graph with nodes replaced and removed,
+        and record replacements into the optimizer context.
+        """
+        removed = removed or set()
+        new_graph = DAG()
+        for node in graph:
+            if node not in removed:
+                new_graph.add_node(replaced.get(node, node))
+        for node in graph:
+            if node in removed:
+                continue
+            for succ in graph.iter_successors(node):
+                if succ not in removed:
+                    new_graph.add_edge(replaced.get(node, node), replaced.get(succ, succ))
+
+        context = self._optimizer_context
+        for k, v in list(context.items()):
+            if v in replaced:
+                context[k] = replaced[v]
+        context.update(replaced)
+        return new_graph
+
+
 class OptimizeContext(weakref.WeakKeyDictionary):
     def __init__(self, dict=None):
         weakref.WeakKeyDictionary.__init__(self, dict=dict)
@@ -119,9 +156,15 @@ class OptimizeIntegratedTileableGraphBuilder(TileableGraphBuilder):
         self._optimizer_context.append_result_tileables(tileables)
         graph = super().build(tileables, tileable_graph=tileable_graph)
         graph = self._replace_copied_tilebale(graph)
+        for rule in _graph_rules:
+            graph = rule(self._optimizer_context).optimize(graph)
         self._mapping_tileables(tileables)
         return graph
 
 
 def register(op_type, rule):
     _rules[op_type].append(rule)
+
+
+def register_graph_rule(rule):
+    _graph_rules.append(rule)
@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright 1999-2020 Alibaba Group Holding Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pandas as pd
+
+from ...core import Base, Entity
+from ...utils import copy_tileables
+from ...dataframe.arithmetic.equal import DataFrameEqual
+from ...dataframe.arithmetic.greater import DataFrameGreater
+from ...dataframe.arithmetic.greater_equal import DataFrameGreaterEqual
+from ...dataframe.arithmetic.less import DataFrameLess
+from ...dataframe.arithmetic.less_equal import DataFrameLessEqual
+from ...dataframe.arithmetic.logical_and import DataFrameAnd
+from ...dataframe.arithmetic.not_equal import DataFrameNotEqual
+from ...dataframe.base.isin import DataFrameIsin
+from ...dataframe.datasource.read_csv import DataFrameReadCSV
+from ...dataframe.datasource.read_parquet import DataFrameReadParquet
+from ...dataframe.datasource.read_sql import DataFrameReadSQL
+from ...dataframe.indexing.getitem import DataFrameIndex
+from .core import TileableGraphOptimizeRule, register_graph_rule
+
+# comparison operand type -> (predicate, predicate with operands swapped)
+_comparison_predicates = {
+    DataFrameEqual: ('==', '=='),
+    DataFrameNotEqual: ('!=', '!='),
+    DataFrameLess: ('<', '>'),
+    DataFrameLessEqual: ('<=', '>='),
+    DataFrameGreater: ('>', '<'),
+    DataFrameGreaterEqual: ('>=', '<='),
+}
+
+
+def _is_tileable(obj):
+    return isinstance(obj, (Base, Entity))
+
+
+def _can_push_read_csv(op):
+    return not op.incremental_index and op.nrows is None
+
+
+def _can_push_read_parquet(op):
+    return not op.incremental_index
+
+
+def _can_push_read_sql(op):
+    # rows are counted ahead when reading by offsets, and labels of
+    # default indexes are changed by filtering
+    return op.method == 'partition' and bool(op.index_col) \
+        and not op.incremental_index and op.nrows is None
+
+
+_data_source_checkers = {
+    DataFrameReadCSV: _can_push_read_csv,
+    DataFrameReadParquet: _can_push_read_parquet,
+    DataFrameReadSQL: _can_push_read_sql,
+}
+
+
+class PredicatePushdown(TileableGraphOptimizeRule):
+    """
+    Push filters like `df[(df['a'] > 1) & df['b'].isin([1, 2])]` down into
+    data sources, thus rows are selected when reading and files, row groups
+    or database rows not matching are skipped if data sources support.
+    """
+    def _get_column(self, node, source):
+        # column selected from the data source by a label
+        op = node.op
+        if not isinstance(op, DataFrameIndex) or op.col_names is None \
+                or isinstance(op.col_names, list) or _is_tileable(op.col_names) \
+                or node.inputs[0] is not source:
+            return None
+        return op.col_names
+
+    def _parse_predicates(self, node, source, chain):
+        """
+        Parse mask into list of (column, op, value), nodes in the mask
+        are added into the chain. None is returned if not supported.
+        """
+        op = node.op
+        chain.add(node)
+        if isinstance(op, DataFrameAnd) and len(node.inputs) == 2:
+            predicates = []
+            for inp in node.inputs:
+                inp_predicates = self._parse_predicates(inp, source, chain)
+                if inp_predicates is None:
+                    return None
+                predicates.extend(inp_predicates)
+            return predicates
+        elif type(op) in _comparison_predicates and len(node.inputs) == 1:
+            if op.level is not None or op.fill_value is not None:
+                return None
+            pred, swapped_pred = _comparison_predicates[type(op)]
+            if op.lhs is node.inputs[0]:
+                value = op.rhs
+            else:
+                value, pred = op.lhs, swapped_pred
+            column = self._get_column(node.inputs[0], source)
+            if column is None or not pd.api.types.is_scalar(value):
+                return None
+            chain.add(node.inputs[0])
+            return [(column, pred, value)]
+        elif isinstance(op, DataFrameIsin):
+            column = self._get_column(node.inputs[0], source)
+            if column is None or _is_tileable(op.values) or isinstance(op.values, dict) \
+                    or not pd.api.types.is_list_like(op.values):
+                return None
+            chain.add(node.inputs[0])
+            return [(column, 'in', list(op.values))]
+        return None
+
+    def _match(self, graph, node):
+        op = node.op
+        if not isinstance(op, DataFrameIndex) or op.col_names is not None \
+                or len(node.inputs) != 2:
+            return None
+        source, mask = node.inputs
+        checker = _data_source_checkers.get(type(source.op))
+        if checker is None or not checker(source.op):
+            return None
+
+        chain = set()
+        predicates = self._parse_predicates(mask, source, chain)
+        if predicates is None:
+            return None
+
+        # intermediate results cannot be consumed by others
+        result_tileables = set(self._optimizer_context.result_tileables)
+        if source in result_tileables or any(n in result_tileables for n in chain):
+            return None
+        if any(succ is not node and succ not in chain
+               for succ in graph.iter_successors(source)):
+            return None
+        for n in chain:
+            if any(succ is not node and succ not in chain
+                   for succ in graph.iter_successors(n)):
+                return None
+        return source, chain, predicates
+
+    @staticmethod
+    def _push_data_source(node, source, predicates):
+        op = source.op.copy().reset_key()
+        op._filters = list(op.filters or []) + predicates
+        params = node.params.copy()
+        params['_key'] = node.key
+        params['_id'] = node.id
+        params.update(source.extra_params)
+        return op.new_tileables(None, kws=[params], output_limit=1)[0].data
+
+    def optimize(self, graph):
+        replaced = dict()
+        removed = set()
+        for node in graph.topological_iter():
+            if node in replaced:
+                continue
+            matched = self._match(graph, node)
+            if matched is not None:
+                source, chain, predicates = matched
+                replaced[node] = self._push_data_source(node, source, predicates)
+                removed.add(source)
+                removed.update(chain)
+            elif any(inp in replaced for inp in node.inputs or ()):
+                new_inputs = [replaced.get(inp, inp) for inp in node.inputs]
+                new_nodes = copy_tileables(node.op.outputs, inputs=new_inputs)
+                for out, new_out in zip(node.op.outputs, new_nodes):
+                    replaced[out] = new_out.data
+
+        if not replaced:
+            return graph
+        return self._replace_nodes(graph, replaced, removed=removed)
+
+
+register_graph_rule(PredicatePushdown)
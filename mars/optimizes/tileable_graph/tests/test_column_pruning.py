@@ -18,14 +18,17 @@ import os
 import shutil
 import tempfile
 
+import numpy as np
 import pandas as pd
 
 import mars.dataframe as md
 from mars.core import ExecutableTuple
 from mars.config import option_context
 from mars.dataframe.datasource.read_csv import DataFrameReadCSV
+from mars.dataframe.datasource.read_parquet import DataFrameReadParquet
 from mars.executor import register, Executor
 from mars.tests.core import TestBase, ExecutorForTest
+from mars.optimizes.tileable_graph import OptimizeIntegratedTileableGraphBuilder
 from mars.optimizes.tileable_graph.core import tileable_optimized
 
 
@@ -109,6 +112,81 @@ class Test(TestBase):
         finally:
             shutil.rmtree(tempdir)
 
+    @staticmethod
+    def _get_data_sources(tileable, op_type):
+        graph = OptimizeIntegratedTileableGraphBuilder().build([tileable.data])
+        return [n for n in graph if isinstance(n.op, op_type)]
+
+    def testColumnPruning(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            file_path = os.path.join(tempdir, 'test.csv')
+            rs = np.random.RandomState(0)
+            raw = pd.DataFrame({'a': rs.randint(0, 5, 20),
+                                'b': rs.rand(20),
+                                'c': list('abcde' * 4),
+                                'd': rs.rand(20),
+                                'e': rs.randint(0, 100, 20)})
+            raw.to_csv(file_path, index=False)
+
+            # arithmetic, filter and sort
+            df = md.read_csv(file_path)
+            r = (df[df['a'] > 1] * 2)[['b', 'd']]
+            sources = self._get_data_sources(r, DataFrameReadCSV)
+            self.assertEqual(sources[0].op.usecols, ['a', 'b', 'd'])
+            self.assertEqual(list(sources[0].dtypes.index), ['a', 'b', 'd'])
+            expected = (raw[raw['a'] > 1] * 2)[['b', 'd']]
+            pd.testing.assert_frame_equal(r.execute().fetch(), expected)
+
+            df = md.read_csv(file_path)
+            r = df.sort_values('e')[['b', 'd']]
+            sources = self._get_data_sources(r, DataFrameReadCSV)
+            self.assertEqual(sources[0].op.usecols, ['b', 'd', 'e'])
+            pd.testing.assert_frame_equal(r.execute().fetch(), raw.sort_values('e')[['b', 'd']])
+
+            # astype and head
+            df = md.read_csv(file_path)
+            r = df.astype({'a': 'float64'}).head(5)['a']
+            sources = self._get_data_sources(r, DataFrameReadCSV)
+            self.assertEqual(sources[0].op.usecols, ['a'])
+            pd.testing.assert_series_equal(r.execute().fetch(),
+                                           raw.astype({'a': 'float64'}).head(5)['a'])
+
+            # merge
+            df = md.read_csv(file_path)
+            df2 = md.DataFrame(raw[['a', 'b', 'd']].iloc[:5], chunk_size=3)
+            r = df.merge(df2, on='a')[['b_x', 'd_y', 'e']]
+            sources = self._get_data_sources(r, DataFrameReadCSV)
+            self.assertEqual(sources[0].op.usecols, ['a', 'b', 'd', 'e'])
+            expected = raw.merge(raw[['a', 'b', 'd']].iloc[:5], on='a')[['b_x', 'd_y', 'e']]
+            pd.testing.assert_frame_equal(
+                r.execute().fetch().sort_values(['e', 'b_x', 'd_y']).reset_index(drop=True),
+                expected.sort_values(['e', 'b_x', 'd_y']).reset_index(drop=True))
+
+            # all columns are required by results
+            df = md.read_csv(file_path)
+            r = df[df['a'] > 1] + 1
+            sources = self._get_data_sources(r, DataFrameReadCSV)
+            self.assertIsNone(sources[0].op.usecols)
+
+            # columns required by other results are kept
+            df = md.read_csv(file_path)
+            r1, r2 = df['b'] * 2, df[['b', 'c']]
+            results = ExecutableTuple([r1, r2]).execute().fetch()
+            pd.testing.assert_series_equal(results[0], raw['b'] * 2)
+            pd.testing.assert_frame_equal(results[1], raw[['b', 'c']])
+            self.assertEqual(tileable_optimized[r1.data].inputs[0].inputs[0].op.usecols,
+                             ['b', 'c'])
+
+            # parquet
+            file_path = os.path.join(tempdir, 'test.parquet')
+            raw.to_parquet(file_path)
+            df = md.read_parquet(file_path)
+            r = df.groupby('c').agg({'b': 'sum'})
+            sources = self._get_data_sources(r, DataFrameReadParquet)
+            self.assertEqual(sources[0].op.columns, ['b', 'c'])
+            pd.testing.assert_frame_equal(r.execute().fetch(),
+                                          raw.groupby('c').agg({'b': 'sum'}))
+
     def testExecutedPruning(self):
         tempdir = tempfile.mkdtemp()
         file_path = os.path.join(tempdir, 'test.csv')
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright 1999-2020 Alibaba Group Holding Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover
+    pa = None
+try:
+    import sqlalchemy
+except ImportError:  # pragma: no cover
+    sqlalchemy = None
+
+import mars.dataframe as md
+from mars.core import ExecutableTuple
+from mars.dataframe.datasource.read_csv import DataFrameReadCSV
+from mars.dataframe.datasource.read_parquet import DataFrameReadParquet
+from mars.dataframe.datasource.read_sql import DataFrameReadSQL
+from mars.dataframe.utils import filter_by_predicates
+from mars.optimizes.tileable_graph import OptimizeIntegratedTileableGraphBuilder, \
+    tileable_optimized
+from mars.tests.core import TestBase
+from mars.tiles import get_tiled
+
+
+class Test(TestBase):
+    @staticmethod
+    def _get_data_sources(tileables, op_type):
+        if not isinstance(tileables, list):
+            tileables = [tileables]
+        graph = OptimizeIntegratedTileableGraphBuilder().build([t.data for t in tileables])
+        return [n for n in graph if isinstance(n.op, op_type)]
+
+    def testFilterByPredicates(self):
+        raw = pd.DataFrame({'a': np.arange(10), 'b': list('abcde' * 2)})
+        pd.testing.assert_frame_equal(filter_by_predicates(raw, None), raw)
+        pd.testing.assert_frame_equal(
+            filter_by_predicates(raw, [('a', '>=', 3), ('b', 'in', ['a', 'd'])]),
+            raw[(raw['a'] >= 3) & raw['b'].isin(['a', 'd'])])
+
+    def testReadCSVPushdown(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            file_path = os.path.join(tempdir, 'test.csv')
+            rs = np.random.RandomState(0)
+            raw = pd.DataFrame({'a': rs.randint(0, 5, 20),
+                                'b': rs.rand(20),
+                                'c': list('abcde' * 4)})
+            raw.to_csv(file_path, index=False)
+
+            df = md.read_csv(file_path)
+            r = df[(df['a'] > 1) & df['c'].isin(['a', 'c'])]
+            sources = self._get_data_sources(r, DataFrameReadCSV)
+            self.assertEqual(len(sources), 1)
+            self.assertEqual(sources[0].op.filters, [('a', '>', 1), ('c', 'in', ['a', 'c'])])
+            pd.testing.assert_frame_equal(
+                r.execute().fetch(), raw[(raw['a'] > 1) & raw['c'].isin(['a', 'c'])])
+
+            # scalar on the left side, combined with column pruning
+            df = md.read_csv(file_path)
+            r = df[2 >= df['a']]['b'] * 2
+            sources = self._get_data_sources(r, DataFrameReadCSV)
+            self.assertEqual(sources[0].op.filters, [('a', '<=', 2)])
+            self.assertEqual(sources[0].op.usecols, ['a', 'b'])
+            pd.testing.assert_series_equal(r.execute().fetch(), raw[2 >= raw['a']]['b'] * 2)
+
+            # masks consumed by other results are not pushed
+            df = md.read_csv(file_path)
+            mask = df['a'] > 1
+            r = df[mask]
+            sources = self._get_data_sources([r, mask], DataFrameReadCSV)
+            self.assertIsNone(sources[0].op.filters)
+            results = ExecutableTuple([r, mask]).execute().fetch()
+            pd.testing.assert_frame_equal(results[0], raw[raw['a'] > 1])
+            pd.testing.assert_series_equal(results[1], raw['a'] > 1)
+
+            # unsupported masks are not pushed
+            df = md.read_csv(file_path)
+            r = df[(df['a'] > 1) | (df['b'] < 0.5)]
+            sources = self._get_data_sources(r, DataFrameReadCSV)
+            self.assertIsNone(sources[0].op.filters)
+
+    @unittest.skipIf(pa is None, 'pyarrow not installed')
+    def testReadParquetPushdown(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            file_path = os.path.join(tempdir, 'test.parquet')
+            raw = pd.DataFrame({'a': np.arange(100),
+                                'b': np.random.rand(100)})
+            raw.to_parquet(file_path, row_group_size=25)
+
+            df = md.read_parquet(file_path, groups_as_chunks=True)
+            r = df[(df['a'] >= 30) & (df['a'] < 60)]
+            # row groups not matching statistics are skipped
+            r.execute()
+            self.assertEqual(len(get_tiled(r, mapping=tileable_optimized).chunks), 2)
+            pd.testing.assert_frame_equal(
+                r.fetch().reset_index(drop=True),
+                raw[(raw['a'] >= 30) & (raw['a'] < 60)].reset_index(drop=True))
+
+            # no rows matched
+            df = md.read_parquet(file_path, groups_as_chunks=True)
+            r = df[df['a'] > 1000]
+            self.assertEqual(len(r.execute().fetch()), 0)
+
+            # whole files are skipped
+            for i in range(2):
+                raw.iloc[i * 50: (i + 1) * 50].to_parquet(
+                    os.path.join(tempdir, f'test_{i}.pq'), row_group_size=25)
+            df = md.read_parquet(os.path.join(tempdir, 'test_*.pq'))
+            r = df[df['a'].isin([10, 20])]
+            sources = self._get_data_sources(r, DataFrameReadParquet)
+            self.assertEqual(sources[0].op.filters, [('a', 'in', [10, 20])])
+            r.execute()
+            self.assertEqual(len(get_tiled(r, mapping=tileable_optimized).chunks), 1)
+            pd.testing.assert_frame_equal(r.fetch().reset_index(drop=True),
+                                          raw[raw['a'].isin([10, 20])].reset_index(drop=True))
+
+        # row groups with nulls are kept for `!=`
+        with tempfile.TemporaryDirectory() as tempdir:
+            raw_x = pd.DataFrame({'a': [5, np.nan, 5]})
+            raw_y = pd.DataFrame({'a': [1., 2.]})
+            raw_x.to_parquet(os.path.join(tempdir, 'x.pq'))
+            raw_y.to_parquet(os.path.join(tempdir, 'y.pq'))
+            raw = pd.concat([raw_x, raw_y])
+
+            df = md.read_parquet(os.path.join(tempdir, '*.pq'))
+            r = df[df['a'] != 5]
+            pd.testing.assert_frame_equal(
+                r.execute().fetch().reset_index(drop=True),
+                raw[raw['a'] != 5].reset_index(drop=True))
+
+    @unittest.skipIf(sqlalchemy is None, 'sqlalchemy not installed')
+    def testReadSQLPushdown(self):
+        raw = pd.DataFrame({'a': np.arange(10),
+                            'b': [f's{i}' for i in range(10)],
+                            'c': np.random.rand(10)})
+        with tempfile.TemporaryDirectory() as tempdir:
+            uri = 'sqlite:///' + os.path.join(tempdir, 'test.db')
+            raw.to_sql('test', uri, index=False)
+
+            df = md.read_sql_table('test', uri, index_col='a',
+                                   partition_col='a', num_partitions=3)
+            r = df[df['c'] > 0.5]
+            sources = self._get_data_sources(r, DataFrameReadSQL)
+            self.assertEqual(sources[0].op.filters, [('c', '>', 0.5)])
+            expected = raw.set_index('a')
+            pd.testing.assert_frame_equal(r.execute().fetch(), expected[expected['c'] > 0.5])
+
+            # rows are counted ahead when reading by offsets
+            df = md.read_sql_table('test', uri, index_col='a', chunk_size=4)
+            r = df[df['c'] > 0.5]
+            sources = self._get_data_sources(r, DataFrameReadSQL)
+            self.assertIsNone(sources[0].op.filters)
+            pd.testing.assert_frame_equal(r.execute().fetch(), expected[expected['c'] > 0.5])
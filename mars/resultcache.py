@@ -0,0 +1,200 @@
+# Copyright 1999-2020 Alibaba Group Holding Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import threading
+import uuid
+
+from .config import options
+from .filesystem import get_fs, LocalFileSystem
+from .operands import Fetch
+from .serialize import dataserializer
+from .utils import parse_readable_size, tokenize
+
+_tmp_suffix = '.tmp'
+
+
+class ResultCache(object):
+    """
+    Cache of chunk results persisted on a local or shared file system,
+    thus reusable across sessions. Results are addressed by chunk keys
+    together with fingerprints of external data they are computed from,
+    and least recently used results are evicted beyond the max size.
+    """
+    def __init__(self, root, max_size=None, storage_options=None):
+        self._root = root
+        self._fs = get_fs(root, dict(storage_options or dict()))
+        if not self._fs.exists(root):
+            self._fs.mkdir(root, create_parents=True)
+        if max_size is not None:
+            max_size = int(parse_readable_size(max_size)[0])
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._stats = dict(hit_count=0, miss_count=0, store_count=0,
+                           store_bytes=0, evict_count=0)
+
+    @property
+    def root(self):
+        return self._root
+
+    @property
+    def max_size(self):
+        return self._max_size
+
+    @property
+    def stats(self):
+        return self._stats.copy()
+
+    def _inc_stats(self, **kw):
+        with self._lock:
+            for k, v in kw.items():
+                self._stats[k] += v
+
+    def _get_path(self, key):
+        sep = self._fs.pathsep
+        return self._root.rstrip(sep) + sep + key
+
+    @staticmethod
+    def get_cache_key(chunk, fetch_cache_keys=None, memo=None, fingerprint_memo=None):
+        """
+        Get key of the chunk in the cache, which is a token of the chunk key and
+        fingerprints of external data read by the chunk and its predecessors.
+        None if the chunk depends on external sources without fingerprints,
+        thus its result cannot be cached.
+
+        :param chunk: chunk to get key
+        :param fetch_cache_keys: cache keys of executed chunks referred by fetch chunks
+        :param memo: dict of chunk keys to cache keys already computed
+        :param fingerprint_memo: dict of fingerprints of paths already computed
+        """
+        fetch_cache_keys = fetch_cache_keys or dict()
+        memo = memo if memo is not None else dict()
+        fingerprint_memo = fingerprint_memo if fingerprint_memo is not None else dict()
+
+        stack = [chunk]
+        while stack:
+            c = stack[-1]
+            if c.key in memo:
+                stack.pop()
+                continue
+            if isinstance(c.op, Fetch):
+                memo[c.key] = fetch_cache_keys[c.key] if c.key in fetch_cache_keys \
+                    else tokenize(c.key)
+                stack.pop()
+                continue
+
+            inputs = c.inputs or []
+            not_visited = [inp for inp in inputs if inp.key not in memo]
+            if not_visited:
+                stack.extend(not_visited)
+                continue
+            stack.pop()
+            input_keys = [memo[inp.key] for inp in inputs]
+            fingerprint = c.op.get_fingerprint(memo=fingerprint_memo)
+            if any(k is None for k in input_keys) \
+                    or (c.op._external_source_ and fingerprint is None):
+                memo[c.key] = None
+            else:
+                memo[c.key] = tokenize(c.key, fingerprint, input_keys)
+        return memo[chunk.key]
+
+    def __contains__(self, key):
+        return self._fs.exists(self._get_path(key))
+
+    def get(self, key, default=None):
+        path = self._get_path(key)
+        try:
+            with self._fs.open(path, 'rb') as f:
+                data = dataserializer.load(f)
+        except (IOError, OSError):
+            self._inc_stats(miss_count=1)
+            return default
+
+        if isinstance(self._fs, LocalFileSystem):
+            # record access time for eviction
+            try:
+                os.utime(path)
+            except OSError:  # pragma: no cover
+                pass
+        self._inc_stats(hit_count=1)
+        return data
+
+    def put(self, key, data):
+        path = self._get_path(key)
+        # write into a temp file first, thus partially written
+        # results are never visible to other sessions
+        tmp_path = f'{path}.{uuid.uuid4().hex}{_tmp_suffix}'
+        with self._fs.open(tmp_path, 'wb') as f:
+            dataserializer.dump(data, f)
+        self._fs.mv(tmp_path, path)
+        self._inc_stats(store_count=1, store_bytes=self._fs.stat(path)['size'])
+
+    def delete(self, key):
+        try:
+            self._fs.delete(self._get_path(key))
+        except (IOError, OSError):
+            pass
+
+    def evict(self):
+        """
+        Remove least recently used results until total size of the cache
+        is no more than the max size
+        """
+        if self._max_size is None:
+            return
+
+        entries = []
+        for path in self._fs.ls(self._root):
+            if path.endswith(_tmp_suffix):
+                continue
+            try:
+                stat = self._fs.stat(path)
+            except (IOError, OSError):  # pragma: no cover
+                # removed by other sessions
+                continue
+            entries.append((stat.get('modified', stat.get('last_modified', 0)),
+                            stat['size'], path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self._max_size:
+                break
+            try:
+                self._fs.delete(path)
+            except (IOError, OSError):  # pragma: no cover
+                pass
+            total_size -= size
+            self._inc_stats(evict_count=1)
+
+
+_result_caches = dict()
+
+
+def get_result_cache():
+    """
+    Get the result cache specified by `options.result_cache`,
+    None if the cache is not enabled
+    """
+    root = options.result_cache.directory
+    if root is None:
+        return None
+    max_size = options.result_cache.max_size
+    storage_options = options.result_cache.storage_options
+    cache_key = (root, max_size, tokenize(storage_options))
+    try:
+        return _result_caches[cache_key]
+    except KeyError:
+        cache = _result_caches[cache_key] = ResultCache(
+            root, max_size=max_size, storage_options=storage_options)
+        return cache
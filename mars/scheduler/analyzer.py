@@ -238,6 +238,26 @@ class GraphAnalyzer(object):
                 worker_quotas[max_worker] -= 1
                 yield op_key, max_worker
 
+    def _iter_assignments_by_pinned_chunks(self, input_chunk_metas, pinned_chunk_keys):
+        """
+        Assign chunks to workers holding their pinned inputs, regardless of quotas
+        :type input_chunk_metas: dict[str, dict[str, mars.scheduler.chunkmeta.WorkerMeta]]
+        """
+        for op_key, chunk_to_meta in input_chunk_metas.items():
+            # compute pinned data amounts held in workers
+            worker_stores = defaultdict(lambda: 0)
+            for chunk_key, meta in chunk_to_meta.items():
+                if chunk_key not in pinned_chunk_keys or meta is None:
+                    continue
+                for w in meta.workers:
+                    if w in self._worker_slots:
+                        # count empty chunks as well
+                        worker_stores[w] += meta.chunk_size + 1
+
+            _max_size, max_workers = self._get_workers_with_max_size(worker_stores)
+            if max_workers:
+                yield op_key, random.choice(max_workers)
+
     def _assign_by_bfs(self, start, worker, initial_sizes, spread_limits,
                        keys_to_assign, assigned_record, graph=None):
         """
@@ -275,13 +295,15 @@ class GraphAnalyzer(object):
                 break
         initial_sizes[worker] -= assigned
 
-    def calc_operand_assignments(self, op_keys, input_chunk_metas=None):
+    def calc_operand_assignments(self, op_keys, input_chunk_metas=None, pinned_chunk_keys=None):
         """
         Decide target worker for given chunks.
 
         :param op_keys: keys of operands to assign
         :param input_chunk_metas: chunk metas for graph-level inputs, grouped by initial chunks
         :type input_chunk_metas: dict[str, dict[str, mars.scheduler.chunkmeta.WorkerMeta]]
+        :param pinned_chunk_keys: keys of pinned input chunks, operands consuming
+            them are always assigned to workers holding them
         :return: dict mapping operand keys into worker endpoints
         """
         graph = self._graph
@@ -313,6 +335,16 @@ class GraphAnalyzer(object):
                     descendant_readies.add(op_key)
                     assigned_counts[cur_assigns[op_key]] += 1
 
+        # assign nodes to workers holding their pinned inputs
+        if input_chunk_metas and pinned_chunk_keys:
+            for op_key, worker in self._iter_assignments_by_pinned_chunks(
+                    input_chunk_metas, pinned_chunk_keys):
+                if op_key in cur_assigns or op_key not in op_keys:
+                    continue
+                assigned_counts[worker] += 1
+                cur_assigns[op_key] = worker
+                worker_op_keys[worker].add(op_key)
+
         # calculate the number of nodes to be assigned to every worker
         # given number of workers and existing assignments
         pre_worker_quotas = self._calc_worker_assign_limits(
@@ -25,7 +25,7 @@ from .. import promise
 from ..config import options
 from ..errors import DependencyMissing
 from ..utils import log_unhandled
-from .operands import BaseOperandActor
+from .operands import BaseOperandActor, HostedOperandRef
 from .resource import ResourceActor
 from .utils import SchedulerActor
 
@@ -318,7 +318,7 @@ class AssignEvaluationActor(SchedulerActor):
                 if item.callback:  # pragma: no branch
                     self.tell_promise(item.callback, *sys.exc_info(), _accept=False)
                 else:
-                    self.get_actor_ref(BaseOperandActor.gen_uid(item.session_id, item.op_key)) \
+                    self._get_operand_ref(item.session_id, item.op_key, item.op_info) \
                         .handle_unexpected_failure(*sys.exc_info(), _tell=True, _wait=False)
                 continue
 
@@ -399,7 +399,7 @@ class AssignEvaluationActor(SchedulerActor):
                 logger.debug('Operand %s(%s) allocated to run in %s', op_key, op_info['op_name'], worker_ep)
                 self._mem_usage_cache.pop(op_key, None)
 
-                self.get_actor_ref(BaseOperandActor.gen_uid(session_id, op_key)) \
+                self._get_operand_ref(session_id, op_key, op_info) \
                     .submit_to_worker(worker_ep, input_metas, _tell=True, _wait=False)
                 return worker_ep, rejects
             else:
@@ -414,6 +414,12 @@ class AssignEvaluationActor(SchedulerActor):
                 self._session_last_assigns[session_id] = time.time()
         return None, rejects
 
+    def _get_operand_ref(self, session_id, op_key, op_info):
+        host_uid = op_info.get('operand_host')
+        if host_uid is not None:
+            return HostedOperandRef(self.get_actor_ref(host_uid), op_key)
+        return self.get_actor_ref(BaseOperandActor.gen_uid(session_id, op_key))
+
     def _get_chunks_meta(self, session_id, keys):
         if not keys:
             return dict()
@@ -17,6 +17,8 @@ import logging
 import os
 from collections import defaultdict, OrderedDict
 
+import numpy as np
+
 from .kvstore import KVStoreActor
 from .utils import SchedulerActor, CombinedFutureWaiter
 from ..config import options
@@ -88,6 +90,9 @@ class ChunkMetaStore(object):
     def get(self, chunk_key, default=None):
         return self._chunk_metas.get(chunk_key, default)
 
+    def batch_get(self, chunk_keys, default=None):
+        return [self.get(k, default) for k in chunk_keys]
+
     def get_worker_chunk_keys(self, worker, default=None):
         """
         Get chunk keys held in a worker
@@ -123,6 +128,18 @@ class ChunkMetaStore(object):
             del self._worker_to_chunk_keys[worker]
         return affected
 
+    def remove_workers(self, workers, filter_fun=None):
+        """
+        Remove workers from storage and return keys of lost chunks
+        :param workers: worker endpoints
+        :param filter_fun: key filter
+        :return: keys of lost chunks
+        """
+        affected = []
+        for w in workers:
+            affected.extend(self.remove_worker_keys(w, filter_fun))
+        return affected
+
 
 class ChunkMetaCache(ChunkMetaStore):
     """
@@ -157,15 +174,286 @@ class ChunkMetaCache(ChunkMetaStore):
                 self._del_chunk_key_from_workers(dkey, ditem.workers)
 
 
+class ColumnarChunkMetaStore(object):
+    """
+    Storage of chunk meta holding fields in NumPy arrays instead of
+    one WorkerMeta object per chunk. Chunk keys are interned into row
+    indices, workers into integer ids, and workers holding a chunk
+    are recorded as a bitmap, thus losing a worker can be handled
+    with vectorized operations.
+    """
+    _initial_capacity = 1024
+
+    def __init__(self, capacity=None):
+        capacity = capacity or self._initial_capacity
+
+        self._key_to_row = dict()
+        self._row_keys = [None] * capacity
+        self._free_rows = []
+        self._n_rows = 0
+
+        # size -1 and ndim -1 stand for None
+        self._sizes = np.full(capacity, -1, dtype=np.int64)
+        self._ndims = np.full(capacity, -1, dtype=np.int8)
+        self._shapes = np.zeros((capacity, 0), dtype=np.int64)
+        # bit j of word i stands for worker with id i * 64 + j
+        self._worker_bits = np.zeros((capacity, 0), dtype=np.uint64)
+
+        self._worker_ids = dict()
+        self._workers = []
+        self._free_worker_ids = []
+
+    def __len__(self):
+        return len(self._key_to_row)
+
+    def __contains__(self, chunk_key):
+        return chunk_key in self._key_to_row
+
+    def __getitem__(self, chunk_key):
+        return self._read_row(self._key_to_row[chunk_key])
+
+    def __setitem__(self, chunk_key, worker_meta):
+        try:
+            row = self._key_to_row[chunk_key]
+        except KeyError:
+            row = self._key_to_row[chunk_key] = self._allocate_row()
+            self._row_keys[row] = chunk_key
+        self._write_row(row, worker_meta)
+
+    def __delitem__(self, chunk_key):
+        row = self._key_to_row.pop(chunk_key)
+        self._release_row(row)
+
+    def _allocate_row(self):
+        if self._free_rows:
+            return self._free_rows.pop()
+        if self._n_rows == len(self._sizes):
+            self._grow_rows(2 * len(self._sizes))
+        row = self._n_rows
+        self._n_rows += 1
+        return row
+
+    def _release_row(self, row):
+        self._row_keys[row] = None
+        self._sizes[row] = -1
+        self._ndims[row] = -1
+        self._worker_bits[row] = 0
+        self._free_rows.append(row)
+
+    def _grow_rows(self, capacity):
+        n_extra = capacity - len(self._sizes)
+        self._row_keys.extend([None] * n_extra)
+        self._sizes = np.concatenate([self._sizes, np.full(n_extra, -1, dtype=np.int64)])
+        self._ndims = np.concatenate([self._ndims, np.full(n_extra, -1, dtype=np.int8)])
+        self._shapes = np.vstack(
+            [self._shapes, np.zeros((n_extra, self._shapes.shape[1]), dtype=np.int64)])
+        self._worker_bits = np.vstack(
+            [self._worker_bits, np.zeros((n_extra, self._worker_bits.shape[1]), dtype=np.uint64)])
+
+    def _get_worker_id(self, worker):
+        try:
+            return self._worker_ids[worker]
+        except KeyError:
+            pass
+        if self._free_worker_ids:
+            worker_id = self._free_worker_ids.pop()
+            self._workers[worker_id] = worker
+        else:
+            worker_id = len(self._workers)
+            self._workers.append(worker)
+            n_words = worker_id // 64 + 1
+            if n_words > self._worker_bits.shape[1]:
+                self._worker_bits = np.hstack(
+                    [self._worker_bits, np.zeros((len(self._sizes), 1), dtype=np.uint64)])
+        self._worker_ids[worker] = worker_id
+        return worker_id
+
+    def _release_worker_id(self, worker):
+        worker_id = self._worker_ids.pop(worker)
+        self._workers[worker_id] = None
+        self._free_worker_ids.append(worker_id)
+
+    @staticmethod
+    def _worker_bit(worker_id):
+        return worker_id // 64, np.uint64(1 << (worker_id % 64))
+
+    def _write_row(self, row, worker_meta):
+        size, shape = worker_meta.chunk_size, worker_meta.chunk_shape
+        self._sizes[row] = size if size is not None else -1
+        if shape is None:
+            self._ndims[row] = -1
+        else:
+            if len(shape) > self._shapes.shape[1]:
+                self._shapes = np.hstack([self._shapes, np.zeros(
+                    (len(self._sizes), len(shape) - self._shapes.shape[1]), dtype=np.int64)])
+            self._ndims[row] = len(shape)
+            self._shapes[row, :len(shape)] = [s if not np.isnan(s) else -1 for s in shape]
+
+        self._worker_bits[row] = 0
+        for w in worker_meta.workers:
+            word, bit = self._worker_bit(self._get_worker_id(w))
+            self._worker_bits[row, word] |= bit
+
+    def _decode_workers(self, bits):
+        """
+        Decode worker bitmaps of rows into tuples of worker endpoints
+        """
+        bit_matrix = np.unpackbits(
+            bits.astype('<u8').view(np.uint8), axis=1, bitorder='little')
+        rows, worker_ids = np.nonzero(bit_matrix)
+        workers = [[] for _ in range(len(bits))]
+        for row, worker_id in zip(rows.tolist(), worker_ids.tolist()):
+            workers[row].append(self._workers[worker_id])
+        return [tuple(ws) for ws in workers]
+
+    def _build_metas(self, rows):
+        sizes = self._sizes[rows].tolist()
+        ndims = self._ndims[rows].tolist()
+        shapes = self._shapes[rows].tolist()
+        workers = self._decode_workers(self._worker_bits[rows])
+
+        metas = []
+        for size, ndim, shape, ws in zip(sizes, ndims, shapes, workers):
+            if ndim < 0:
+                shape = None
+            else:
+                shape = tuple(s if s >= 0 else np.nan for s in shape[:ndim])
+            metas.append(WorkerMeta(size if size >= 0 else None, shape, ws))
+        return metas
+
+    def _read_row(self, row):
+        return self._build_metas(np.array([row]))[0]
+
+    def get(self, chunk_key, default=None):
+        try:
+            return self[chunk_key]
+        except KeyError:
+            return default
+
+    def batch_get(self, chunk_keys, default=None):
+        """
+        Get metas of multiple chunks, fields are gathered in a vectorized way
+        :param chunk_keys: chunk keys
+        :param default: default value for missing chunks
+        """
+        key_to_row = self._key_to_row
+        rows = np.array([key_to_row.get(k, -1) for k in chunk_keys], dtype=np.int64)
+        valid = rows >= 0
+
+        results = [default] * len(rows)
+        for idx, meta in zip(np.nonzero(valid)[0].tolist(), self._build_metas(rows[valid])):
+            results[idx] = meta
+        return results
+
+    def _get_worker_rows(self, worker):
+        word, bit = self._worker_bit(self._worker_ids[worker])
+        return np.nonzero(self._worker_bits[:self._n_rows, word] & bit)[0]
+
+    def get_worker_chunk_keys(self, worker, default=None):
+        """
+        Get chunk keys held in a worker
+        :param worker: worker endpoint
+        :param default: default value
+        """
+        if worker not in self._worker_ids:
+            return default
+        row_keys = self._row_keys
+        return set(row_keys[r] for r in self._get_worker_rows(worker).tolist())
+
+    def remove_worker_keys(self, worker, filter_fun=None):
+        """
+        Remove a worker from storage and return keys of lost chunks
+        :param worker: worker endpoint
+        :param filter_fun: key filter
+        :return: keys of lost chunks
+        """
+        return self.remove_workers([worker], filter_fun)
+
+    def remove_workers(self, workers, filter_fun=None):
+        """
+        Remove workers from storage and return keys of lost chunks
+        :param workers: worker endpoints
+        :param filter_fun: key filter
+        :return: keys of lost chunks
+        """
+        workers = [w for w in workers if w in self._worker_ids]
+        if not workers:
+            return []
+
+        masks = np.zeros(self._worker_bits.shape[1], dtype=np.uint64)
+        for w in workers:
+            word, bit = self._worker_bit(self._worker_ids[w])
+            masks[word] |= bit
+
+        bits = self._worker_bits[:self._n_rows]
+        rows = np.nonzero((bits & masks).any(axis=1))[0]
+        if filter_fun is not None:
+            row_keys = self._row_keys
+            rows = rows[np.array([bool(filter_fun(row_keys[r])) for r in rows.tolist()],
+                                 dtype=bool)]
+
+        bits[rows] &= ~masks
+        lost_rows = rows[~bits[rows].any(axis=1)]
+        affected = [self._row_keys[r] for r in lost_rows.tolist()]
+        for key in affected:
+            del self[key]
+
+        for w in workers:
+            if not len(self._get_worker_rows(w)):
+                self._release_worker_id(w)
+        return affected
+
+
+class ColumnarChunkMetaCache(ColumnarChunkMetaStore):
+    """
+    Cache of chunk meta with an LRU, with fields stored in NumPy arrays
+    """
+    def __init__(self, limit=_META_CACHE_SIZE):
+        super().__init__(capacity=min(limit, self._initial_capacity))
+        self._key_to_row = OrderedDict()
+        self._limit = limit
+
+    def __getitem__(self, item):
+        self._key_to_row.move_to_end(item)
+        return super().__getitem__(item)
+
+    def get(self, chunk_key, default=None):
+        try:
+            return self[chunk_key]
+        except KeyError:
+            return default
+
+    def batch_get(self, chunk_keys, default=None):
+        key_to_row = self._key_to_row
+        for k in chunk_keys:
+            try:
+                key_to_row.move_to_end(k)
+            except KeyError:
+                pass
+        return super().batch_get(chunk_keys, default)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        key_to_row = self._key_to_row
+        key_to_row.move_to_end(key)
+        while len(key_to_row) > self._limit:
+            _, row = key_to_row.popitem(False)
+            self._release_row(row)
+
+
 class ChunkMetaActor(SchedulerActor):
     """
     Actor storing chunk metas and chunk cache
     """
     def __init__(self, chunk_info_uid=None):
         super().__init__()
-        self._meta_store = ChunkMetaStore()
+        if options.scheduler.columnar_chunk_meta:
+            self._meta_store = ColumnarChunkMetaStore()
+            self._meta_cache = ColumnarChunkMetaCache()
+        else:
+            self._meta_store = ChunkMetaStore()
+            self._meta_cache = ChunkMetaCache()
         self._meta_broadcasts = dict()
-        self._meta_cache = ChunkMetaCache()
         self._chunk_info_uid = chunk_info_uid
 
         self._kv_store_ref = None
@@ -312,7 +600,14 @@ class ChunkMetaActor(SchedulerActor):
         """
         Obtain metadata in batch
         """
-        return [self.get_chunk_meta(session_id, k) for k in chunk_keys]
+        query_keys = [(session_id, k) for k in chunk_keys]
+        metas = self._meta_store.batch_get(query_keys)
+        missing_idxes = [idx for idx, meta in enumerate(metas) if meta is None]
+        if missing_idxes:
+            cached_metas = self._meta_cache.batch_get([query_keys[idx] for idx in missing_idxes])
+            for idx, meta in zip(missing_idxes, cached_metas):
+                metas[idx] = meta
+        return metas
 
     def delete_meta(self, session_id, chunk_key, broadcast=True):
         """
@@ -366,10 +661,12 @@ class ChunkMetaActor(SchedulerActor):
         """
         logger.debug('Removing workers %r from store', workers)
         self._worker_blacklist.update(workers)
-        removed_chunks = set()
-        for w in workers:
-            self._meta_cache.remove_worker_keys(w, lambda k: k[0] == session_id)
-            removed_chunks.update(self._meta_store.remove_worker_keys(w, lambda k: k[0] == session_id))
+
+        def _filter_session(k):
+            return k[0] == session_id
+
+        self._meta_cache.remove_workers(workers, _filter_session)
+        removed_chunks = set(self._meta_store.remove_workers(workers, _filter_session))
         for c in removed_chunks:
             try:
                 del self._meta_broadcasts[c]
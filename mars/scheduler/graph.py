@@ -20,7 +20,7 @@ import os
 import random
 import sys
 import time
-from collections import defaultdict, OrderedDict
+from collections import defaultdict, deque, OrderedDict
 from functools import lru_cache, reduce
 
 import numpy as np
@@ -28,7 +28,8 @@ import numpy as np
 from .analyzer import GraphAnalyzer
 from .assigner import AssignerActor
 from .kvstore import KVStoreActor
-from .operands import get_operand_actor_class, OperandState
+from .operands import get_operand_actor_class, OperandState, OperandHostActor, \
+    HostedOperandRef
 from .resource import ResourceActor
 from .session import SessionActor
 from .utils import SchedulerActor, GraphState
@@ -76,6 +77,8 @@ class GraphMetaActor(SchedulerActor):
         self._op_infos = defaultdict(dict)
         self._state_to_infos = defaultdict(dict)
 
+        self._trace_spans = deque(maxlen=options.trace.max_spans)
+
     def post_create(self):
         super().post_create()
         self._kv_store_ref = self.ctx.actor_ref(KVStoreActor.default_uid())
@@ -171,6 +174,12 @@ class GraphMetaActor(SchedulerActor):
             self._op_infos[key].update(info)
         self._update_session_graph_info()
 
+    def add_trace_spans(self, spans):
+        self._trace_spans.extend(spans)
+
+    def get_trace_spans(self):
+        return list(self._trace_spans)
+
     @log_unhandled
     def calc_stats(self):
         states = list(OperandState.__members__.values())
@@ -279,6 +288,7 @@ class GraphActor(SchedulerActor):
         self._terminated_chunk_keys = set()
         self._terminal_chunk_keys = set()
         self._target_tileable_finished = dict()
+        self._pinned_tileable_keys = set()
 
         self._assigned_workers = set()
         self._worker_adds = set()
@@ -435,7 +445,6 @@ class GraphActor(SchedulerActor):
         """
         Stop graph execution
         """
-        from .operands import OperandActor
         if self.state == GraphState.CANCELLED:
             return
         self.state = GraphState.CANCELLING
@@ -453,11 +462,8 @@ class GraphActor(SchedulerActor):
             if self._operand_infos[chunk.op.key].get('state') in \
                     (OperandState.READY, OperandState.RUNNING, OperandState.FINISHED):
                 # we only need to stop on ready, running and finished operands
-                op_uid = OperandActor.gen_uid(self._session_id, chunk.op.key)
-                scheduler_addr = self.get_scheduler(op_uid)
-                ref = self.ctx.actor_ref(op_uid, address=scheduler_addr)
                 has_stopping = True
-                ref.stop_operand(_tell=True)
+                self._get_operand_ref(chunk.op.key).stop_operand(_tell=True)
         if not has_stopping:
             self.state = GraphState.CANCELLED
             self._graph_meta_ref.set_graph_end(_tell=True, _wait=False)
@@ -701,6 +707,12 @@ class GraphActor(SchedulerActor):
         metrics = self._resource_actor_ref.get_workers_meta()
         return dict((ep, int(metrics[ep]['hardware']['cpu_total'])) for ep in metrics)
 
+    def _get_pinned_chunk_keys(self, chunk_keys):
+        if not chunk_keys or self._session_ref is None \
+                or not self.ctx.has_actor(self._session_ref):
+            return set()
+        return set(self._session_ref.filter_pinned_chunk_keys(chunk_keys))
+
     def _collect_external_input_metas(self, ext_chunks_to_inputs):
         ext_chunk_keys = reduce(operator.add, ext_chunks_to_inputs.values(), [])
         metas = dict(zip(ext_chunk_keys,
@@ -712,7 +724,8 @@ class GraphActor(SchedulerActor):
                 chunk_metas[k] = metas[k]
         return input_chunk_metas
 
-    def assign_operand_workers(self, op_keys, input_chunk_metas=None, analyzer=None):
+    def assign_operand_workers(self, op_keys, input_chunk_metas=None, analyzer=None,
+                               pinned_chunk_keys=None):
         operand_infos = self._operand_infos
         chunk_graph = self.get_chunk_graph()
 
@@ -724,7 +737,8 @@ class GraphActor(SchedulerActor):
         else:
             if analyzer is None:
                 analyzer = GraphAnalyzer(chunk_graph, self._get_worker_slots())
-            assignments = analyzer.calc_operand_assignments(op_keys, input_chunk_metas=input_chunk_metas)
+            assignments = analyzer.calc_operand_assignments(
+                op_keys, input_chunk_metas=input_chunk_metas, pinned_chunk_keys=pinned_chunk_keys)
         for idx, (k, v) in enumerate(assignments.items()):
             operand_infos[k]['optimize']['placement_order'] = idx
             operand_infos[k]['target_worker'] = v
@@ -739,12 +753,14 @@ class GraphActor(SchedulerActor):
         if invalid_keys:
             raise KeyError(f'Input metas for data chunks {invalid_keys!r} missing when '
                            f'executing graph {self._graph_key}')
+        pinned_chunk_keys = self._get_pinned_chunk_keys(
+            reduce(operator.add, ext_chunks_to_inputs.values(), []))
 
         def _do_assign():
             # do placements
             return self.assign_operand_workers(
                 analyzer.get_initial_operand_keys(), input_chunk_metas=input_chunk_metas,
-                analyzer=analyzer
+                analyzer=analyzer, pinned_chunk_keys=pinned_chunk_keys
             )
 
         return self._graph_analyze_pool.submit(_do_assign).result()
@@ -889,7 +905,9 @@ class GraphActor(SchedulerActor):
         operand_infos = self._operand_infos
 
         session_id = self._session_id
+        n_host_shards = options.scheduler.operand_host_shards
         op_refs = dict()
+        host_op_specs = defaultdict(list)
         meta_op_infos = dict()
         initial_keys = []
         to_allocate_op_keys = set()
@@ -936,16 +954,25 @@ class GraphActor(SchedulerActor):
                 kw['allocated'] = True
                 to_allocate_op_keys.add(op_key)
 
-            op_refs[op_key] = self.ctx.create_actor(
-                op_cls, session_id, self._graph_key, op_key, op_info.copy(),
-                with_kvstore=self._kv_store_ref is not None,
-                schedulers=self.get_schedulers(),
-                uid=op_uid, address=scheduler_addr, wait=False, **kw
-            )
+            if n_host_shards:
+                host_uid = op_info['operand_host'] = OperandHostActor.gen_operand_host_uid(
+                    session_id, op_key, n_host_shards)
+                kw['with_kvstore'] = self._kv_store_ref is not None
+                host_op_specs[host_uid].append((op_cls, op_key, op_info.copy(), kw))
+            else:
+                op_refs[op_key] = self.ctx.create_actor(
+                    op_cls, session_id, self._graph_key, op_key, op_info.copy(),
+                    with_kvstore=self._kv_store_ref is not None,
+                    schedulers=self.get_schedulers(),
+                    uid=op_uid, address=scheduler_addr, wait=False, **kw
+                )
             if _clean_info:
                 op_info.pop('executable_dag', None)
                 del op_info['io_meta']
 
+        if host_op_specs:
+            self._create_operands_in_hosts(host_op_specs, n_host_shards)
+
         self.state = GraphState.RUNNING
         self._graph_meta_ref.update_op_infos(meta_op_infos, _tell=True, _wait=False)
 
@@ -979,6 +1006,32 @@ class GraphActor(SchedulerActor):
             self._assigner_actor_ref.apply_for_multiple_resources(
                 session_id, res_applications, _tell=True)
 
+    def _create_operands_in_hosts(self, host_op_specs, n_host_shards):
+        """
+        Create operands in OperandHostActors instead of creating one actor
+        for every operand. Hosts are shared among graphs in the same session.
+        """
+        host_refs = dict()
+        futures = []
+        for shard in range(n_host_shards):
+            host_uid = OperandHostActor.gen_uid(self._session_id, shard)
+            if host_uid not in host_op_specs:
+                continue
+            futures.append((host_uid, self.ctx.create_actor(
+                OperandHostActor, self._session_id, shard, n_host_shards,
+                uid=host_uid, address=self.get_scheduler(host_uid), wait=False)))
+        for host_uid, future in futures:
+            try:
+                host_refs[host_uid] = future.result()
+            except ActorAlreadyExist:
+                host_refs[host_uid] = self.get_actor_ref(host_uid)
+
+        futures = []
+        for host_uid, op_specs in host_op_specs.items():
+            futures.append(host_refs[host_uid].create_operands(
+                self._graph_key, op_specs, _wait=False))
+        [f.result() for f in futures]
+
     @log_unhandled
     def add_finished_terminal(self, op_key, final_state=None, exc=None):
         """
@@ -1117,6 +1170,10 @@ class GraphActor(SchedulerActor):
             return dict((k, info) for k, info in self._operand_infos.items()
                         if info.get('state') == state)
 
+    @log_unhandled
+    def add_trace_spans(self, spans):
+        self._graph_meta_ref.add_trace_spans(spans, _tell=True, _wait=False)
+
     @log_unhandled
     def set_operand_worker(self, op_key, worker):
         if op_key not in self._operand_infos and self.state in GraphState.TERMINATED_STATES:
@@ -1134,6 +1191,9 @@ class GraphActor(SchedulerActor):
     @lru_cache(1000)
     def _get_operand_ref(self, key):
         from .operands import OperandActor
+        host_uid = self._operand_infos[key].get('operand_host')
+        if host_uid is not None:
+            return HostedOperandRef(self.get_actor_ref(host_uid), key)
         op_uid = OperandActor.gen_uid(self._session_id, key)
         scheduler_addr = self.get_scheduler(op_uid)
         return self.ctx.actor_ref(op_uid, address=scheduler_addr)
@@ -1158,6 +1218,42 @@ class GraphActor(SchedulerActor):
                      tileable_key, [c.key for c in tileable.chunks])
         [f.result() for f in futures]
 
+        if tileable_key in self._pinned_tileable_keys:
+            self._pinned_tileable_keys.remove(tileable_key)
+            self._session_ref.unpin_chunk_keys(
+                [c.key for c in tileable.chunks], _tell=True, _wait=False)
+
+    @log_unhandled
+    def pin_tileable_data(self, tileable_key, pin=True):
+        """
+        Pin or unpin chunks of a tileable in workers holding them. Pinned
+        chunks are not spilled where possible, and operands consuming
+        them in later graphs are assigned to workers holding them.
+        """
+        from ..worker import ExecutionActor
+
+        tileable = self._get_tileable_by_key(tileable_key)
+        chunk_keys = [c.key for c in tileable.chunks]
+        if pin:
+            self._pinned_tileable_keys.add(tileable_key)
+            self._session_ref.pin_chunk_keys(chunk_keys)
+        else:
+            self._pinned_tileable_keys.discard(tileable_key)
+            self._session_ref.unpin_chunk_keys(chunk_keys)
+
+        worker_to_keys = defaultdict(list)
+        for chunk_key, endpoints in zip(
+                chunk_keys, self.chunk_meta.batch_get_workers(self._session_id, chunk_keys)):
+            for ep in endpoints or ():
+                worker_to_keys[ep].append(chunk_key)
+
+        futures = []
+        for ep, keys in worker_to_keys.items():
+            execution_ref = self.ctx.actor_ref(ExecutionActor.default_uid(), address=ep)
+            futures.append(execution_ref.pin_data_by_keys(
+                self._session_id, keys, pin=pin, _tell=True, _wait=False))
+        [f.result() for f in futures]
+
     def get_tileable_metas(self, tileable_keys, filter_fields=None):
         """
         Get tileable meta including nsplits, chunk keys and chunk indexes.
@@ -16,5 +16,6 @@ from .base import BaseOperandActor
 from .core import register_operand_class, get_operand_actor_class, \
     OperandState
 from .common import OperandActor
+from .host import OperandHostActor, HostedOperandRef
 from .shuffle import ShuffleProxyActor
 from .successors_exclusive import SuccessorsExclusiveOperandActor
@@ -19,6 +19,7 @@ import time
 from ...config import options
 from ...errors import ExecutionInterrupted, DependencyMissing, WorkerDead
 from ...operands import Operand
+from ...tracing import TraceSpan
 from ...utils import log_unhandled, insert_reversed_tuple
 from ..utils import GraphState, array_to_bytes
 from .base import BaseOperandActor
@@ -59,6 +60,9 @@ class OperandActor(BaseOperandActor):
         self._input_worker_scores = dict()
         self._worker_scores = dict()
 
+        # time when the operand is ready, used in tracing
+        self._ready_time = None
+
         self._allocated = allocated
         self._submit_promise = None
 
@@ -355,6 +359,11 @@ class OperandActor(BaseOperandActor):
             return
 
         self.worker = worker
+        if options.trace.enabled and self._ready_time is not None:
+            span = TraceSpan('assigning', self._op_key, self._ready_time, time.time(),
+                             address=self.address, args=dict(worker=worker))
+            for graph_ref in self._graph_refs:
+                graph_ref.add_trace_spans([span], _tell=True, _wait=False)
 
         target_predicts = self._get_target_predicts(worker)
         try:
@@ -399,6 +408,7 @@ class OperandActor(BaseOperandActor):
     def _on_ready(self):
         self.worker = None
         self._execution_ref = None
+        self._ready_time = time.time()
 
         def _apply_fail(*exc_info):
             if issubclass(exc_info[0], DependencyMissing):
@@ -0,0 +1,305 @@
+# Copyright 1999-2020 Alibaba Group Holding Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextlib
+import logging
+import sys
+from collections import defaultdict, deque
+
+from ...lib.mmh3 import hash as mmh_hash
+from ...utils import to_binary, log_unhandled
+from ..utils import SchedulerActor
+from .base import BaseOperandActor
+
+logger = logging.getLogger(__name__)
+
+
+class _DoneFuture(object):
+    """
+    Future-like object holding the result of an operand call which is
+    already executed inside the host
+    """
+    __slots__ = '_result', '_exc_info'
+
+    def __init__(self, result=None, exc_info=None):
+        self._result = result
+        self._exc_info = exc_info
+
+    def result(self):
+        if self._exc_info is not None:
+            raise self._exc_info[1].with_traceback(self._exc_info[2])
+        return self._result
+
+
+class HostedOperandRef(object):
+    """
+    Ref-like object addressing an operand inside an :class:`OperandHostActor`.
+    When ``caller`` is a host, the call is dispatched by the host itself,
+    otherwise it is sent to the host as an actor message.
+    """
+    def __init__(self, host_ref, op_key, caller=None):
+        self._host_ref = host_ref
+        self._op_key = op_key
+        self._caller = caller
+
+    @property
+    def uid(self):
+        return self._host_ref.uid
+
+    @property
+    def address(self):
+        return self._host_ref.address
+
+    @property
+    def op_key(self):
+        return self._op_key
+
+    def __getattr__(self, item):
+        if item.startswith('_'):
+            return object.__getattribute__(self, item)
+
+        def _mt_call(*args, **kwargs):
+            if self._caller is not None:
+                return self._caller.dispatch_operand_call(
+                    self._host_ref.uid, self._op_key, item, args, kwargs)
+            control = dict((k, kwargs.pop(k)) for k in ('_tell', '_wait', '_delay')
+                           if k in kwargs)
+            return self._host_ref.call_operand(self._op_key, item, args, kwargs, **control)
+
+        return _mt_call
+
+
+class HostedOperandMixin(object):
+    """
+    Mixin making an operand actor class runnable as a plain object
+    inside an :class:`OperandHostActor`
+    """
+    _host = None
+
+    def bind_host(self, host):
+        self._host = host
+        self.uid = BaseOperandActor.gen_uid(self._session_id, self._op_key)
+        self.address = host.address
+        self.ctx = host.ctx
+
+    def ref(self):
+        return self._host.get_operand_ref(self._op_key)
+
+    def set_cluster_info_ref(self, set_schedulers_fun_name=None):
+        # scheduler changes are observed by the host
+        self._cluster_info_ref = self._host._cluster_info_ref
+
+    def unset_cluster_info_ref(self):
+        pass
+
+    def get_schedulers(self):
+        return self._host.get_schedulers()
+
+    def get_scheduler(self, key, size=1):
+        return self._host.get_scheduler(key, size=size)
+
+    @property
+    def chunk_meta(self):
+        return self._host.chunk_meta
+
+    @property
+    def async_group(self):
+        return self._host.async_group
+
+    def promise_ref(self, *args, **kwargs):
+        return self._host.promise_ref(*args, **kwargs)
+
+    def tell_promise(self, callback, *args, **kwargs):
+        return self._host.tell_promise(callback, *args, **kwargs)
+
+    def _get_operand_actor(self, key):
+        return self._host.get_operand_ref(key)
+
+
+_hosted_classes = dict()
+
+
+def get_hosted_operand_class(op_cls):
+    try:
+        return _hosted_classes[op_cls]
+    except KeyError:
+        hosted_cls = _hosted_classes[op_cls] = \
+            type(f'Hosted{op_cls.__name__}', (HostedOperandMixin, op_cls), {})
+        return hosted_cls
+
+
+class OperandHostActor(SchedulerActor):
+    """
+    Actor hosting a shard of operands in a session. Operands live as plain
+    objects, and state transitions among operands in the same host are
+    queued and processed in batches inside the host instead of being sent
+    as actor messages. Transitions towards operands in other hosts are
+    coalesced into one message per host in each batch.
+    """
+    @staticmethod
+    def gen_uid(session_id, shard):
+        return f's:h1:operand_host${session_id}${shard}'
+
+    @classmethod
+    def gen_operand_host_uid(cls, session_id, op_key, n_shards):
+        return cls.gen_uid(session_id, mmh_hash(to_binary(op_key)) % n_shards)
+
+    def __init__(self, session_id, shard, n_shards):
+        super().__init__()
+        self._session_id = session_id
+        self._shard = shard
+        self._n_shards = n_shards
+
+        self._operands = dict()
+        self._operand_refs = dict()
+        self._host_refs = dict()
+
+        # queue of calls on operands inside current host
+        self._pending_calls = deque()
+        # calls on operands in other hosts, grouped by host uid
+        self._outboxes = defaultdict(list)
+        self._batch_depth = 0
+
+    def post_create(self):
+        super().post_create()
+        self.set_cluster_info_ref()
+
+    def pre_destroy(self):
+        for op in self._operands.values():
+            op.pre_destroy()
+        self.unset_cluster_info_ref()
+        super().pre_destroy()
+
+    def _get_host_ref(self, host_uid):
+        try:
+            return self._host_refs[host_uid]
+        except KeyError:
+            ref = self._host_refs[host_uid] = self.get_actor_ref(host_uid)
+            return ref
+
+    def get_operand_ref(self, op_key):
+        try:
+            return self._operand_refs[op_key]
+        except KeyError:
+            host_uid = self.gen_operand_host_uid(self._session_id, op_key, self._n_shards)
+            ref = self._operand_refs[op_key] = HostedOperandRef(
+                self._get_host_ref(host_uid), op_key, caller=self)
+            return ref
+
+    @contextlib.contextmanager
+    def _batch(self):
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            if self._batch_depth == 1:
+                self._process_pending_calls()
+            self._batch_depth -= 1
+
+    def _process_pending_calls(self):
+        while True:
+            while self._pending_calls:
+                op_key, method, args, kwargs = self._pending_calls.popleft()
+                try:
+                    getattr(self._operands[op_key], method)(*args, **kwargs)
+                except:  # noqa: E722
+                    logger.exception('Unexpected error when calling %s on operand %s',
+                                     method, op_key)
+            for host_uid in list(self._outboxes.keys()):
+                self._flush_outbox(host_uid)
+            if not self._pending_calls:
+                break
+
+    def _flush_outbox(self, host_uid):
+        calls = self._outboxes.pop(host_uid, None)
+        if calls:
+            self._get_host_ref(host_uid).batch_call_operands(calls, _tell=True, _wait=False)
+
+    def dispatch_operand_call(self, host_uid, op_key, method, args, kwargs):
+        """
+        Dispatch a call made by a hosted operand onto another operand.
+        As actors handle messages one by one, calls towards other hosts
+        are always sent as tells to avoid hosts waiting for each other,
+        thus their results are not available.
+        """
+        tell = kwargs.pop('_tell', False)
+        wait = kwargs.pop('_wait', True)
+        delay = kwargs.pop('_delay', None)
+
+        if delay:
+            self._get_host_ref(host_uid).call_operand(
+                op_key, method, args, kwargs, _tell=True, _wait=False, _delay=delay)
+            return _DoneFuture()
+        elif host_uid != self.uid:
+            self._outboxes[host_uid].append((op_key, method, args, kwargs))
+            if not self._batch_depth:
+                self._flush_outbox(host_uid)
+            return _DoneFuture()
+        elif tell:
+            self._pending_calls.append((op_key, method, args, kwargs))
+            if not self._batch_depth:
+                with self._batch():
+                    pass
+            return _DoneFuture()
+
+        try:
+            with self._batch():
+                result = getattr(self._operands[op_key], method)(*args, **kwargs)
+        except:  # noqa: E722
+            if wait:
+                raise
+            return _DoneFuture(exc_info=sys.exc_info())
+        return result if wait else _DoneFuture(result)
+
+    @log_unhandled
+    def create_operands(self, graph_key, op_specs):
+        """
+        Create operands in the host, or append the graph to operands
+        already hosted. Operands are started in a separate message as
+        the caller is waiting for the call.
+        :param graph_key: key of the graph
+        :param op_specs: list of (operand actor class, operand key, operand info, kwargs)
+        """
+        for op_cls, op_key, op_info, kw in op_specs:
+            if op_key in self._operands:
+                self._pending_calls.append((op_key, 'append_graph', (graph_key, op_info), {}))
+                continue
+            op = self._operands[op_key] = get_hosted_operand_class(op_cls)(
+                self._session_id, graph_key, op_key, op_info,
+                schedulers=self.get_schedulers(), **kw)
+            op.bind_host(self)
+            self._pending_calls.append((op_key, 'post_create', (), {}))
+        self.ref().process_pending_calls(_tell=True, _wait=False)
+
+    def process_pending_calls(self):
+        with self._batch():
+            pass
+
+    def call_operand(self, op_key, method, args, kwargs):
+        with self._batch():
+            return getattr(self._operands[op_key], method)(*args, **kwargs)
+
+    def batch_call_operands(self, calls):
+        with self._batch():
+            self._pending_calls.extend(calls)
+
+    def handle_promise(self, promise_id, *args, **kwargs):
+        with self._batch():
+            return super().handle_promise(promise_id, *args, **kwargs)
+
+    def get_operand_states(self, op_keys):
+        return [self._operands[k].state for k in op_keys if k in self._operands]
+
+    def get_operand_count(self):
+        return len(self._operands)
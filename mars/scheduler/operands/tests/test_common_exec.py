@@ -176,6 +176,7 @@ class Test(unittest.TestCase):
                     raise SystemError('Wait for execution finish timeout')
                 if graph_meta_ref.get_state() in (GraphState.SUCCEEDED, GraphState.FAILED, GraphState.CANCELLED):
                     break
+            return graph_meta_ref.get_state()
 
     @patch_method(OperandActor._get_raw_execution_ref)
     @patch_method(OperandActor._free_data_in_worker)
@@ -200,6 +201,23 @@ class Test(unittest.TestCase):
         self._run_operand_case(session_id, graph_key, arr2,
                                lambda pool, uid: pool.create_actor(FakeExecutionActor, uid=uid))
 
+    @patch_method(OperandActor._get_raw_execution_ref)
+    @patch_method(OperandActor._free_data_in_worker)
+    def testOperandHostActor(self, *_):
+        arr = mt.random.randint(10, size=(10, 8), chunk_size=4)
+        arr_add = mt.random.randint(10, size=(10, 8), chunk_size=4)
+        arr2 = mt.concatenate([arr + arr_add, arr_add]).sum(axis=0)
+
+        session_id = str(uuid.uuid4())
+        graph_key = str(uuid.uuid4())
+        try:
+            options.scheduler.operand_host_shards = 3
+            state = self._run_operand_case(session_id, graph_key, arr2,
+                                           lambda pool, uid: pool.create_actor(FakeExecutionActor, uid=uid))
+            self.assertEqual(state, GraphState.SUCCEEDED)
+        finally:
+            options.scheduler.operand_host_shards = 0
+
     @patch_method(OperandActor._get_raw_execution_ref)
     @patch_method(OperandActor._free_data_in_worker)
     def testOperandActorWithRetry(self, *_):
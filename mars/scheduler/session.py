@@ -17,6 +17,7 @@ import os
 import uuid
 
 from .utils import SchedulerActor
+from ..config import options
 from ..utils import log_unhandled
 
 logger = logging.getLogger(__name__)
@@ -38,6 +39,7 @@ class SessionActor(SchedulerActor):
         self._graph_meta_refs = dict()
         self._tileable_to_graph = dict()
         self._mut_tensor_refs = dict()
+        self._pinned_chunk_keys = set()
 
     @staticmethod
     def gen_uid(session_id):
@@ -58,6 +60,15 @@ class SessionActor(SchedulerActor):
     def get_graph_ref_by_tileable_key(self, tileable_key):
         return self._tileable_to_graph[tileable_key]
 
+    def pin_chunk_keys(self, chunk_keys):
+        self._pinned_chunk_keys.update(chunk_keys)
+
+    def unpin_chunk_keys(self, chunk_keys):
+        self._pinned_chunk_keys.difference_update(chunk_keys)
+
+    def filter_pinned_chunk_keys(self, chunk_keys):
+        return [k for k in chunk_keys if k in self._pinned_chunk_keys]
+
     def post_create(self):
         super().post_create()
         logger.debug('Actor %s running in process %d', self.uid, os.getpid())
@@ -79,6 +90,14 @@ class SessionActor(SchedulerActor):
             self.ctx.destroy_actor(graph_ref)
         for mut_tensor_ref in self._mut_tensor_refs.values():
             self.ctx.destroy_actor(mut_tensor_ref)
+        self._destroy_operand_hosts()
+
+    def _destroy_operand_hosts(self):
+        from .operands import OperandHostActor
+        for shard in range(options.scheduler.operand_host_shards):
+            host_ref = self.get_actor_ref(OperandHostActor.gen_uid(self._session_id, shard))
+            if self.ctx.has_actor(host_ref):
+                self.ctx.destroy_actor(host_ref)
 
     def set_graph_info(self, graph_key, **kwargs):
         try:
@@ -232,6 +232,60 @@ class Test(unittest.TestCase):
         self.assertEqual(assignments['4'], 'w2')
         self.assertEqual(assignments['5'], 'w2')
 
+    def testAssignWithPinnedData(self):
+        import numpy as np
+        from mars.scheduler.chunkmeta import WorkerMeta
+        from mars.tensor.random import TensorRandint
+        from mars.tensor.arithmetic import TensorTreeAdd
+
+        graph = DAG()
+        inputs = [
+            tuple(TensorRandint(_key=str(i * 2 + j), dtype=np.float32()).new_chunk(
+                None, shape=(10, 10)) for j in range(2))
+            for i in range(3)
+        ]
+        results = [TensorTreeAdd(dtype=np.float32()).new_chunk(None, shape=(10, 10)) for _ in range(3)]
+        for inp, r in zip(inputs, results):
+            r.op._inputs = list(inp)
+
+            graph.add_node(r)
+            for n in inp:
+                graph.add_node(n)
+                graph.add_edge(n, r)
+
+        data_dist = {
+            '0': dict(c00=WorkerMeta(chunk_size=5, workers=('w1',)),
+                      c01=WorkerMeta(chunk_size=5, workers=('w2',))),
+            '1': dict(c10=WorkerMeta(chunk_size=10, workers=('w1',))),
+            '2': dict(c20=WorkerMeta(chunk_size=10, workers=('w3',))),
+            '3': dict(c30=WorkerMeta(chunk_size=10, workers=('w3',))),
+            '4': dict(c40=WorkerMeta(chunk_size=7, workers=('w3',)),
+                      c41=WorkerMeta(chunk_size=100, workers=('w2',))),
+        }
+        # pinned chunks are preferred even if quotas are used up
+        # or more data are held by other workers
+        analyzer = GraphAnalyzer(graph, dict(w1=24, w2=24, w3=24))
+        assignments = analyzer.calc_operand_assignments(
+            analyzer.get_initial_operand_keys(),
+            input_chunk_metas=data_dist,
+            pinned_chunk_keys={'c01', 'c40'},
+        )
+
+        self.assertEqual(len(assignments), 6)
+        self.assertEqual(assignments['0'], 'w2')
+        self.assertEqual(assignments['1'], 'w1')
+        self.assertEqual(assignments['4'], 'w3')
+
+        # pinned chunks in dead workers are ignored
+        analyzer = GraphAnalyzer(graph, dict(w1=24, w2=24))
+        assignments = analyzer.calc_operand_assignments(
+            analyzer.get_initial_operand_keys(),
+            input_chunk_metas=data_dist,
+            pinned_chunk_keys={'c40'},
+        )
+        self.assertEqual(len(assignments), 6)
+        self.assertIn(assignments['4'], ('w1', 'w2'))
+
     def testAssignsHalfway(self):
         from mars.operands import ShuffleProxy
 
@@ -18,8 +18,9 @@ import unittest
 import uuid
 
 from mars.actors import new_client
+from mars.config import options
 from mars.scheduler.chunkmeta import WorkerMeta, ChunkMetaStore, ChunkMetaCache, \
-    ChunkMetaActor, ChunkMetaClient
+    ColumnarChunkMetaStore, ColumnarChunkMetaCache, ChunkMetaActor, ChunkMetaClient
 from mars.scheduler.utils import SchedulerClusterInfoActor
 from mars.tests.core import patch_method, create_actor_pool
 from mars.utils import get_next_port
@@ -27,7 +28,12 @@ from mars.utils import get_next_port
 
 class Test(unittest.TestCase):
     def testChunkMetaStore(self):
-        store = ChunkMetaStore()
+        for store_cls in (ChunkMetaStore, ColumnarChunkMetaStore):
+            with self.subTest(store_cls=store_cls.__name__):
+                self._testChunkMetaStore(store_cls)
+
+    def _testChunkMetaStore(self, store_cls):
+        store = store_cls()
 
         store['c0'] = WorkerMeta(0, (0,), ('w0',))
         self.assertIn('c0', store)
@@ -63,7 +69,12 @@ class Test(unittest.TestCase):
         self.assertSetEqual(store.get_worker_chunk_keys('w1'), {'c1', 'c2'})
 
     def testChunkMetaCache(self):
-        cache = ChunkMetaCache(9)
+        for cache_cls in (ChunkMetaCache, ColumnarChunkMetaCache):
+            with self.subTest(cache_cls=cache_cls.__name__):
+                self._testChunkMetaCache(cache_cls)
+
+    def _testChunkMetaCache(self, cache_cls):
+        cache = cache_cls(9)
 
         for idx in range(10):
             cache[f'c{idx}'] = WorkerMeta(idx, (idx,), ('w0',))
@@ -94,6 +105,40 @@ class Test(unittest.TestCase):
         self.assertIn('c1', dup_cache)
         self.assertTrue(all(f'c{idx}' in dup_cache for idx in range(3, 11)))
 
+    def testColumnarChunkMetaStore(self):
+        store = ColumnarChunkMetaStore(capacity=4)
+        workers = [f'w{idx}' for idx in range(70)]
+
+        for idx in range(100):
+            store[f'c{idx}'] = WorkerMeta(idx * 10, (idx, 3), (workers[idx % 70], workers[-1]))
+        store['c_none'] = WorkerMeta(None, None, ('w0',))
+        self.assertEqual(len(store), 101)
+        # workers are listed in the order they are registered
+        self.assertEqual(store['c1'], WorkerMeta(10, (1, 3), ('w69', 'w1')))
+        self.assertEqual(store['c_none'], WorkerMeta(None, None, ('w0',)))
+        self.assertSetEqual(store.get_worker_chunk_keys('w25'), {'c25', 'c95'})
+
+        metas = store.batch_get(['c2', 'c_missing', 'c99'])
+        self.assertListEqual(metas, [
+            WorkerMeta(20, (2, 3), ('w69', 'w2')),
+            None,
+            WorkerMeta(990, (99, 3), ('w69', 'w29')),
+        ])
+
+        store['c3'] = WorkerMeta(30, (3, 3, 1), ('w1',))
+        self.assertEqual(store['c3'], WorkerMeta(30, (3, 3, 1), ('w1',)))
+        self.assertEqual(store['c4'], WorkerMeta(40, (4, 3), ('w69', 'w4')))
+
+        affected = store.remove_workers(['w69', 'w0', 'w1', 'w2'])
+        self.assertSetEqual(set(affected), {'c0', 'c1', 'c2', 'c3', 'c69', 'c70', 'c71', 'c72', 'c_none'})
+        self.assertEqual(store['c4'], WorkerMeta(40, (4, 3), ('w4',)))
+        self.assertIsNone(store.get_worker_chunk_keys('w69'))
+
+        # released rows and worker ids are reused
+        store['c_new'] = WorkerMeta(1, (1,), ('w_new',))
+        self.assertEqual(store['c_new'], WorkerMeta(1, (1,), ('w_new',)))
+        self.assertEqual(len(store), 93)
+
     @unittest.skipIf(sys.platform == 'win32', 'Currently not support multiple pools under Windows')
     @patch_method(ChunkMetaClient.get_scheduler)
     def testChunkMetaActors(self, *_):
@@ -204,6 +249,13 @@ class Test(unittest.TestCase):
                 self.assertEqual(loc_ref1.get_chunk_meta(session1, key5).chunk_size, 512)
                 self.assertEqual(loc_ref2.get_chunk_meta(session1, key6).chunk_size, 512)
 
+    def testColumnarChunkMetaActors(self):
+        try:
+            options.scheduler.columnar_chunk_meta = True
+            self.testChunkMetaActors()
+        finally:
+            options.scheduler.columnar_chunk_meta = False
+
     @unittest.skipIf(sys.platform == 'win32', 'Currently not support multiple pools under Windows')
     @patch_method(ChunkMetaClient.get_scheduler)
     def testChunkBroadcast(self, *_):
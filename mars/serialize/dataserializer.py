@@ -14,7 +14,9 @@
 
 import functools
 import gzip
+import io
 import struct
+import sys
 import zlib
 from collections import namedtuple
 from distutils.version import LooseVersion
@@ -43,6 +45,12 @@ try:
 except ImportError:  # pragma: no cover
     pyarrow = None
     SerializationCallbackError = Exception
+try:
+    with warnings.catch_warnings():
+        warnings.filterwarnings('ignore', category=FutureWarning)
+        ArrowSerializedPyObject = pyarrow.SerializedPyObject
+except AttributeError:  # pragma: no cover
+    ArrowSerializedPyObject = type('ArrowSerializedPyObject', (object,), {})
 try:
     from pyarrow.lib import ArrowNotImplementedError
 except ImportError:  # pragma: no cover
@@ -54,6 +62,14 @@ try:
 except ImportError:  # pragma: no cover
     vineyard = None
 
+if sys.version_info[:2] >= (3, 8):
+    pickle5 = pickle
+else:  # pragma: no cover
+    try:
+        import pickle5
+    except ImportError:
+        pickle5 = None
+
 
 BUFFER_SIZE = 256 * 1024
 
@@ -90,6 +106,28 @@ except ImportError:  # pragma: no cover
     lz4_compress, lz4_compressobj = None, None
     lz4_decompress, lz4_decompressobj = None, None
 
+try:
+    import zstandard
+
+    zstd_open = functools.partial(zstandard.open, closefd=False)
+
+    def zstd_compress(data):
+        return zstandard.ZstdCompressor().compress(data)
+
+    def zstd_compressobj():
+        return zstandard.ZstdCompressor().compressobj()
+
+    def zstd_decompressobj():
+        return zstandard.ZstdDecompressor().decompressobj()
+
+    def zstd_decompress(data):
+        # frames written in streaming mode do not record content sizes
+        return zstd_decompressobj().decompress(data)
+except ImportError:  # pragma: no cover
+    zstd_open = None
+    zstd_compress, zstd_compressobj = None, None
+    zstd_decompress, zstd_decompressobj = None, None
+
 gz_open = gzip.open
 gz_compressobj = functools.partial(
     lambda level=-1: zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS, zlib.DEF_MEM_LEVEL, 0)
@@ -122,43 +160,64 @@ class CompressType(_EnumTagMixin, Enum):
     NONE = 'none'
     LZ4 = 'lz4'
     GZIP = 'gzip'
+    ZSTD = 'zstd'
+    # compression selected for every piece of data given a sample of it,
+    # which is never written into file headers
+    ADAPTIVE = 'adaptive'
 CompressType._tags = {  # noqa: E305
     CompressType.NONE: 0,
     CompressType.LZ4: 1,
     CompressType.GZIP: 2,
+    CompressType.ZSTD: 3,
 }
 
 
 class SerialType(_EnumTagMixin, Enum):
     ARROW = 'arrow'
     PICKLE = 'pickle'
+    PICKLE5 = 'pickle5'
 SerialType._tags = {  # noqa: E305
     SerialType.ARROW: 0,
     SerialType.PICKLE: 1,
+    SerialType.PICKLE5: 2,
 }
 
 
+def get_default_serial_type():
+    if pickle5 is not None:
+        return SerialType.PICKLE5
+    elif pyarrow is not None:  # pragma: no cover
+        return SerialType.ARROW
+    else:  # pragma: no cover
+        return SerialType.PICKLE
+
+
 compressors = {
     CompressType.LZ4: lz4_compress,
     CompressType.GZIP: gz_compress,
+    CompressType.ZSTD: zstd_compress,
 }
 compressobjs = {
     CompressType.NONE: DummyCompress,
     CompressType.LZ4: lz4_compressobj,
     CompressType.GZIP: gz_compressobj,
+    CompressType.ZSTD: zstd_compressobj,
 }
 decompressors = {
     CompressType.LZ4: lz4_decompress,
     CompressType.GZIP: gz_decompress,
+    CompressType.ZSTD: zstd_decompress,
 }
 decompressobjs = {
     CompressType.NONE: DummyCompress,
     CompressType.LZ4: lz4_decompressobj,
     CompressType.GZIP: gz_decompressobj,
+    CompressType.ZSTD: zstd_decompressobj,
 }
 compress_openers = {
     CompressType.LZ4: lz4_open,
     CompressType.GZIP: gz_open,
+    CompressType.ZSTD: zstd_open,
 }
 
 
@@ -166,6 +225,43 @@ def get_supported_compressions():
     return set(k for k, v in decompressors.items() if v is not None)
 
 
+ADAPTIVE_SAMPLE_SIZE = 64 * 1024
+# data are not compressed if the saving ratio on the sample is below the value
+_ADAPTIVE_MIN_SAVING = 0.1
+# zstd is selected only when it saves more than lz4 by the ratio of sample size
+_ADAPTIVE_ZSTD_GAIN = 0.1
+
+
+def choose_compression(sample):
+    """
+    Choose compression type for data given a sample block of it. The sample
+    is compressed with fast compression types, and zstd is preferred over lz4
+    only when it produces notably smaller outputs.
+
+    :param sample: uncompressed sample block
+    :return: tuple of compression type and compression ratio on the sample
+    """
+    sample = memoryview(sample)[:ADAPTIVE_SAMPLE_SIZE]
+    sample_size = sample.nbytes
+    if not sample_size:
+        return CompressType.NONE, 1.0
+
+    ratios = dict()
+    for compress in (CompressType.LZ4, CompressType.ZSTD):
+        if compressors[compress] is not None:
+            ratios[compress] = len(compressors[compress](sample)) * 1.0 / sample_size
+    if not ratios:  # pragma: no cover
+        return CompressType.NONE, 1.0
+
+    compress = min(ratios, key=lambda k: ratios[k])
+    if compress == CompressType.ZSTD and CompressType.LZ4 in ratios \
+            and ratios[CompressType.LZ4] - ratios[compress] < _ADAPTIVE_ZSTD_GAIN:
+        compress = CompressType.LZ4
+    if ratios[compress] > 1 - _ADAPTIVE_MIN_SAVING:
+        return CompressType.NONE, 1.0
+    return compress, ratios[compress]
+
+
 def get_compressobj(compress):
     return compressobjs[compress]()
 
@@ -227,8 +323,8 @@ def load(file):
         if header.compress != CompressType.NONE:
             file.close()
 
-    if header.type == SerialType.ARROW:
-        return pyarrow.deserialize(memoryview(buf), mars_serialize_context())
+    if header.type in (SerialType.ARROW, SerialType.PICKLE5):
+        return deserialize(memoryview(buf))
     else:
         return pickle.loads(buf)
 
@@ -243,7 +339,9 @@ def loads(buf):
     else:
         data = decompressors[compress](mv[HEADER_LENGTH:])
 
-    if header.type == SerialType.ARROW:
+    if header.type == SerialType.PICKLE5:
+        return deserialize(memoryview(data))
+    elif header.type == SerialType.ARROW:
         try:
             return deserialize(memoryview(data))
         except pyarrow.lib.ArrowInvalid:  # pragma: no cover
@@ -260,24 +358,62 @@ def loads(buf):
         return pickle.loads(data)
 
 
+class _SampleWriter(io.RawIOBase):
+    """
+    File-like object keeping only leading bytes written into it
+    """
+    def __init__(self, size):
+        super().__init__()
+        self._size = size
+        self._bio = BytesIO()
+
+    def writable(self):
+        return True
+
+    def write(self, d):
+        mv = memoryview(d).cast('B')
+        remain = self._size - self._bio.tell()
+        if remain > 0:
+            self._bio.write(mv[:remain])
+        return len(mv)
+
+    def getvalue(self):
+        return self._bio.getvalue()
+
+
+def get_serialized_sample(serialized, size=ADAPTIVE_SAMPLE_SIZE):
+    """
+    Get leading bytes of serialized data as a sample for choosing compressions
+    """
+    if isinstance(serialized, (bytes, bytearray, memoryview)):
+        return memoryview(serialized)[:size]
+    writer = _SampleWriter(size)
+    serialized.write_to(writer)
+    return writer.getvalue()
+
+
 def dump(obj, file, *, serial_type=None, compress=None, pickle_protocol=None):
     if serial_type is None:
-        serial_type = SerialType.ARROW if pyarrow is not None else SerialType.PICKLE
+        serial_type = get_default_serial_type()
     if compress is None:
         compress = CompressType.NONE
+
+    if serial_type in (SerialType.ARROW, SerialType.PICKLE5):
+        serialized = serialize(obj, serial_type=serial_type)
+        data_size = serialized.total_bytes
+    else:
+        pickle_protocol = pickle_protocol or pickle.HIGHEST_PROTOCOL
+        serialized = pickle.dumps(obj, protocol=pickle_protocol)
+        data_size = len(serialized)
+    if compress == CompressType.ADAPTIVE:
+        compress, _ = choose_compression(get_serialized_sample(serialized))
+
     try:
-        if serial_type == SerialType.ARROW:
-            serialized = serialize(obj)
-            data_size = serialized.total_bytes
-            write_file_header(file, file_header(serial_type, SERIAL_VERSION, data_size, compress))
-            file = open_compression_file(file, compress)
+        write_file_header(file, file_header(serial_type, SERIAL_VERSION, data_size, compress))
+        file = open_compression_file(file, compress)
+        if hasattr(serialized, 'write_to'):
             serialized.write_to(file)
         else:
-            pickle_protocol = pickle_protocol or pickle.HIGHEST_PROTOCOL
-            serialized = pickle.dumps(obj, protocol=pickle_protocol)
-            data_size = len(serialized)
-            write_file_header(file, file_header(serial_type, SERIAL_VERSION, data_size, compress))
-            file = open_compression_file(file, compress)
             file.write(serialized)
     finally:
         if compress != CompressType.NONE:
@@ -303,10 +439,141 @@ def _wrap_deprecates(fun):
     return fun
 
 
-@_wrap_deprecates
-def serialize(data):
-    if isinstance(data, pyarrow.SerializedPyObject):
+_PICKLE5_MAGIC = b'\x93MP5'
+# magic, number of buffers and size of pickled payload
+_PICKLE5_PREFIX = struct.Struct('<4sIQ')
+_PICKLE5_ALIGNMENT = 64
+
+
+def _align_pickle5_offset(offset):
+    return (offset + _PICKLE5_ALIGNMENT - 1) // _PICKLE5_ALIGNMENT * _PICKLE5_ALIGNMENT
+
+
+class Pickle5SerializedObject(object):
+    """
+    Object serialized with pickle protocol 5. The object consists of a
+    header holding the pickled payload and a list of out-of-band buffers
+    referencing memory of the original object, thus data can be written
+    or sent buffer by buffer without being concatenated first.
+
+    When laid out continuously, every buffer is aligned to 64 bytes.
+    """
+    __slots__ = 'header', 'buffers', '_total_bytes'
+
+    def __init__(self, header, buffers):
+        self.header = header
+        self.buffers = [memoryview(b) for b in buffers]
+
+        offset = len(header)
+        for buf in self.buffers:
+            offset = _align_pickle5_offset(offset) + buf.nbytes
+        self._total_bytes = offset
+
+    def __reduce_ex__(self, protocol):
+        if protocol >= 5:
+            return type(self), (bytes(self.header), [pickle5.PickleBuffer(b) for b in self.buffers])
+        return _deserialize_pickle5_object, (self.to_buffer().tobytes(),)
+
+    @property
+    def total_bytes(self):
+        return self._total_bytes
+
+    def to_buffers(self):
+        """
+        Get the list of buffers to be written continuously, including paddings
+        """
+        results = [self.header]
+        offset = len(self.header)
+        for buf in self.buffers:
+            aligned = _align_pickle5_offset(offset)
+            if aligned > offset:
+                results.append(bytes(aligned - offset))
+            results.append(buf)
+            offset = aligned + buf.nbytes
+        return results
+
+    def write_to(self, file):
+        for buf in self.to_buffers():
+            file.write(buf)
+
+    def to_buffer(self):
+        buf = bytearray(self._total_bytes)
+        mv = memoryview(buf)
+        offset = 0
+        for b in self.to_buffers():
+            mv[offset:offset + len(b)] = b
+            offset += len(b)
+        return mv
+
+    def deserialize(self, context=None):
+        payload = memoryview(self.header)[_PICKLE5_PREFIX.size + 8 * len(self.buffers):]
+        return pickle5.loads(payload, buffers=self.buffers)
+
+
+def _serialize_pickle5(data):
+    buffers = []
+    payload = pickle5.dumps(data, protocol=5, buffer_callback=buffers.append)
+    buffers = [b.raw() for b in buffers]
+    header = b''.join([
+        _PICKLE5_PREFIX.pack(_PICKLE5_MAGIC, len(buffers), len(payload)),
+        struct.pack(f'<{len(buffers)}Q', *(b.nbytes for b in buffers)),
+        payload,
+    ])
+    return Pickle5SerializedObject(header, buffers)
+
+
+def is_pickle5_serialized(data):
+    return isinstance(data, Pickle5SerializedObject) \
+        or bytes(memoryview(data)[:len(_PICKLE5_MAGIC)]) == _PICKLE5_MAGIC
+
+
+def _deserialize_pickle5_object(data):
+    mv = memoryview(data)
+    _, n_buffers, payload_size = _PICKLE5_PREFIX.unpack_from(mv)
+    sizes = struct.unpack_from(f'<{n_buffers}Q', mv, _PICKLE5_PREFIX.size)
+
+    offset = _PICKLE5_PREFIX.size + 8 * n_buffers + payload_size
+    header = mv[:offset]
+    buffers = []
+    for size in sizes:
+        offset = _align_pickle5_offset(offset)
+        buffers.append(mv[offset:offset + size])
+        offset += size
+    return Pickle5SerializedObject(header, buffers)
+
+
+def serialize(data, serial_type=None):
+    """
+    Serialize data into an object whose buffers can be written without
+    being concatenated.
+    :param data: data to serialize
+    :param serial_type: serial type, pickle protocol 5 by default
+    """
+    if isinstance(data, (Pickle5SerializedObject, ArrowSerializedPyObject)):
         return data
+    serial_type = serial_type or get_default_serial_type()
+    if serial_type == SerialType.PICKLE5:
+        try:
+            return _serialize_pickle5(data)
+        except (pickle.PicklingError, TypeError, AttributeError, BufferError):
+            raise SerializationFailed(obj=data) from None
+    return _serialize_arrow(data)
+
+
+def deserialize(data):
+    """
+    Deserialize data from a buffer or an object returned by :func:`serialize`.
+    Serial type is detected from the data.
+    """
+    if isinstance(data, Pickle5SerializedObject):
+        return data.deserialize()
+    elif not isinstance(data, ArrowSerializedPyObject) and is_pickle5_serialized(data):
+        return _deserialize_pickle5_object(data).deserialize()
+    return _deserialize_arrow(data)
+
+
+@_wrap_deprecates
+def _serialize_arrow(data):
     try:
         return pyarrow.serialize(data, mars_serialize_context())
     except (ArrowNotImplementedError, SerializationCallbackError):
@@ -321,7 +588,9 @@ def serialize(data):
 
 
 @_wrap_deprecates
-def deserialize(data):
+def _deserialize_arrow(data):
+    if isinstance(data, ArrowSerializedPyObject):
+        return data.deserialize(mars_serialize_context())
     return pyarrow.deserialize(data, mars_serialize_context())
 
 
@@ -849,3 +849,83 @@ class Test(unittest.TestCase):
             des_tp = dataserializer.deserialize(dataserializer.serialize(tp).to_buffer())
             assert_array_equal(tp[0], des_tp[0])
             self.assertTrue((tp[1].spmatrix != des_tp[1].spmatrix).nnz == 0)
+
+    @unittest.skipIf(dataserializer.pickle5 is None, 'pickle protocol 5 not supported.')
+    def testPickle5Serialize(self):
+        ser_type = dataserializer.SerialType.PICKLE5
+
+        array = np.random.rand(1000, 100)
+        serialized = dataserializer.serialize(array, serial_type=ser_type)
+        self.assertEqual(len(serialized.buffers), 1)
+        # data buffer refers to memory of the original array
+        self.assertTrue(np.shares_memory(np.frombuffer(serialized.buffers[0]), array))
+
+        buffers = serialized.to_buffers()
+        self.assertEqual(sum(len(b) for b in buffers), serialized.total_bytes)
+        self.assertEqual(len(b''.join(buffers[:-1])) % 64, 0)
+
+        buf = serialized.to_buffer()
+        self.assertTrue(dataserializer.is_pickle5_serialized(buf))
+        des_array = dataserializer.deserialize(buf)
+        assert_array_equal(array, des_array)
+        # deserialized array refers to memory of the buffer
+        self.assertTrue(np.shares_memory(des_array, np.frombuffer(buf, dtype=np.uint8)))
+
+        bio = BytesIO()
+        serialized.write_to(bio)
+        self.assertEqual(bio.getvalue(), bytes(buf))
+        assert_array_equal(array, dataserializer.deserialize(serialized))
+
+        for protocol in (4, 5):
+            des_serialized = pickle.loads(pickle.dumps(serialized, protocol=protocol))
+            assert_array_equal(array, des_serialized.deserialize())
+
+        df = pd.DataFrame({'a': np.random.rand(100), 'b': np.random.randint(100, size=100),
+                           'c': [f'c{i}' for i in range(100)]})
+        serialized = dataserializer.serialize(df, serial_type=ser_type)
+        self.assertGreater(len(serialized.buffers), 0)
+        pd.testing.assert_frame_equal(df, dataserializer.deserialize(serialized.to_buffer()))
+
+        tp = (np.random.rand(10, 10).T, np.array([]), np.random.rand(5))
+        des_tp = dataserializer.deserialize(
+            dataserializer.serialize(tp, serial_type=ser_type).to_buffer())
+        for a, b in zip(tp, des_tp):
+            assert_array_equal(a, b)
+
+        if sps:
+            mat = sparse.SparseMatrix(sps.random(100, 100, 0.1, format='csr'))
+            des_mat = dataserializer.deserialize(
+                dataserializer.serialize(mat, serial_type=ser_type).to_buffer())
+            self.assertTrue((mat.spmatrix != des_mat.spmatrix).nnz == 0)
+
+    def testAdaptiveCompress(self):
+        CompressType = dataserializer.CompressType
+        self.assertNotIn(CompressType.ADAPTIVE, dataserializer.get_supported_compressions())
+
+        arrays = [
+            np.random.rand(1000, 100),
+            np.zeros((1000, 100)),
+            np.random.randint(10, size=(1000, 100)),
+        ]
+        for array in arrays:
+            dumped = dataserializer.dumps(array, compress=CompressType.ADAPTIVE)
+            header = dataserializer.read_file_header(dumped)
+            self.assertNotEqual(header.compress, CompressType.ADAPTIVE)
+            assert_array_equal(array, dataserializer.loads(dumped))
+
+        # incompressible data are left uncompressed
+        compress, ratio = dataserializer.choose_compression(os.urandom(65536))
+        self.assertEqual(compress, CompressType.NONE)
+        self.assertGreater(ratio, 0.9)
+
+        if CompressType.LZ4 in dataserializer.get_supported_compressions():
+            compress, ratio = dataserializer.choose_compression(bytes(65536))
+            self.assertEqual(compress, CompressType.LZ4)
+            self.assertLess(ratio, 0.1)
+
+        if CompressType.ZSTD in dataserializer.get_supported_compressions():
+            array = np.random.rand(1000, 100)
+            dumped = dataserializer.dumps(array, compress=CompressType.ZSTD)
+            self.assertEqual(dataserializer.read_file_header(dumped).compress, CompressType.ZSTD)
+            assert_array_equal(array, dataserializer.loads(dumped))
+            assert_array_equal(array, dataserializer.load(BytesIO(dumped)))
@@ -28,8 +28,10 @@ from .context import get_context, LocalContext
 from .operands import Fetch
 from .tiles import get_tiled
 from .executor import Executor
+from .spill import get_spill_limit
 from .config import options
-from .utils import classproperty, calc_nsplits
+from .utils import classproperty, calc_nsplits, merge_chunks, split_chunk_batches, \
+    build_fetch_with_new_keys
 try:
     from .resource import cpu_count, cuda_count
 except ImportError:  # pragma: no cover
@@ -42,7 +44,7 @@ class LocalSession(object):
         engine = kwargs.pop('engine', None)
         self._endpoint = None
         self._session_id = uuid.uuid4()
-        self._context = LocalContext(self)
+        self._context = LocalContext(self, spill_limit=get_spill_limit())
         self._executor = Executor(engine=engine, storage=self._context)
 
         self._mut_tensor = dict()
@@ -124,6 +126,30 @@ class LocalSession(object):
             kw['n_parallel'] = cpu_count()
         return self._executor.fetch_tileables(tileables, **kw)
 
+    def iter_fetch(self, tileable, batch_size=1, **_):
+        from .optimizes.tileable_graph import tileable_optimized
+
+        if self._executor is None:
+            raise RuntimeError('Session has closed')
+        if tileable.key not in self._executor.stored_tileables and \
+                not isinstance(tileable.op, Fetch):
+            raise ValueError(
+                f'Tileable object {tileable.key} must be executed first before being fetched')
+
+        chunk_result = self._executor.chunk_result
+        tiled = get_tiled(tileable, mapping=tileable_optimized)
+        batches = split_chunk_batches([c.index for c in tiled.chunks],
+                                      [c.key for c in tiled.chunks], batch_size=batch_size)
+
+        def _iter_batches():
+            for batch in batches:
+                if len(batch) == 1:
+                    yield chunk_result[batch[0][1]]
+                else:
+                    yield merge_chunks([(idx, chunk_result[k]) for idx, k in batch])
+
+        return _iter_batches()
+
     def fetch_log(self, tileables, offsets=None, sizes=None):  # pragma: no cover
         raise NotImplementedError('`fetch_log` is not implemented for local executor')
 
@@ -163,6 +189,42 @@ class LocalSession(object):
     def get_named_tileable_infos(self, name):
         return self._context.get_named_tileable_infos(name)
 
+    def get_spill_stats(self):
+        """
+        Get counters of data spilled to disk and loaded back, as well as
+        size of data currently held in memory. All counters are zero if
+        spilling is not enabled by `options.local.spill_limit`.
+        """
+        spiller = self._context.spiller
+        stats = spiller.stats if spiller is not None \
+            else dict(spill_count=0, spill_bytes=0, load_count=0, load_bytes=0)
+        stats['mem_size'] = self._context.mem_size
+        stats['spilled_count'] = sum(1 for k in list(self._context) if self._context.is_spilled(k))
+        return stats
+
+    def compile(self, tileables, inputs, **kw):
+        with self.context:
+            if self._executor is None:
+                raise RuntimeError('Session has closed')
+            kw.pop('fetch', None)
+            return self._executor.compile_tileables(tileables, inputs, **kw)
+
+    def run_compiled(self, compiled, feeds, **kw):
+        with self.context:
+            if self._executor is None:
+                raise RuntimeError('Session has closed')
+            kw.pop('fetch', None)
+            if 'n_parallel' not in kw:
+                kw['n_parallel'] = cpu_count()
+            self.context.set_ncores(kw['n_parallel'])
+            return self._executor.execute_compiled(compiled, feeds, **kw)
+
+    def persist(self, *tileables):
+        self._executor.persist_tileables(tileables, pin=True)
+
+    def unpersist(self, *tileables):
+        self._executor.persist_tileables(tileables, pin=False)
+
     def decref(self, *keys):
         self._executor.decref(*keys)
 
@@ -383,6 +445,25 @@ class ClusterSession(object):
             tileable_results.append(sort_dataframe_result(tileable, result))
         return tileable_results
 
+    def iter_fetch(self, tileable, batch_size=1, prefetch=None):
+        from .serialize import dataserializer
+
+        if not self._is_executed(tileable):
+            raise ValueError('Cannot fetch the unexecuted tileable')
+
+        compressions = dataserializer.get_supported_compressions()
+        if getattr(tileable, 'chunks', None) is not None:
+            # fetch which owns fetch chunks inside remote
+            results = self._api.iter_fetch_chunks_data(
+                self._session_id, [c.index for c in tileable.chunks], [c.key for c in tileable.chunks],
+                batch_size=batch_size, prefetch=prefetch, serial=False, compressions=compressions)
+        else:
+            graph_key = self._get_tileable_graph_key(tileable.key)
+            results = self._api.iter_fetch_data(
+                self._session_id, graph_key, tileable.key, batch_size=batch_size,
+                prefetch=prefetch, serial=False, compressions=compressions)
+        return results
+
     def fetch_tileable_op_logs(self, tileable_op_key, offsets=None, sizes=None):
         return self._context.fetch_tileable_op_logs(
             tileable_op_key, chunk_op_key_to_offsets=offsets,
@@ -412,6 +493,18 @@ class ClusterSession(object):
         self._api.delete_data(self._session_id, graph_key, tileable_key, wait=wait)
         del self._executed_tileables[tileable_key]
 
+    def persist(self, *tileables):
+        for tileable in tileables:
+            graph_key = self._get_tileable_graph_key(tileable.key)
+            self._api.pin_data(self._session_id, graph_key, tileable.key, pin=True)
+
+    def unpersist(self, *tileables):
+        for tileable in tileables:
+            if tileable.key not in self._executed_tileables:
+                continue
+            graph_key = self._get_tileable_graph_key(tileable.key)
+            self._api.pin_data(self._session_id, graph_key, tileable.key, pin=False)
+
     def get_named_tileable_infos(self, name):
         return self._context.get_named_tileable_infos(name)
 
@@ -427,6 +520,124 @@ class ClusterSession(object):
         self._api.delete_session(self._session_id)
 
 
+class CompiledGraph(object):
+    """
+    Graph built by a function from inputs, which is tiled only once and
+    executed repeatedly with new values of inputs, see `Session.compile`.
+    """
+    def __init__(self, session, func, inputs, **kw):
+        self._session = session
+        self._func = func
+        self._id = uuid.uuid4().hex
+        self._n_inputs = len(inputs)
+        self._placeholders = None
+        self._outputs = None
+        self._ret_list = True
+        # tileables executed at once are kept until the graph is released
+        self._constants = []
+        self._compiled = None
+
+        if hasattr(session._sess, 'compile'):
+            self._compile(inputs, **kw)
+
+    @property
+    def compiled(self):
+        return self._compiled is not None
+
+    @staticmethod
+    def _to_tileable(obj):
+        from . import tensor as mt
+
+        return obj if isinstance(obj, (Entity, Base)) else mt.tensor(obj)
+
+    def _ensure_executed(self, tileables, **kw):
+        executed = self._session._sess.executed_tileables
+        to_run = [t for t in tileables if t.key not in executed]
+        if to_run:
+            self._session.run(*to_run, fetch=False, **kw)
+
+    def _compile(self, inputs, **kw):
+        sess = self._session._sess
+        inputs = [self._to_tileable(inp) for inp in inputs]
+        self._ensure_executed(inputs, **kw)
+        # placeholders have the same chunks as inputs, but their keys
+        # are unique thus their data can be replaced in every run
+        self._placeholders = [
+            build_fetch_with_new_keys(sess.executor.stored_tileables[inp.key][0], self._id)
+            for inp in inputs]
+
+        outputs = self._func(*self._placeholders)
+        self._ret_list = isinstance(outputs, (list, tuple))
+        self._outputs = list(outputs) if self._ret_list else [outputs]
+
+        compiled, constants = sess.compile(self._outputs, self._placeholders, **kw)
+        for t in constants:
+            t._attach_session(self._session)
+            self._constants.append(t)
+        if compiled is None:
+            # shapes are unknown before execution, thus the function is called in every run
+            self._placeholders = self._outputs = None
+            return
+        self._compiled = compiled
+
+    def _get_feeds(self, placeholder, value, **kw):
+        executor = self._session._sess.executor
+        if isinstance(value, (Entity, Base)):
+            self._ensure_executed([value], **kw)
+            stored = executor.stored_tileables[value.key][0]
+            if tuple(stored.shape) != tuple(placeholder.shape):
+                raise ValueError(f'Shape of input {stored.shape} does not '
+                                 f'match the compiled one {placeholder.shape}')
+            if tuple(stored.nsplits) == tuple(placeholder.nsplits):
+                # chunk data are shared without copy
+                index_to_key = {c.index: c.key for c in stored.chunks}
+                return {c.key: executor.chunk_result[index_to_key[c.index]]
+                        for c in placeholder.chunks}
+            value = self._session.fetch(value)
+
+        if not hasattr(value, 'iloc') and not hasattr(value, 'tocsr'):
+            value = np.asarray(value, dtype=placeholder.dtype)
+        if tuple(value.shape) != tuple(placeholder.shape):
+            raise ValueError(f'Shape of input {value.shape} does not '
+                             f'match the compiled one {placeholder.shape}')
+        getter = value.iloc.__getitem__ if hasattr(value, 'iloc') else value.__getitem__
+        cum_nsplits = [np.cumsum((0,) + tuple(ns)) for ns in placeholder.nsplits]
+        feeds = dict()
+        for c in placeholder.chunks:
+            slc = tuple(slice(cum[i], cum[i + 1]) for cum, i in zip(cum_nsplits, c.index))
+            feeds[c.key] = getter(slc)
+        return feeds
+
+    def run(self, *values, **kw):
+        """
+        Execute the graph with new values of inputs.
+
+        :param values: tensors or data in the order of inputs
+        :return: executed results of the function, which are new
+                 tileables in every run
+        """
+        from .core import ExecutableTuple
+
+        if len(values) != self._n_inputs:
+            raise TypeError(f'Expect {self._n_inputs} inputs, got {len(values)}')
+
+        if self._compiled is None:
+            outputs = self._func(*(self._to_tileable(v) for v in values))
+            ret_list = isinstance(outputs, (list, tuple))
+            outputs = list(outputs) if ret_list else [outputs]
+            ExecutableTuple(outputs).execute(session=self._session, **kw)
+            return outputs if ret_list else outputs[0]
+
+        sess = self._session._sess
+        feeds = dict()
+        for placeholder, value in zip(self._placeholders, values):
+            feeds.update(self._get_feeds(placeholder, value, **kw))
+        results = sess.run_compiled(self._compiled, feeds, **kw)
+        for t in results:
+            t._attach_session(self._session)
+        return results if self._ret_list else results[0]
+
+
 class Session(object):
     _default_session_local = threading.local()
 
@@ -538,6 +749,69 @@ class Session(object):
             return ret
         return ret[0]
 
+    def compile(self, func, *inputs, **kw):
+        """
+        Compile the graph built by `func` from inputs, thus it can be executed
+        repeatedly by `run` of the returned graph with new values of inputs,
+        while tiling is done only once. Tileables not depending on inputs,
+        like the training data captured by `func`, are executed once and kept.
+        Only local sessions support compilation. In other sessions, like
+        cluster sessions, or if shapes are unknown before execution, `func`
+        is called in every run instead, and `compiled` of the returned graph
+        is False.
+
+        :param func: function accepting tensors as inputs, returning
+                     a tileable or a list of tileables
+        :param inputs: tensors or data whose values are replaced in every run,
+                       shapes and chunks of values should be the same
+        :return: compiled graph
+        """
+        return CompiledGraph(self, func, inputs, **kw)
+
+    def persist(self, *tileables, **kw):
+        """
+        Execute tileables if not executed, and pin their chunks where they
+        are stored. Pinned chunks are not spilled where possible, and operands
+        consuming them in later runs are placed on workers holding them, thus
+        only small operands are transferred between workers in iterations.
+        Chunks are unpinned by `unpersist` or when tileables are deleted.
+        Sessions not supporting pinning only execute tileables.
+
+        :param tileables: tileables to persist
+        """
+        if len(tileables) == 1 and isinstance(tileables[0], (tuple, list)):
+            tileables = tileables[0]
+        kw['fetch'] = False
+        self.run(*tileables, **kw)
+        if hasattr(self._sess, 'persist'):
+            self._sess.persist(*tileables)
+
+    def unpersist(self, *tileables):
+        """
+        Unpin chunks of tileables pinned by `persist`.
+
+        :param tileables: tileables to unpin
+        """
+        if len(tileables) == 1 and isinstance(tileables[0], (tuple, list)):
+            tileables = tileables[0]
+        if hasattr(self._sess, 'unpersist'):
+            self._sess.unpersist(*tileables)
+
+    def iter_fetch(self, tileable, batch_size=1, **kw):
+        """
+        Fetch result of an executed tileable chunk by chunk. Chunks are
+        yielded in index order, every piece holds chunks in `batch_size`
+        consecutive rows and pieces can be concatenated along the first
+        axis to get the whole result.
+
+        :param tileable: tileable to fetch
+        :param batch_size: number of chunk rows in every piece
+        :param prefetch: number of pieces fetched ahead, only used in
+                         distributed sessions
+        :return: generator of pieces
+        """
+        return self._sess.iter_fetch(tileable, batch_size=batch_size, **kw)
+
     @property
     def endpoint(self):
         return self._sess.endpoint
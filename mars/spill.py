@@ -0,0 +1,270 @@
+# Copyright 1999-2020 Alibaba Group Holding Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+import weakref
+from collections import OrderedDict
+
+from .config import options
+from .serialize import dataserializer
+from .utils import calc_data_size, parse_readable_size
+
+
+def _remove_file(path):
+    try:
+        os.unlink(path)
+    except OSError:  # pragma: no cover
+        pass
+
+
+class SpilledData(object):
+    """
+    Placeholder of data spilled to disk. The file is removed once the
+    placeholder is not referred by any storage.
+    """
+    __slots__ = 'path', 'size', 'shape', '__weakref__'
+
+    def __init__(self, path, size, shape=None):
+        self.path = path
+        self.size = size
+        self.shape = shape
+        weakref.finalize(self, _remove_file, path)
+
+
+class DiskSpiller(object):
+    """
+    Write data into files of a local directory and read them back,
+    shared by copies of a storage
+    """
+    def __init__(self, spill_dir=None, eviction_policy=None):
+        from .worker.storage.eviction import get_eviction_policy
+
+        self._spill_dir = spill_dir or options.local.spill_directory
+        self._eviction_policy = get_eviction_policy(
+            eviction_policy or options.local.eviction_policy)
+        self._lock = threading.RLock()
+        self._stats = dict(spill_count=0, spill_bytes=0, load_count=0, load_bytes=0)
+
+    @property
+    def lock(self):
+        return self._lock
+
+    @property
+    def stats(self):
+        return self._stats.copy()
+
+    def _get_spill_dir(self):
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix='mars_local_spill_')
+            weakref.finalize(self, shutil.rmtree, self._spill_dir, True)
+        elif not os.path.exists(self._spill_dir):
+            os.makedirs(self._spill_dir)
+        return self._spill_dir
+
+    def iter_spill_keys(self, keys, data_sizes):
+        return self._eviction_policy.iter_spill_keys(keys, data_sizes, dict())
+
+    def dump(self, data, size):
+        path = os.path.join(self._get_spill_dir(), uuid.uuid4().hex)
+        with open(path, 'wb') as f:
+            dataserializer.dump(data, f)
+        self._stats['spill_count'] += 1
+        self._stats['spill_bytes'] += size
+        return SpilledData(path, size, shape=getattr(data, 'shape', None))
+
+    def load(self, spilled):
+        with open(spilled.path, 'rb') as f:
+            data = dataserializer.load(f)
+        self._stats['load_count'] += 1
+        self._stats['load_bytes'] += spilled.size
+        return data
+
+
+def get_spill_limit(limit=None):
+    """
+    Get size limit of memory in bytes from a size or a percentage of total memory
+    """
+    from .resource import virtual_memory
+
+    limit = limit if limit is not None else options.local.spill_limit
+    if limit is None:
+        return None
+    limit, is_percent = parse_readable_size(limit)
+    if is_percent:
+        limit *= virtual_memory().total
+    return int(limit)
+
+
+class SpillableStorage(dict):
+    """
+    Dict holding data in memory until their total size exceeds the limit,
+    then data are spilled to disk in order given by the eviction policy
+    and loaded back into memory once accessed. Spilled data are stored as
+    placeholders, thus copies of the storage share spilled files.
+    Pinned data are never spilled, and copies share pinned keys.
+    """
+    def __init__(self, *args, spill_limit=None, spiller=None, pinned_keys=None, **kwargs):
+        super().__init__()
+        self._spill_limit = spill_limit
+        if spill_limit is not None and spiller is None:
+            spiller = DiskSpiller()
+        self._spiller = spiller
+        self._pinned_keys = pinned_keys if pinned_keys is not None else set()
+        # sizes of data in memory, least recently used first
+        self._data_sizes = OrderedDict()
+        self._mem_size = 0
+        self.update(*args, **kwargs)
+
+    @property
+    def spill_limit(self):
+        return self._spill_limit
+
+    @property
+    def spiller(self):
+        return self._spiller
+
+    @property
+    def mem_size(self):
+        return self._mem_size
+
+    @property
+    def pinned_keys(self):
+        return self._pinned_keys
+
+    def pin_keys(self, keys):
+        """
+        Keep data of keys in memory, spilled data are loaded back
+        """
+        keys = list(keys)
+        self._pinned_keys.update(keys)
+        for key in keys:
+            if self.is_spilled(key):
+                # loaded data are put back into memory
+                _ = self[key]
+
+    def unpin_keys(self, keys):
+        self._pinned_keys.difference_update(keys)
+        if self._spiller is not None:
+            with self._spiller.lock:
+                self._spill()
+
+    def peek(self, key):
+        """
+        Get stored data without loading spilled data back into memory
+        """
+        return super().__getitem__(key)
+
+    def is_spilled(self, key):
+        return isinstance(super().get(key), SpilledData)
+
+    def _discard_size(self, key):
+        self._mem_size -= self._data_sizes.pop(key, 0)
+
+    def _spill(self, exclude=None):
+        if self._mem_size <= self._spill_limit:
+            return
+        keys = [k for k in self._data_sizes
+                if k != exclude and k not in self._pinned_keys]
+        for key in self._spiller.iter_spill_keys(keys, self._data_sizes):
+            if self._mem_size <= self._spill_limit:
+                break
+            size = self._data_sizes[key]
+            if size == 0:
+                continue
+            super().__setitem__(key, self._spiller.dump(super().__getitem__(key), size))
+            self._discard_size(key)
+
+    def _put(self, key, value):
+        self._discard_size(key)
+        super().__setitem__(key, value)
+        if not isinstance(value, SpilledData):
+            size = self._data_sizes[key] = calc_data_size(value)
+            self._mem_size += size
+            self._spill(exclude=key)
+
+    def __getitem__(self, key):
+        if self._spiller is None:
+            return super().__getitem__(key)
+        with self._spiller.lock:
+            value = super().__getitem__(key)
+            if isinstance(value, SpilledData):
+                value = self._spiller.load(value)
+                self._put(key, value)
+            elif key in self._data_sizes:
+                self._data_sizes.move_to_end(key)
+            return value
+
+    def __setitem__(self, key, value):
+        if self._spiller is None:
+            return super().__setitem__(key, value)
+        with self._spiller.lock:
+            self._put(key, value)
+
+    def __delitem__(self, key):
+        if self._spiller is None:
+            return super().__delitem__(key)
+        with self._spiller.lock:
+            super().__delitem__(key)
+            self._discard_size(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def pop(self, key, *args):
+        try:
+            value = self[key]
+        except KeyError:
+            if args:
+                return args[0]
+            raise
+        del self[key]
+        return value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        if self._spiller is None:
+            return super().update(*args, **kwargs)
+        # spilled data of other storages are copied as placeholders
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def items(self):
+        if self._spiller is None:
+            return super().items()
+        return [(key, self[key]) for key in list(self)]
+
+    def values(self):
+        if self._spiller is None:
+            return super().values()
+        return [self[key] for key in list(self)]
+
+    def clear(self):
+        super().clear()
+        self._data_sizes.clear()
+        self._mem_size = 0
+
+    def copy(self):
+        return SpillableStorage(self, spill_limit=self._spill_limit, spiller=self._spiller,
+                                pinned_keys=self._pinned_keys)
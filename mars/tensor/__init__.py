@@ -50,7 +50,8 @@ from .linalg.matmul import matmul
 from .reduction import sum, nansum, prod, prod as product, nanprod, \
     max, max as amax, nanmax, min, min as amin, nanmin, all, any, mean, nanmean, \
     argmax, nanargmax, argmin, nanargmin, cumsum, cumprod, \
-    var, std, nanvar, nanstd, nancumsum, nancumprod, count_nonzero, allclose, array_equal
+    var, std, nanvar, nanstd, nancumsum, nancumprod, count_nonzero, allclose, array_equal, \
+    unique_count_approx
 from .reshape import reshape
 from .merge import concatenate, stack, hstack, vstack, dstack, column_stack, union1d
 from .indexing import take, compress, extract, choose, unravel_index, \
@@ -18,6 +18,7 @@ import itertools
 import numpy as np
 
 from ...config import options
+from ...filesystem import get_fingerprint
 from ...serialize import ValueType, StringField, TupleField
 from ..utils import normalize_shape, decide_chunk_sizes
 from ..core import TensorOrder
@@ -136,6 +137,8 @@ class TensorLike(TensorHasInput):
 
 
 class TensorFromHDF5Like(TensorNoInput):
+    _external_source_ = True
+
     _filename = StringField('filename')
     _group = StringField('group')
     _dataset = StringField('dataset')
@@ -166,6 +169,11 @@ class TensorFromHDF5Like(TensorNoInput):
     def path(self):
         return self.get_path(self.group, self.dataset)
 
+    def get_fingerprint(self, memo=None):
+        if self._filename is None:
+            return None
+        return get_fingerprint(self._filename, memo=memo)
+
     def to_chunk_op(self, *args):
         _, chunk_index, nsplits = args
         chunk_op = super().to_chunk_op(*args)
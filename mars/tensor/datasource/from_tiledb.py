@@ -22,6 +22,7 @@ from .core import TensorNoInput
 
 class TensorTileDBDataSource(TensorNoInput):
     _op_type_ = OperandDef.TENSOR_FROM_TILEDB
+    _external_source_ = True
 
     _tiledb_config = DictField('tiledb_config')
     # URI of array to open
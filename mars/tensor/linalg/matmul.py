@@ -24,10 +24,11 @@ from ...utils import check_chunks_unknown_shape
 from ...tiles import TilesError
 from ..core import Tensor, TensorOrder
 from ..utils import broadcast_shape, check_out_param, unify_chunks, check_order
-from ..array_utils import device, as_same_device, is_sparse_module
+from ..array_utils import device, as_same_device, is_sparse_module, issparse
 from ..operands import TensorOperand, TensorOperandMixin
-from ..arithmetic.utils import tree_add
 from ..datasource import tensor as astensor
+from .tensordot import TensorTensorDot
+from .utils import multiply_accumulate_chunks
 
 
 class TensorMatmul(TensorOperand, TensorOperandMixin):
@@ -129,10 +130,13 @@ class TensorMatmul(TensorOperand, TensorOperandMixin):
     def tile(cls, op):
         a, b = op.inputs
         tensor = op.outputs[0]
+        check_chunks_unknown_shape(op.inputs, TilesError)
+        if a.ndim == 2 and b.ndim == 2:
+            return TensorTensorDot.tile_matrix(op, a, b, 1, 0)
+
         # the axes to align on
         a_axes = list(range(a.ndim - 2))[::-1] + [tensor.ndim - 2, tensor.ndim - 1]
         b_axes = list(range(b.ndim - 2))[::-1] + [tensor.ndim - 1, tensor.ndim]
-        check_chunks_unknown_shape(op.inputs, TilesError)
         a, b = unify_chunks((a, a_axes), (b, b_axes))
 
         get_nsplit = lambda i: a.nsplits[i] if a.nsplits[i] != (1,) else b.nsplits[i]
@@ -143,7 +147,7 @@ class TensorMatmul(TensorOperand, TensorOperandMixin):
 
         out_chunks = []
         for out_idx in itertools.product(*out_idxes):
-            chunks = []
+            chunk_pairs = []
             get_s = lambda x, idx: x[idx] if x != (1,) else x[0]
             shape = tuple(max(get_s(a_s, j), get_s(b_s, j))
                           for a_s, b_s, j in zip(a.nsplits[:-2], b.nsplits[:-2], out_idx[:-2])) + \
@@ -151,44 +155,44 @@ class TensorMatmul(TensorOperand, TensorOperandMixin):
 
             for contract_idx in range(len(a.nsplits[-1])):
                 a_idx = get_idx(a, out_idx[: a.ndim - 1] + (contract_idx,))
-                a_chunk = a.cix[a_idx]
                 b_idx = get_idx(b, out_idx[: b.ndim - 2] + (contract_idx,) + out_idx[-1:])
-                b_chunk = b.cix[b_idx]
-                chunk_op = op.copy().reset_key()
-                c = chunk_op.new_chunk([a_chunk, b_chunk], shape=shape, order=tensor.order)
-                chunks.append(c)
-
-            if len(chunks) == 1:
-                c = chunks[0]
-                out_chunk_op = c.op.copy()
-                out_chunk = out_chunk_op.new_chunk(out_chunk_op.inputs, shape=c.shape,
-                                                   index=out_idx, order=tensor.order)
-            else:
-                out_chunk = tree_add(tensor.op.dtype, chunks, out_idx, shape, sparse=tensor.op.sparse)
+                chunk_pairs.append((a.cix[a_idx], b.cix[b_idx]))
 
-            out_chunks.append(out_chunk)
+            out_chunks.append(multiply_accumulate_chunks(
+                op, chunk_pairs, out_idx, shape, tensor.order))
 
         nsplits = tuple(get_nsplit(i) for i in range(a.ndim - 2)) + (a.nsplits[-2], b.nsplits[-1])
         new_op = op.copy()
         return new_op.new_tensors([a, b], tensor.shape, order=tensor.order,
                                   chunks=out_chunks, nsplits=nsplits)
 
+    @classmethod
+    def _matmul(cls, xp, op, a, b):
+        if not op.sparse and is_sparse_module(xp):
+            # tell sparse to do calculation on numpy or cupy matmul
+            return xp.matmul(a, b, sparse=False)
+        else:
+            try:
+                # `np.matmul` support `order` argument in version 1.16
+                return xp.matmul(a, b, casting=op.casting, order=op.order)
+            except TypeError:  # pragma: no cover
+                return xp.matmul(a, b).astype(dtype=op.dtype, casting=op.casting, order=op.order)
+
     @classmethod
     def execute(cls, ctx, op):
-        (a, b), device_id, xp = as_same_device(
+        inputs, device_id, xp = as_same_device(
             [ctx[c.key] for c in op.inputs], device=op.device, ret_extra=True)
 
         with device(device_id):
-            if not op.sparse and is_sparse_module(xp):
-                # tell sparse to do calculation on numpy or cupy matmul
-                ctx[op.outputs[0].key] = xp.matmul(a, b, sparse=False)
-            else:
-                try:
-                    # `np.matmul` support `order` argument in version 1.16
-                    ctx[op.outputs[0].key] = xp.matmul(a, b, casting=op.casting, order=op.order)
-                except TypeError:  # pragma: no cover
-                    ctx[op.outputs[0].key] = xp.matmul(a, b).astype(dtype=op.dtype,
-                                                                    casting=op.casting, order=op.order)
+            # inputs are pairs of chunks whose products are accumulated
+            ret = cls._matmul(xp, op, inputs[0], inputs[1])
+            for a, b in zip(inputs[2::2], inputs[3::2]):
+                product = cls._matmul(xp, op, a, b)
+                if issparse(ret) or issparse(product):
+                    ret = ret + product
+                else:
+                    ret += product
+            ctx[op.outputs[0].key] = ret
 
 
 def matmul(a, b, sparse=None, out=None, **kw):
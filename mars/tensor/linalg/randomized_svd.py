@@ -25,9 +25,25 @@ from .utils import svd_flip
 # ---------------------------------------------------------------------
 
 
+def _power_iteration(A, Q, power_iteration_normalizer):
+    if power_iteration_normalizer == 'none':
+        Q = A.dot(Q)
+        Q = A.T.dot(Q)
+    elif power_iteration_normalizer == 'LU':
+        # TODO: directly get Q when lu supports `permute_l`
+        p, l, _ = lu(A.dot(Q))
+        Q = p.dot(l)
+        p, l, _ = lu(A.T.dot(Q))
+        Q = p.dot(l)
+    elif power_iteration_normalizer == 'QR':
+        Q, _ = qr(A.dot(Q))
+        Q, _ = qr(A.T.dot(Q))
+    return Q
+
+
 def randomized_range_finder(A, size, n_iter,
                             power_iteration_normalizer='auto',
-                            random_state=None):
+                            random_state=None, session=None, run_kwargs=None):
     r"""Computes an orthonormal matrix whose range approximates the range of A.
 
     .. versionadded:: 0.1.3
@@ -58,6 +74,13 @@ def randomized_range_finder(A, size, n_iter,
         generator; If None, the random number generator is the RandomState
         instance used by `np.random`.
 
+    session : session to execute power iterations, if specified and the
+        session supports compilation, i.e. a local session, power iterations
+        are executed one by one with a graph compiled only once, otherwise
+        they are built into the returned tensor lazily
+
+    run_kwargs : dict, extra arguments to execute power iterations
+
     Returns
     -------
     Q : 2D array
@@ -93,19 +116,23 @@ def randomized_range_finder(A, size, n_iter,
 
     # Perform power iterations with Q to further 'imprint' the top
     # singular vectors of A in Q
-    for _ in range(n_iter):
-        if power_iteration_normalizer == 'none':
-            Q = A.dot(Q)
-            Q = A.T.dot(Q)
-        elif power_iteration_normalizer == 'LU':
-            # TODO: directly get Q when lu supports `permute_l`
-            p, l, _ = lu(A.dot(Q))
-            Q = p.dot(l)
-            p, l, _ = lu(A.T.dot(Q))
-            Q = p.dot(l)
-        elif power_iteration_normalizer == 'QR':
-            Q, _ = qr(A.dot(Q))
-            Q, _ = qr(A.T.dot(Q))
+    iterate = None
+    if session is not None and n_iter > 0 and min(A.shape) >= size:
+        # the graph of an iteration is tiled only once,
+        # and A is kept in the session during iterations. Note that
+        # shape of Q changes if A has fewer rows or columns than `size`
+        run_kwargs = run_kwargs or dict()
+        iterate = session.compile(
+            lambda q: _power_iteration(A, q, power_iteration_normalizer),
+            Q, **run_kwargs)
+    if iterate is not None and iterate.compiled:
+        for _ in range(n_iter):
+            Q = iterate.run(Q, **run_kwargs)
+    else:
+        # iterations are built into a single graph if the session
+        # cannot compile, e.g. a cluster session
+        for _ in range(n_iter):
+            Q = _power_iteration(A, Q, power_iteration_normalizer)
 
     # Sample the range of A using by linear projection of Q
     # Extract an orthonormal basis
@@ -115,7 +142,7 @@ def randomized_range_finder(A, size, n_iter,
 
 def randomized_svd(M, n_components, n_oversamples=10, n_iter='auto',
                    power_iteration_normalizer='auto', transpose='auto',
-                   flip_sign=True, random_state=0):
+                   flip_sign=True, random_state=0, session=None, run_kwargs=None):
     r"""
     Computes a truncated randomized SVD
 
@@ -162,6 +189,10 @@ def randomized_svd(M, n_components, n_oversamples=10, n_iter='auto',
         generator; If RandomState instance, random_state is the random number
         generator; If None, the random number generator is the RandomState
         instance used by `np.random`.
+    session : session to execute power iterations, if specified and the
+        session supports compilation, i.e. a local session, power iterations
+        are executed one by one with a graph compiled only once
+    run_kwargs : dict, extra arguments to execute power iterations
     Notes
     -----
     This algorithm finds a (usually very good) approximate truncated
@@ -199,7 +230,8 @@ def randomized_svd(M, n_components, n_oversamples=10, n_iter='auto',
         M = M.T
 
     Q = randomized_range_finder(M, n_random, n_iter,
-                                power_iteration_normalizer, random_state)
+                                power_iteration_normalizer, random_state,
+                                session=session, run_kwargs=run_kwargs)
     # project M to the (k + p) dimensional space using the basis vectors
     B = Q.T.dot(M)
 
@@ -20,15 +20,17 @@ from collections.abc import Iterable
 import numpy as np
 
 from ... import opcodes as OperandDef
+from ...context import get_context
 from ...serialize import ValueType, KeyField, TupleField
 from ...utils import check_chunks_unknown_shape
 from ...tiles import TilesError
 from ..utils import unify_chunks
-from ..array_utils import as_same_device, device, is_sparse_module
+from ..array_utils import as_same_device, device, is_sparse_module, issparse
 from ..operands import TensorOperand, TensorOperandMixin
-from ..arithmetic.utils import tree_add
+from ..base.transpose import TensorTranspose
 from ..datasource import tensor as astensor
 from ..core import TensorOrder
+from .utils import plan_matmul_blocks, multiply_accumulate_chunks
 
 
 class TensorTensorDot(TensorOperand, TensorOperandMixin):
@@ -78,7 +80,7 @@ class TensorTensorDot(TensorOperand, TensorOperandMixin):
         calc_usage = chunk.nbytes
 
         # add input sizes when sparse-to-dense is needed
-        for inp in chunk.inputs:
+        for inp in {c.key: c for c in chunk.inputs}.values():
             if inp.is_sparse():
                 calc_usage += inp.nbytes
 
@@ -87,11 +89,13 @@ class TensorTensorDot(TensorOperand, TensorOperandMixin):
     @classmethod
     def tile(cls, op):
         a, b, a_axes, b_axes = op.a, op.b, op.a_axes, op.b_axes
+        check_chunks_unknown_shape(op.inputs, TilesError)
+        if a.ndim == 2 and b.ndim == 2 and len(a_axes) == 1:
+            return cls.tile_matrix(op, a, b, a_axes[0], b_axes[0])
 
         c = itertools.count(max(a.ndim, b.ndim))
         a_ax = tuple(a_axes.index(i) if i in a_axes else next(c) for i in range(a.ndim))
         b_ax = tuple(b_axes.index(i) if i in b_axes else next(c) for i in range(b.ndim))
-        check_chunks_unknown_shape(op.inputs, TilesError)
         a, b = unify_chunks((a, a_ax), (b, b_ax))
         out = op.outputs[0]
 
@@ -112,27 +116,17 @@ class TensorTensorDot(TensorOperand, TensorOperandMixin):
                 tensor_shape.append(t.nsplits[axis][idx])
             tensor_shape = tuple(tensor_shape)
 
-            tensordot_chunks = []
+            chunk_pairs = []
             for contract_indexes in itertools.product(*[range(len(a.nsplits[ax])) for ax in a_axes]):
                 a_indices, b_indices = list(a_indexes), list(b_indexes)
                 for a_axis, contract_index in zip(a_axes, contract_indexes):
                     a_indices[a_axis] = contract_index
                 for b_axis, contract_index in zip(b_axes, contract_indexes):
                     b_indices[b_axis] = contract_index
+                chunk_pairs.append((a.cix[tuple(a_indices)], b.cix[tuple(b_indices)]))
 
-                tensordot_chunk_op = op.copy().reset_key()
-                tensordot_chunk = tensordot_chunk_op.new_chunk(
-                    [a.cix[tuple(a_indices)], b.cix[tuple(b_indices)]],
-                    shape=tensor_shape, order=out.order)
-                tensordot_chunks.append(tensordot_chunk)
-
-            if len(tensordot_chunks) == 1:
-                c = tensordot_chunks[0]
-                chunk_op = c.op.copy()
-                chunk = chunk_op.new_chunk(c.inputs, shape=c.shape, index=out_idx, order=out.order)
-            else:
-                chunk = tree_add(op.dtype, tensordot_chunks, out_idx, tensor_shape, sparse=op.sparse)
-            out_chunks.append(chunk)
+            out_chunks.append(multiply_accumulate_chunks(
+                op, chunk_pairs, out_idx, tensor_shape, out.order))
 
         get_nsplits = lambda t_idx, i: (a, b)[t_idx].nsplits[i]
         nsplits = [get_nsplits(*it) for it in output_axes]
@@ -140,20 +134,109 @@ class TensorTensorDot(TensorOperand, TensorOperandMixin):
         return new_op.new_tensors([a, b], out.shape,
                                   chunks=out_chunks, nsplits=nsplits)
 
+    @classmethod
+    def tile_matrix(cls, op, a, b, a_axis, b_axis):
+        """
+        Tile product of two matrices contracted along `a_axis` and `b_axis`
+        by blocks planned given sizes of matrices and cores in the cluster.
+        Products like `X.T @ X` are computed from blocks of X, and blocks
+        below the diagonal are transposed from those above.
+        """
+        out = op.outputs[0]
+        x, x_axis = _get_gram_source(a, b, a_axis, b_axis)
+        if x is not None:
+            a, b, a_axis, b_axis = x, x, x_axis, x_axis
+        else:
+            a, b = unify_chunks((a, (0, 1) if a_axis == 0 else (1, 0)),
+                                (b, (0, 2) if b_axis == 0 else (2, 0)))
+
+        ctx = get_context()
+        n_cores = ctx.get_total_ncores() if ctx is not None else None
+        m_splits, n_splits, group_size = plan_matmul_blocks(
+            a.nsplits[1 - a_axis], a.nsplits[a_axis], b.nsplits[1 - b_axis],
+            out.dtype.itemsize, n_cores=n_cores, symmetric=x is not None)
+        if m_splits != a.nsplits[1 - a_axis]:
+            a = a.rechunk({1 - a_axis: m_splits})._inplace_tile()
+        if x is not None:
+            b = a
+        elif n_splits != b.nsplits[1 - b_axis]:
+            b = b.rechunk({1 - b_axis: n_splits})._inplace_tile()
+
+        chunk_op = TensorTensorDot(a_axes=(a_axis,), b_axes=(b_axis,), dtype=out.dtype,
+                                   sparse=op.sparse, gpu=op.gpu).reset_key()
+        out_chunks = dict()
+        for i, j in itertools.product(range(len(m_splits)), range(len(n_splits))):
+            shape = (m_splits[i], n_splits[j])
+            if x is not None and i > j:
+                transpose_op = TensorTranspose(axes=[1, 0], dtype=out.dtype, sparse=op.sparse)
+                out_chunks[i, j] = transpose_op.new_chunk(
+                    [out_chunks[j, i]], shape=shape, index=(i, j), order=out.order)
+                continue
+            chunk_pairs = []
+            for k in range(len(a.nsplits[a_axis])):
+                a_idx = (k, i) if a_axis == 0 else (i, k)
+                b_idx = (k, j) if b_axis == 0 else (j, k)
+                chunk_pairs.append((a.cix[a_idx], b.cix[b_idx]))
+            out_chunks[i, j] = multiply_accumulate_chunks(
+                chunk_op, chunk_pairs, (i, j), shape, out.order, group_size=group_size)
+
+        new_op = op.copy()
+        return new_op.new_tensors(op.inputs if x is not None else [a, b],
+                                  out.shape, order=out.order,
+                                  chunks=list(out_chunks.values()),
+                                  nsplits=(m_splits, n_splits))
+
     @classmethod
     def execute(cls, ctx, op):
-        (a, b), device_id, xp = as_same_device(
+        inputs, device_id, xp = as_same_device(
             [ctx[c.key] for c in op.inputs], device=op.device, ret_extra=True)
 
         axes = op.a_axes, op.b_axes
+        out = op.outputs[0]
         with device(device_id):
-            if not op.sparse and is_sparse_module(xp):
-                # tell sparse to do calculation on numpy or cupy dot
-                ctx[op.outputs[0].key] = xp.tensordot(a, b, axes, sparse=False)
-            else:
-                ret = xp.tensordot(a, b, axes)
-                out = op.outputs[0]
-                ctx[out.key] = ret.astype(ret.dtype, order=out.order.value, copy=False)
+            ret = None
+            # inputs are pairs of chunks whose products are accumulated
+            for a, b in zip(inputs[::2], inputs[1::2]):
+                if not op.sparse and is_sparse_module(xp):
+                    # tell sparse to do calculation on numpy or cupy dot
+                    product = xp.tensordot(a, b, axes, sparse=False)
+                elif a is b and axes == ((0,), (0,)) and a.ndim == 2 \
+                        and not is_sparse_module(xp):
+                    # symmetric rank-k update
+                    product = xp.dot(a.T, a)
+                else:
+                    product = xp.tensordot(a, b, axes)
+                if ret is None:
+                    ret = product
+                elif issparse(ret) or issparse(product):
+                    ret = ret + product
+                else:
+                    ret += product
+            if not issparse(ret):
+                ret = ret.astype(ret.dtype, order=out.order.value, copy=False)
+            ctx[out.key] = ret
+
+
+def _get_gram_source(a, b, a_axis, b_axis):
+    """
+    Get X and the contracted axis of X if product of matrices
+    `a` and `b` is like `X.T @ X` or `X @ X.T`, otherwise None.
+    """
+    def get_source(t, axis):
+        if isinstance(t.op, TensorTranspose) and t.op.axes in (None, [1, 0]):
+            return t.inputs[0], 1 - axis, True
+        return t, axis, False
+
+    a_source, a_source_axis, a_transposed = get_source(a, a_axis)
+    b_source, b_source_axis, b_transposed = get_source(b, b_axis)
+    if a_source.key != b_source.key or a_source_axis != b_source_axis \
+            or a.key != b.key and a_transposed == b_transposed:
+        return None, None
+    if a.key == b.key:
+        # axes of the same tensor, transposed or not
+        return a, a_axis
+    # use the one not transposed
+    return (b if a_transposed else a), a_source_axis
 
 
 def tensordot(a, b, axes=2, sparse=None):
@@ -494,3 +494,65 @@ class Test(unittest.TestCase):
                          np.matmul(raw1, raw3, order='A').flags['C_CONTIGUOUS'])
         self.assertEqual(matmul(tensor(raw1), tensor(raw3), order='A').flags['F_CONTIGUOUS'],
                          np.matmul(raw1, raw3, order='A').flags['F_CONTIGUOUS'])
+
+    def testMatmulPlan(self):
+        from mars.config import option_context
+        from mars.context import LocalContext
+        from mars.tensor.arithmetic.add import TensorTreeAdd
+        from mars.tensor.base.transpose import TensorTranspose
+        from mars.tensor.linalg.tensordot import TensorTensorDot
+        from mars.tensor.linalg.utils import plan_matmul_blocks
+
+        # blocks are kept without number of cores
+        self.assertEqual(plan_matmul_blocks((2,) * 5, (2,) * 8, (2,) * 5, 8),
+                         ((2,) * 5, (2,) * 5, 4))
+        # tall matrices are multiplied by groups of row blocks
+        m_splits, n_splits, group_size = plan_matmul_blocks(
+            (10,) * 10, (10000,) * 100, (10,) * 10, 8, n_cores=16, symmetric=True)
+        self.assertEqual((m_splits, n_splits), ((100,), (100,)))
+        self.assertEqual(group_size, 7)
+        # blocks are limited by chunk_store_limit
+        with option_context({'chunk_store_limit': 8 * 100 * 50}):
+            m_splits, n_splits, _ = plan_matmul_blocks(
+                (10,) * 10, (10,) * 10, (10,) * 10, 8, n_cores=1)
+            self.assertLessEqual(m_splits[0] * n_splits[0], 100 * 50)
+            self.assertLess(len(m_splits) * len(n_splits), 100)
+
+        x = ones((200, 30), chunk_size=(20, 7))
+        for t in [x.T.dot(x), x.T @ x, mt.tensordot(x, x, axes=(0, 0))]:
+            t = t.tiles()
+            self.assertEqual(t.nsplits, ((7, 7, 7, 7, 2),) * 2)
+            self.assertEqual(len(t.chunks), 25)
+            # lower blocks are transposed from upper ones
+            transposed = [c for c in t.chunks if isinstance(c.op, TensorTranspose)]
+            self.assertEqual(len(transposed), 10)
+            for c in transposed:
+                self.assertEqual(c.inputs[0].index, c.index[::-1])
+            # products are computed from blocks of x
+            c = t.cix[0, 0]
+            self.assertIsInstance(c.op, TensorTreeAdd)
+            self.assertEqual(len(c.inputs), 3)
+            self.assertIsInstance(c.inputs[0].op, TensorTensorDot)
+            self.assertEqual(len(c.inputs[0].inputs), 8)
+            self.assertEqual(c.inputs[0].inputs[0].key, c.inputs[0].inputs[1].key)
+
+        with LocalContext(None, ncores=4):
+            t = x.T.dot(x).tiles()
+            self.assertEqual(t.nsplits, ((30,), (30,)))
+            self.assertEqual(len(t.chunks[0].inputs), 4)
+
+            a = ones((20, 400), chunk_size=10)
+            b = ones((400, 200), chunk_size=10)
+            t = (a @ b).tiles()
+            self.assertEqual(t.nsplits, ((20,), (200,)))
+            self.assertEqual(len(t.chunks[0].inputs), 4)
+
+            # not rechunked if transferring more data
+            a = ones((100, 80), chunk_size=10)
+            b = ones((80, 10), chunk_size=10)
+            t = (a @ b).tiles()
+            self.assertEqual(t.nsplits, ((10,) * 10, (10,)))
+
+            with option_context({'tensor.matmul.reblock': False}):
+                t = x.T.dot(x).tiles()
+                self.assertEqual(t.nsplits, ((7, 7, 7, 7, 2),) * 2)
@@ -1102,3 +1102,35 @@ class Test(unittest.TestCase):
         np.testing.assert_allclose(res, expected)
         self.assertEqual(res.flags['C_CONTIGUOUS'], expected.flags['C_CONTIGUOUS'])
         self.assertEqual(res.flags['F_CONTIGUOUS'], expected.flags['F_CONTIGUOUS'])
+
+    def testMatmulPlanExecution(self):
+        from mars.context import LocalContext
+
+        rs = np.random.RandomState(0)
+        raw_x = rs.rand(200, 30)
+        raw_y = rs.rand(30, 50)
+        x = tensor(raw_x, chunk_size=(20, 7))
+        y = tensor(raw_y, chunk_size=9)
+        raw_sparse_x = sps.random(200, 30, density=.1, random_state=0, format='csr')
+        sparse_x = tensor(raw_sparse_x, chunk_size=(20, 7))
+
+        for ncores in (None, 1, 8):
+            with LocalContext(None, ncores=ncores):
+                for t, expected in [(x.T @ x, raw_x.T @ raw_x),
+                                    (x.T.dot(x), raw_x.T.dot(raw_x)),
+                                    (x @ x.T, raw_x @ raw_x.T),
+                                    (tensordot(x, x, axes=(0, 0)), raw_x.T @ raw_x),
+                                    (tensordot(x.T, x.T, axes=((1,), (1,))),
+                                     np.tensordot(raw_x.T, raw_x.T, axes=((1,), (1,)))),
+                                    (tensordot(x.T, x.T, axes=((0,), (0,))),
+                                     np.tensordot(raw_x.T, raw_x.T, axes=((0,), (0,)))),
+                                    (x @ y, raw_x @ raw_y),
+                                    (y.T.dot(x.T), raw_y.T.dot(raw_x.T))]:
+                    res = self.executor.execute_tensor(t, concat=True)[0]
+                    np.testing.assert_allclose(res, expected)
+
+                t = sparse_x.T.dot(sparse_x)
+                res = self.executor.execute_tensor(t, concat=True)[0]
+                expected = raw_sparse_x.T.dot(raw_sparse_x)
+                self.assertTrue(issparse(res))
+                np.testing.assert_allclose(res.toarray(), expected.toarray())
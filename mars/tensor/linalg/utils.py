@@ -12,8 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import itertools
+from math import ceil
+
 import numpy as np
 
+from ...config import options
+
 
 def calc_svd_shapes(a):
     """
@@ -76,3 +81,110 @@ def svd_flip(u, v, u_based_decision=True):
         u *= signs
         v *= signs[:, mt.newaxis]
     return u, v
+
+
+def _even_splits(size, n):
+    chunk_size = ceil(size / n)
+    splits = [chunk_size] * (size // chunk_size)
+    if size % chunk_size:
+        splits.append(size % chunk_size)
+    return tuple(splits)
+
+
+def plan_matmul_blocks(m_splits, k_splits, n_splits, itemsize,
+                       n_cores=None, symmetric=False):
+    """
+    Plan blocks of the product of a (m, k) matrix and a (k, n) matrix.
+
+    Each block of the left matrix is sent to every column of output blocks,
+    and each block of the right one to every row, thus output blocks are
+    coarsened when it transfers less data, including that to rechunk, while
+    blocks are still enough for all cores and fit in `chunk_store_limit`.
+    Blocks along k for an output block are then split into groups, each
+    multiplied and accumulated in one chunk without storing partial products,
+    and groups are replicated to make use of cores left.
+
+    :param m_splits: splits of the left matrix along m
+    :param k_splits: splits along the contracted axis
+    :param n_splits: splits of the right matrix along n
+    :param itemsize: item size of matrices
+    :param n_cores: number of cores in the cluster, blocks are not changed if None
+    :param symmetric: if the product is symmetric, m and n are blocked the same
+    :return: splits along m, splits along n and number of blocks along k in a group
+    """
+    limit = options.chunk_store_limit
+    m, k, n = sum(m_splits), sum(k_splits), sum(n_splits)
+    n_contract, max_k = len(k_splits), max(k_splits)
+    a_size, b_size = m * k * itemsize, k * n * itemsize
+
+    if n_cores and options.tensor.matmul.reblock:
+        n_tasks = min(n_cores, len(m_splits) * len(n_splits) * n_contract)
+        best = len(n_splits) * a_size + len(m_splits) * b_size, m_splits, n_splits
+        for p in range(1, len(m_splits) + 1):
+            row_splits = _even_splits(m, p)
+            p = len(row_splits)
+            if row_splits[0] * max_k * itemsize > limit:
+                continue
+            if symmetric:
+                col_splits = row_splits
+            else:
+                q = max(ceil(n_tasks / (p * n_contract)),
+                        ceil(n * max_k * itemsize / limit),
+                        ceil(row_splits[0] * n * itemsize / limit))
+                if q > len(n_splits):
+                    continue
+                col_splits = _even_splits(n, q)
+            q = len(col_splits)
+            if p * q * n_contract < n_tasks or \
+                    row_splits[0] * col_splits[0] * itemsize > limit:
+                continue
+            cost = q * a_size + p * b_size
+            if row_splits != tuple(m_splits):
+                cost += a_size
+            if col_splits != tuple(n_splits) and not symmetric:
+                cost += b_size
+            if cost < best[0]:
+                best = cost, row_splits, col_splits
+        _, m_splits, n_splits = best
+
+    n_blocks = len(m_splits) * len(n_splits)
+    if n_cores:
+        n_groups = min(n_contract, ceil(n_cores / n_blocks))
+    else:
+        n_groups = ceil(n_contract / options.combine_size)
+    group_size = ceil(n_contract / n_groups)
+    pair_size = (max(m_splits) + max(n_splits)) * max_k * itemsize
+    group_size = max(min(group_size, limit // pair_size), 1)
+    return tuple(m_splits), tuple(n_splits), group_size
+
+
+def multiply_accumulate_chunks(op, chunk_pairs, index, shape, order, group_size=None):
+    """
+    Generate chunks multiplying pairs of chunks and adding up products.
+
+    Pairs are split into groups of `group_size`, products of a group are
+    accumulated in one chunk of `op` instead of being stored respectively,
+    then groups are added up by tree add.
+
+    :param op: operand to copy for each group, accepting inputs as pairs
+    :param chunk_pairs: list of input chunk pairs
+    :param index: index of result chunk
+    :param shape: shape of result chunk
+    :param order: order of result chunk
+    :param group_size: number of pairs in a group, `combine_size` if not specified
+    :return: result chunk
+    """
+    from ..arithmetic.utils import tree_add
+
+    group_size = group_size or options.combine_size
+    if len(chunk_pairs) <= group_size:
+        chunk_op = op.copy().reset_key()
+        return chunk_op.new_chunk(list(itertools.chain(*chunk_pairs)), shape=shape,
+                                  index=index, order=order)
+
+    chunks = []
+    for i in range(0, len(chunk_pairs), group_size):
+        chunk_op = op.copy().reset_key()
+        chunks.append(chunk_op.new_chunk(
+            list(itertools.chain(*chunk_pairs[i: i + group_size])), shape=shape, order=order))
+    return tree_add(op.dtype, chunks, index, shape, sparse=op.sparse)
@@ -39,6 +39,7 @@ from .nanstd import nanstd
 from .nancumsum import nancumsum, TensorNanCumsum
 from .nancumprod import nancumprod, TensorNanCumprod
 from .count_nonzero import count_nonzero, TensorCountNonzero
+from .unique_count_approx import unique_count_approx, TensorUniqueCountApprox
 from .allclose import allclose
 from .array_equal import array_equal
 
@@ -21,7 +21,8 @@ import scipy.sparse as sps
 
 from mars.tensor.datasource import ones, tensor
 from mars.tensor.reduction import mean, nansum, nanmax, nanmin, nanmean, nanprod, nanargmax, \
-    nanargmin, nanvar, nanstd, count_nonzero, allclose, array_equal, var, std, nancumsum, nancumprod
+    nanargmin, nanvar, nanstd, count_nonzero, allclose, array_equal, var, std, nancumsum, nancumprod, \
+    unique_count_approx
 from mars.utils import ignore_warning
 from mars.tests.core import ExecutorForTest
 
@@ -518,6 +519,27 @@ class Test(unittest.TestCase):
         expected = np.count_nonzero(raw.A, axis=1)
         np.testing.assert_equal(res, expected)
 
+    def testUniqueCountApproxExecution(self):
+        rs = np.random.RandomState(0)
+        raw = rs.randint(50000, size=(300, 400)).astype(float)
+        raw[::7, ::3] = np.nan
+
+        arr = tensor(raw, chunk_size=70)
+        res = self.executor.execute_tensor(unique_count_approx(arr, combine_size=3))[0]
+        self.assertLess(abs(res / len(np.unique(raw)) - 1), 0.03)
+
+        arr = tensor(raw, chunk_size=70)
+        res2 = self.executor.execute_tensor(unique_count_approx(arr.T, combine_size=5))[0]
+        self.assertEqual(res, res2)
+
+        arr = tensor([[1, 1, 2], [2, 3, 3]], chunk_size=1)
+        res = self.executor.execute_tensor(unique_count_approx(arr))[0]
+        self.assertEqual(res, 3)
+
+        arr = tensor([[1, 1, 2], [2, 3, 3]], chunk_size=3)
+        res = self.executor.execute_tensor(unique_count_approx(arr))[0]
+        self.assertEqual(res, 3)
+
     def testAllcloseExecution(self):
         a = tensor([1e10, 1e-7], chunk_size=1)
         b = tensor([1.00001e10, 1e-8], chunk_size=1)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright 1999-2020 Alibaba Group Holding Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+
+from ... import opcodes as OperandDef
+from ...lib.hyperloglog import HyperLogLog, precision_from_error
+from ...serialize import Int32Field
+from .core import TensorReduction, TensorReductionMixin
+
+
+class TensorUniqueCountApprox(TensorReduction, TensorReductionMixin):
+    _op_type_ = OperandDef.UNIQUE_COUNT_APPROX
+
+    _precision = Int32Field('precision')
+
+    def __init__(self, axis=None, dtype=None, keepdims=None, combine_size=None,
+                 precision=None, stage=None, **kw):
+        super().__init__(_axis=axis, _dtype=dtype, _keepdims=keepdims,
+                         _combine_size=combine_size, _precision=precision,
+                         _stage=stage, **kw)
+
+    @property
+    def precision(self):
+        return self._precision
+
+    def _get_op_kw(self):
+        return {'precision': self._precision}
+
+    @staticmethod
+    def _wrap_sketch(sketch, ndim):
+        # keep sketches in object tensors thus they can be concatenated
+        ret = np.empty((1,) * ndim, dtype=object)
+        ret[(0,) * ndim] = sketch
+        return ret
+
+    @classmethod
+    def execute_map(cls, ctx, op):
+        x = ctx[op.inputs[0].key]
+        sketch = HyperLogLog.from_values(x, precision=op.precision, dropna=False)
+        ctx[op.outputs[0].key] = cls._wrap_sketch(sketch, op.outputs[0].ndim)
+
+    @classmethod
+    def execute_combine(cls, ctx, op):
+        sketch = HyperLogLog.merge(ctx[op.inputs[0].key].ravel())
+        ctx[op.outputs[0].key] = cls._wrap_sketch(sketch, op.outputs[0].ndim)
+
+    @classmethod
+    def execute_agg(cls, ctx, op):
+        sketch = HyperLogLog.merge(ctx[op.inputs[0].key].ravel())
+        ctx[op.outputs[0].key] = np.array(sketch.count(), dtype=op.dtype) \
+            .reshape(op.outputs[0].shape)
+
+    @classmethod
+    def execute_one_chunk(cls, ctx, op):
+        x = ctx[op.inputs[0].key]
+        sketch = HyperLogLog.from_values(x, precision=op.precision, dropna=False)
+        ctx[op.outputs[0].key] = np.array(sketch.count(), dtype=op.dtype) \
+            .reshape(op.outputs[0].shape)
+
+
+def unique_count_approx(a, relative_error=0.01, combine_size=None):
+    """
+    Estimate the number of unique elements of a tensor.
+
+    Elements of every chunk are summarized into a HyperLogLog sketch, and
+    sketches are merged across chunks, thus only sketches of bounded sizes
+    are transferred instead of unique elements.
+
+    Parameters
+    ----------
+    a : array_like
+        Input tensor, which is flattened.
+    relative_error : float, default 0.01
+        Approximate standard error of the estimated number.
+    combine_size: int, optional
+        The number of chunks to combine.
+
+    Returns
+    -------
+    count : int
+        Estimated number of unique elements, NaN is counted as one element.
+
+    See Also
+    --------
+    unique : Find the unique elements of a tensor.
+
+    Examples
+    --------
+    >>> import mars.tensor as mt
+
+    >>> mt.unique_count_approx([1, 1, 2, 2, 3, 3]).execute()
+    3
+    """
+    op = TensorUniqueCountApprox(axis=None, dtype=np.dtype(np.int64), keepdims=None,
+                                 combine_size=combine_size,
+                                 precision=precision_from_error(relative_error))
+    return op(a)
@@ -0,0 +1,142 @@
+# Copyright 1999-2020 Alibaba Group Holding Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+import mars.tensor as mt
+import mars.dataframe as md
+from mars.config import option_context
+from mars.dataframe.datasource.read_csv import DataFrameReadCSV
+from mars.filesystem import get_fingerprint
+from mars.resultcache import ResultCache, get_result_cache
+from mars.session import new_session
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self._cache_dir = tempfile.mkdtemp(prefix='mars_test_result_cache_')
+
+    def tearDown(self):
+        shutil.rmtree(self._cache_dir, ignore_errors=True)
+
+    def testResultCache(self):
+        cache = ResultCache(os.path.join(self._cache_dir, 'cache'), max_size=3000)
+        self.assertIsNone(cache.get('non_exist'))
+
+        data = dict((f'key{idx}', np.random.rand(100)) for idx in range(3))
+        for k, v in data.items():
+            cache.put(k, v)
+            self.assertIn(k, cache)
+            np.testing.assert_array_equal(cache.get(k), v)
+            time.sleep(0.01)
+
+        # least recently used results are evicted
+        os.utime(os.path.join(cache.root, 'key0'))
+        cache.evict()
+        self.assertIn('key0', cache)
+        self.assertNotIn('key1', cache)
+        self.assertIn('key2', cache)
+        self.assertEqual(cache.stats['evict_count'], 1)
+
+        cache.delete('key0')
+        self.assertNotIn('key0', cache)
+
+    def testSessionResultCache(self):
+        raw = np.random.rand(20, 10)
+        with option_context({'result_cache.directory': self._cache_dir}):
+            cache = get_result_cache()
+
+            t = mt.tensor(raw, chunk_size=5)
+            r = (t * 2).sum(axis=0)
+            np.testing.assert_array_almost_equal(
+                new_session().run(r), raw.sum(axis=0) * 2)
+            stats = cache.stats
+            self.assertEqual(stats['store_count'], 2)
+
+            # results are loaded from the cache by another session
+            t = mt.tensor(raw, chunk_size=5)
+            r = (t * 2).sum(axis=0)
+            np.testing.assert_array_almost_equal(
+                new_session().run(r), raw.sum(axis=0) * 2)
+            self.assertEqual(cache.stats['hit_count'] - stats['hit_count'], 2)
+            self.assertEqual(cache.stats['store_count'], 2)
+
+        # cache is not used when not enabled
+        self.assertIsNone(get_result_cache())
+        np.testing.assert_array_almost_equal(
+            new_session().run(r), raw.sum(axis=0) * 2)
+        self.assertEqual(cache.stats['hit_count'] - stats['hit_count'], 2)
+
+    def testResultCacheInvalidation(self):
+        file_path = os.path.join(self._cache_dir, 'test.csv')
+        raw = pd.DataFrame({'a': np.arange(10), 'b': np.random.rand(10)})
+        raw.to_csv(file_path, index=False)
+
+        with option_context({'result_cache.directory': os.path.join(self._cache_dir, 'cache')}):
+            cache = get_result_cache()
+
+            r = md.read_csv(file_path)['b'] * 2
+            pd.testing.assert_series_equal(new_session().run(r), raw['b'] * 2)
+            stats = cache.stats
+
+            r = md.read_csv(file_path)['b'] * 2
+            pd.testing.assert_series_equal(new_session().run(r), raw['b'] * 2)
+            self.assertGreater(cache.stats['hit_count'], stats['hit_count'])
+            stats = cache.stats
+
+            # results are recomputed once the file is modified
+            raw2 = pd.DataFrame({'a': np.arange(12), 'b': np.random.rand(12)})
+            raw2.to_csv(file_path, index=False)
+            mtime = os.stat(file_path).st_mtime + 10
+            os.utime(file_path, (mtime, mtime))
+            r = md.read_csv(file_path)['b'] * 2
+            pd.testing.assert_series_equal(new_session().run(r), raw2['b'] * 2)
+            self.assertEqual(cache.stats['hit_count'], stats['hit_count'])
+
+    def testResultCacheExternalSource(self):
+        file_path = os.path.join(self._cache_dir, 'test.csv')
+        raw = pd.DataFrame({'a': np.arange(10), 'b': np.random.rand(10)})
+        raw.to_csv(file_path, index=False)
+
+        # fingerprints of paths are computed once
+        memo = dict()
+        fingerprint = get_fingerprint(file_path, memo=memo)
+        self.assertEqual(memo, {file_path: fingerprint})
+        with mock.patch('mars.filesystem.glob') as glob_mock:
+            self.assertEqual(get_fingerprint([file_path], memo=memo), fingerprint)
+            glob_mock.assert_not_called()
+
+        with option_context({'result_cache.directory': os.path.join(self._cache_dir, 'cache')}), \
+                mock.patch.object(DataFrameReadCSV, 'get_fingerprint', return_value=None):
+            cache = get_result_cache()
+
+            # results depending on sources without fingerprints are not cached
+            r = md.read_csv(file_path)['b'] * 2
+            pd.testing.assert_series_equal(new_session().run(r), raw['b'] * 2)
+            self.assertEqual(cache.stats['store_count'], 0)
+
+            raw2 = pd.DataFrame({'a': np.arange(12), 'b': np.random.rand(12)})
+            raw2.to_csv(file_path, index=False)
+            r = md.read_csv(file_path)['b'] * 2
+            pd.testing.assert_series_equal(new_session().run(r), raw2['b'] * 2)
+            self.assertEqual(cache.stats['hit_count'], 0)
+            self.assertEqual(cache.stats['store_count'], 0)
@@ -15,6 +15,7 @@
 # limitations under the License.
 
 import unittest
+from unittest import mock
 
 import numpy as np
 import pandas as pd
@@ -356,6 +357,30 @@ class Test(unittest.TestCase):
         finally:
             del Executor._op_runners[ArrayDataSource]
 
+    def testIterFetch(self):
+        sess = new_session()
+
+        raw = np.random.rand(10, 5)
+        arr = mt.tensor(raw, chunk_size=3)
+        with self.assertRaises(ValueError):
+            sess.iter_fetch(arr)
+
+        sess.run(arr)
+        batches = list(sess.iter_fetch(arr))
+        self.assertEqual([b.shape for b in batches], [(3, 5), (3, 5), (3, 5), (1, 5)])
+        np.testing.assert_array_equal(np.concatenate(batches), raw)
+
+        batches = list(sess.iter_fetch(arr, batch_size=3))
+        self.assertEqual([b.shape for b in batches], [(9, 5), (1, 5)])
+        np.testing.assert_array_equal(np.concatenate(batches), raw)
+
+        raw_df = pd.DataFrame(np.random.rand(10, 5), columns=list('abcde'))
+        df = md.DataFrame(raw_df, chunk_size=4)
+        sess.run(df)
+        batches = list(sess.iter_fetch(df, batch_size=2))
+        self.assertEqual(len(batches), 2)
+        pd.testing.assert_frame_equal(pd.concat(batches), raw_df)
+
     def testDecref(self):
         sess = new_session()
 
@@ -662,3 +687,79 @@ class Test(unittest.TestCase):
         d2 = md.named_dataframe(name=name, session=sess)
         r2 = d2.execute(session=sess).fetch()
         pd.testing.assert_frame_equal(r2, raw)
+
+    def testCompile(self):
+        sess = new_session()
+        executor = sess._sess._executor
+
+        rs = np.random.RandomState(0)
+        raw_x = rs.rand(20, 10)
+        raw_w = rs.rand(10)
+        x = mt.tensor(raw_x, chunk_size=5) * 2
+
+        def step(w):
+            y = x.dot(w)
+            return x.T.dot(y) / mt.linalg.norm(y), y.sum()
+
+        w = mt.tensor(raw_w, chunk_size=5)
+        compiled = sess.compile(step, w)
+        self.assertTrue(compiled.compiled)
+        # x is executed only once
+        self.assertIn(x.key, sess.executed_tileables)
+
+        expect_w = raw_w
+        for _ in range(3):
+            y = (raw_x * 2).dot(expect_w)
+            expect_w, expect_s = (raw_x * 2).T.dot(y) / np.linalg.norm(y), y.sum()
+            w, s = compiled.run(w)
+            np.testing.assert_allclose(sess.fetch(w), expect_w)
+            self.assertAlmostEqual(sess.fetch(s), expect_s)
+
+        # results of former runs are kept
+        w2, _ = compiled.run(np.ones(10))
+        y = (raw_x * 2).dot(np.ones(10))
+        np.testing.assert_allclose(sess.fetch(w2), (raw_x * 2).T.dot(y) / np.linalg.norm(y))
+        np.testing.assert_allclose(sess.fetch(w), expect_w)
+        self.assertNotEqual(w.key, w2.key)
+
+        # chunks different from the compiled ones
+        w3, _ = compiled.run(mt.tensor(raw_w, chunk_size=3))
+        y = (raw_x * 2).dot(raw_w)
+        np.testing.assert_allclose(sess.fetch(w3), (raw_x * 2).T.dot(y) / np.linalg.norm(y))
+
+        with self.assertRaises(ValueError):
+            compiled.run(np.ones(5))
+        with self.assertRaises(TypeError):
+            compiled.run()
+
+        del compiled, w, w2, w3, s, _
+        # only results of x are kept
+        self.assertEqual(list(executor.stored_tileables), [x.key])
+        self.assertEqual(len(executor.chunk_result), 8)
+
+        # function is called in every run when shapes are unknown
+        compiled = sess.compile(lambda t: mt.quantile(t[t > 0.5], 0.5),
+                                mt.tensor(raw_w, chunk_size=5))
+        self.assertFalse(compiled.compiled)
+        self.assertAlmostEqual(sess.fetch(compiled.run(raw_w)),
+                               np.quantile(raw_w[raw_w > 0.5], 0.5))
+
+    def testRandomizedRangeFinderWithoutCompile(self):
+        from mars.tensor.linalg.randomized_svd import randomized_range_finder
+
+        sess = new_session()
+        raw = np.random.RandomState(0).rand(30, 20)
+        a = mt.tensor(raw, chunk_size=10)
+        expected = randomized_range_finder(a, 5, 3, random_state=0).execute(session=sess)
+
+        # power iterations are built lazily if the session cannot compile
+        with mock.patch.object(type(sess._sess), 'compile', return_value=(None, [])):
+            q = randomized_range_finder(a, 5, 3, random_state=0, session=sess)
+        # q = qr(a.dot(Q)), where Q is the result of power iterations
+        self.assertNotIn(q.inputs[0].inputs[1].key, sess.executed_tileables)
+        np.testing.assert_allclose(np.abs(sess.run(q)), np.abs(expected.fetch()))
+
+        # power iterations are executed with the compiled graph
+        q = randomized_range_finder(a, 5, 3, random_state=0, session=sess)
+        self.assertIn(q.inputs[0].inputs[1].key, sess.executed_tileables)
+        np.testing.assert_allclose(np.abs(sess.run(q)), np.abs(expected.fetch()))
@@ -0,0 +1,166 @@
+# Copyright 1999-2020 Alibaba Group Holding Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gc
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import mars.tensor as mt
+import mars.dataframe as md
+from mars.config import option_context
+from mars.session import new_session
+from mars.spill import SpillableStorage, DiskSpiller, get_spill_limit
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self._spill_dir = tempfile.mkdtemp(prefix='mars_test_spill_')
+
+    def tearDown(self):
+        shutil.rmtree(self._spill_dir, ignore_errors=True)
+
+    def testSpillableStorage(self):
+        spiller = DiskSpiller(spill_dir=self._spill_dir)
+        storage = SpillableStorage(spill_limit=3000, spiller=spiller)
+        data = dict((f'key{idx}', np.random.rand(100)) for idx in range(5))
+        for k, v in data.items():
+            storage[k] = v
+
+        # least recently used data are spilled
+        self.assertLessEqual(storage.mem_size, 3000)
+        self.assertTrue(storage.is_spilled('key0'))
+        self.assertFalse(storage.is_spilled('key4'))
+        self.assertEqual(spiller.stats['spill_count'], len(os.listdir(self._spill_dir)))
+        self.assertEqual(storage.peek('key0').shape, (100,))
+
+        # spilled data are loaded back when accessed
+        np.testing.assert_array_equal(storage['key0'], data['key0'])
+        self.assertFalse(storage.is_spilled('key0'))
+        self.assertEqual(spiller.stats['load_count'], 1)
+        for k, v in data.items():
+            np.testing.assert_array_equal(storage.get(k), v)
+        self.assertIsNone(storage.get('non_exist'))
+        self.assertEqual(len(storage.values()), len(data))
+
+        # copies share spilled files
+        storage_copy = storage.copy()
+        spilled_keys = [k for k in storage if storage.is_spilled(k)]
+        self.assertGreater(len(spilled_keys), 0)
+        for k in spilled_keys:
+            self.assertTrue(storage_copy.is_spilled(k))
+            del storage[k]
+        gc.collect()
+        self.assertEqual(len(os.listdir(self._spill_dir)), len(spilled_keys))
+        for k in spilled_keys:
+            np.testing.assert_array_equal(storage_copy.pop(k), data[k])
+        del storage, storage_copy
+        gc.collect()
+        self.assertEqual(os.listdir(self._spill_dir), [])
+
+        # data are kept in memory without limit
+        storage = SpillableStorage(data)
+        self.assertIsNone(storage.spiller)
+        self.assertFalse(any(storage.is_spilled(k) for k in storage))
+
+    def testPinnedKeys(self):
+        spiller = DiskSpiller(spill_dir=self._spill_dir)
+        storage = SpillableStorage(spill_limit=3000, spiller=spiller)
+        storage.pin_keys(['key0', 'key1'])
+        data = dict((f'key{idx}', np.random.rand(100)) for idx in range(5))
+        for k, v in data.items():
+            storage[k] = v
+
+        # pinned data are not spilled
+        self.assertFalse(storage.is_spilled('key0'))
+        self.assertFalse(storage.is_spilled('key1'))
+        self.assertTrue(storage.is_spilled('key2'))
+
+        # copies share pinned keys
+        storage_copy = storage.copy()
+        self.assertIs(storage_copy.pinned_keys, storage.pinned_keys)
+
+        # spilled data are loaded back once pinned
+        storage.pin_keys(['key2'])
+        self.assertFalse(storage.is_spilled('key2'))
+        self.assertTrue(storage.is_spilled('key4'))
+
+        # data are spilled once unpinned
+        storage.unpin_keys(['key0', 'key1', 'key2'])
+        storage['key5'] = np.random.rand(100)
+        self.assertTrue(storage.is_spilled('key0'))
+        self.assertLessEqual(storage.mem_size, 3000)
+
+    def testGetSpillLimit(self):
+        self.assertIsNone(get_spill_limit())
+        self.assertEqual(get_spill_limit(1024), 1024)
+        self.assertEqual(get_spill_limit('2k'), 2048)
+        self.assertGreater(get_spill_limit('50%'), 0)
+        with option_context({'local.spill_limit': '1M'}):
+            self.assertEqual(get_spill_limit(), 1024 ** 2)
+
+    def testLocalSessionSpill(self):
+        with option_context({'local.spill_limit': 100 * 1024,
+                             'local.spill_directory': self._spill_dir}):
+            sess = new_session()
+
+        raw = np.random.rand(200, 200)
+        t = mt.tensor(raw, chunk_size=50)
+        r = (t * 2).execute(session=sess)
+        np.testing.assert_array_equal(r.fetch(session=sess), raw * 2)
+
+        raw_df = pd.DataFrame(raw)
+        df = md.DataFrame(raw_df, chunk_size=50)
+        r = (df + 1).cumsum().execute(session=sess).fetch(session=sess)
+        pd.testing.assert_frame_equal(r, (raw_df + 1).cumsum())
+
+        stats = sess.get_spill_stats()
+        self.assertGreater(stats['spill_count'], 0)
+        self.assertGreater(stats['load_count'], 0)
+
+        sess = new_session()
+        self.assertEqual(sess.get_spill_stats()['spill_count'], 0)
+
+    def testLocalSessionPersist(self):
+        with option_context({'local.spill_limit': 100 * 1024,
+                             'local.spill_directory': self._spill_dir}):
+            sess = new_session()
+        executor = sess._sess._executor
+
+        raw = np.random.rand(200, 200)
+        t = mt.tensor(raw, chunk_size=50) * 2
+        t.persist(session=sess)
+        chunk_keys = [c.key for c in executor.stored_tileables[t.key][0].chunks]
+        self.assertEqual(set(chunk_keys), executor.storage.pinned_keys)
+
+        for _ in range(3):
+            r = (t + mt.random.rand(200, 200, chunk_size=50)).sum()
+            r.execute(session=sess)
+        self.assertGreater(sess.get_spill_stats()['spill_count'], 0)
+        self.assertFalse(any(executor.storage.is_spilled(k) for k in chunk_keys))
+        np.testing.assert_array_equal(t.fetch(session=sess), raw * 2)
+
+        t.unpersist(session=sess)
+        self.assertEqual(len(executor.storage.pinned_keys), 0)
+
+        # chunks are unpinned when deleted
+        t2 = (mt.tensor(raw, chunk_size=50) + 1).persist(session=sess)
+        self.assertGreater(len(executor.storage.pinned_keys), 0)
+        del t2
+        gc.collect()
+        self.assertEqual(len(executor.storage.pinned_keys), 0)
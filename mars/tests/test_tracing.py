@@ -0,0 +1,65 @@
+# Copyright 1999-2020 Alibaba Group Holding Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import unittest
+
+from mars.tracing import TraceSpan, aggregate_spans, to_chrome_trace
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self.spans = [
+            TraceSpan('assigning', 'op1', 0.0, 1.0, address='scheduler'),
+            TraceSpan('calculating', 'op1', 1.0, 3.0, address='worker1'),
+            TraceSpan('calc', 'op1', 1.5, 2.5, address='worker1', args=dict(op_name='Add')),
+            TraceSpan('calculating', 'op2', 1.5, 2.0, address='worker1'),
+            TraceSpan('calculating', 'op3', 3.0, 4.0, address='worker1'),
+        ]
+
+    def testAggregateSpans(self):
+        stats = aggregate_spans(self.spans)
+        self.assertListEqual(list(stats.keys()), ['calculating', 'assigning', 'calc'])
+        self.assertEqual(stats['calculating']['count'], 3)
+        self.assertAlmostEqual(stats['calculating']['total'], 3.5)
+        self.assertAlmostEqual(stats['calculating']['max'], 2.0)
+
+    def testChromeTrace(self):
+        trace = to_chrome_trace(self.spans, op_names=dict(op1='TensorAdd'))
+        json.dumps(trace)
+
+        events = trace['traceEvents']
+        processes = dict((ev['args']['name'], ev['pid']) for ev in events if ev['ph'] == 'M')
+        self.assertSetEqual(set(processes.keys()), {'scheduler', 'worker1'})
+
+        span_events = [ev for ev in events if ev['ph'] == 'X']
+        self.assertEqual(len(span_events), len(self.spans))
+        op_tids = dict()
+        for ev in span_events:
+            op_tids.setdefault(ev['args']['op_key'], set()).add((ev['pid'], ev['tid']))
+            self.assertGreaterEqual(ev['dur'], 0)
+
+        calc_event = next(ev for ev in span_events if ev['name'] == 'calc')
+        self.assertEqual(calc_event['ts'], 1.5e6)
+        self.assertEqual(calc_event['dur'], 1e6)
+        self.assertEqual(calc_event['args']['op_name'], 'Add')
+
+        # spans of an operand in the same process share a thread,
+        # while overlapping operands use different threads
+        worker_tids = dict((op_key, [tid for pid, tid in v if pid == processes['worker1']])
+                           for op_key, v in op_tids.items())
+        self.assertEqual(len(worker_tids['op1']), 1)
+        self.assertNotEqual(worker_tids['op1'], worker_tids['op2'])
+        # operands not overlapping reuse threads
+        self.assertIn(worker_tids['op3'][0], worker_tids['op1'] + worker_tids['op2'])
@@ -410,3 +410,20 @@ class Test(unittest.TestCase):
         self.assertEqual(ref_bio.read(5), fix_bio.read(5))
         self.assertEqual(ref_bio.readlines(25), fix_bio.readlines(25))
         self.assertEqual(list(ref_bio), list(fix_bio))
+
+    def testSplitChunkBatches(self):
+        chunk_indexes = [(1, 1), (0, 0), (2, 0), (0, 1), (1, 0), (2, 1)]
+        chunk_keys = [f'{i}-{j}' for i, j in chunk_indexes]
+
+        batches = utils.split_chunk_batches(chunk_indexes, chunk_keys)
+        self.assertEqual(batches, [[((i, j), f'{i}-{j}') for j in range(2)] for i in range(3)])
+
+        batches = utils.split_chunk_batches(chunk_indexes, chunk_keys, batch_size=2)
+        self.assertEqual([[k for _, k in b] for b in batches],
+                         [['0-0', '0-1', '1-0', '1-1'], ['2-0', '2-1']])
+
+        batches = utils.split_chunk_batches([()], ['scalar'], batch_size=2)
+        self.assertEqual(batches, [[((), 'scalar')]])
+
+        with self.assertRaises(ValueError):
+            utils.split_chunk_batches(chunk_indexes, chunk_keys, batch_size=0)
@@ -0,0 +1,111 @@
+# Copyright 1999-2020 Alibaba Group Holding Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import heapq
+from collections import OrderedDict, defaultdict
+
+
+class TraceSpan(object):
+    """
+    Time span of a stage when executing an operand
+    """
+    __slots__ = 'name', 'op_key', 'start', 'end', 'address', 'args'
+
+    def __init__(self, name, op_key, start, end, address=None, args=None):
+        self.name = name
+        self.op_key = op_key
+        self.start = start
+        self.end = end
+        self.address = address
+        self.args = args
+
+    def __repr__(self):
+        return f'<TraceSpan {self.name}({self.op_key}) {self.start}-{self.end}>'
+
+    @property
+    def duration(self):
+        return self.end - self.start
+
+
+def aggregate_spans(spans):
+    """
+    Summarize durations of spans by stage names, stages with longest total
+    durations come first
+    :param spans: list of trace spans
+    :return: ordered dict mapping stage names to their statistics
+    """
+    stage_durations = defaultdict(list)
+    for span in spans:
+        stage_durations[span.name].append(span.duration)
+
+    stats = OrderedDict()
+    for name, durations in sorted(stage_durations.items(), key=lambda it: -sum(it[1])):
+        total = sum(durations)
+        stats[name] = dict(count=len(durations), total=total,
+                           mean=total / len(durations), max=max(durations))
+    return stats
+
+
+def to_chrome_trace(spans, op_names=None):
+    """
+    Build trace in Chrome trace event format, which can be loaded by
+    chrome://tracing or Perfetto. Spans are grouped into processes by
+    addresses. Spans of the same operand are put in the same thread,
+    and operands not overlapping in time share threads.
+    :param spans: list of trace spans
+    :param op_names: dict mapping operand keys to operand names
+    :return: trace as a dict, can be dumped as json
+    """
+    op_names = op_names or dict()
+
+    addr_op_ranges = defaultdict(dict)
+    for span in spans:
+        op_ranges = addr_op_ranges[span.address]
+        try:
+            start, end = op_ranges[span.op_key]
+            op_ranges[span.op_key] = (min(start, span.start), max(end, span.end))
+        except KeyError:
+            op_ranges[span.op_key] = (span.start, span.end)
+
+    events = []
+    addr_to_pid = dict()
+    op_to_tid = dict()
+    for pid, (address, op_ranges) in enumerate(sorted(addr_op_ranges.items(), key=lambda it: str(it[0]))):
+        addr_to_pid[address] = pid
+        events.append(dict(name='process_name', ph='M', pid=pid, tid=0,
+                           args=dict(name=str(address))))
+
+        # assign operands to threads greedily by their start times
+        lane_ends = []
+        free_lanes = []
+        for op_key, (start, end) in sorted(op_ranges.items(), key=lambda it: it[1]):
+            while lane_ends and lane_ends[0][0] <= start:
+                heapq.heappush(free_lanes, heapq.heappop(lane_ends)[1])
+            tid = heapq.heappop(free_lanes) if free_lanes \
+                else len(lane_ends) + len(free_lanes)
+            heapq.heappush(lane_ends, (end, tid))
+            op_to_tid[(address, op_key)] = tid
+
+    for span in sorted(spans, key=lambda s: (s.start, -s.end)):
+        args = dict(op_key=span.op_key)
+        if span.op_key in op_names:
+            args['op_name'] = op_names[span.op_key]
+        args.update(span.args or dict())
+        events.append(dict(
+            name=span.name, cat='operand', ph='X',
+            ts=span.start * 1e6, dur=max(span.duration, 0) * 1e6,
+            pid=addr_to_pid[span.address], tid=op_to_tid[(span.address, span.op_key)],
+            args=args,
+        ))
+    return dict(traceEvents=events, displayTimeUnit='ms')
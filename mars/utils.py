@@ -585,6 +585,34 @@ def build_fetch_tileable(tileable):
                                 _key=tileable.key, _id=tileable.id, **params)[0]
 
 
+def build_fetch_with_new_keys(tileable, token, chunk_shapes=None):
+    """
+    Build fetch tileable with chunks of the tileable, whose keys are
+    tokenized with `token`, thus data can be stored under new keys.
+
+    :param tileable: tiled tileable
+    :param token: token to generate new keys
+    :param chunk_shapes: dict of chunk indexes to shapes, used if shapes are unknown
+    """
+    chunks = []
+    for c in tileable.chunks:
+        params = c.params.copy()
+        params['index'] = c.index
+        if chunk_shapes is not None:
+            params['shape'] = chunk_shapes[c.index]
+        op = c.op.get_fetch_op_cls(c)(sparse=c.op.sparse)
+        chunks.append(op.new_chunk(None, kws=[params], _key=tokenize(c.key, token)))
+
+    params = tileable.params.copy()
+    nsplits = tileable.nsplits
+    if chunk_shapes is not None:
+        nsplits = calc_nsplits(chunk_shapes)
+        params['shape'] = tuple(sum(ns) for ns in nsplits)
+    op = tileable.op.get_fetch_op_cls(tileable)()
+    return op.new_tileables(None, chunks=chunks, nsplits=nsplits,
+                            _key=tokenize(tileable.key, token), **params)[0]
+
+
 def build_fetch(entity):
     from .core import Chunk, ChunkData
     if isinstance(entity, (Chunk, ChunkData)):
@@ -647,6 +675,29 @@ def merge_chunks(chunk_results):
         return result
 
 
+def split_chunk_batches(chunk_indexes, chunk_keys, batch_size=1):
+    """
+    Split chunks into batches in index order. Every batch holds chunks in
+    `batch_size` consecutive rows, i.e., chunks with consecutive indexes on
+    the first axis, thus merged batches can be concatenated along the first
+    axis to get the whole result.
+    :param chunk_indexes: indexes of chunks
+    :param chunk_keys: keys of chunks
+    :param batch_size: number of chunk rows in every batch
+    :return: list of batches, each is a list of tuple (chunk_idx, chunk_key)
+    """
+    if batch_size < 1:
+        raise ValueError('batch_size should be positive')
+
+    batches = []
+    chunk_items = sorted(zip(chunk_indexes, chunk_keys), key=lambda it: it[0])
+    rows = [list(cs) for _, cs in itertools.groupby(
+        chunk_items, key=lambda it: it[0][0] if it[0] else 0)]
+    for start in range(0, len(rows), batch_size):
+        batches.append(list(itertools.chain(*rows[start:start + batch_size])))
+    return batches
+
+
 def calc_nsplits(chunk_idx_to_shape):
     """
     Calculate a tiled entity's nsplits
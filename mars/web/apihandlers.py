@@ -16,6 +16,7 @@ import base64
 import json
 import logging
 import pickle
+import struct
 import sys
 import traceback
 import uuid
@@ -30,6 +31,7 @@ from ..actors import new_client
 from ..errors import GraphNotExists
 from ..lib.tblib import pickling_support
 from ..serialize.dataserializer import SerialType, CompressType
+from ..tracing import aggregate_spans, to_chrome_trace
 from ..utils import to_str, tokenize, numpy_dtype_from_descr_json, parse_readable_size
 from .server import MarsWebAPI, MarsRequestHandler, register_web_handler
 
@@ -54,6 +56,15 @@ class MarsApiRequestHandler(MarsRequestHandler):
         self.set_status(status_code)
         self.finish()
 
+    def _get_serial_arguments(self):
+        serial_type = SerialType(self.get_argument('serial_type', 'arrow'))
+        pickle_protocol = int(self.get_argument('pickle_protocol', str(pickle.HIGHEST_PROTOCOL)))
+
+        compressions_arg = self.get_argument('compressions', None)
+        if compressions_arg:
+            compressions_arg = [CompressType(s) for s in compressions_arg.split(',') if s]
+        return serial_type, pickle_protocol, compressions_arg
+
     @staticmethod
     @lru_cache(20)
     def _check_arrow_compatibility(client_version):
@@ -190,6 +201,20 @@ class GraphApiHandler(MarsApiRequestHandler):
             self._dump_exception(sys.exc_info(), status_code=404)
 
 
+class GraphTraceApiHandler(MarsApiRequestHandler):
+    def get(self, session_id, graph_key):
+        aggregate = int(self.get_argument('aggregate', '0'))
+        try:
+            spans, op_names = self.web_api.get_graph_trace_spans(session_id, graph_key)
+        except GraphNotExists:
+            raise web.HTTPError(404, 'Graph not exists')
+
+        if aggregate:
+            self.write(json.dumps(aggregate_spans(spans)))
+        else:
+            self.write(json.dumps(to_chrome_trace(spans, op_names)))
+
+
 class GraphDataApiHandler(MarsApiRequestHandler):
     _executor = ThreadPoolExecutor(1)
 
@@ -197,12 +222,7 @@ class GraphDataApiHandler(MarsApiRequestHandler):
     def get(self, session_id, graph_key, tileable_key):
         data_type = self.get_argument('type', None)
         try:
-            serial_type = SerialType(self.get_argument('serial_type', 'arrow'))
-            pickle_protocol = int(self.get_argument('pickle_protocol', str(pickle.HIGHEST_PROTOCOL)))
-
-            compressions_arg = self.get_argument('compressions', None)
-            if compressions_arg:
-                compressions_arg = [CompressType(s) for s in compressions_arg.split(',') if s]
+            serial_type, pickle_protocol, compressions_arg = self._get_serial_arguments()
             slices_arg = self.request.arguments.get('slices')
             if slices_arg:
                 slices_arg = Indexes.from_json(json.loads(to_str(slices_arg[0]))).indexes
@@ -231,6 +251,40 @@ class GraphDataApiHandler(MarsApiRequestHandler):
         self.web_api.delete_data(session_id, graph_key, tileable_key, wait=wait)
 
 
+class GraphDataStreamApiHandler(MarsApiRequestHandler):
+    """
+    Stream data of a tileable batch by batch in chunked transfer encoding,
+    every serialized batch is preceded by its size as an 8-byte integer
+    """
+    _executor = ThreadPoolExecutor(1)
+
+    @gen.coroutine
+    def get(self, session_id, graph_key, tileable_key):
+        try:
+            serial_type, pickle_protocol, compressions_arg = self._get_serial_arguments()
+            batch_size = int(self.get_argument('batch_size', '1'))
+            prefetch = self.get_argument('prefetch', None)
+            prefetch = int(prefetch) if prefetch is not None else None
+        except (TypeError, ValueError):
+            raise web.HTTPError(403, 'Malformed encodings')
+
+        def _iter_fetch_fun():
+            web_api = MarsWebAPI(self._scheduler)
+            return web_api.iter_fetch_data(session_id, graph_key, tileable_key, batch_size=batch_size,
+                                           prefetch=prefetch, serial_type=serial_type,
+                                           compressions=compressions_arg, pickle_protocol=pickle_protocol)
+
+        # batches are fetched in the executor thread where the iterator is created
+        batches = yield self._executor.submit(_iter_fetch_fun)
+        while True:
+            data = yield self._executor.submit(next, batches, None)
+            if data is None:
+                break
+            self.write(struct.pack('<Q', len(data)))
+            self.write(data)
+            yield self.flush()
+
+
 class OpLogHandler(MarsRequestHandler):
     _executor = ThreadPoolExecutor(1)
 
@@ -346,7 +400,11 @@ register_web_handler('/api/worker', WorkersApiHandler)
 register_web_handler('/api/session/(?P<session_id>[^/]+)', SessionApiHandler)
 register_web_handler('/api/session/(?P<session_id>[^/]+)/graph', GraphsApiHandler)
 register_web_handler('/api/session/(?P<session_id>[^/]+)/graph/(?P<graph_key>[^/]+)', GraphApiHandler)
+register_web_handler('/api/session/(?P<session_id>[^/]+)/graph/(?P<graph_key>[^/]+)/trace',
+                     GraphTraceApiHandler)
 register_web_handler('/api/session/(?P<session_id>[^/]+)/graph/(?P<graph_key>[^/]+)/data/(?P<tileable_key>[^/]+)',
                      GraphDataApiHandler)
+register_web_handler('/api/session/(?P<session_id>[^/]+)/graph/(?P<graph_key>[^/]+)/data/(?P<tileable_key>[^/]+)'
+                     '/stream', GraphDataStreamApiHandler)
 register_web_handler('/api/session/(?P<session_id>[^/]+)/mutable-tensor/(?P<name>[^/]+)', MutableTensorApiHandler)
 register_web_handler('/api/session/(?P<session_id>[^/]+)/op/(?P<op_key>[^/]+)/log', OpLogHandler)
@@ -17,6 +17,7 @@ import json
 import time
 import logging
 import pickle
+import struct
 import sys
 import uuid
 from io import BytesIO
@@ -278,6 +279,45 @@ class Session(object):
             results.append(sort_dataframe_result(tileable, result_data))
         return results
 
+    def iter_fetch(self, tileable, batch_size=1, prefetch=None, timeout=None):
+        if not self._is_executed(tileable):
+            raise ValueError('Cannot fetch the unexecuted tileable')
+
+        key = tileable.key
+        session_url = f'{self._endpoint}/api/session/{self._session_id}'
+        compression_str = ','.join(v.value for v in dataserializer.get_supported_compressions())
+        params = dict(compressions=compression_str, batch_size=batch_size,
+                      serial_type=self._serial_type.value, pickle_protocol=self._pickle_protocol)
+        if prefetch is not None:
+            params['prefetch'] = prefetch
+        data_url = f'{session_url}/graph/{self._get_tileable_graph_key(key)}/data/{key}/stream'
+        resp = self._req_session.get(data_url, params=params, timeout=timeout, stream=True)
+        if resp.status_code >= 400:
+            raise ValueError(f'Failed to fetch data from server. Code: {resp.status_code}, '
+                             f'Reason: {resp.reason}, Content:\n{resp.text}')
+
+        def _read_exact(size):
+            buf = BytesIO()
+            while buf.tell() < size:
+                data = resp.raw.read(size - buf.tell())
+                if not data:
+                    raise ResponseMalformed('Data stream ended unexpectedly')
+                buf.write(data)
+            return buf.getvalue()
+
+        def _iter_batches():
+            with resp:
+                while True:
+                    size_bytes = resp.raw.read(8)
+                    if not size_bytes:
+                        break
+                    if len(size_bytes) < 8:
+                        size_bytes += _read_exact(8 - len(size_bytes))
+                    size, = struct.unpack('<Q', size_bytes)
+                    yield dataserializer.loads(_read_exact(size))
+
+        return _iter_batches()
+
     @classmethod
     def _process_int_or_dict_argument(cls, argument, name, params):
         if argument is None:
@@ -22,4 +22,5 @@ from .prochelper import ProcessHelperActor
 from .quota import QuotaActor, MemQuotaActor
 from .storage import *
 from .status import StatusActor
+from .tracer import TracerActor
 from .transfer import SenderActor, ReceiverManagerActor, ReceiverWorkerActor
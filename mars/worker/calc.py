@@ -20,6 +20,7 @@ from .. import promise
 from ..config import options
 from ..executor import Executor
 from ..serialize import dataserializer
+from ..tracing import TraceSpan
 from ..utils import to_str, deserialize_graph, log_unhandled, calc_data_size, \
     get_chunk_shuffle_key
 from ..context import DistributedDictContext
@@ -46,6 +47,7 @@ class BaseCalcActor(WorkerActor):
         self._events_ref = None
         self._status_ref = None
         self._execution_ref = None
+        self._tracer_ref = None
         self._resource_ref = None
 
         self._executing_set = set()
@@ -62,6 +64,7 @@ class BaseCalcActor(WorkerActor):
         from .events import EventsActor
         from .quota import MemQuotaActor
         from .status import StatusActor
+        from .tracer import TracerActor
         from ..scheduler.resource import ResourceActor
 
         self._mem_quota_ref = self.promise_ref(MemQuotaActor.default_uid())
@@ -79,6 +82,11 @@ class BaseCalcActor(WorkerActor):
         if not self.ctx.has_actor(self._events_ref):
             self._events_ref = None
 
+        if options.trace.enabled:
+            self._tracer_ref = self.ctx.actor_ref(TracerActor.default_uid())
+            if not self.ctx.has_actor(self._tracer_ref):
+                self._tracer_ref = None
+
         self._resource_ref = self.get_actor_ref(ResourceActor.default_uid())
 
         self._execution_pool = self.ctx.threadpool(1)
@@ -246,6 +254,10 @@ class BaseCalcActor(WorkerActor):
             self._status_ref.update_mean_stats(
                 'calc_speed.' + op_name, sum(apply_alloc_sizes) * 1.0 / (end_time - start_time),
                 _tell=True, _wait=False)
+        if self._tracer_ref:
+            span = TraceSpan('calc', graph_key, start_time, end_time,
+                             args=dict(op_name=op_name, result_size=sum(apply_alloc_sizes)))
+            self._tracer_ref.add_spans(session_id, [span], _tell=True, _wait=False)
 
         return self.storage_client.put_objects(
             session_id, result_keys, result_values, [self._calc_intermediate_device],
@@ -12,13 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import io
 from io import BytesIO
 import pickle  # nosec
 
 import numpy as np
 
 from ..serialize.dataserializer import SerialType, CompressType, get_compressobj, get_decompressobj, \
-    HEADER_LENGTH, file_header, read_file_header, write_file_header, SERIAL_VERSION
+    HEADER_LENGTH, file_header, read_file_header, write_file_header, SERIAL_VERSION, \
+    is_pickle5_serialized, choose_compression, open_compression_file, ADAPTIVE_SAMPLE_SIZE
 
 
 class WorkerBufferIO(object):
@@ -28,14 +30,17 @@ class WorkerBufferIO(object):
     def __init__(self, mode='r', compress_in=None, compress_out=None, block_size=8192):
         """
         :param mode: 'r' indicates read, or 'w' indicates write
-        :param compress_in: compression type inside
-        :param compress_out: compression type outside
+        :param compress_in: compression type inside. When adaptive, compression
+                            type of written data is kept.
+        :param compress_out: compression type outside. When adaptive, compression
+                             type is chosen given the first block of data.
         :param block_size: size of data block when copying
         """
         self._mode = mode
         self._block_size = block_size
         self._compress_type_in = compress_in or CompressType.NONE
         self._compress_type_out = compress_out or CompressType.NONE
+        self._compress_stats = None
 
         if 'w' in mode:
             self._compressor_in = None
@@ -66,17 +71,32 @@ class WorkerBufferIO(object):
         """
         raise NotImplementedError
 
+    @property
+    def compress_stats(self):
+        """
+        Compression type chosen adaptively and the compression ratio achieved,
+        available after all data are read
+        """
+        return self._compress_stats
+
     def _iter_blocks(self):
         """
         Returns a generator providing data blocks. The sizes of data blocks can vary.
         """
         bio = BytesIO()
-        compressor_out = get_compressobj(self._compress_type_out)
-
         header = self._read_header()
         self._compress_type_in = header.compress
         decompressor_in = get_decompressobj(header.compress)
 
+        copy_size = self._block_size
+        block = self._read_block(copy_size)
+        adaptive = self._compress_type_out == CompressType.ADAPTIVE
+        first_data = None
+        if adaptive:
+            first_data = decompressor_in.decompress(block) if block else b''
+            self._compress_type_out, _ = choose_compression(first_data)
+
+        compressor_out = get_compressobj(self._compress_type_out)
         new_header = file_header(header.type, header.version, header.nbytes, self._compress_type_out)
         write_file_header(bio, new_header)
 
@@ -91,20 +111,30 @@ class WorkerBufferIO(object):
                 bio.write(compressor_out.begin())
 
         # yield file header and compress header
+        out_size = bio.tell() - HEADER_LENGTH
         yield bio.getvalue()
 
-        copy_size = self._block_size
+        if first_data is not None and self._compress_type_in != self._compress_type_out:
+            # first block is already decompressed when choosing compression
+            buf = compressor_out.compress(first_data)
+        else:
+            buf = handle_block(block) if block else b''
         while True:
+            if buf:
+                # only yield when some data are produced by the compressor
+                out_size += len(buf)
+                yield buf
             block = self._read_block(copy_size)
             if not block:
                 break
             buf = handle_block(block)
-            if buf:
-                # only yield when some data are produced by the compressor
-                yield buf
 
         if hasattr(compressor_out, 'flush'):
-            yield compressor_out.flush()
+            buf = compressor_out.flush()
+            out_size += len(buf)
+            yield buf
+        if adaptive:
+            self._compress_stats = (self._compress_type_out, out_size * 1.0 / max(header.nbytes, 1))
 
     def read(self, size=-1):
         bio = BytesIO()
@@ -190,6 +220,9 @@ class WorkerBufferIO(object):
 
             header = read_file_header(mv)
             self._compress_type_out = header.compress
+            if self._compress_type_in == CompressType.ADAPTIVE:
+                # compression of written data is kept
+                self._compress_type_in = header.compress
             new_header = file_header(header.type, header.version, header.nbytes, self._compress_type_in)
             self._write_header(new_header)
 
@@ -205,6 +238,73 @@ class WorkerBufferIO(object):
         self._remain_buf = self._block_iterator = None
 
 
+class AdaptiveCompressionFile(io.RawIOBase):
+    """
+    Writable file-like object writing data after a file header, whose
+    compression type is chosen given the first block of written data
+    """
+    def __init__(self, file, serial_type, nbytes, sample_size=ADAPTIVE_SAMPLE_SIZE):
+        super().__init__()
+        self._file = file
+        self._serial_type = serial_type
+        self._nbytes = nbytes
+        self._sample_size = sample_size
+
+        self._sample_buf = BytesIO()
+        self._compress_file = None
+        self._compress = None
+        self._data_start = None
+        self._compress_stats = None
+
+    @property
+    def compress(self):
+        return self._compress
+
+    @property
+    def compress_stats(self):
+        """
+        Compression type chosen and the compression ratio achieved,
+        available after the file is closed
+        """
+        return self._compress_stats
+
+    def writable(self):
+        return True
+
+    def _open_compression(self):
+        with self._sample_buf.getbuffer() as sample:
+            self._compress, _ = choose_compression(sample)
+            write_file_header(self._file, file_header(
+                self._serial_type, SERIAL_VERSION, self._nbytes, self._compress))
+            self._data_start = self._file.tell()
+            self._compress_file = open_compression_file(self._file, self._compress)
+            self._compress_file.write(sample)
+        self._sample_buf = None
+
+    def write(self, d):
+        if self._compress_file is not None:
+            return self._compress_file.write(d)
+        size = self._sample_buf.write(d)
+        if self._sample_buf.tell() >= self._sample_size:
+            self._open_compression()
+        return size
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            if not self._file.closed:
+                if self._compress_file is None:
+                    self._open_compression()
+                if self._compress_file is not self._file:
+                    self._compress_file.close()
+                self._compress_stats = (
+                    self._compress, (self._file.tell() - self._data_start) * 1.0 / max(self._nbytes, 1))
+        finally:
+            self._compress_file = self._sample_buf = None
+            super().close()
+
+
 class ArrowBufferIO(WorkerBufferIO):
     """
     File-like object mocking object stored in shared memory as file with header
@@ -225,7 +325,8 @@ class ArrowBufferIO(WorkerBufferIO):
             self._writer.set_memcopy_threads(6)
 
     def _read_header(self):
-        return file_header(SerialType.ARROW, SERIAL_VERSION, self._nbytes, self._compress_type_in)
+        serial_type = SerialType.PICKLE5 if is_pickle5_serialized(self._mv) else SerialType.ARROW
+        return file_header(serial_type, SERIAL_VERSION, self._nbytes, self._compress_type_in)
 
     def _read_block(self, size):
         right = min(self._nbytes, self._buf_offset + size)
@@ -247,16 +348,19 @@ class ArrowBufferIO(WorkerBufferIO):
         super().close()
 
 
-class ArrowComponentsIO(WorkerBufferIO):  # pragma: no cover
+class SerializedBuffersIO(WorkerBufferIO):
     """
-    File-like object mocking object stored in shared memory as file with header
+    File-like object mocking a list of buffers as file with header,
+    thus buffers of serialized objects can be read without being
+    concatenated first
     """
-    def __init__(self, components, mode='r', compress_in=None, compress_out=None, block_size=8192):
+    def __init__(self, buffers, mode='r', compress_in=None, compress_out=None,
+                 block_size=8192, serial_type=None):
         super().__init__(
             mode=mode, compress_in=compress_in, compress_out=compress_out, block_size=block_size)
 
-        self._components = components
-        self._buffers = [self._components_meta()] + self._components['data']
+        self._serial_type = serial_type or SerialType.PICKLE5
+        self._buffers = buffers
         self._mv = memoryview(self._buffers[0])
         if 'r' in mode:
             self._nbytes = 0
@@ -266,20 +370,10 @@ class ArrowComponentsIO(WorkerBufferIO):  # pragma: no cover
             self._index_of_buf = 0
             self._writer = None
         else:
-            raise NotImplementedError('No support for write mode in ArrowComponentsIO')
-
-    def _components_meta(self):
-        meta_block = pickle.dumps({
-            'num_tensors': self._components['num_tensors'],
-            'num_sparse_tensors': self._components['num_sparse_tensors'],
-            'num_ndarrays': self._components['num_ndarrays'],
-            'num_buffers': self._components['num_buffers'],
-            'buffer_sizes': [len(buf) for buf in self._components['data']],
-        }, protocol=pickle.HIGHEST_PROTOCOL)
-        return np.int32(len(meta_block)).tobytes() + meta_block
+            raise NotImplementedError(f'No support for write mode in {type(self).__name__}')
 
     def _read_header(self):
-        return file_header(SerialType.ARROW, SERIAL_VERSION, self._nbytes, self._compress_type_in)
+        return file_header(self._serial_type, SERIAL_VERSION, self._nbytes, self._compress_type_in)
 
     def _read_block(self, size):
         if self._index_of_buf >= len(self._buffers):
@@ -298,16 +392,35 @@ class ArrowComponentsIO(WorkerBufferIO):  # pragma: no cover
         pass
 
     def _write_block(self, d):
-        raise NotImplementedError('No support for _write_block in ArrowComponentsIO')
+        raise NotImplementedError(f'No support for _write_block in {type(self).__name__}')
 
     def close(self):
-        if self._writer is not None:
-            self._writer.close()
-        self._writer = self._mv = self._buffers = None
+        self._mv = self._buffers = None
 
         super().close()
 
 
+class ArrowComponentsIO(SerializedBuffersIO):  # pragma: no cover
+    """
+    File-like object mocking object stored in shared memory as file with header
+    """
+    def __init__(self, components, mode='r', compress_in=None, compress_out=None, block_size=8192):
+        self._components = components
+        super().__init__(
+            [self._components_meta()] + components['data'], mode=mode, compress_in=compress_in,
+            compress_out=compress_out, block_size=block_size, serial_type=SerialType.ARROW)
+
+    def _components_meta(self):
+        meta_block = pickle.dumps({
+            'num_tensors': self._components['num_tensors'],
+            'num_sparse_tensors': self._components['num_sparse_tensors'],
+            'num_ndarrays': self._components['num_ndarrays'],
+            'num_buffers': self._components['num_buffers'],
+            'buffer_sizes': [len(buf) for buf in self._components['data']],
+        }, protocol=pickle.HIGHEST_PROTOCOL)
+        return np.int32(len(meta_block)).tobytes() + meta_block
+
+
 class FileBufferIO(WorkerBufferIO):
     """
     File-like object handling input of one compression type and outputs another
@@ -24,6 +24,7 @@ from ..errors import PinDataKeyFailed, WorkerProcessStopped, WorkerDead, \
     ExecutionInterrupted, DependencyMissing
 from ..executor import Executor
 from ..operands import Fetch, FetchShuffle
+from ..tracing import TraceSpan
 from ..utils import BlacklistSet, deserialize_graph, log_unhandled, build_exc_info, \
     calc_data_size, get_chunk_shuffle_key, calc_object_overhead
 from .storage import DataStorageDevice
@@ -33,6 +34,9 @@ from .utils import WorkerActor, ExpiringCache, ExecutionState, concat_operand_ke
 
 logger = logging.getLogger(__name__)
 
+# token to pin data persisted by users
+_PERSIST_PIN_TOKEN = 'persist'
+
 
 class GraphExecutionRecord(object):
     """
@@ -43,7 +47,8 @@ class GraphExecutionRecord(object):
                  'state_time', 'mem_request', 'pinned_keys', 'mem_overhead_keys',
                  'est_finish_time', 'calc_actor_uid', 'send_addresses', 'retry_delay',
                  'retry_pending', 'finish_callbacks', 'stop_requested', 'calc_device',
-                 'preferred_data_device', 'resource_released', 'no_prepare_chunk_keys')
+                 'preferred_data_device', 'resource_released', 'no_prepare_chunk_keys',
+                 'trace_spans')
 
     def __init__(self, graph_serialized, state, chunk_targets=None, data_targets=None,
                  io_meta=None, data_metas=None, mem_request=None, shared_input_chunks=None,
@@ -77,6 +82,7 @@ class GraphExecutionRecord(object):
         self.preferred_data_device = preferred_data_device
         self.resource_released = resource_released
         self.no_prepare_chunk_keys = no_prepare_chunk_keys or set()
+        self.trace_spans = []
 
         _, self.op_string = concat_operand_keys(graph)
 
@@ -124,6 +130,7 @@ class ExecutionActor(WorkerActor):
         self._status_ref = None
         self._daemon_ref = None
         self._receiver_manager_ref = None
+        self._tracer_ref = None
 
         self._resource_ref = None
 
@@ -137,6 +144,7 @@ class ExecutionActor(WorkerActor):
         from .dispatcher import DispatchActor
         from .quota import MemQuotaActor
         from .status import StatusActor
+        from .tracer import TracerActor
 
         super().post_create()
 
@@ -153,6 +161,11 @@ class ExecutionActor(WorkerActor):
         if not self.ctx.has_actor(self._status_ref):
             self._status_ref = None
 
+        if options.trace.enabled:
+            self._tracer_ref = self.ctx.actor_ref(TracerActor.default_uid())
+            if not self.ctx.has_actor(self._tracer_ref):
+                self._tracer_ref = None
+
         self._receiver_manager_ref = self.ctx.actor_ref(ReceiverManagerActor.default_uid())
         if not self.ctx.has_actor(self._receiver_manager_ref):
             self._receiver_manager_ref = None
@@ -372,10 +385,18 @@ class ExecutionActor(WorkerActor):
             logger.debug('Fetching chunk %s in %s to %s with slot %s',
                          chunk_key, remote_addr, self.address, sender_uid)
 
+            start_time = time.time()
+
+            def _record_transfer_span(*_):
+                if self._tracer_ref is not None:
+                    graph_record.trace_spans.append(TraceSpan(
+                        'transfer', graph_key, start_time, time.time(),
+                        args=dict(chunk_key=str(chunk_key), source=remote_addr)))
+
             return sender_ref.send_data(
                 session_id, [chunk_key], [self.address], ensure_cached=ensure_cached,
                 pin_token=graph_key, timeout=timeout, _timeout=timeout, _promise=True
-            ).then(_finish_fetch)
+            ).then(_record_transfer_span).then(_finish_fetch)
 
         return promise.finished() \
             .then(lambda *_: remote_disp_ref.acquire_free_slot('sender', _promise=True, _timeout=timeout)) \
@@ -450,6 +471,9 @@ class ExecutionActor(WorkerActor):
     def _update_state(self, session_id, key, state):
         logger.debug('Operand %s switched to %s', key, getattr(state, 'name'))
         record = self._graph_records[(session_id, key)]
+        if self._tracer_ref is not None and record.state != state:
+            record.trace_spans.append(
+                TraceSpan(record.state.value, key, record.state_time, time.time()))
         record.state = state
         if self._status_ref:
             self._status_ref.update_progress(
@@ -837,6 +861,8 @@ class ExecutionActor(WorkerActor):
             raise ExecutionInterrupted
 
         storage_client.unpin_data_keys(session_id, graph_record.pinned_keys, graph_key)
+        storage_client.release_data_refs(
+            session_id, graph_record.pinned_keys, (graph_record.preferred_data_device,))
         self._dump_execution_states()
 
         data_attrs = storage_client.get_data_attrs(session_id, saved_keys)
@@ -848,6 +874,7 @@ class ExecutionActor(WorkerActor):
             save_sizes = dict((k, v.size) for k, v in zip(saved_keys, data_attrs) if v)
             save_shapes = dict((k, v.shape) for k, v in zip(saved_keys, data_attrs) if v)
             self._result_cache[(session_id, graph_key)] = GraphResultRecord(save_sizes, save_shapes)
+            self._set_result_ref_counts(session_id, graph_key, list(save_sizes.keys()))
 
         if not send_addresses:
             # no endpoints to send, dump keys into shared memory and return
@@ -872,6 +899,22 @@ class ExecutionActor(WorkerActor):
                 .then(lambda *_: functools.partial(self._do_active_transfer,
                                                    session_id, graph_key, data_to_addresses))
 
+    def _set_result_ref_counts(self, session_id, graph_key, data_keys):
+        """
+        Record numbers of successors using results of the graph, which
+        are considered when choosing data to spill
+        """
+        try:
+            graph_record = self._graph_records[(session_id, graph_key)]
+        except KeyError:
+            return
+        # results without successors are still fetched once
+        n_succs = max(len(graph_record.io_meta.get('successors') or ()), 1)
+        # shuffle partitions are used by single successors
+        ref_counts = [1 if isinstance(k, tuple) else n_succs for k in data_keys]
+        self.storage_client.set_data_ref_counts(
+            session_id, data_keys, ref_counts, (graph_record.preferred_data_device,))
+
     def deallocate_scheduler_resource(self, session_id, graph_key, delay=0):
         try:
             graph_record = self._graph_records[(session_id, graph_key)]
@@ -909,6 +952,10 @@ class ExecutionActor(WorkerActor):
 
         if self._status_ref:
             self._status_ref.remove_progress(session_id, graph_key, _tell=True, _wait=False)
+        if self._tracer_ref is not None:
+            graph_record.trace_spans.append(
+                TraceSpan(graph_record.state.value, graph_key, graph_record.state_time, time.time()))
+            self._tracer_ref.add_spans(session_id, graph_record.trace_spans, _tell=True, _wait=False)
         del self._graph_records[(session_id, graph_key)]
         self.ref().delete_result_cache(session_id, graph_key, _tell=True, _delay=20)
 
@@ -969,6 +1016,21 @@ class ExecutionActor(WorkerActor):
     def delete_data_by_keys(self, session_id, keys):
         self.storage_client.delete(session_id, keys, _tell=True)
 
+    @log_unhandled
+    def pin_data_by_keys(self, session_id, keys, pin=True):
+        """
+        Pin or unpin data persisted by users, thus data are not spilled.
+        Data spilled already are not pinned.
+        """
+        if not pin:
+            self.storage_client.unpin_data_keys(session_id, keys, _PERSIST_PIN_TOKEN)
+            return
+        try:
+            pinned_keys = self.storage_client.pin_data_keys(session_id, keys, _PERSIST_PIN_TOKEN)
+            logger.debug('%d of %d persisted data keys pinned', len(pinned_keys), len(keys))
+        except PinDataKeyFailed:
+            logger.warning('Failed to pin persisted data keys %r under spilling', keys)
+
     @log_unhandled
     def handle_worker_change(self, _adds, removes):
         """
@@ -32,6 +32,7 @@ from .quota import QuotaActor, MemQuotaActor
 from .status import StatusActor
 from .storage import IORunnerActor, StorageManagerActor, SharedHolderActor, \
     InProcHolderActor, CudaHolderActor
+from .tracer import TracerActor
 from .transfer import SenderActor, ReceiverManagerActor, ReceiverWorkerActor, ResultSenderActor
 from .utils import WorkerClusterInfoActor
 
@@ -49,6 +50,7 @@ class WorkerService(object):
         self._mem_quota_ref = None
         self._dispatch_ref = None
         self._events_ref = None
+        self._tracer_ref = None
         self._status_ref = None
         self._execution_ref = None
         self._daemon_ref = None
@@ -256,6 +258,8 @@ class WorkerService(object):
         self._dispatch_ref = pool.create_actor(DispatchActor, uid=DispatchActor.default_uid())
         # create EventsActor
         self._events_ref = pool.create_actor(EventsActor, uid=EventsActor.default_uid())
+        # create TracerActor
+        self._tracer_ref = pool.create_actor(TracerActor, uid=TracerActor.default_uid())
         # create ReceiverNotifierActor
         self._receiver_manager_ref = pool.create_actor(ReceiverManagerActor, uid=ReceiverManagerActor.default_uid())
         # create ExecutionActor
@@ -365,6 +369,8 @@ class WorkerService(object):
                 destroy_futures.append(self._storage_manager_ref.destroy(wait=False))
             if self._events_ref:
                 destroy_futures.append(self._events_ref.destroy(wait=False))
+            if self._tracer_ref:
+                destroy_futures.append(self._tracer_ref.destroy(wait=False))
             if self._dispatch_ref:
                 destroy_futures.append(self._dispatch_ref.destroy(wait=False))
             if self._execution_ref:
@@ -384,6 +384,23 @@ class StorageClient(object):
                 continue
             handler.unpin_data_keys(session_id, data_keys, token)
 
+    def set_data_ref_counts(self, session_id, data_keys, ref_counts, devices):
+        """
+        Set remaining references of data, which are used when choosing data to spill
+        """
+        for dev in self._normalize_devices(devices):
+            handler = self.get_storage_handler(dev)
+            if not getattr(handler, '_spillable', False):
+                continue
+            handler.set_data_ref_counts(session_id, data_keys, ref_counts)
+
+    def release_data_refs(self, session_id, data_keys, devices):
+        for dev in self._normalize_devices(devices):
+            handler = self.get_storage_handler(dev)
+            if not getattr(handler, '_spillable', False):
+                continue
+            handler.release_data_refs(session_id, data_keys)
+
     def spill_size(self, data_size, devices):
         promises = []
         devices = self._normalize_devices(devices)
@@ -105,6 +105,21 @@ class BytesStorageIO(object):
     def read(self, size=-1):
         raise NotImplementedError
 
+    @property
+    def compress_stats(self):
+        """
+        Compression type chosen adaptively when reading packed data and the
+        compression ratio achieved, available after all data are read
+        """
+        return getattr(self._buf, 'compress_stats', None)
+
+    def get_mapped_buffer(self):
+        """
+        Get serialized data as a memory-mapped buffer without copying.
+        None is returned when the storage does not support mapping.
+        """
+        return None
+
     def write(self, d):
         raise NotImplementedError
 
@@ -396,6 +411,12 @@ class SpillableStorageMixin(object):
     def unpin_data_keys(self, session_id, data_keys, token, _tell=False):
         raise NotImplementedError
 
+    def set_data_ref_counts(self, session_id, data_keys, ref_counts):
+        raise NotImplementedError
+
+    def release_data_refs(self, session_id, data_keys):
+        raise NotImplementedError
+
 
 def wrap_promised(func):
     @functools.wraps(func)
@@ -152,5 +152,11 @@ class CudaHandler(StorageHandler, ObjectStorageMixin, SpillableStorageMixin):
     def unpin_data_keys(self, session_id, data_keys, token, _tell=False):
         return self._cuda_store_ref.unpin_data_keys(session_id, data_keys, token, _tell=_tell)
 
+    def set_data_ref_counts(self, session_id, data_keys, ref_counts):
+        self._cuda_store_ref.set_data_ref_counts(session_id, data_keys, ref_counts, _tell=True)
+
+    def release_data_refs(self, session_id, data_keys):
+        self._cuda_store_ref.release_data_refs(session_id, data_keys, _tell=True)
+
 
 register_storage_handler_cls(DataStorageDevice.CUDA, CudaHandler)
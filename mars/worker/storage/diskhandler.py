@@ -18,18 +18,27 @@ import shutil
 import subprocess
 import sys
 import time
+from collections import defaultdict
+from io import BytesIO
 
 from ... import promise
 from ...config import options
 from ...serialize import dataserializer
 from ...errors import SpillNotConfigured, StorageDataExists
 from ...utils import mod_hash
-from ..dataio import FileBufferIO
+from ..dataio import FileBufferIO, AdaptiveCompressionFile
 from ..events import EventsActor, EventCategory, EventLevel, ProcedureEventType
 from ..status import StatusActor
 from ..utils import parse_spill_dirs
 from .core import StorageHandler, BytesStorageMixin, BytesStorageIO, \
     DataStorageDevice, wrap_promised, register_storage_handler_cls
+from .segment import get_segment_store, map_file_range
+
+# spilled data are written after a padding and a file header to keep
+# data offsets aligned in files, thus data can be deserialized from
+# memory-mapped files without copying or producing unaligned arrays
+_DATA_OFFSET = 64
+_HEADER_OFFSET = _DATA_OFFSET - dataserializer.HEADER_LENGTH
 
 
 def _get_file_dir_id(session_id, data_key):
@@ -57,6 +66,19 @@ def _build_file_name(session_id, data_key, writing=False):
     return os.path.join(spill_dir, data_key)
 
 
+def _get_segment_store(session_id, data_key):
+    """
+    Get segment store holding data of the key. Only shuffle data are
+    packed into segment files, None is returned for other keys
+    """
+    if not options.worker.spill_segment_max_item_size or not isinstance(data_key, tuple):
+        return None
+    data_key = '@'.join(data_key)
+    dirs = options.worker.spill_directory
+    seg_dir = os.path.join(dirs[_get_file_dir_id(session_id, data_key)], str(session_id), 'segments')
+    return get_segment_store(seg_dir, options.worker.spill_segment_size)
+
+
 class DiskIO(BytesStorageIO):
     storage_type = DataStorageDevice.DISK
 
@@ -71,42 +93,69 @@ class DiskIO(BytesStorageIO):
         self._raw_buf = self._buf = None
         self._nbytes = nbytes
         self._compress = compress or dataserializer.CompressType.NONE
+        self._packed = packed
         self._total_time = 0
         self._event_id = None
 
+        seg_store = _get_segment_store(session_id, data_key)
+        self._segment_store = None
+        self._segment_key = '@'.join(data_key) if seg_store is not None else None
+
         filename = self._dest_filename = self._filename = _build_file_name(session_id, data_key)
         if self.is_writable:
-            if os.path.exists(self._dest_filename):
+            file_exists = os.path.exists(self._dest_filename)
+            seg_exists = seg_store is not None and seg_store.contains(self._segment_key)
+            if file_exists or seg_exists:
                 exist_devs = self._storage_ctx.manager_ref.get_data_locations(session_id, [data_key])[0]
                 if (0, DataStorageDevice.DISK) in exist_devs:
                     self._closed = True
                     raise StorageDataExists(f'File for data ({session_id}, {data_key}) already exists')
-                else:
+                if file_exists:
                     os.unlink(self._dest_filename)
+                if seg_exists:
+                    seg_store.delete([self._segment_key])
+
+            if seg_store is not None and nbytes is not None \
+                    and nbytes <= options.worker.spill_segment_max_item_size:
+                # small shuffle data are buffered and appended into segment files on close
+                self._segment_store = seg_store
+                buf = self._raw_buf = BytesIO()
+            else:
+                filename = self._filename = _build_file_name(session_id, data_key, writing=True)
+                buf = self._raw_buf = open(filename, 'wb')
 
-            filename = self._filename = _build_file_name(session_id, data_key, writing=True)
-            buf = self._raw_buf = open(filename, 'wb')
-
+            buf.write(b'\0' * _HEADER_OFFSET)
             if packed:
                 self._buf = FileBufferIO(
-                    buf, 'w', compress_in=compress, block_size=block_size)
+                    buf, 'w', compress_in=compress, block_size=block_size, managed=False)
+            elif compress == dataserializer.CompressType.ADAPTIVE:
+                self._buf = AdaptiveCompressionFile(buf, dataserializer.SerialType.ARROW, nbytes)
             else:
                 dataserializer.write_file_header(buf, dataserializer.file_header(
                     dataserializer.SerialType.ARROW, dataserializer.SERIAL_VERSION, nbytes, compress
                 ))
                 self._buf = dataserializer.open_compression_file(buf, compress)
         elif self.is_readable:
-            buf = self._raw_buf = open(filename, 'rb')
+            if seg_store is not None and not os.path.exists(filename) \
+                    and seg_store.contains(self._segment_key):
+                self._segment_store = seg_store
+                buf = self._raw_buf = seg_store.open_reader(self._segment_key)
+                self._dest_filename = self._filename = seg_store.get_path(self._segment_key)
+                data_size = buf.size
+            else:
+                buf = self._raw_buf = open(filename, 'rb')
+                data_size = os.path.getsize(filename)
 
+            buf.seek(_HEADER_OFFSET, os.SEEK_SET)
             header = dataserializer.read_file_header(buf)
             self._nbytes = header.nbytes
             self._offset = 0
 
             if packed:
-                buf.seek(0, os.SEEK_SET)
+                buf.seek(_HEADER_OFFSET, os.SEEK_SET)
                 self._buf = FileBufferIO(
                     buf, 'r', compress_out=compress, block_size=block_size)
-                self._total_bytes = os.path.getsize(filename)
+                self._total_bytes = data_size - _HEADER_OFFSET
             else:
                 compress = self._compress = header.compress
                 self._buf = dataserializer.open_decompression_file(buf, compress)
@@ -131,6 +180,17 @@ class DiskIO(BytesStorageIO):
         file_dir_id = _get_file_dir_id(self._session_id, self._data_key)
         return super().get_io_pool(f'{pool_name or ""}__{file_dir_id}')
 
+    def get_mapped_buffer(self):
+        if self._packed or self._compress != dataserializer.CompressType.NONE or not self._nbytes:
+            return None
+        try:
+            if self._segment_store is not None:
+                return self._segment_store.map_range(self._segment_key, _DATA_OFFSET, self._nbytes)
+            else:
+                return map_file_range(self._filename, _DATA_OFFSET, self._nbytes)
+        except (OSError, ValueError):  # pragma: no cover
+            return None
+
     def read(self, size=-1):
         start = time.time()
         buf = self._buf.read(size)
@@ -149,9 +209,13 @@ class DiskIO(BytesStorageIO):
         if self._closed:
             return
 
-        self._buf.close()
         if self._raw_buf is not self._buf:
-            self._raw_buf.close()
+            self._buf.close()
+        compress_stats = getattr(self._buf, 'compress_stats', None)
+        if self._segment_store is not None and self.is_writable and finished:
+            with self._raw_buf.getbuffer() as seg_buf:
+                self._dest_filename = self._segment_store.append(self._segment_key, seg_buf)
+        self._raw_buf.close()
         self._raw_buf = self._buf = None
 
         transfer_speed = None
@@ -160,7 +224,10 @@ class DiskIO(BytesStorageIO):
 
         if self.is_writable:
             status_key = 'disk_write_speed'
-            if finished:
+            if self._segment_store is not None:
+                if finished:
+                    self.register(self._nbytes)
+            elif finished:
                 shutil.move(self._filename, self._dest_filename)
                 self.register(self._nbytes)
             else:
@@ -170,6 +237,10 @@ class DiskIO(BytesStorageIO):
 
         if self._handler.status_ref and transfer_speed is not None:
             self._handler.status_ref.update_mean_stats(status_key, transfer_speed, _tell=True, _wait=False)
+        if self._handler.status_ref and compress_stats is not None and self.is_writable and finished:
+            compress, ratio = compress_stats
+            self._handler.status_ref.update_mean_stats(
+                f'compress_ratio.disk.{compress.value}', ratio, _tell=True, _wait=False)
         if self._event_id:
             self._handler.events_ref.close_event(self._event_id, _tell=True, _wait=False)
 
@@ -255,9 +326,27 @@ class DiskHandler(StorageHandler, BytesStorageMixin):
         return self.transfer_in_runner(session_id, data_keys, src_handler, _fallback)
 
     def delete(self, session_id, data_keys, _tell=False):
-        file_names = [_build_file_name(session_id, k) for k in data_keys]
         del_pool = self.get_io_pool()
 
+        store_to_keys = defaultdict(list)
+        for k in data_keys:
+            seg_store = _get_segment_store(session_id, k)
+            if seg_store is not None:
+                store_to_keys[seg_store].append(k)
+
+        seg_deleted = set()
+        for seg_store, keys in store_to_keys.items():
+            deleted = set(seg_store.delete(['@'.join(k) for k in keys]))
+            if deleted:
+                seg_deleted.update(k for k in keys if '@'.join(k) in deleted)
+                del_pool.submit(seg_store.compact)
+
+        file_names = []
+        for k in data_keys:
+            file_name = _build_file_name(session_id, k)
+            if k not in seg_deleted or os.path.exists(file_name):
+                file_names.append(file_name)
+
         for idx in range(0, len(file_names), 10):
             cmd = ['rm', '-f'] if sys.platform != 'win32' else ['del']
             cmd += file_names[idx:idx + 10]
@@ -0,0 +1,114 @@
+# Copyright 1999-2020 Alibaba Group Holding Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from ...config import options
+
+
+class EvictionPolicy(object):
+    """
+    Policy deciding the order of data keys to spill when an object holder
+    runs short of memory
+    """
+    name = None
+    # whether disk io statistics are needed when ordering keys
+    use_io_stats = False
+
+    def iter_spill_keys(self, keys, data_sizes, ref_counts, io_stats=None):
+        """
+        Iterate data keys in the order they should be spilled
+        :param keys: candidate keys, in order of least recently used first
+        :param data_sizes: dict of data sizes
+        :param ref_counts: dict of remaining references of data, keys without
+                           known references are absent
+        :param io_stats: statistics of disk reads and writes
+        """
+        raise NotImplementedError
+
+
+class LRUEvictionPolicy(EvictionPolicy):
+    """
+    Spill least recently used data first
+    """
+    name = 'lru'
+
+    def iter_spill_keys(self, keys, data_sizes, ref_counts, io_stats=None):
+        return iter(keys)
+
+
+class CostEvictionPolicy(EvictionPolicy):
+    """
+    Spill data with least estimated cost per freed byte first. The cost of
+    a key is the time to write it to disk plus the time to read it back for
+    every remaining reference, and is discounted for keys not used recently.
+    Thus big, cold data with few remaining references are spilled first.
+    """
+    name = 'cost'
+    use_io_stats = True
+
+    # fixed time spent on every disk access, in seconds
+    io_latency = 0.005
+    # references assumed for data whose references are unknown
+    default_ref_count = 1
+    # discount of cost for the least recently used data
+    cold_discount = 0.5
+
+    @staticmethod
+    def _get_io_speed(io_stats, item):
+        stats = (io_stats or dict()).get(item)
+        if stats and stats['count'] >= options.optimize.min_stats_count and stats['mean'] > 0:
+            return stats['mean']
+        return options.optimize.default_disk_io_speed
+
+    def get_cost(self, size, ref_count, read_speed, write_speed):
+        """
+        Estimate time spent on disk when spilling data and loading it back
+        """
+        spill_cost = self.io_latency + size * 1.0 / write_speed
+        reload_cost = ref_count * (self.io_latency + size * 1.0 / read_speed)
+        return spill_cost + reload_cost
+
+    def iter_spill_keys(self, keys, data_sizes, ref_counts, io_stats=None):
+        read_speed = self._get_io_speed(io_stats, 'disk_read_speed')
+        write_speed = self._get_io_speed(io_stats, 'disk_write_speed')
+
+        keys = list(keys)
+        scores = dict()
+        for idx, k in enumerate(keys):
+            size = max(data_sizes[k], 1)
+            ref_count = ref_counts.get(k, self.default_ref_count)
+            recency = (idx + 1) * 1.0 / len(keys)
+            weight = 1 - self.cold_discount * (1 - recency)
+            scores[k] = weight * self.get_cost(size, ref_count, read_speed, write_speed) / size
+        return iter(sorted(keys, key=scores.__getitem__))
+
+
+_eviction_policies = dict()
+
+
+def register_eviction_policy(policy_cls):
+    _eviction_policies[policy_cls.name] = policy_cls
+
+
+def get_eviction_policy(name):
+    """
+    Create the eviction policy given its name
+    """
+    try:
+        return _eviction_policies[name]()
+    except KeyError:
+        raise ValueError(f'Eviction policy {name} not supported') from None
+
+
+register_eviction_policy(LRUEvictionPolicy)
+register_eviction_policy(CostEvictionPolicy)
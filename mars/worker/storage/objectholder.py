@@ -24,6 +24,7 @@ from ...utils import parse_readable_size, log_unhandled, readable_size, tokenize
 from ...errors import SpillNotConfigured, SpillSizeExceeded, NoDataToSpill, PinDataKeyFailed
 from ..utils import WorkerActor
 from .core import DataStorageDevice
+from .eviction import get_eviction_policy
 from .manager import StorageManagerActor
 
 logger = logging.getLogger(__name__)
@@ -32,6 +33,8 @@ logger = logging.getLogger(__name__)
 class ObjectHolderActor(WorkerActor):
     _storage_device = None
     _spill_devices = None
+    # seconds between refreshes of disk io statistics
+    _io_stats_refresh_time = 10
 
     def __init__(self, size_limit=0):
         super().__init__()
@@ -45,9 +48,20 @@ class ObjectHolderActor(WorkerActor):
         self._spill_pending_keys = set()
 
         self._total_spill = 0
+        self._spill_count = 0
         self._min_spill_size = 0
         self._max_spill_size = 0
 
+        self._eviction_policy = None
+        # remaining references of data from graphs to execute
+        self._data_ref_counts = dict()
+        # keys spilled by the holder, used to detect cache misses
+        self._spilled_keys = set()
+        # disk io statistics for the eviction policy, refreshed periodically
+        self._io_stats = None
+        self._access_count = 0
+        self._miss_count = 0
+
         self._dispatch_ref = None
         self._status_ref = None
         self._storage_handler = None
@@ -64,6 +78,7 @@ class ObjectHolderActor(WorkerActor):
         self._min_spill_size = int(self._size_limit * parse_num if is_percent else parse_num)
         parse_num, is_percent = parse_readable_size(options.worker.max_spill_size)
         self._max_spill_size = int(self._size_limit * parse_num if is_percent else parse_num)
+        self._eviction_policy = get_eviction_policy(options.worker.eviction_policy)
 
         status_ref = self.ctx.actor_ref(StatusActor.default_uid())
         self._status_ref = status_ref if self.ctx.has_actor(status_ref) else None
@@ -72,6 +87,8 @@ class ObjectHolderActor(WorkerActor):
             self._storage_device.build_location(self.proc_id))
 
         self.ref().update_cache_status(_tell=True)
+        if self._eviction_policy.use_io_stats and self._status_ref:
+            self.ref().update_io_stats(_tell=True)
 
     def pre_destroy(self):
         for k in self._data_holder:
@@ -86,6 +103,27 @@ class ObjectHolderActor(WorkerActor):
     def get_size_limit(self):
         return self._size_limit
 
+    def get_eviction_stats(self):
+        """
+        Get hit rate and spill volume of the eviction policy
+        """
+        hit_rate = 1.0
+        if self._access_count:
+            hit_rate = max(self._access_count - self._miss_count, 0) * 1.0 / self._access_count
+        return dict(policy=self._eviction_policy.name, hit_rate=hit_rate,
+                    access_count=self._access_count, miss_count=self._miss_count,
+                    spill_size=self._total_spill, spill_count=self._spill_count)
+
+    def update_io_stats(self):
+        self._io_stats = self._status_ref.get_stats(['disk_read_speed', 'disk_write_speed'])
+        self.ref().update_io_stats(_tell=True, _delay=self._io_stats_refresh_time)
+
+    def _iter_spill_candidates(self):
+        keys = [k for k in self._data_holder.keys()
+                if k not in self._pinned_counter and k not in self._spill_pending_keys]
+        return self._eviction_policy.iter_spill_keys(
+            keys, self._data_sizes, self._data_ref_counts, io_stats=self._io_stats)
+
     @promise.reject_on_exception
     @log_unhandled
     def spill_size(self, size, multiplier=1, callback=None):
@@ -106,9 +144,7 @@ class ObjectHolderActor(WorkerActor):
         if request_size + self._total_hold > self._size_limit:
             acc_free = 0
             free_keys = []
-            for k in self._data_holder.keys():
-                if k in self._pinned_counter or k in self._spill_pending_keys:
-                    continue
+            for k in self._iter_spill_candidates():
                 acc_free += self._data_sizes[k]
                 free_keys.append(k)
                 self._spill_pending_keys.add(k)
@@ -127,7 +163,13 @@ class ObjectHolderActor(WorkerActor):
             def _release_spill_allocations(key):
                 logger.debug('Removing reference of data %s from %s when spilling. ref_key=%s',
                              key, self.uid, spill_ref_key)
+                spilled = key in self._data_holder
+                if spilled:
+                    self._total_spill += self._data_sizes[key]
+                    self._spill_count += 1
                 self.delete_objects(key[0], [key[1]])
+                if spilled:
+                    self._spilled_keys.add(key)
 
             @log_unhandled
             def _handle_spill_reject(*exc, **kwargs):
@@ -171,6 +213,10 @@ class ObjectHolderActor(WorkerActor):
             if session_data_key in self._data_holder:
                 self._total_hold -= self._data_sizes[session_data_key]
                 del self._data_holder[session_data_key]
+            if session_data_key in self._spilled_keys:
+                # data spilled before are loaded back
+                self._spilled_keys.remove(session_data_key)
+                self._miss_count += 1
 
             self._data_holder[session_data_key] = obj
             self._data_sizes[session_data_key] = size
@@ -204,6 +250,8 @@ class ObjectHolderActor(WorkerActor):
                 del self._pinned_counter[session_data_key]
             except KeyError:
                 pass
+            self._data_ref_counts.pop(session_data_key, None)
+            self._spilled_keys.discard(session_data_key)
 
             if session_data_key in self._data_holder:
                 actual_removed.append(data_key)
@@ -237,6 +285,7 @@ class ObjectHolderActor(WorkerActor):
                 self._pinned_counter[session_k] = set()
             self._pinned_counter[session_k].add(token)
             pinned.append(k)
+        self._access_count += len(pinned)
         logger.debug('Data keys %r pinned in %s', pinned, self.uid)
         return pinned
 
@@ -256,6 +305,31 @@ class ObjectHolderActor(WorkerActor):
             logger.debug('Data keys %r unpinned in %s', unpinned, self.uid)
         return unpinned
 
+    def set_data_ref_counts(self, session_id, data_keys, ref_counts):
+        """
+        Set remaining references of data held in the holder
+        :param session_id: session id
+        :param data_keys: data keys
+        :param ref_counts: numbers of remaining references of data keys
+        """
+        for k, ref_count in zip(data_keys, ref_counts):
+            session_k = (session_id, k)
+            if session_k in self._data_holder:
+                self._data_ref_counts[session_k] = ref_count
+
+    def release_data_refs(self, session_id, data_keys):
+        """
+        Decrease remaining references of data after they are used
+        :param session_id: session id
+        :param data_keys: data keys
+        """
+        for k in data_keys:
+            session_k = (session_id, k)
+            try:
+                self._data_ref_counts[session_k] = max(self._data_ref_counts[session_k] - 1, 0)
+            except KeyError:
+                continue
+
     def dump_keys(self):  # pragma: no cover
         return list(self._data_holder.keys())
 
@@ -306,6 +380,9 @@ class SharedHolderActor(ObjectHolderActor):
         if self._status_ref:
             self._status_ref.set_cache_allocations(
                 dict(hold=self._total_hold, total=self._size_limit), _tell=True, _wait=False)
+            self._status_ref.update_stats(
+                {f'cache_eviction.{self._eviction_policy.name}': self.get_eviction_stats()},
+                _tell=True, _wait=False)
 
     def post_delete(self, session_id, data_keys):
         self._shared_store.batch_delete(session_id, data_keys)
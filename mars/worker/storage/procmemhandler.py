@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from ...config import options
 from ...serialize import dataserializer
 from ...utils import calc_data_size
 from .core import DataStorageDevice, StorageHandler, ObjectStorageMixin, \
@@ -57,6 +58,10 @@ class ProcMemHandler(StorageHandler, ObjectStorageMixin):
     def load_from_bytes_io(self, session_id, data_keys, src_handler, pin_token=None):
         def _read_serialized(reader):
             with reader:
+                if options.worker.mmap_spilled_data:
+                    buf = reader.get_mapped_buffer()
+                    if buf is not None:
+                        return buf
                 return reader.get_io_pool().submit(reader.read).result()
 
         def _fallback(*_):
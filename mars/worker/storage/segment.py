@@ -0,0 +1,504 @@
+# Copyright 1999-2020 Alibaba Group Holding Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import logging
+import mmap
+import os
+import struct
+import threading
+import uuid
+from collections import namedtuple, defaultdict
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = '.seg'
+TOMBSTONE_SUFFIX = '.tomb'
+
+# record layout: magic, record type, key length, padding length, payload length,
+# key, padding, payload. payloads of data records are aligned inside files.
+_RECORD_MAGIC = b'\x93MSR'
+_record_header = struct.Struct('<4sBHHQ')
+_tombstone_header = struct.Struct('<Q')
+_RECORD_DATA = 0
+_RECORD_TOMBSTONE = 1
+
+_FSYNC_BATCH_SIZE = 16 * 1024 ** 2
+_DATA_ALIGNMENT = 64
+
+SegmentLocation = namedtuple('SegmentLocation', 'file_name offset size record_size')
+
+
+def map_file_range(path, offset, size):
+    """
+    Memory-map a range of a file and return a read-only memoryview over it.
+    The mapping is released once the memoryview and all objects created
+    from it are released.
+
+    :param path: path of the file
+    :param offset: start offset of the range
+    :param size: size of the range
+    """
+    map_offset = offset - offset % mmap.ALLOCATIONGRANULARITY
+    with open(path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), offset + size - map_offset,
+                       access=mmap.ACCESS_READ, offset=map_offset)
+    return memoryview(mm)[offset - map_offset:offset - map_offset + size]
+
+
+class SegmentRecordIO(io.RawIOBase):
+    """
+    Read-only file-like object over one record inside a segment file.
+    The record is memory-mapped when possible, otherwise it is read
+    from the file with seeks.
+    """
+    def __init__(self, path, offset, size):
+        super().__init__()
+        self._size = size
+        self._pos = 0
+        self._file = open(path, 'rb')
+        self._mmap = self._view = None
+        self._offset = offset
+
+        if size:
+            map_offset = offset - offset % mmap.ALLOCATIONGRANULARITY
+            try:
+                self._mmap = mmap.mmap(self._file.fileno(), offset + size - map_offset,
+                                       access=mmap.ACCESS_READ, offset=map_offset)
+                self._view = memoryview(self._mmap)[offset - map_offset:offset - map_offset + size]
+            except (OSError, ValueError):  # pragma: no cover
+                self._mmap = self._view = None
+
+    @property
+    def size(self):
+        return self._size
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, pos, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            pos += self._pos
+        elif whence == os.SEEK_END:
+            pos += self._size
+        self._pos = min(max(pos, 0), self._size)
+        return self._pos
+
+    def readinto(self, b):
+        n = min(len(b), self._size - self._pos)
+        if n <= 0:
+            return 0
+        if self._view is not None:
+            b[:n] = self._view[self._pos:self._pos + n]
+        else:  # pragma: no cover
+            self._file.seek(self._offset + self._pos)
+            n = self._file.readinto(memoryview(b)[:n])
+        self._pos += n
+        return n
+
+    def close(self):
+        if self.closed:
+            return
+        if self._view is not None:
+            self._view.release()
+            self._mmap.close()
+        self._view = self._mmap = None
+        self._file.close()
+        super().close()
+
+
+class SegmentStore(object):
+    """
+    Store packing small spilled data of one session inside one spill
+    directory into append-only segment files.
+
+    Every process appends records into its own segment files and keeps an
+    in-memory index from data keys to record offsets. Records written by
+    other processes are discovered by scanning their files incrementally
+    when a key is missing or on refresh. Deletions are appended as
+    tombstones into a tombstone log of the deleting process, and segment
+    files with most records deleted are compacted by the process owning
+    them. A tombstone log is removed once all segment files it refers to
+    are removed.
+    """
+    def __init__(self, seg_dir, max_segment_size=None, fsync_batch_size=_FSYNC_BATCH_SIZE):
+        self._dir = seg_dir
+        self._max_segment_size = max_segment_size or 64 * 1024 ** 2
+        self._fsync_batch_size = fsync_batch_size
+        self._owner = f'{os.getpid()}-{uuid.uuid4().hex[:8]}'
+        self._lock = threading.RLock()
+
+        # data key -> list of locations holding the data
+        self._index = defaultdict(list)
+        # locations known to be deleted, used when tombstones are
+        # scanned before the records they refer to
+        self._dead = set()
+        # file name -> size scanned
+        self._scanned = dict()
+        # locations moved by compaction
+        self._moved = dict()
+
+        self._seq = 0
+        self._active_name = self._active_file = None
+        self._unsynced = 0
+        # sizes and live sizes of segment files owned by current process
+        self._owned_sizes = dict()
+        self._owned_live = defaultdict(int)
+
+        self._tomb_name = self._tomb_file = None
+        # segment files referred by current tombstone log
+        self._tomb_targets = set()
+
+    @property
+    def directory(self):
+        return self._dir
+
+    def _path(self, file_name):
+        return os.path.join(self._dir, file_name)
+
+    def _is_owned(self, file_name):
+        return file_name in self._owned_sizes or file_name == self._tomb_name
+
+    def _list_files(self):
+        def _sort_key(fn):
+            owner, seq = os.path.splitext(fn)[0].rsplit('-', 1)
+            return owner, int(seq)
+
+        try:
+            names = [fn for fn in os.listdir(self._dir)
+                     if fn.endswith(SEGMENT_SUFFIX) or fn.endswith(TOMBSTONE_SUFFIX)]
+        except FileNotFoundError:
+            return []
+        return sorted(names, key=_sort_key)
+
+    def _new_file(self, suffix):
+        os.makedirs(self._dir, exist_ok=True)
+        self._seq += 1
+        file_name = f'{self._owner}-{self._seq}{suffix}'
+        self._scanned[file_name] = 0
+        return file_name, open(self._path(file_name), 'wb')
+
+    @staticmethod
+    def _close_file(f):
+        f.flush()
+        os.fsync(f.fileno())
+        f.close()
+
+    def _write_record(self, f, file_name, record_type, key, payloads):
+        key_bytes = key.encode('utf-8')
+        payload_size = sum(memoryview(p).nbytes for p in payloads)
+
+        offset = f.tell()
+        pad_size = 0
+        if record_type == _RECORD_DATA:
+            pad_size = -(offset + _record_header.size + len(key_bytes)) % _DATA_ALIGNMENT
+        header = _record_header.pack(
+            _RECORD_MAGIC, record_type, len(key_bytes), pad_size, payload_size)
+
+        f.write(header)
+        f.write(key_bytes)
+        f.write(b'\0' * pad_size)
+        for p in payloads:
+            f.write(p)
+        f.flush()
+
+        data_offset = offset + len(header) + len(key_bytes) + pad_size
+        record_size = data_offset + payload_size - offset
+        self._scanned[file_name] = offset + record_size
+        return SegmentLocation(file_name, data_offset, payload_size, record_size)
+
+    def _append_data(self, key, payloads):
+        if self._active_file is not None and not os.path.exists(self._path(self._active_name)):
+            # segment file removed outside the store
+            self._active_file.close()
+            self._drop_owned_file(self._active_name)
+            self._active_file = self._active_name = None
+        if self._active_file is None or self._owned_sizes[self._active_name] >= self._max_segment_size:
+            if self._active_file is not None:
+                self._close_file(self._active_file)
+            self._active_name, self._active_file = self._new_file(SEGMENT_SUFFIX)
+            self._unsynced = 0
+
+        loc = self._write_record(self._active_file, self._active_name, _RECORD_DATA, key, payloads)
+        self._owned_sizes[self._active_name] = loc.offset + loc.size
+
+        self._unsynced += loc.record_size
+        if self._unsynced >= self._fsync_batch_size:
+            os.fsync(self._active_file.fileno())
+            self._unsynced = 0
+        return loc
+
+    def _append_tombstone(self, key, target_file, target_offset):
+        if self._tomb_file is not None and not os.path.exists(self._path(self._tomb_name)):
+            self._tomb_file.close()
+            self._tomb_file = None
+        if self._tomb_file is None:
+            self._tomb_name, self._tomb_file = self._new_file(TOMBSTONE_SUFFIX)
+            self._tomb_targets = set()
+
+        payload = _tombstone_header.pack(target_offset) + target_file.encode('utf-8')
+        self._write_record(self._tomb_file, self._tomb_name, _RECORD_TOMBSTONE, key, [payload])
+        self._tomb_targets.add(target_file)
+
+    def _add_location(self, key, loc):
+        if (loc.file_name, loc.offset) in self._dead:
+            return
+        self._index[key].append(loc)
+        if loc.file_name in self._owned_sizes:
+            self._owned_live[loc.file_name] += loc.record_size
+
+    def _kill_location(self, key, file_name, offset):
+        file_name, offset = self._moved.get((file_name, offset), (file_name, offset))
+        self._dead.add((file_name, offset))
+
+        locs = self._index.get(key)
+        if not locs:
+            return
+        for idx, loc in enumerate(locs):
+            if loc.file_name == file_name and loc.offset == offset:
+                locs.pop(idx)
+                if file_name in self._owned_sizes:
+                    self._owned_live[file_name] -= loc.record_size
+                break
+        if not locs:
+            del self._index[key]
+
+    def _scan_file(self, file_name):
+        path = self._path(file_name)
+        pos = self._scanned.get(file_name, 0)
+        try:
+            file_size = os.path.getsize(path)
+            if file_size <= pos:
+                return
+            with open(path, 'rb') as f:
+                f.seek(pos)
+                while pos + _record_header.size <= file_size:
+                    magic, record_type, key_size, pad_size, payload_size = \
+                        _record_header.unpack(f.read(_record_header.size))
+                    if magic != _RECORD_MAGIC:  # pragma: no cover
+                        logger.warning('Segment file %s corrupted at %d', path, pos)
+                        pos = file_size
+                        break
+                    data_offset = pos + _record_header.size + key_size + pad_size
+                    record_end = data_offset + payload_size
+                    if record_end > file_size:
+                        # record still being written
+                        break
+
+                    key = f.read(key_size).decode('utf-8')
+                    f.seek(pad_size, os.SEEK_CUR)
+                    if record_type == _RECORD_TOMBSTONE:
+                        payload = f.read(payload_size)
+                        target_offset, = _tombstone_header.unpack(payload[:_tombstone_header.size])
+                        target_file = payload[_tombstone_header.size:].decode('utf-8')
+                        self._kill_location(key, target_file, target_offset)
+                    else:
+                        f.seek(record_end)
+                        self._add_location(
+                            key, SegmentLocation(file_name, data_offset, payload_size, record_end - pos))
+                    pos = record_end
+        except FileNotFoundError:
+            self._forget_file(file_name)
+            return
+        self._scanned[file_name] = pos
+
+    def _forget_file(self, file_name):
+        self._scanned.pop(file_name, None)
+        for key in list(self._index.keys()):
+            locs = [loc for loc in self._index[key] if loc.file_name != file_name]
+            if locs:
+                self._index[key] = locs
+            else:
+                del self._index[key]
+        self._dead = set(t for t in self._dead if t[0] != file_name)
+
+    def _drop_owned_file(self, file_name):
+        self._owned_sizes.pop(file_name, None)
+        self._owned_live.pop(file_name, None)
+        self._forget_file(file_name)
+
+    def refresh(self):
+        """
+        Scan records appended by other processes since last refresh
+        """
+        with self._lock:
+            names = self._list_files()
+            for fn in set(self._scanned) - set(names):
+                if fn != self._active_name and fn != self._tomb_name:
+                    self._drop_owned_file(fn)
+            for fn in names:
+                if not self._is_owned(fn):
+                    self._scan_file(fn)
+
+    def _get_locations(self, key, refresh=True):
+        locs = self._index.get(key)
+        if not locs and refresh:
+            self.refresh()
+            locs = self._index.get(key)
+        return list(locs or ())
+
+    def contains(self, key):
+        with self._lock:
+            return bool(self._get_locations(key))
+
+    def get_location(self, key):
+        with self._lock:
+            locs = self._get_locations(key)
+            return locs[-1] if locs else None
+
+    def get_path(self, key):
+        loc = self.get_location(key)
+        return self._path(loc.file_name) if loc is not None else None
+
+    def open_reader(self, key):
+        """
+        Open a file-like object reading data of the key
+        """
+        for _ in range(2):
+            loc = self.get_location(key)
+            if loc is None:
+                break
+            try:
+                return SegmentRecordIO(self._path(loc.file_name), loc.offset, loc.size)
+            except FileNotFoundError:
+                # segment compacted by other processes
+                with self._lock:
+                    self._forget_file(loc.file_name)
+        raise KeyError(key)
+
+    def map_range(self, key, offset=0, size=None):
+        """
+        Memory-map data of the key, see :func:`map_file_range`
+        """
+        for _ in range(2):
+            loc = self.get_location(key)
+            if loc is None:
+                break
+            map_size = loc.size - offset if size is None else size
+            try:
+                return map_file_range(self._path(loc.file_name), loc.offset + offset, map_size)
+            except FileNotFoundError:
+                with self._lock:
+                    self._forget_file(loc.file_name)
+        raise KeyError(key)
+
+    def append(self, key, *payloads):
+        """
+        Append data of the key into the active segment file
+
+        :return: path of the segment file
+        """
+        with self._lock:
+            loc = self._append_data(key, payloads)
+            self._add_location(key, loc)
+            return self._path(loc.file_name)
+
+    def delete(self, keys):
+        """
+        Delete data by writing tombstones for them
+
+        :param keys: data keys
+        :return: keys deleted
+        """
+        deleted = []
+        with self._lock:
+            self.refresh()
+            for key in keys:
+                locs = self._index.get(key)
+                if not locs:
+                    continue
+                for loc in list(locs):
+                    self._append_tombstone(key, loc.file_name, loc.offset)
+                    self._kill_location(key, loc.file_name, loc.offset)
+                deleted.append(key)
+            if self._tomb_file is not None:
+                self._tomb_file.flush()
+        return deleted
+
+    def _compact_file(self, file_name):
+        path = self._path(file_name)
+        live_locs = [(key, loc) for key, locs in self._index.items()
+                     for loc in locs if loc.file_name == file_name]
+        for key, loc in live_locs:
+            with SegmentRecordIO(path, loc.offset, loc.size) as reader:
+                data = reader.read()
+            new_loc = self._append_data(key, [data])
+            self._add_location(key, new_loc)
+            self._moved[(file_name, loc.offset)] = (new_loc.file_name, new_loc.offset)
+
+        # other processes drop locations in the file once it is removed
+        self._drop_owned_file(file_name)
+        try:
+            os.unlink(path)
+        except OSError:  # pragma: no cover
+            logger.warning('Failed to remove segment file %s', path)
+
+    def compact(self, ratio=0.5):
+        """
+        Compact sealed segment files owned by current process whose ratio
+        of deleted bytes reaches given value. Live records are copied into
+        the active segment file. The active segment file is removed when
+        all data inside it are deleted.
+        """
+        with self._lock:
+            self.refresh()
+            for file_name, size in list(self._owned_sizes.items()):
+                live_size = self._owned_live[file_name]
+                if file_name == self._active_name:
+                    if live_size > 0:
+                        continue
+                    self._active_file.close()
+                    self._active_file = self._active_name = None
+                elif not size or size - live_size < size * ratio:
+                    continue
+                self._compact_file(file_name)
+
+            if self._tomb_file is not None \
+                    and not any(os.path.exists(self._path(fn)) for fn in self._tomb_targets):
+                # all segment files referred by tombstones are removed
+                self._tomb_file.close()
+                os.unlink(self._path(self._tomb_name))
+                self._scanned.pop(self._tomb_name, None)
+                self._tomb_file = self._tomb_name = None
+
+    def close(self):
+        with self._lock:
+            for f in (self._active_file, self._tomb_file):
+                if f is not None:
+                    self._close_file(f)
+            self._active_file = self._active_name = None
+            self._tomb_file = self._tomb_name = None
+
+
+_segment_stores = dict()
+_segment_stores_lock = threading.Lock()
+
+
+def get_segment_store(seg_dir, max_segment_size=None):
+    """
+    Get segment store of current process for given directory
+    """
+    try:
+        return _segment_stores[seg_dir]
+    except KeyError:
+        with _segment_stores_lock:
+            if seg_dir not in _segment_stores:
+                _segment_stores[seg_dir] = SegmentStore(seg_dir, max_segment_size=max_segment_size)
+            return _segment_stores[seg_dir]
@@ -257,5 +257,11 @@ class SharedStorageHandler(StorageHandler, BytesStorageMixin, ObjectStorageMixin
     def unpin_data_keys(self, session_id, data_keys, token, _tell=False):
         return self._holder_ref.unpin_data_keys(session_id, data_keys, token, _tell=_tell)
 
+    def set_data_ref_counts(self, session_id, data_keys, ref_counts):
+        self._holder_ref.set_data_ref_counts(session_id, data_keys, ref_counts, _tell=True)
+
+    def release_data_refs(self, session_id, data_keys):
+        self._holder_ref.release_data_refs(session_id, data_keys, _tell=True)
+
 
 register_storage_handler_cls(DataStorageDevice.SHARED_MEMORY, SharedStorageHandler)
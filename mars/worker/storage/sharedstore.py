@@ -90,11 +90,8 @@ class PlasmaSharedStore(object):
     Wrapper of plasma client for Mars objects
     """
     def __init__(self, plasma_client, mapper_ref):
-        from ...serialize.dataserializer import mars_serialize_context
-
         self._plasma_client = plasma_client
         self._size_limit = None
-        self._serialize_context = mars_serialize_context()
 
         self._mapper_ref = mapper_ref
         self._pool = mapper_ref.ctx.threadpool(1)
@@ -174,12 +171,7 @@ class PlasmaSharedStore(object):
         """
         Get deserialized Mars object from plasma store
         """
-        obj_id = self._get_object_id(session_id, data_key)
-        obj = self._plasma_client.get(obj_id, serialization_context=self._serialize_context, timeout_ms=10)
-        if obj is plasma.ObjectNotAvailable:
-            self._mapper_ref.delete(session_id, data_key)
-            raise KeyError((session_id, data_key))
-        return obj
+        return dataserializer.deserialize(self.get_buffer(session_id, data_key))
 
     def get_buffer(self, session_id, data_key):
         """
@@ -40,7 +40,7 @@ def mock_transfer_in_global_runner(self, session_id, data_key, src_handler, fall
 class Test(WorkerCase):
     @staticmethod
     def _get_compress_types():
-        return {dataserializer.CompressType.NONE} \
+        return {dataserializer.CompressType.NONE, dataserializer.CompressType.ADAPTIVE} \
             | dataserializer.get_supported_compressions()
 
     def testDiskReadAndWrite(self, *_):
@@ -246,3 +246,63 @@ class Test(WorkerCase):
             proc_handler.delete(session_id, [data_key2])
             self.assertIsNone(ref_data2())
             handler.delete(session_id, [data_key2])
+
+    def testDiskSegments(self, *_):
+        test_addr = f'127.0.0.1:{get_next_port()}'
+        with self.create_pool(n_process=1, address=test_addr) as pool, \
+                self.run_actor_test(pool) as test_actor:
+            pool.create_actor(WorkerDaemonActor, uid=WorkerDaemonActor.default_uid())
+            storage_manager_ref = pool.create_actor(
+                StorageManagerActor, uid=StorageManagerActor.default_uid())
+
+            session_id = str(uuid.uuid4())
+            data_key = str(uuid.uuid4())
+            shuffle_keys = [(data_key, str(idx)) for idx in range(10)]
+            shuffle_data = [np.random.random((10, 10)) for _ in shuffle_keys]
+
+            storage_client = test_actor.storage_client
+            handler = storage_client.get_storage_handler((0, DataStorageDevice.DISK))
+
+            def _write_data(ser, writer):
+                with writer:
+                    ser.write_to(writer)
+                return writer.filename
+
+            def _read_data(reader):
+                with reader:
+                    return dataserializer.deserialize(reader.read())
+
+            file_names = set()
+            for k, d in zip(shuffle_keys, shuffle_data):
+                ser = dataserializer.serialize(d)
+                handler.create_bytes_writer(session_id, k, ser.total_bytes, _promise=True) \
+                    .then(functools.partial(_write_data, ser)) \
+                    .then(test_actor.set_result,
+                          lambda *exc: test_actor.set_result(exc, accept=False))
+                file_names.add(self.get_result(5))
+
+            # shuffle data are packed into one segment file
+            self.assertEqual(len(file_names), 1)
+            seg_file_name = file_names.pop()
+            self.assertEqual(sorted(storage_manager_ref.get_data_locations(session_id, shuffle_keys[:1])[0]),
+                             [(0, DataStorageDevice.DISK)])
+
+            # test writing existing data
+            handler.create_bytes_writer(session_id, shuffle_keys[0], 100, _promise=True) \
+                .then(test_actor.set_result,
+                      lambda *exc: test_actor.set_result(exc, accept=False))
+            with self.assertRaises(StorageDataExists):
+                self.get_result(5)
+
+            for k, d in zip(shuffle_keys, shuffle_data):
+                handler.create_bytes_reader(session_id, k, _promise=True) \
+                    .then(_read_data) \
+                    .then(test_actor.set_result,
+                          lambda *exc: test_actor.set_result(exc, accept=False))
+                assert_allclose(self.get_result(5), d)
+
+            # segment file is removed after all data deleted
+            handler.delete(session_id, shuffle_keys)
+            while os.path.exists(seg_file_name):
+                test_actor.ctx.sleep(0.05)
+            self.assertFalse(os.path.exists(seg_file_name))
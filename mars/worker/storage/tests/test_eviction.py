@@ -0,0 +1,52 @@
+# Copyright 1999-2020 Alibaba Group Holding Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from mars.worker.storage.eviction import get_eviction_policy
+
+
+class Test(unittest.TestCase):
+    def testLRUEviction(self):
+        policy = get_eviction_policy('lru')
+        keys = ['k1', 'k2', 'k3']
+        sizes = dict(k1=10, k2=1000, k3=100)
+        self.assertListEqual(list(policy.iter_spill_keys(keys, sizes, dict(k1=5))), keys)
+
+        with self.assertRaises(ValueError):
+            get_eviction_policy('non_exist')
+
+    def testCostEviction(self):
+        policy = get_eviction_policy('cost')
+        mb = 1024 ** 2
+        io_stats = dict(disk_read_speed=dict(count=100, mean=100 * mb, std=0),
+                        disk_write_speed=dict(count=100, mean=100 * mb, std=0))
+
+        # bigger data are spilled first
+        keys = ['small', 'big']
+        sizes = dict(small=10 * 1024, big=10 * mb)
+        self.assertListEqual(list(policy.iter_spill_keys(keys, sizes, dict(), io_stats)),
+                             ['big', 'small'])
+
+        # colder data are spilled first
+        keys = ['cold', 'hot']
+        sizes = dict(cold=mb, hot=mb)
+        self.assertListEqual(list(policy.iter_spill_keys(keys, sizes, dict(), io_stats)),
+                             ['cold', 'hot'])
+
+        # data with fewer remaining references are spilled first
+        keys = ['cold', 'hot']
+        ref_counts = dict(cold=3, hot=0)
+        self.assertListEqual(list(policy.iter_spill_keys(keys, sizes, ref_counts, io_stats)),
+                             ['hot', 'cold'])
@@ -247,3 +247,75 @@ class Test(WorkerCase):
 
             with self.assertRaises(SystemError):
                 self.get_result(5)
+
+    def testSharedHolderCostSpill(self):
+        old_policy = options.worker.eviction_policy
+        options.worker.eviction_policy = 'cost'
+        try:
+            with self._start_shared_holder_pool() as (pool, test_actor):
+                pool.create_actor(DispatchActor, uid=DispatchActor.default_uid())
+                pool.create_actor(MockIORunnerActor, uid=MockIORunnerActor.default_uid())
+
+                manager_ref = pool.actor_ref(StorageManagerActor.default_uid())
+                shared_holder_ref = pool.actor_ref(SharedHolderActor.default_uid())
+                mock_runner_ref = pool.actor_ref(MockIORunnerActor.default_uid())
+                status_ref = pool.actor_ref(StatusActor.default_uid())
+
+                storage_client = test_actor.storage_client
+                shared_handler = storage_client.get_storage_handler((0, DataStorageDevice.SHARED_MEMORY))
+
+                session_id = str(uuid.uuid4())
+                data_list = [np.random.randint(0, 32767, (655360,), np.int16)
+                             for _ in range(20)]
+                key_list = [str(uuid.uuid4()) for _ in range(20)]
+
+                last_idx = self._fill_shared_storage(session_id, key_list, data_list)
+                data_size = manager_ref.get_data_sizes(session_id, [key_list[0]])[0]
+
+                # keys without remaining references are spilled first
+                storage_client.set_data_ref_counts(
+                    session_id, key_list[:last_idx], [2] * last_idx,
+                    [DataStorageDevice.SHARED_MEMORY])
+                expect_spills = key_list[last_idx - 2:last_idx]
+                storage_client.release_data_refs(
+                    session_id, expect_spills, [DataStorageDevice.SHARED_MEMORY])
+                storage_client.release_data_refs(
+                    session_id, expect_spills, [DataStorageDevice.SHARED_MEMORY])
+
+                keys_before = [tp[1] for tp in shared_holder_ref.dump_keys()]
+                shared_handler.spill_size(data_size * 2) \
+                    .then(lambda *_: test_actor.set_result(None),
+                          lambda *exc: test_actor.set_result(exc, accept=False))
+
+                pool.sleep(0.5)
+                for k in mock_runner_ref.get_request_keys():
+                    mock_runner_ref.submit_item(session_id, k)
+                self.get_result(5)
+
+                keys_after = [tp[1] for tp in shared_holder_ref.dump_keys()]
+                self.assertSetEqual(set(keys_before) - set(keys_after), set(expect_spills))
+
+                stats = shared_holder_ref.get_eviction_stats()
+                self.assertEqual(stats['policy'], 'cost')
+                self.assertEqual(stats['spill_count'], 2)
+                self.assertEqual(stats['spill_size'], data_size * 2)
+                self.assertEqual(status_ref.get_stats(['cache_eviction.cost'])['cache_eviction.cost'],
+                                 stats)
+
+                # loading spilled data back counts as misses
+                pin_token = str(uuid.uuid4())
+                shared_handler.put_objects(session_id, expect_spills[:1], data_list[last_idx - 2:last_idx - 1],
+                                           pin_token=pin_token)
+                stats = shared_holder_ref.get_eviction_stats()
+                self.assertEqual(stats['miss_count'], 1)
+                self.assertEqual(stats['access_count'], 1)
+                self.assertEqual(stats['hit_rate'], 0)
+
+                # deleted keys are no longer tracked as spilled
+                shared_holder_ref.delete_objects(session_id, expect_spills[1:])
+                shared_handler.put_objects(session_id, expect_spills[1:], data_list[last_idx - 1:last_idx],
+                                           pin_token=pin_token)
+                self.assertEqual(shared_holder_ref.get_eviction_stats()['miss_count'], 1)
+
+        finally:
+            options.worker.eviction_policy = old_policy
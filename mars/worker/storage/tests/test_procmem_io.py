@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import mmap
 import uuid
 import weakref
 
@@ -133,3 +134,60 @@ class Test(WorkerCase):
             del data_load
             handler.delete(session_id, [data_key2])
             self.assertIsNone(ref_data())
+
+    def testProcMemLoadMapped(self):
+        test_addr = f'127.0.0.1:{get_next_port()}'
+        with self.create_pool(n_process=1, address=test_addr) as pool, \
+                self.run_actor_test(pool) as test_actor:
+            pool.create_actor(DispatchActor, uid=DispatchActor.default_uid())
+            pool.create_actor(WorkerDaemonActor, uid=WorkerDaemonActor.default_uid())
+            storage_manager_ref = pool.create_actor(
+                StorageManagerActor, uid=StorageManagerActor.default_uid())
+
+            pool.create_actor(QuotaActor, 1024 ** 2, uid=MemQuotaActor.default_uid())
+            pool.create_actor(InProcHolderActor)
+            pool.create_actor(IORunnerActor)
+
+            session_id = str(uuid.uuid4())
+            data_key = str(uuid.uuid4())
+            data_keys = [str(uuid.uuid4()), (data_key, '0'), str(uuid.uuid4())]
+            data_list = [np.random.random((100, 100)) for _ in data_keys]
+
+            storage_client = test_actor.storage_client
+            handler = storage_client.get_storage_handler((0, DataStorageDevice.PROC_MEMORY))
+            disk_handler = storage_client.get_storage_handler((0, DataStorageDevice.DISK))
+
+            def _get_root_buffer(obj):
+                while True:
+                    base = getattr(obj, 'base', None)
+                    if base is None:
+                        base = getattr(obj, 'obj', None)
+                    if base is None:
+                        return obj
+                    obj = base
+
+            compressions = [dataserializer.CompressType.NONE] * 2 + [dataserializer.CompressType.LZ4]
+            for k, d, compress in zip(data_keys, data_list, compressions):
+                disk_handler._compress = compress
+                ser_data = dataserializer.serialize(d)
+                with disk_handler.create_bytes_writer(session_id, k, ser_data.total_bytes) as writer:
+                    ser_data.write_to(writer)
+
+            handler.load_from_bytes_io(session_id, data_keys, disk_handler) \
+                .then(lambda *_: test_actor.set_result(None),
+                      lambda *exc: test_actor.set_result(exc, accept=False))
+            self.get_result(5)
+            self.assertEqual(sorted(storage_manager_ref.get_data_locations(session_id, data_keys[:1])[0]),
+                             [(0, DataStorageDevice.PROC_MEMORY), (0, DataStorageDevice.DISK)])
+
+            disk_handler.delete(session_id, data_keys)
+
+            data_loads = handler.get_objects(session_id, data_keys)
+            for data_load, data in zip(data_loads, data_list):
+                assert_allclose(data_load, data)
+                self.assertTrue(data_load.flags.aligned)
+            # uncompressed data are mapped from spill files
+            self.assertIsInstance(_get_root_buffer(data_loads[0]), mmap.mmap)
+            self.assertIsInstance(_get_root_buffer(data_loads[1]), mmap.mmap)
+            self.assertNotIsInstance(_get_root_buffer(data_loads[2]), mmap.mmap)
+            handler.delete(session_id, data_keys)
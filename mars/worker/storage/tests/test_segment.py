@@ -0,0 +1,110 @@
+# Copyright 1999-2020 Alibaba Group Holding Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from mars.worker.storage.segment import SegmentStore, SEGMENT_SUFFIX, TOMBSTONE_SUFFIX
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self._seg_dir = tempfile.mkdtemp(prefix='mars_test_segment_')
+
+    def tearDown(self):
+        shutil.rmtree(self._seg_dir, ignore_errors=True)
+
+    def _list_segments(self, suffix=SEGMENT_SUFFIX):
+        return [fn for fn in os.listdir(self._seg_dir) if fn.endswith(suffix)]
+
+    def testSegmentStore(self):
+        store = SegmentStore(self._seg_dir, max_segment_size=1024)
+        data = dict((f'key{idx}', os.urandom(100 + idx)) for idx in range(30))
+        for k, v in data.items():
+            store.append(k, v[:50], v[50:])
+
+        # data are packed into a few segment files
+        self.assertLess(len(self._list_segments()), len(data))
+        for k, v in data.items():
+            self.assertTrue(store.contains(k))
+            self.assertEqual(store.get_location(k).offset % 64, 0)
+            self.assertEqual(bytes(store.map_range(k)), v)
+            with store.open_reader(k) as reader:
+                self.assertEqual(reader.size, len(v))
+                self.assertEqual(reader.read(10), v[:10])
+                reader.seek(0)
+                self.assertEqual(reader.read(), v)
+        self.assertFalse(store.contains('non_exist'))
+        with self.assertRaises(KeyError):
+            store.open_reader('non_exist')
+
+        # delete data and compact sealed segments
+        deleted_keys = [f'key{idx}' for idx in range(20)]
+        self.assertEqual(store.delete(deleted_keys + ['non_exist']), deleted_keys)
+        old_segments = self._list_segments()
+        store.compact()
+        self.assertNotEqual(set(old_segments), set(self._list_segments()))
+        for k, v in data.items():
+            if k in deleted_keys:
+                self.assertFalse(store.contains(k))
+            else:
+                with store.open_reader(k) as reader:
+                    self.assertEqual(reader.read(), v)
+
+        # all segments are removed once data are deleted
+        store.delete(list(data.keys()))
+        store.compact()
+        self.assertEqual(self._list_segments(), [])
+        self.assertEqual(self._list_segments(TOMBSTONE_SUFFIX), [])
+
+    def testMultipleStores(self):
+        # stores in different processes share the directory
+        store1 = SegmentStore(self._seg_dir)
+        store2 = SegmentStore(self._seg_dir)
+
+        store1.append('key1', b'data1')
+        store2.append('key2', b'data2')
+
+        with store2.open_reader('key1') as reader:
+            self.assertEqual(reader.read(), b'data1')
+        with store1.open_reader('key2') as reader:
+            self.assertEqual(reader.read(), b'data2')
+
+        # delete data written by another store
+        self.assertEqual(store2.delete(['key1']), ['key1'])
+        self.assertFalse(store2.contains('key1'))
+        store1.refresh()
+        self.assertFalse(store1.contains('key1'))
+
+        # data can be written again after deletion
+        store2.append('key1', b'data1_new')
+        with store1.open_reader('key1') as reader:
+            self.assertEqual(reader.read(), b'data1_new')
+
+        # segments are compacted by their owners
+        store1.delete(['key1', 'key2'])
+        store1.compact()
+        self.assertEqual(len(self._list_segments()), 1)
+        store2.compact()
+        self.assertEqual(self._list_segments(), [])
+
+        # tombstone logs are removed after segments they refer to are removed
+        self.assertEqual(len(self._list_segments(TOMBSTONE_SUFFIX)), 1)
+        store1.compact()
+        self.assertEqual(self._list_segments(TOMBSTONE_SUFFIX), [])
+
+        store1.close()
+        store2.close()
@@ -167,8 +167,9 @@ class VineyardHandler(StorageHandler, ObjectStorageMixin):
                     serialize=False, pin_token=None, _promise=False):
         sizes, shapes = [], []
         for data_key, obj in zip(data_keys, objs):
-            if isinstance(obj, pyarrow.SerializedPyObject):
-                obj = obj.deserialize(dataserializer.mars_serialize_context())
+            if isinstance(obj, (dataserializer.ArrowSerializedPyObject,
+                                dataserializer.Pickle5SerializedObject)):
+                obj = dataserializer.deserialize(obj)
             data_id, size, shape = self._client.put_object(obj)
             sizes.append(size)
             shapes.append(shape)
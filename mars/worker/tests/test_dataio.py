@@ -22,7 +22,8 @@ except ImportError:
     pyarrow = None
 
 from mars.serialize import dataserializer
-from mars.worker.dataio import ArrowBufferIO, FileBufferIO
+from mars.worker.dataio import ArrowBufferIO, FileBufferIO, SerializedBuffersIO, \
+    AdaptiveCompressionFile
 
 
 class Test(unittest.TestCase):
@@ -76,6 +77,38 @@ class Test(unittest.TestCase):
 
             assert_array_equal(data, pyarrow.deserialize(data_sink))
 
+    def testSerializedBuffersIO(self):
+        from numpy.testing import assert_array_equal
+
+        data = (np.random.random((1000, 100)), np.random.random(100))
+        serialized = dataserializer.serialize(data, serial_type=dataserializer.SerialType.PICKLE5)
+
+        for compress in [dataserializer.CompressType.NONE, dataserializer.CompressType.LZ4,
+                         dataserializer.CompressType.GZIP]:
+            if compress != dataserializer.CompressType.NONE \
+                    and compress not in dataserializer.get_supported_compressions():
+                continue
+
+            # test read by chunks
+            bio = BytesIO()
+            reader = SerializedBuffersIO(serialized.to_buffers(), 'r', compress_out=compress)
+            while True:
+                block = reader.read(128)
+                if not block:
+                    break
+                bio.write(block)
+
+            header = dataserializer.read_file_header(bio.getvalue())
+            self.assertEqual(header.type, dataserializer.SerialType.PICKLE5)
+            self.assertEqual(header.nbytes, serialized.total_bytes)
+
+            des_data = dataserializer.loads(bio.getvalue())
+            for a, b in zip(data, des_data):
+                assert_array_equal(a, b)
+
+        with self.assertRaises(NotImplementedError):
+            SerializedBuffersIO(serialized.to_buffers(), 'w')
+
     def testFileBufferIO(self):
         if not np:
             return
@@ -131,3 +164,61 @@ class Test(unittest.TestCase):
                 compressed = compressed_write_file.getvalue()
                 self.assertEqual(c2, dataserializer.read_file_header(compressed).compress)
                 assert_array_equal(data, dataserializer.loads(compressed))
+
+    def testAdaptiveCompression(self):
+        from numpy.testing import assert_array_equal
+
+        CompressType = dataserializer.CompressType
+        compressible = np.zeros((1000, 100))
+        incompressible = np.random.random((1000, 100))
+
+        # test writing into adaptive compression files
+        for data in (compressible, incompressible):
+            serialized = dataserializer.serialize(data).to_buffer()
+            bio = BytesIO()
+            writer = AdaptiveCompressionFile(bio, dataserializer.SerialType.ARROW,
+                                             len(serialized), sample_size=4096)
+            for pos in range(0, len(serialized), 1000):
+                writer.write(serialized[pos:pos + 1000])
+            writer.close()
+
+            compress, ratio = writer.compress_stats
+            self.assertEqual(dataserializer.read_file_header(bio.getvalue()).compress, compress)
+            if data is compressible:
+                self.assertNotEqual(compress, CompressType.NONE)
+                self.assertLess(ratio, 0.5)
+            else:
+                self.assertEqual(compress, CompressType.NONE)
+            assert_array_equal(data, dataserializer.loads(bio.getvalue()))
+
+        # test choosing compression when reading files
+        for data in (compressible, incompressible):
+            for c in [CompressType.NONE] + list(dataserializer.get_supported_compressions()):
+                compressed_read_file = BytesIO(dataserializer.dumps(data, compress=c))
+                reader = FileBufferIO(compressed_read_file, 'r',
+                                      compress_out=CompressType.ADAPTIVE)
+                bio = BytesIO()
+                while True:
+                    block = reader.read(128)
+                    if not block:
+                        break
+                    bio.write(block)
+
+                compress, ratio = reader.compress_stats
+                self.assertEqual(dataserializer.read_file_header(bio.getvalue()).compress, compress)
+                if data is compressible:
+                    self.assertNotEqual(compress, CompressType.NONE)
+                else:
+                    self.assertEqual(compress, CompressType.NONE)
+                assert_array_equal(data, dataserializer.loads(bio.getvalue()))
+
+                # adaptive writers keep compression of incoming data
+                bio.seek(0)
+                compressed_write_file = BytesIO()
+                writer = FileBufferIO(compressed_write_file, 'w',
+                                      compress_in=CompressType.ADAPTIVE, managed=False)
+                writer.write(bio.read())
+                writer.close()
+                self.assertEqual(
+                    dataserializer.read_file_header(compressed_write_file.getvalue()).compress, compress)
+                assert_array_equal(data, dataserializer.loads(compressed_write_file.getvalue()))
@@ -33,7 +33,7 @@ from mars.scheduler.utils import SchedulerClusterInfoActor
 from mars.tests.core import patch_method, create_actor_pool
 from mars.worker.tests.base import WorkerCase
 from mars.worker import DispatchActor, ExecutionActor, CpuCalcActor, WorkerDaemonActor, \
-    StorageManagerActor, StatusActor, QuotaActor, MemQuotaActor, IORunnerActor
+    StorageManagerActor, StatusActor, QuotaActor, MemQuotaActor, IORunnerActor, TracerActor
 from mars.worker.storage import PlasmaKeyMapActor, SharedHolderActor, InProcHolderActor, \
     DataStorageDevice
 from mars.distributor import MarsDistributor
@@ -234,6 +234,47 @@ class Test(WorkerCase):
 
             self.get_result()
 
+    def testExecutionTrace(self):
+        pool_address = f'127.0.0.1:{get_next_port()}'
+        old_trace_enabled = options.trace.enabled
+        options.trace.enabled = True
+        try:
+            with create_actor_pool(n_process=1, backend='gevent', address=pool_address) as pool:
+                tracer_ref = pool.create_actor(TracerActor, uid=TracerActor.default_uid())
+                self.create_standard_actors(pool, pool_address, with_daemon=False)
+                pool.create_actor(CpuCalcActor, uid='w:1:calc-a')
+                pool.create_actor(InProcHolderActor)
+
+                import mars.tensor as mt
+                arr = mt.ones((10, 8), chunk_size=10)
+                graph = arr.build_graph(compose=False, tiled=True)
+                arr = get_tiled(arr)
+
+                with self.run_actor_test(pool) as test_actor:
+                    session_id = str(uuid.uuid4())
+                    execution_ref = test_actor.promise_ref(ExecutionActor.default_uid())
+
+                    graph_key = str(uuid.uuid4())
+                    execution_ref.execute_graph(session_id, graph_key, serialize_graph(graph),
+                                                dict(chunks=[arr.chunks[0].key]), dict(), _promise=True) \
+                        .then(lambda *_: test_actor.set_result(None)) \
+                        .catch(lambda *exc: test_actor.set_result(exc, False))
+
+                self.get_result()
+                pool.sleep(0.5)
+
+                spans = tracer_ref.get_spans(session_id, [graph_key])
+                span_names = [span.name for span in spans]
+                for name in ('allocating', 'preparing_inputs', 'calculating', 'storing', 'calc'):
+                    self.assertIn(name, span_names)
+                for span in spans:
+                    self.assertEqual(span.op_key, graph_key)
+                    self.assertEqual(span.address, pool_address)
+                    self.assertGreaterEqual(span.end, span.start)
+                self.assertEqual(tracer_ref.get_spans(session_id, ['non_exist']), [])
+        finally:
+            options.trace.enabled = old_trace_enabled
+
     def testPrepareQuota(self, *_):
         pinned = True
 
@@ -20,7 +20,6 @@ import tempfile
 import time
 import uuid
 from collections import defaultdict
-from io import BytesIO
 from queue import Empty
 
 import numpy as np
@@ -55,6 +54,7 @@ class MockReceiverWorkerActor(WorkerActor):
 
         self._data_metas = dict()
         self._data_writers = dict()
+        self._end_part_indexes = dict()
         self._callbacks = defaultdict(list)
 
         self._receive_delays = dict()
@@ -76,8 +76,8 @@ class MockReceiverWorkerActor(WorkerActor):
             self._data_metas[query_key] = ReceiverDataMeta(status=status)
 
     def get_result_data(self, session_id, chunk_key):
-        buf = self._data_writers[(session_id, chunk_key)].getvalue()
-        return dataserializer.loads(buf)
+        parts = self._data_writers[(session_id, chunk_key)]
+        return dataserializer.loads(b''.join(parts[idx] for idx in sorted(parts)))
 
     def set_receive_delay_key(self, session_id, chunk_key, delay):
         self._receive_delays[(session_id, chunk_key)] = delay
@@ -101,21 +101,27 @@ class MockReceiverWorkerActor(WorkerActor):
                 self.tell_promise(callback, self.address, self._data_metas[query_key].status)
                 return
             self._data_metas[query_key] = ReceiverDataMeta(chunk_size=data_size, status=ReceiveStatus.RECEIVING)
-            self._data_writers[query_key] = BytesIO()
+            self._data_writers[query_key] = dict()
         if callback:
             self.tell_promise(callback)
 
-    def receive_data_part(self, session_id, chunk_keys, end_marks, *data_parts):
+    def receive_data_part(self, session_id, chunk_keys, end_marks, *data_parts, part_indexes=None):
         finished_keys = []
-        for chunk_key, data_part, end_mark in zip(chunk_keys, data_parts, end_marks):
+        part_indexes = part_indexes or [None] * len(chunk_keys)
+        for chunk_key, data_part, end_mark, part_index in zip(
+                chunk_keys, data_parts, end_marks, part_indexes):
             query_key = (session_id, chunk_key)
             if query_key in self._receive_delays:
                 self.ctx.sleep(self._receive_delays[query_key])
             if query_key in self._receive_errors:
                 raise ValueError
             meta = self._data_metas[query_key]  # type: ReceiverDataMeta
-            self._data_writers[query_key].write(data_part)
+            parts = self._data_writers[query_key]
+            part_index = len(parts) if part_index is None else part_index
+            parts[part_index] = data_part
             if end_mark:
+                self._end_part_indexes[query_key] = part_index
+            if len(parts) == self._end_part_indexes.get(query_key, -1) + 1:
                 finished_keys.append(chunk_key)
                 meta.status = ReceiveStatus.RECEIVED
                 self.storage_client.put_objects(
@@ -459,6 +465,24 @@ class Test(WorkerCase):
             assert_array_equal(storage_client.get_object(
                 session_id, chunk_key2, [DataStorageDevice.SHARED_MEMORY], _promise=False), mock_data)
 
+            # SCENARIO 1.1: parts arriving out of order are reordered
+            chunk_key10 = str(uuid.uuid4())
+            split_size = len(dumped_mock_data) // 3
+            data_parts = [dumped_mock_data[:split_size], dumped_mock_data[split_size:2 * split_size],
+                          dumped_mock_data[2 * split_size:]]
+            self.waitp(receiver_ref.create_data_writers(
+                session_id, [chunk_key10], [data_size], test_actor, _promise=True))
+            receiver_ref.receive_data_part(
+                session_id, [chunk_key10], [True], data_parts[2], part_indexes=[2])
+            receiver_ref.receive_data_part(
+                session_id, [chunk_key10], [False], data_parts[1], part_indexes=[1])
+            self.assertEqual(receiver_ref.check_status(session_id, chunk_key10), ReceiveStatus.RECEIVING)
+            receiver_ref.receive_data_part(
+                session_id, [chunk_key10], [False], data_parts[0], part_indexes=[0])
+            self.assertEqual(receiver_ref.check_status(session_id, chunk_key10), ReceiveStatus.RECEIVED)
+            assert_array_equal(storage_client.get_object(
+                session_id, chunk_key10, [DataStorageDevice.SHARED_MEMORY], _promise=False), mock_data)
+
             # SCENARIO 2: one of the writers failed to create,
             # will test both existing and non-existing keys
             old_create_writer = StorageClient.create_writer
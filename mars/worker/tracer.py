@@ -0,0 +1,49 @@
+# Copyright 1999-2020 Alibaba Group Holding Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import deque
+
+from ..config import options
+from .utils import WorkerActor
+
+
+class TracerActor(WorkerActor):
+    """
+    Actor collecting trace spans of operands executed in the worker
+    """
+    def __init__(self):
+        super().__init__()
+        self._session_spans = dict()
+
+    def add_spans(self, session_id, spans):
+        try:
+            session_spans = self._session_spans[session_id]
+        except KeyError:
+            session_spans = self._session_spans[session_id] = \
+                deque(maxlen=options.trace.max_spans)
+        for span in spans:
+            span.address = self.address
+            session_spans.append(span)
+
+    def get_spans(self, session_id, op_keys=None):
+        """
+        Get trace spans in a session
+        :param session_id: session id
+        :param op_keys: keys of operands to get spans, all spans returned if not specified
+        """
+        spans = self._session_spans.get(session_id, ())
+        if op_keys is None:
+            return list(spans)
+        op_keys = set(op_keys)
+        return [span for span in spans if span.op_key in op_keys]
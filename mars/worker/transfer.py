@@ -17,7 +17,7 @@ import operator
 import logging
 import sys
 import time
-from collections import defaultdict
+from collections import defaultdict, deque
 from enum import Enum
 
 from .. import promise
@@ -45,17 +45,28 @@ class EndpointTransferState(object):
     """
     Structure providing transfer status in an endpoint
     """
-    __slots__ = 'parts', 'total_size', 'keys', 'end_marks', 'send_future'
+    __slots__ = 'parts', 'total_size', 'keys', 'end_marks', 'part_indexes', 'send_futures', \
+                'sent_size', 'start_time'
 
     def __init__(self):
         self.reset()
-        self.send_future = None
+        self.send_futures = deque()
+        self.sent_size = 0
+        self.start_time = None
 
     def reset(self):
         self.parts = []
         self.total_size = 0
         self.keys = []
         self.end_marks = []
+        self.part_indexes = []
+
+    def wait_futures(self, max_in_flight=0, timeout=None):
+        """
+        Wait until number of messages in flight is no more than max_in_flight
+        """
+        while len(self.send_futures) > max_in_flight:
+            self.send_futures.popleft().result(timeout=timeout)
 
 
 class SenderActor(WorkerActor):
@@ -66,10 +77,12 @@ class SenderActor(WorkerActor):
         super().__init__()
         self._dispatch_ref = None
         self._events_ref = None
+        self._status_ref = None
 
     def post_create(self):
         from .dispatcher import DispatchActor
         from .events import EventsActor
+        from .status import StatusActor
 
         super().post_create()
 
@@ -77,6 +90,10 @@ class SenderActor(WorkerActor):
         if not self.ctx.has_actor(self._events_ref):
             self._events_ref = None
 
+        self._status_ref = self.ctx.actor_ref(StatusActor.default_uid())
+        if not self.ctx.has_actor(self._status_ref):
+            self._status_ref = None
+
         self._dispatch_ref = self.promise_ref(DispatchActor.default_uid())
         self._dispatch_ref.register_free_slot(self.uid, 'sender')
 
@@ -194,7 +211,10 @@ class SenderActor(WorkerActor):
     def _compress_and_send(self, session_id, addrs_to_chunks, receiver_refs, keys_to_readers,
                            block_size, timeout=None):
         """
-        Compress and send data to receivers in chunked manner
+        Compress and send data to receivers in chunked manner. Parts of multiple
+        chunks are packed into one message, the next block is read and compressed
+        while current messages are on the wire, and at most
+        ``worker.transfer_window_size`` messages are in flight for every receiver.
         :param session_id: session id
         :param addrs_to_chunks: dict mapping endpoints to chunks to send
         :param receiver_refs: refs to send data to
@@ -207,74 +227,106 @@ class SenderActor(WorkerActor):
         all_chunk_keys = sorted(chunks_to_addrs.keys(), key=lambda k: len(chunks_to_addrs[k]))
         addr_statuses = dict((k, EndpointTransferState()) for k in addrs_to_chunks.keys())
         addr_to_refs = dict((ref.address, ref) for ref in receiver_refs)
+        window_size = max(options.worker.transfer_window_size, 1)
 
         # start compress and send data into targets
         logger.debug('Data writer for chunks %r allocated at targets, start transmission', all_chunk_keys)
 
+        def _submit_read(reader):
+            return reader.get_io_pool().submit(reader.read, block_size)
+
+        def _send_parts(addr, addr_status):
+            addr_status.wait_futures(window_size - 1, timeout=timeout)
+            if addr_status.start_time is None:
+                addr_status.start_time = time.time()
+            # messages in flight may arrive out of order, thus indexes
+            # of parts are sent for receivers to reorder them
+            addr_status.send_futures.append(addr_to_refs[addr].receive_data_part(
+                session_id, addr_status.keys, addr_status.end_marks, *addr_status.parts,
+                part_indexes=addr_status.part_indexes, _wait=False))
+            addr_status.sent_size += addr_status.total_size
+            addr_status.reset()
+
         # filter out endpoints we need to send to
+        read_future = None
         try:
             if not receiver_refs:
                 self._dispatch_ref.register_free_slot(self.uid, 'sender', _tell=True, _wait=False)
                 return
-            cur_key_id = 0
+            cur_key_id = cur_part_index = 0
             cur_key = all_chunk_keys[cur_key_id]
             cur_reader = keys_to_readers[cur_key]
+            read_future = _submit_read(cur_reader)
             with EventContext(self._events_ref, EventCategory.PROCEDURE, EventLevel.NORMAL,
                               ProcedureEventType.NETWORK, self.uid):
                 while cur_key_id < len(all_chunk_keys):
                     # read a data part from reader we defined above
-                    pool = cur_reader.get_io_pool()
-                    next_part = pool.submit(cur_reader.read, block_size).result()
+                    next_part = read_future.result()
                     file_eof = len(next_part) < block_size
+                    part_key, part_index = cur_key, cur_part_index
+                    cur_part_index += 1
 
-                    for addr in chunks_to_addrs[cur_key]:
-                        addr_status = addr_statuses[addr]
-                        addr_status.parts.append(next_part)
-                        addr_status.keys.append(cur_key)
-                        addr_status.total_size += len(next_part)
-                        addr_status.end_marks.append(file_eof)
-
-                        if addr_status.total_size >= block_size:
-                            if addr_status.send_future:
-                                addr_status.send_future.result(timeout=timeout)
-                            addr_status.send_future = addr_to_refs[addr].receive_data_part(
-                                session_id, addr_status.keys, addr_status.end_marks,
-                                *addr_status.parts, _wait=False)
-                            addr_status.reset()
-
-                    # when some part goes to end, move to the next chunk
+                    # when some part goes to end, move to the next chunk,
+                    # and read ahead before sending current part
                     if file_eof:
+                        self._update_compress_stats(cur_reader)
                         cur_reader.close()
                         cur_key_id += 1
+                        cur_part_index = 0
                         if cur_key_id < len(all_chunk_keys):
-                            # still some chunks left unhandled
                             cur_key = all_chunk_keys[cur_key_id]
                             cur_reader = keys_to_readers[cur_key]
-                        else:
-                            # all chunks handled
-                            for addr, addr_status in addr_statuses.items():
-                                if addr_status.send_future:
-                                    addr_status.send_future.result(timeout=timeout)
-                                if addr_status.parts:
-                                    # send remaining chunks
-                                    addr_status.end_marks[-1] = True
-                                    addr_status.send_future = addr_to_refs[addr].receive_data_part(
-                                        session_id, addr_status.keys, addr_status.end_marks,
-                                        *addr_status.parts, _wait=False)
-                                addr_status.reset()
-                            for addr_status in addr_statuses.values():
-                                if addr_status.send_future:
-                                    addr_status.send_future.result(timeout=timeout)
-                                addr_status.reset()
+                            read_future = _submit_read(cur_reader)
+                    else:
+                        read_future = _submit_read(cur_reader)
+
+                    for addr in chunks_to_addrs[part_key]:
+                        addr_status = addr_statuses[addr]
+                        addr_status.parts.append(next_part)
+                        addr_status.keys.append(part_key)
+                        addr_status.total_size += len(next_part)
+                        addr_status.end_marks.append(file_eof)
+                        addr_status.part_indexes.append(part_index)
 
+                        if addr_status.total_size >= block_size:
+                            _send_parts(addr, addr_status)
+
+                # all chunks handled, send remaining parts
+                for addr, addr_status in addr_statuses.items():
+                    if addr_status.parts:
+                        addr_status.end_marks[-1] = True
+                        _send_parts(addr, addr_status)
+                for addr, addr_status in addr_statuses.items():
+                    addr_status.wait_futures(timeout=timeout)
+                    self._update_send_speed(addr, addr_status)
         except:  # noqa: E722
             for ref in receiver_refs:
                 ref.cancel_receive(session_id, addrs_to_chunks[ref.address], _tell=True, _wait=False)
             raise
         finally:
+            if read_future is not None:
+                # make sure no reads are running when closing readers
+                read_future.wait()
             for reader in keys_to_readers.values():
                 reader.close()
 
+    def _update_compress_stats(self, reader):
+        compress_stats = reader.compress_stats
+        if self._status_ref is None or compress_stats is None:
+            return
+        compress, ratio = compress_stats
+        self._status_ref.update_mean_stats(
+            f'compress_ratio.transfer.{compress.value}', ratio, _tell=True, _wait=False)
+
+    def _update_send_speed(self, addr, addr_status):
+        if self._status_ref is None or addr_status.start_time is None:
+            return
+        time_delta = time.time() - addr_status.start_time
+        if time_delta > 1e-6:
+            self._status_ref.update_mean_stats(
+                f'net_send_speed.{addr}', addr_status.sent_size * 1.0 / time_delta,
+                _tell=True, _wait=False)
+
 
 class ReceiverDataMeta(object):
     __slots__ = 'start_time', 'chunk_size', 'source_address',\
@@ -489,6 +541,9 @@ class ReceiverWorkerActor(WorkerActor):
         self._data_writers = dict()
         self._writing_futures = dict()
         self._data_metas = dict()
+        # indexes of parts to write next and parts arriving earlier
+        self._next_part_indexes = dict()
+        self._early_parts = defaultdict(dict)
 
     def post_create(self):
         from .events import EventsActor
@@ -615,8 +670,36 @@ class ReceiverWorkerActor(WorkerActor):
         except KeyError:
             pass
 
+    def _iter_ordered_parts(self, session_id, chunk_keys, end_marks, data_parts, part_indexes):
+        """
+        Iterate over data parts in the order they are sent. Parts arriving
+        earlier than their predecessors are held until predecessors arrive.
+        """
+        if part_indexes is None:
+            yield from zip(chunk_keys, data_parts, end_marks)
+            return
+
+        for chunk_key, data_part, end_mark, part_index in zip(
+                chunk_keys, data_parts, end_marks, part_indexes):
+            session_chunk_key = (session_id, chunk_key)
+            next_index = self._next_part_indexes.get(session_chunk_key, 0)
+            if part_index != next_index:
+                self._early_parts[session_chunk_key][part_index] = (data_part, end_mark)
+                continue
+
+            yield chunk_key, data_part, end_mark
+            next_index += 1
+            early_parts = self._early_parts.get(session_chunk_key)
+            while early_parts and next_index in early_parts:
+                data_part, end_mark = early_parts.pop(next_index)
+                yield chunk_key, data_part, end_mark
+                next_index += 1
+            if early_parts is not None and not early_parts:
+                del self._early_parts[session_chunk_key]
+            self._next_part_indexes[session_chunk_key] = next_index
+
     @log_unhandled
-    def receive_data_part(self, session_id, chunk_keys, end_marks, *data_parts):
+    def receive_data_part(self, session_id, chunk_keys, end_marks, *data_parts, part_indexes=None):
         """
         Receive data part from sender
         :param session_id: session id
@@ -625,10 +708,13 @@ class ReceiverWorkerActor(WorkerActor):
                           if one element is True, the corresponding data in data_parts
                           is the last part of the chunk.
         :param data_parts: data parts to be written
+        :param part_indexes: indexes of data parts in their chunks. If specified,
+                             parts arriving out of order will be reordered.
         """
         try:
             finished_keys, finished_meta_keys, finished_metas = [], [], []
-            for chunk_key, data_part, end_mark in zip(chunk_keys, data_parts, end_marks):
+            for chunk_key, data_part, end_mark in self._iter_ordered_parts(
+                    session_id, chunk_keys, end_marks, data_parts, part_indexes):
                 self._wait_unfinished_writing(session_id, chunk_key)
                 session_chunk_key = (session_id, chunk_key)
                 try:
@@ -668,6 +754,7 @@ class ReceiverWorkerActor(WorkerActor):
                     data_meta.status = ReceiveStatus.RECEIVED
                     logger.debug('Transfer for data %s finished.', chunk_key)
                     del self._data_writers[session_chunk_key]
+                    self._next_part_indexes.pop(session_chunk_key, None)
 
                 self._invoke_finish_callbacks(session_id, finished_keys)
             if finished_meta_keys:
@@ -736,6 +823,8 @@ class ReceiverWorkerActor(WorkerActor):
 
         for chunk_key in chunk_keys:
             session_chunk_key = (session_id, chunk_key)
+            self._next_part_indexes.pop(session_chunk_key, None)
+            self._early_parts.pop(session_chunk_key, None)
 
             # stop and close data writer
             try:
@@ -865,16 +954,20 @@ def put_remote_chunk(session_id, chunk_key, data, receiver_manager_ref):
     """
     Put a chunk to target machine using given receiver_ref
     """
-    from .dataio import ArrowBufferIO
-    buf = dataserializer.serialize(data).to_buffer()
+    from .dataio import ArrowBufferIO, SerializedBuffersIO
+    serialized = dataserializer.serialize(data)
     receiver_ref, _ = receiver_manager_ref.create_data_writers(
-        session_id, [chunk_key], [buf.size], None, ensure_cached=False, use_promise=False)
+        session_id, [chunk_key], [serialized.total_bytes], None, ensure_cached=False, use_promise=False)
     receiver_ref = receiver_manager_ref.ctx.actor_ref(receiver_ref)
     block_size = options.worker.transfer_block_size
 
     reader = None
     try:
-        reader = ArrowBufferIO(buf, 'r', block_size=block_size)
+        if isinstance(serialized, dataserializer.Pickle5SerializedObject):
+            # send buffers one by one without concatenating them
+            reader = SerializedBuffersIO(serialized.to_buffers(), 'r', block_size=block_size)
+        else:  # pragma: no cover
+            reader = ArrowBufferIO(serialized.to_buffer(), 'r', block_size=block_size)
         futures = []
         while True:
             next_part = reader.read(block_size)